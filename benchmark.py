@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Benchmarks sans interface des opérations principales de github.py.
+
+Construit un dépôt synthétique (nombre de commits, de branches, de fichiers et
+profondeur d'historique configurables) et un dépôt distant local nu, mesure les
+chemins utilisés par l'application puis compare le résultat à une référence.
+Les lectures d'historique sont mesurées à la fois via git et via le lecteur natif.
+
+    python benchmark.py --commits 2000 --branches 20 --files 500 --depth 50
+    python benchmark.py --save-baseline
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+from git import Repo
+
+from github import GitOperations, NativeGitReader
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+BENCH_AUTHOR = b"Bench <bench@example.com>"
+
+
+class SyntheticRepoBuilder:
+    """Génère un dépôt de travail et son dépôt distant nu avec git fast-import"""
+
+    def __init__(self, commits=1000, branches=10, files=200, depth=20):
+        self.commits = max(2, commits)
+        self.branches = branches
+        self.files = max(1, files)
+        self.depth = depth
+
+    def _path(self, index):
+        # Répartir les fichiers sur deux niveaux de dossiers
+        return f"src/d{index % 16:02d}/s{index % 7}/file{index}.txt".encode()
+
+    @staticmethod
+    def _data(payload):
+        return b"data %d\n%s\n" % (len(payload), payload)
+
+    def _commit(self, ref, mark, parent, timestamp, message, changes):
+        out = [b"commit %s\n" % ref, b"mark :%d\n" % mark,
+               b"committer %s %d +0000\n" % (BENCH_AUTHOR, timestamp),
+               self._data(message)]
+        if parent:
+            out.append(b"from :%d\n" % parent)
+        for path, content in changes:
+            out.append(b"M 100644 inline %s\n" % path)
+            out.append(self._data(content))
+        return b"".join(out)
+
+    def _stream(self):
+        """Produit le flux fast-import : branche main, branches latérales et branche en conflit"""
+        timestamp = 1700000000
+        mark = 0
+        main_marks = []
+        touched = 0
+
+        # Commit initial avec tous les fichiers
+        mark += 1
+        yield self._commit(b"refs/heads/main", mark, None, timestamp, b"Initial commit",
+                           [(self._path(i), b"line 0 of file %d\n" % i) for i in range(self.files)])
+        main_marks.append(mark)
+
+        # Historique principal : chaque commit modifie quelques fichiers en rotation
+        for n in range(1, self.commits):
+            mark += 1
+            changes = []
+            for _ in range(3):
+                touched = (touched + 1) % self.files
+                changes.append((self._path(touched), b"revision %d of file %d\n" % (n, touched)))
+            yield self._commit(b"refs/heads/main", mark, main_marks[-1], timestamp + n,
+                               b"Commit %d on main\n\nUpdates %d files" % (n, len(changes)), changes)
+            main_marks.append(mark)
+        last_touched = touched
+
+        # Branches latérales partant de points répartis dans l'historique
+        for b in range(self.branches):
+            ref = b"refs/heads/feature-%d" % b
+            parent = main_marks[(b + 1) * len(main_marks) // (self.branches + 1)]
+            for d in range(self.depth):
+                mark += 1
+                index = (b * 31 + d) % self.files
+                yield self._commit(ref, mark, parent, timestamp + self.commits + d,
+                                   b"Feature %d step %d" % (b, d),
+                                   [(self._path(index), b"feature %d step %d\n" % (b, d))])
+                parent = mark
+            if not self.depth:
+                yield b"reset %s\nfrom :%d\n\n" % (ref, parent)
+
+        # Branche qui entre en conflit avec le dernier commit de main
+        mark += 1
+        yield self._commit(b"refs/heads/bench-conflict", mark, main_marks[-2], timestamp + self.commits,
+                           b"Conflicting change", [(self._path(last_touched), b"conflicting content\n")])
+
+    def build(self, root):
+        """Crée root/work (dépôt de travail) et root/remote.git (distant nu), renvoie leurs chemins"""
+        work = os.path.join(root, "work")
+        remote = os.path.join(root, "remote.git")
+        subprocess.run(["git", "init", "-q", "-b", "main", work], check=True)
+        subprocess.run(["git", "-C", work, "config", "user.name", "Bench"], check=True)
+        subprocess.run(["git", "-C", work, "config", "user.email", "bench@example.com"], check=True)
+
+        proc = subprocess.Popen(["git", "-C", work, "fast-import", "--quiet"], stdin=subprocess.PIPE)
+        for chunk in self._stream():
+            proc.stdin.write(chunk)
+        proc.stdin.close()
+        if proc.wait() != 0:
+            raise RuntimeError("git fast-import a échoué")
+
+        subprocess.run(["git", "-C", work, "checkout", "-q", "-f", "main"], check=True)
+        subprocess.run(["git", "clone", "-q", "--bare", work, remote], check=True)
+        subprocess.run(["git", "-C", work, "remote", "add", "origin", remote], check=True)
+        subprocess.run(["git", "-C", work, "fetch", "-q", "origin"], check=True)
+        return work, remote
+
+
+class BenchmarkRunner:
+    """Mesure les opérations de github.py sur un dépôt synthétique"""
+
+    def __init__(self, work, remote, root, repeat=5):
+        self.work = work
+        self.remote = remote
+        self.root = root
+        self.repeat = repeat
+        self.repo = Repo(work)
+        self.ops = GitOperations(self.repo)
+        self.native = NativeGitReader(work)
+        self.results = {}
+        self.outputs = {}
+        self.mismatches = []
+
+    def measure(self, name, func, setup=None, teardown=None):
+        """Exécute func plusieurs fois, conserve la médiane et le dernier résultat"""
+        durations = []
+        for i in range(self.repeat):
+            if setup:
+                setup(i)
+            start = time.perf_counter()
+            self.outputs[name] = func(i)
+            durations.append(time.perf_counter() - start)
+            if teardown:
+                teardown(i)
+        self.results[name] = statistics.median(durations)
+
+    def check(self, reference, native, normalize=lambda value: value):
+        """Le lecteur natif doit renvoyer exactement ce que renvoie git : sinon la mesure ne compte pas"""
+        if normalize(self.outputs[reference]) != normalize(self.outputs[native]):
+            self.mismatches.append(native)
+
+    def _touch(self, i):
+        with open(os.path.join(self.work, "bench.txt"), "w", encoding="utf-8") as f:
+            f.write(f"bench {i} {time.time()}\n")
+
+    def _commit(self, i):
+        self._touch(i)
+        self.ops.commit_all(f"Bench commit {i}")
+
+    def _merge_conflict(self, i):
+        try:
+            self.repo.git.merge("--no-edit", "bench-conflict")
+        except Exception:
+            pass  # Le conflit est attendu
+
+    def _abort_merge(self, i):
+        self.repo.git.merge("--abort")
+
+    def run(self):
+        total = int(self.repo.git.rev_list("--count", "--all"))
+        self.measure("history_50", lambda i: self.ops.commit_history(limit=50))
+        self.measure("history_full", lambda i: self.ops.commit_history(limit=total))
+        self.measure("history_grep", lambda i: self.ops.commit_history(message="Commit 1", limit=total))
+        self.measure("branch_list", lambda i: self.ops.list_branches())
+
+        # Lecteur natif (packs projetés en mémoire) comparé aux sous-processus ci-dessus
+        self.measure("native_history_50", lambda i: self.native.commit_history(limit=50))
+        self.measure("native_history_full", lambda i: self.native.commit_history(limit=total))
+        self.measure("native_history_grep", lambda i: self.native.commit_history(message="Commit 1", limit=total))
+        self.measure("native_branch_list", lambda i: self.native.list_branches())
+        head = self.repo.head.commit
+        self.measure("commit_files", lambda i: [d.a_path for p in head.parents for d in p.diff(head)])
+        self.measure("native_commit_files", lambda i: self.native.changed_files(head.hexsha))
+        for name in ("history_50", "history_full", "history_grep"):
+            self.check(name, f"native_{name}")
+        self.check("branch_list", "native_branch_list", sorted)
+        self.check("commit_files", "native_commit_files", sorted)
+
+        self.measure("status", lambda i: self.ops.is_dirty())
+        self.measure("commit", lambda i: self.ops.commit_all(f"Bench commit {i}"), setup=self._touch)
+        self.measure("push", lambda i: self.ops.push("origin", "main"), setup=self._commit)
+        self.measure("clone", lambda i: Repo.clone_from(self.remote, os.path.join(self.root, f"clone{i}")),
+                     teardown=lambda i: shutil.rmtree(os.path.join(self.root, f"clone{i}"), ignore_errors=True))
+        self.measure("conflict_detection", lambda i: self.ops.unmerged_files(),
+                     setup=self._merge_conflict, teardown=self._abort_merge)
+        self.native.close()
+        return self.results
+
+
+def scenario_key(args):
+    return f"commits={args.commits},branches={args.branches},files={args.files},depth={args.depth}"
+
+
+def load_baselines(path):
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def compare(results, baseline, threshold, min_delta):
+    """Renvoie la liste des opérations en régression par rapport à la référence"""
+    regressions = []
+    for name, duration in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if duration > reference * (1 + threshold) and duration - reference > min_delta:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks sans interface de github.py")
+    parser.add_argument("--commits", type=int, default=1000, help="nombre de commits sur main")
+    parser.add_argument("--branches", type=int, default=10, help="nombre de branches latérales")
+    parser.add_argument("--files", type=int, default=200, help="nombre de fichiers suivis")
+    parser.add_argument("--depth", type=int, default=20, help="profondeur d'historique de chaque branche")
+    parser.add_argument("--repeat", type=int, default=5, help="répétitions par mesure (médiane)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="régression tolérée (0.25 = +25%%)")
+    parser.add_argument("--min-delta", type=float, default=0.005, help="écart minimal signalé, en secondes")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="fichier de référence")
+    parser.add_argument("--save-baseline", action="store_true", help="enregistrer les résultats comme référence")
+    parser.add_argument("--keep", action="store_true", help="conserver les dépôts générés")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="github_py_bench_")
+    try:
+        start = time.perf_counter()
+        work, remote = SyntheticRepoBuilder(args.commits, args.branches, args.files, args.depth).build(root)
+        print(f"Dépôt synthétique créé en {time.perf_counter() - start:.2f}s dans {root}")
+
+        runner = BenchmarkRunner(work, remote, root, args.repeat)
+        results = runner.run()
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    key = scenario_key(args)
+    baselines = load_baselines(args.baseline)
+    baseline = baselines.get(key, {})
+    regressions = compare(results, baseline, args.threshold, args.min_delta)
+
+    print(f"\nScénario: {key}")
+    print(f"{'Opération':<22}{'Médiane (ms)':>14}{'Référence (ms)':>16}{'Écart':>10}")
+    for name, duration in results.items():
+        reference = baseline.get(name)
+        ref_text = f"{reference * 1000:.1f}" if reference is not None else "-"
+        delta = f"{(duration / reference - 1) * 100:+.0f}%" if reference else "-"
+        flag = "  RÉGRESSION" if name in regressions else ""
+        print(f"{name:<22}{duration * 1000:>14.1f}{ref_text:>16}{delta:>10}{flag}")
+
+    if runner.mismatches:
+        print(f"\nRésultats différents de git pour : {', '.join(runner.mismatches)}")
+        return 1
+
+    if args.save_baseline:
+        baselines[key] = results
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=4, ensure_ascii=False)
+        print(f"\nRéférence enregistrée dans {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} régression(s) au-delà de {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
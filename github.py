@@ -7,21 +7,87 @@ import shutil
 import hashlib
 import time
 import json
+import sqlite3
+import tempfile
+import atexit
 import threading
+import uuid
 import ctypes
+import mmap
+import zlib
+import heapq
+import re
+import struct
+import glob
+import itertools
+import codecs
+import unicodedata
+import array
+import bisect
+import subprocess
+import pickle
+import multiprocessing
+import asyncio
+import difflib
 import git
 from git import Repo
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, simpledialog, filedialog, font
-from datetime import datetime
+from collections import deque, OrderedDict
+from contextlib import contextmanager, asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone, timedelta
 
 # Configuration
 CONFIG_FILE = "github_py_config.json"
+CONFIG_DB_FILE = "github_py_config.db"
+USE_SQLITE_CONFIG = False
+CONFIG_SAVE_DELAY = 0.5  # secondes
 TEMP_DIR = "temp_git"
 CACHE_DIR = "git_cache"
 BACKUP_DIR = "git_backups"
-HISTORY_FILE = "git_history.json"
+HISTORY_FILE = "git_history.json"  # journal des opérations, une ligne JSON par opération
+JOURNAL_FLUSH_INTERVAL = 1.0  # secondes entre deux écritures du journal
+JOURNAL_MAX_BYTES = 5 * 1024 * 1024  # taille au-delà de laquelle le journal est renommé en .1
+JOURNAL_BACKUPS = 3
+TAG_PAGE_SIZE = 100
+METRICS_RING_SIZE = 5000
+NATIVE_DELTA_CACHE_BYTES = 32 * 1024 * 1024
+SEARCH_INDEX_DIR = os.path.abspath(os.path.join(CACHE_DIR, "search"))
+FILE_HISTORY_CACHE_BYTES = 32 * 1024 * 1024
+STREAM_FLUSH_INTERVAL = 0.1  # secondes entre deux lots envoyés à l'interface
+DIFF_FILE_MAX_BYTES = 2 * 1024 * 1024  # diff d'un fichier lu au-delà : tronqué
+DIFF_VIEW_MAX_BYTES = 8 * 1024 * 1024  # texte affiché au total dans une visionneuse
+DIFF_PAGE_LINES = 400
+REMOTE_REFS_TTL = 300  # secondes ; remplaçable par dépôt avec la clé "remote_refs_ttl"
+REMOTE_REFS_DIR = os.path.abspath(os.path.join(CACHE_DIR, "remote_refs"))
+AUTO_STASH_MAX_AGE_DAYS = 30
+WORKTREE_DIR = os.path.abspath(os.path.join(CACHE_DIR, "worktrees"))
+WORKTREE_POOL_SIZE = 4
+WORKTREE_DISK_BUDGET = 5 * 1024 * 1024 * 1024
+LARGE_FILE_THRESHOLD = 50 * 1024 * 1024  # remplaçable par dépôt avec la clé "large_file_threshold"
+PARSE_POOL_WORKERS = 2  # processus dédiés à l'analyse des sorties git ; 0 pour tout garder dans l'application
+PARSE_POOL_VIEWS = 8  # parcours d'historique conservés par processus
+STATUS_POLL_INTERVAL = 2000  # ms minimum entre deux git status du panneau des modifications
+ASYNC_GIT_CONCURRENCY = 8  # commandes git réseau simultanées, tous dépôts confondus
+ASYNC_GIT_PER_REPO = 2  # commandes git réseau simultanées dans un même dépôt
+IMPORT_SCAN_WORKERS = 8  # dossiers lus en parallèle lors de l'import d'une arborescence
+IMPORT_SKIP_DIRS = ("node_modules", "venv", ".venv", "__pycache__", ".tox", "build", "dist", "target")
+MIRROR_DIR = os.path.abspath(os.path.join(CACHE_DIR, "mirrors"))
+MIRROR_CONCURRENCY = 2  # synchronisations de miroirs simultanées
+MIRROR_INTERVAL = 15 * 60  # secondes entre deux synchronisations d'un même miroir
+ANALYTICS_DIR = os.path.abspath(os.path.join(CACHE_DIR, "analytics"))
+ANALYTICS_TOP_COUNT = 50  # plus gros fichiers et dossiers conservés dans le rapport
+MAINTENANCE_STATE_FILE = os.path.abspath(os.path.join(CACHE_DIR, "maintenance.json"))
+MAINTENANCE_IDLE_SECONDS = 300  # inactivité requise avant de lancer la maintenance
+MAINTENANCE_INTERVAL = 24 * 3600  # délai minimal entre deux maintenances d'un dépôt
+MAINTENANCE_CONCURRENCY = 2
+MAINTENANCE_NICENESS = 10
+# Chemins absolus : les opérations changent le répertoire courant (os.chdir)
+METRICS_JSONL_FILE = os.path.abspath(os.path.join(CACHE_DIR, "metrics.jsonl"))
+METRICS_PROM_FILE = os.path.abspath(os.path.join(CACHE_DIR, "metrics.prom"))
 
 # Thème de couleurs plus douce et moderne
 COLORS = {
@@ -87,676 +153,6780 @@ class Fonts:
                 font.nametofont("TkTitleFont").configure(family="Segoe UI", size=16, weight="bold")
                 font.nametofont("TkButtonFont").configure(family="Segoe UI", size=10, weight="bold")
             except:
-                pass 
+                pass
+
+def format_size(size):
+    """Formate une taille en octets pour l'affichage"""
+    if size is None:
+        return "inconnue"
+    for unit in ("o", "Ko", "Mo", "Go"):
+        if size < 1024 or unit == "Go":
+            return f"{size:.0f} {unit}" if unit == "o" else f"{size:.1f} {unit}"
+        size /= 1024
+
+class OperationMetrics:
+    """Mesures de durée des opérations, conservées dans un anneau en mémoire"""
+
+    def __init__(self, size=METRICS_RING_SIZE):
+        self.spans = deque(maxlen=size)
+        self.lock = threading.Lock()
+
+    def record(self, operation, repo, command, duration, size=0, exit_status=0):
+        """Enregistre une mesure terminée"""
+        with self.lock:
+            self.spans.append({
+                "time": time.time(),
+                "operation": operation,
+                "repo": repo,
+                "command": command,
+                "duration": duration,
+                "bytes": size,
+                "exit_status": exit_status,
+            })
+
+    @contextmanager
+    def span(self, operation, repo="", command=""):
+        """Mesure la durée du bloc ; le dictionnaire renvoyé permet de renseigner 'bytes' (stdout et stderr)"""
+        info = {"bytes": 0, "exit_status": 0}
+        start = time.perf_counter()
+        try:
+            yield info
+        except BaseException:
+            info["exit_status"] = info["exit_status"] or 1
+            raise
+        finally:
+            self.record(operation, repo, command, time.perf_counter() - start,
+                        info["bytes"], info["exit_status"])
+
+    def snapshot(self):
+        """Renvoie une copie des mesures courantes"""
+        with self.lock:
+            return list(self.spans)
+
+    @staticmethod
+    def _percentile(sorted_values, fraction):
+        if not sorted_values:
+            return 0.0
+        rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+        return sorted_values[rank]
+
+    def summary(self):
+        """Renvoie par type d'opération : nombre, p50, p95, erreurs et octets"""
+        by_operation = {}
+        for span in self.snapshot():
+            by_operation.setdefault(span["operation"], []).append(span)
+        result = {}
+        for operation, spans in by_operation.items():
+            durations = sorted(span["duration"] for span in spans)
+            result[operation] = {
+                "count": len(spans),
+                "p50": self._percentile(durations, 0.50),
+                "p95": self._percentile(durations, 0.95),
+                "sum": sum(durations),
+                "errors": sum(1 for span in spans if span["exit_status"]),
+                "bytes": sum(span["bytes"] for span in spans),
+            }
+        return result
+
+    def export_jsonl(self, path):
+        """Exporte les mesures au format JSON lines"""
+        with open(path, "w", encoding="utf-8") as f:
+            for span in self.snapshot():
+                f.write(json.dumps(span, ensure_ascii=False) + "\n")
+
+    def export_prometheus(self, path):
+        """Exporte un résumé au format texte Prometheus"""
+        def label(value):
+            return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        lines = [
+            "# HELP github_py_operation_duration_seconds Durée des opérations",
+            "# TYPE github_py_operation_duration_seconds summary",
+        ]
+        summary = self.summary()
+        for operation, stats in sorted(summary.items()):
+            op = label(operation)
+            lines.append(f'github_py_operation_duration_seconds{{operation="{op}",quantile="0.5"}} {stats["p50"]:.6f}')
+            lines.append(f'github_py_operation_duration_seconds{{operation="{op}",quantile="0.95"}} {stats["p95"]:.6f}')
+            lines.append(f'github_py_operation_duration_seconds_sum{{operation="{op}"}} {stats["sum"]:.6f}')
+            lines.append(f'github_py_operation_duration_seconds_count{{operation="{op}"}} {stats["count"]}')
+        lines.append("# HELP github_py_operation_errors_total Opérations terminées en erreur")
+        lines.append("# TYPE github_py_operation_errors_total counter")
+        for operation, stats in sorted(summary.items()):
+            lines.append(f'github_py_operation_errors_total{{operation="{label(operation)}"}} {stats["errors"]}')
+        lines.append("# HELP github_py_operation_bytes_total Octets produits par les opérations")
+        lines.append("# TYPE github_py_operation_bytes_total counter")
+        for operation, stats in sorted(summary.items()):
+            lines.append(f'github_py_operation_bytes_total{{operation="{label(operation)}"}} {stats["bytes"]}')
+
+        # Écriture atomique pour le collecteur de fichiers texte
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+# Mesures partagées par toute l'application
+METRICS = OperationMetrics()
+
+class OperationJournal:
+    """Journal des opérations en ajout seul (JSON lines), écrit par lots et avec rotation par taille
+
+    Chaque enregistrement contient le dépôt, les arguments, les références modifiées (avant/après),
+    la durée et le résultat. Un index en mémoire, complété au fil des lectures, sert aux requêtes.
+    """
+
+    def __init__(self, path=HISTORY_FILE, flush_interval=JOURNAL_FLUSH_INTERVAL,
+                 max_bytes=JOURNAL_MAX_BYTES, backups=JOURNAL_BACKUPS):
+        self.path = os.path.abspath(path)
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.pending = []
+        self.flusher = None
+        self.stopped = threading.Event()
+        # Index des requêtes : enregistrements, durées et positions par (dépôt, jour)
+        self.index_lock = threading.Lock()
+        self.index_file = None
+        self.index_offset = 0
+        self.entries = []
+        self.durations = array.array('d')
+        self.by_repo_day = {}
+        self.by_id = {}
+        self.undo_stacks = {}  # dépôt -> positions des opérations encore annulables, la plus récente en dernier
+        atexit.register(self.close)
+
+    @staticmethod
+    def ref_state(git_repo):
+        """Renvoie {référence: hash} des références locales, plus HEAD tel qu'écrit dans .git/HEAD
+
+        Chaque stash apparaît aussi sous la clé "stash:<hash>" avec son message, lu directement
+        dans le reflog de refs/stash : un stash créé ou supprimé est ainsi visible même s'il
+        n'était pas au sommet de la pile.
+        """
+        state = {}
+        for line in git_repo.git.for_each_ref('--format=%(refname) %(objectname)').splitlines():
+            ref, _, sha = line.partition(" ")
+            state[ref] = sha
+        try:
+            with open(os.path.join(git_repo.git_dir, "HEAD"), "r", encoding="utf-8") as f:
+                state["HEAD"] = f.read().strip()
+        except OSError:
+            pass
+        try:
+            with open(os.path.join(git_repo.common_dir, "logs", "refs", "stash"), "r",
+                      encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    header, _, message = line.rstrip("\n").partition("\t")
+                    fields = header.split(" ", 2)
+                    if len(fields) == 3:
+                        state[f"stash:{fields[1]}"] = message
+        except OSError:
+            pass
+        return state
+
+    @staticmethod
+    def _safe_state(git_repo):
+        try:
+            return OperationJournal.ref_state(git_repo) if git_repo is not None else {}
+        except Exception:
+            return {}
+
+    @staticmethod
+    def _start(operation, repo, args):
+        return {"id": uuid.uuid4().hex, "time": time.time(), "operation": operation, "repo": repo,
+                "args": [str(arg) for arg in args]}
+
+    def _finish(self, entry, before, after, start):
+        entry["duration"] = time.perf_counter() - start
+        entry["refs"] = {ref: [before.get(ref), after.get(ref)]
+                         for ref in sorted(set(before) | set(after)) if before.get(ref) != after.get(ref)}
+        self.append(entry)
+
+    @contextmanager
+    def operation(self, operation, repo, args=(), git_repo=None):
+        """Journalise le bloc : références avant/après, durée et résultat
+
+        Le dictionnaire renvoyé accepte une clé "git_repo" pour lire l'état final dans un autre
+        dépôt (par exemple celui qui vient d'être cloné).
+        """
+        entry = self._start(operation, repo, args)
+        before = self._safe_state(git_repo)
+        start = time.perf_counter()
+        try:
+            yield entry
+            entry["outcome"] = "success"
+        except BaseException as e:
+            entry["outcome"] = "error"
+            entry["error"] = str(e).strip()[:500]
+            raise
+        finally:
+            self._finish(entry, before, self._safe_state(entry.pop("git_repo", git_repo)), start)
+
+    @asynccontextmanager
+    async def operation_async(self, operation, repo, args=(), git_repo=None):
+        """Comme operation, dans une coroutine : l'état des références est lu hors de la boucle asyncio"""
+        loop = asyncio.get_running_loop()
+        entry = self._start(operation, repo, args)
+        before = await loop.run_in_executor(None, self._safe_state, git_repo)
+        start = time.perf_counter()
+        try:
+            yield entry
+            entry["outcome"] = "success"
+        except BaseException as e:
+            entry["outcome"] = "error"
+            entry["error"] = str(e).strip()[:500]
+            raise
+        finally:
+            after = await loop.run_in_executor(None, self._safe_state, entry.pop("git_repo", git_repo))
+            self._finish(entry, before, after, start)
+
+    def append(self, entry):
+        """Ajoute un enregistrement ; il sera écrit au prochain passage du thread d'écriture"""
+        entry.setdefault("time", time.time())
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self.lock:
+            self.pending.append(line)
+            if self.flusher is None:
+                self.flusher = threading.Thread(target=self._flush_loop, daemon=True)
+                self.flusher.start()
+
+    def _flush_loop(self):
+        while not self.stopped.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Écrit les enregistrements en attente en un seul ajout, après rotation si nécessaire"""
+        with self.write_lock:
+            with self.lock:
+                lines, self.pending = self.pending, []
+            if not lines:
+                return
+            data = "".join(lines).encode("utf-8")
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                size = 0
+            if size and size + len(data) > self.max_bytes:
+                self._rotate()
+            with open(self.path, "ab") as f:
+                f.write(data)
+
+    def _rotate(self):
+        # journal.N-1 -> journal.N ... journal -> journal.1 ; le plus ancien est écrasé
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        with self.index_lock:
+            self.index_file = None
+
+    def close(self):
+        self.stopped.set()
+        try:
+            self.flush()
+        except OSError:
+            pass
+
+    def _index_file(self, path, offset):
+        """Indexe les lignes complètes de path à partir de offset ; renvoie la nouvelle position"""
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break  # Ligne en cours d'écriture
+                    offset += len(raw)
+                    try:
+                        entry = json.loads(raw)
+                    except ValueError:
+                        continue
+                    position = len(self.entries)
+                    self.entries.append(entry)
+                    self.durations.append(entry.get("duration", 0.0))
+                    day = datetime.fromtimestamp(entry.get("time", 0)).strftime("%Y-%m-%d")
+                    self.by_repo_day.setdefault((entry.get("repo"), day), []).append(position)
+                    if "id" in entry:
+                        self.by_id[entry["id"]] = position
+                    stack = self.undo_stacks.setdefault(entry.get("repo"), [])
+                    if entry.get("operation") == "undo" and entry.get("outcome") == "success" and entry["args"]:
+                        target = self.by_id.get(entry["args"][0])
+                        if target in stack:
+                            stack.remove(target)
+                    elif UndoManager.is_undoable(entry):
+                        stack.append(position)
+        except OSError:
+            pass
+        return offset
+
+    def _refresh_index(self):
+        """Met l'index à jour : seules les nouvelles lignes sont lues, sauf après une rotation"""
+        self.flush()
+        with self.index_lock:
+            try:
+                identity = os.stat(self.path).st_ino
+            except OSError:
+                identity = None
+            if identity != self.index_file:
+                self.entries = []
+                self.durations = array.array('d')
+                self.by_repo_day = {}
+                self.by_id = {}
+                self.undo_stacks = {}
+                self.index_offset = 0
+                for i in range(self.backups, 0, -1):
+                    self._index_file(f"{self.path}.{i}", 0)
+                self.index_file = identity
+            self.index_offset = self._index_file(self.path, self.index_offset)
+
+    def slowest(self, limit=50, repo=None):
+        """Les opérations les plus longues, éventuellement pour un seul dépôt"""
+        self._refresh_index()
+        with self.index_lock:
+            if repo is None:
+                positions = range(len(self.entries))
+            else:
+                positions = [p for (name, _), items in self.by_repo_day.items() if name == repo for p in items]
+            best = heapq.nlargest(limit, positions, key=self.durations.__getitem__)
+            return [self.entries[p] for p in best]
+
+    def last_undoable(self, repo):
+        """Dernière opération du dépôt qui peut encore être annulée, ou None"""
+        self._refresh_index()
+        with self.index_lock:
+            stack = self.undo_stacks.get(repo)
+            return self.entries[stack[-1]] if stack else None
+
+    def changes_on(self, repo, day=None):
+        """Les opérations d'un dépôt pour un jour donné (aujourd'hui par défaut), les plus récentes d'abord"""
+        self._refresh_index()
+        day = day or datetime.now().strftime("%Y-%m-%d")
+        with self.index_lock:
+            return [self.entries[p] for p in reversed(self.by_repo_day.get((repo, day), []))]
+
+class TimedGit(git.Git):
+    """Enveloppe de git.Git qui mesure chaque sous-processus git"""
+
+    def execute(self, command, *args, **kwargs):
+        # Les processus rendus au code appelant ne peuvent pas être mesurés ici
+        if kwargs.get("as_process") or kwargs.get("output_stream") is not None:
+            return super().execute(command, *args, **kwargs)
+
+        parts = [command] if isinstance(command, str) else list(command)
+        # Préfixe de priorité (nice -n N, voir MaintenanceScheduler) : la mesure porte le nom de la commande git
+        if len(parts) > 3 and os.path.basename(str(parts[0])) == "nice" and parts[1] == "-n":
+            parts = parts[3:]
+        if parts and os.path.basename(str(parts[0])).startswith("git"):
+            parts = parts[1:]
+        subcommand = str(parts[0]) if parts else ""
+        repo = os.path.basename(str(self._working_dir or ""))
+
+        # Demander toujours les deux flux : la progression et les erreurs arrivent sur stderr
+        extended = kwargs.get("with_extended_output", False)
+        kwargs["with_extended_output"] = True
+        with METRICS.span(f"git {subcommand}", repo, " ".join(str(p) for p in parts)) as info:
+            try:
+                result = super().execute(command, *args, **kwargs)
+            except git.GitCommandError as e:
+                info["exit_status"] = e.status if isinstance(e.status, int) else 1
+                info["bytes"] = sum(len(stream) for stream in (e.stdout, e.stderr) if isinstance(stream, (str, bytes)))
+                raise
+            status, stdout, stderr = result
+            info["bytes"] = sum(len(stream) for stream in (stdout, stderr) if isinstance(stream, (str, bytes)))
+            if isinstance(status, int):
+                info["exit_status"] = status
+            return result if extended else stdout
+
+# Toutes les instances de Repo passent par la version mesurée
+Repo.GitCommandWrapperType = TimedGit
+
+class JsonRepoStore:
+    """Stockage de la configuration dans un fichier JSON, écrit de manière atomique"""
+
+    def __init__(self, path=CONFIG_FILE):
+        # Chemin résolu dès l'ouverture : l'écriture différée peut survenir après un os.chdir
+        self.path = os.path.abspath(path)
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """Charge la liste des dépôts depuis le fichier JSON"""
+        with open(self.path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        return config.get("repos", [])
+
+    def save(self, repos, changed=None, deleted=()):
+        """Écrit dans un fichier temporaire puis le renomme, pour ne jamais tronquer la configuration
+
+        Le fichier est toujours réécrit en entier : changed et deleted ne servent qu'à SqliteRepoStore.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".github_py_config.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"repos": repos}, f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def close(self):
+        pass
+
+class SqliteRepoStore:
+    """Stockage optionnel de la configuration dans SQLite : une ligne par dépôt, écrite individuellement
+
+    La base ne sert qu'à la persistance : ajouter, modifier ou supprimer un dépôt n'écrit que sa ligne,
+    au lieu de réécrire tout le fichier JSON. Les recherches par nom et par chemin ne l'interrogent pas :
+    elles passent par les index en mémoire de RepoConfig (by_name, by_path), chargés au démarrage.
+    """
+
+    def __init__(self, path=CONFIG_DB_FILE):
+        self.path = os.path.abspath(path)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self.conn:
+            # position fixe l'ordre d'affichage ; elle n'est jamais renumérotée
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS repos (
+                                     id TEXT PRIMARY KEY,
+                                     position INTEGER NOT NULL,
+                                     data TEXT NOT NULL)""")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def exists(self):
+        """Vrai si la base a déjà été initialisée (même si elle ne contient plus aucun dépôt)"""
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM meta WHERE key = 'initialized'").fetchone() is not None
+
+    def load(self):
+        """Charge la liste des dépôts dans l'ordre d'insertion"""
+        with self.lock:
+            rows = self.conn.execute("SELECT data FROM repos ORDER BY position").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def save(self, repos, changed=None, deleted=()):
+        """Écrit les dépôts modifiés (identifiants de changed) et supprime ceux de deleted
+
+        Sans changed, le contenu de la table est remplacé par repos.
+        """
+        with self.lock, self.conn:
+            if changed is None:
+                self.conn.execute("DELETE FROM repos")
+                changed = {repo.get("id") for repo in repos}
+            self.conn.executemany("DELETE FROM repos WHERE id = ?", [(repo_id,) for repo_id in deleted])
+            rows = [(repo["id"], json.dumps(repo, ensure_ascii=False)) for repo in repos if repo.get("id") in changed]
+            # Un nouveau dépôt prend la position suivant la dernière ; une mise à jour garde la sienne
+            self.conn.executemany("""INSERT INTO repos (id, position, data)
+                                     VALUES (?, (SELECT COALESCE(MAX(position), -1) + 1 FROM repos), ?)
+                                     ON CONFLICT(id) DO UPDATE SET data = excluded.data""", rows)
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('initialized', '1')")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
 
 class RepoConfig:
-    def __init__(self):
+    def __init__(self, use_sqlite=USE_SQLITE_CONFIG, save_delay=CONFIG_SAVE_DELAY):
         self.repos = []
+        self.store = SqliteRepoStore() if use_sqlite else JsonRepoStore()
+        self.save_delay = save_delay
+        self.lock = threading.RLock()
+        self.save_timer = None
+        self.batch_depth = 0
+        self.dirty = False
+        # Dépôts à écrire ou à supprimer au prochain flush (None : tout réécrire)
+        self.changed_ids = set()
+        self.deleted_ids = set()
+        self.by_name = {}
+        self.by_path = {}
+        self.by_id = {}
         self.load_config()
+        atexit.register(self.flush)
     
     def load_config(self):
-        """Charge la configuration depuis le fichier JSON"""
-        if os.path.exists(CONFIG_FILE):
+        """Charge la configuration depuis le fichier JSON (ou la base SQLite)"""
+        if self.store.exists():
             try:
-                with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                    config = json.load(f)
-                    self.repos = config.get("repos", [])
+                self.repos = self.store.load()
             except Exception as e:
                 print(f"Erreur lors du chargement de la configuration: {e}")
                 self.repos = []
         else:
             # Créer le fichier de configuration s'il n'existe pas
             self.repos = []
-            self.save_config()
+            if isinstance(self.store, SqliteRepoStore) and os.path.exists(CONFIG_FILE):
+                # Migrer la configuration JSON existante vers SQLite
+                try:
+                    self.repos = JsonRepoStore().load()
+                except Exception as e:
+                    print(f"Erreur lors de la migration de la configuration: {e}")
+            self.dirty = True
+            self.changed_ids = None
+
+        # Attribuer un identifiant stable aux dépôts qui n'en ont pas encore
+        for repo in self.repos:
+            if not repo.get("id"):
+                repo["id"] = self.new_repo_id()
+                self.dirty = True
+                self.changed_ids = None
+        self.flush()
+        self._rebuild_index()
     
-    def save_config(self):
-        """Sauvegarde la configuration dans le fichier JSON"""
+    def save_config(self, changed=None, deleted=None):
+        """Programme la sauvegarde de la configuration (les changements rapprochés sont regroupés)
+
+        changed et deleted sont les identifiants des dépôts concernés ; sans eux, tout est réécrit.
+        """
+        with self.lock:
+            self.dirty = True
+            if changed is None and deleted is None:
+                self.changed_ids = None
+            else:
+                if self.changed_ids is not None:
+                    self.changed_ids.update(changed or ())
+                    self.changed_ids.difference_update(deleted or ())
+                self.deleted_ids.update(deleted or ())
+            if self.batch_depth:
+                return
+            if self.save_delay <= 0:
+                self.flush()
+                return
+            # Debounce : chaque nouvel appel repousse l'écriture
+            if self.save_timer:
+                self.save_timer.cancel()
+            self.save_timer = threading.Timer(self.save_delay, self.flush)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+
+    def flush(self):
+        """Écrit immédiatement les changements en attente"""
+        with self.lock:
+            if self.save_timer:
+                self.save_timer.cancel()
+                self.save_timer = None
+            if not self.dirty:
+                return
+            try:
+                self.store.save(self.repos, self.changed_ids, self.deleted_ids)
+                self.dirty = False
+                self.changed_ids = set()
+                self.deleted_ids = set()
+            except Exception as e:
+                print(f"Erreur lors de la sauvegarde de la configuration: {e}")
+
+    @contextmanager
+    def batch(self):
+        """Regroupe plusieurs modifications en une seule écriture"""
+        with self.lock:
+            self.batch_depth += 1
         try:
-            with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-                json.dump({"repos": self.repos}, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            print(f"Erreur lors de la sauvegarde de la configuration: {e}")
+            yield self
+        finally:
+            with self.lock:
+                self.batch_depth -= 1
+                if self.batch_depth == 0 and self.dirty:
+                    self.save_config(changed=())
+
+    @staticmethod
+    def new_repo_id():
+        """Génère un identifiant stable pour un dépôt"""
+        return uuid.uuid4().hex[:12]
+
+    @staticmethod
+    def _path_key(local_path):
+        return os.path.normcase(os.path.abspath(local_path)) if local_path else ""
+
+    def _rebuild_index(self):
+        """Reconstruit les index par nom et par chemin (chaque clé donne la liste de ses dépôts, dans l'ordre)"""
+        self.by_name = {}
+        self.by_path = {}
+        self.by_id = {}
+        for repo in self.repos:
+            self._index_repo(repo)
+
+    def _index_repo(self, repo):
+        self.by_id[repo.get("id")] = repo
+        self.by_name.setdefault(repo.get("name"), []).append(repo)
+        self.by_path.setdefault(self._path_key(repo.get("local_path")), []).append(repo)
+
+    def _unindex_repo(self, repo):
+        """Retire un dépôt des index sans parcourir toute la liste"""
+        self.by_id.pop(repo.get("id"), None)
+        for index, key in ((self.by_name, repo.get("name")), (self.by_path, self._path_key(repo.get("local_path")))):
+            candidates = [candidate for candidate in index.get(key, []) if candidate is not repo]
+            if candidates:
+                index[key] = candidates
+            else:
+                index.pop(key, None)
+
+    def find_by_name(self, name):
+        """Renvoie le dépôt portant ce nom, ou None"""
+        candidates = self.by_name.get(name)
+        return candidates[0] if candidates else None
+
+    def find_by_path(self, local_path):
+        """Renvoie le dépôt configuré pour ce dossier local, ou None"""
+        candidates = self.by_path.get(self._path_key(local_path))
+        return candidates[0] if candidates else None
+
+    def find_by_id(self, repo_id):
+        """Renvoie le dépôt portant cet identifiant stable, ou None"""
+        return self.by_id.get(repo_id)
+
+    def index_of(self, repo):
+        """Renvoie la position d'un dépôt dans la liste, ou -1"""
+        for i, candidate in enumerate(self.repos):
+            if candidate is repo:
+                return i
+        return -1
     
     def add_repo(self, name, local_path, remote_url, branch, excluded_files):
         """Ajoute un nouveau dépôt à la configuration"""
         repo = {
+            "id": self.new_repo_id(),
             "name": name,
             "local_path": local_path,
             "remote_url": remote_url,
             "branch": branch,
             "excluded_files": excluded_files
         }
-        self.repos.append(repo)
-        self.save_config()
+        with self.lock:
+            self.repos.append(repo)
+            self._index_repo(repo)
+        self.save_config(changed=[repo["id"]])
         return repo
     
     def update_repo(self, index, **kwargs):
         """Met à jour un dépôt existant"""
-        if 0 <= index < len(self.repos):
-            for key, value in kwargs.items():
-                self.repos[index][key] = value
-            self.save_config()
+        with self.lock:
+            if 0 <= index < len(self.repos):
+                repo = self.repos[index]
+                reindex = "name" in kwargs or "local_path" in kwargs
+                if reindex:
+                    self._unindex_repo(repo)
+                for key, value in kwargs.items():
+                    repo[key] = value
+                if reindex:
+                    self._index_repo(repo)
+                self.save_config(changed=[repo["id"]])
     
     def delete_repo(self, index):
         """Supprime un dépôt"""
-        if 0 <= index < len(self.repos):
-            del self.repos[index]
-            self.save_config()
+        with self.lock:
+            if 0 <= index < len(self.repos):
+                repo = self.repos.pop(index)
+                self._unindex_repo(repo)
+                self.save_config(deleted=[repo["id"]])
     
     def get_repos(self):
         """Renvoie la liste des dépôts"""
-        return self.repos 
+        return self.repos
 
-# Widget personnalisé pour un bouton moderne avec coins arrondis et ombre
-class ModernButton(tk.Frame):
-    def __init__(self, parent, text, command=None, width=120, height=36, bg_color=COLORS['primary'], 
-                 hover_color=COLORS['button_hover'], text_color=COLORS['text_light'], state=tk.NORMAL):
-        # Correction pour éviter l'erreur
-        super().__init__(parent, width=width, height=height)
-        self.configure(background=COLORS['bg_light'])
-        
-        self.bg_color = bg_color
-        self.hover_color = hover_color
-        self.text_color = text_color
-        self.state_normal = state == tk.NORMAL
-        self.command = command
-        
-        # Créer le canvas pour le bouton
-        self.canvas = tk.Canvas(self, width=width, height=height, 
-                              highlightthickness=0, bd=0, bg=COLORS['bg_light'])
-        self.canvas.pack(fill=tk.BOTH, expand=True)
-        
-        # Créer l'ombre
-        self.shadow_id = self.canvas.create_rounded_rectangle(4, 4, width-1, height-1, 12, 
-                                                      fill='#DDDDDD', outline='')
-        
-        # Créer le rectangle du bouton
-        self.rect_id = self.canvas.create_rounded_rectangle(0, 0, width-4, height-4, 12, 
-                                                        fill=bg_color if self.state_normal else COLORS['divider'],
-                                                        outline='')
-        
-        # Ajouter le texte - Utiliser une configuration de police sûre
+class RepoListIndex:
+    """Index en mémoire de la liste des dépôts pour la recherche, le tri et le regroupement"""
+
+    GROUP_MODES = {
+        "Aucun": None,
+        "Dossier parent": "parent",
+        "Hôte distant": "host",
+    }
+
+    def __init__(self):
+        # id -> (nom, chemin, url, clé de recherche en minuscules)
+        self.entries = {}
+
+    def update(self, repos):
+        """Met à jour l'index, en ne recalculant que les dépôts modifiés"""
+        seen = set()
+        for repo in repos:
+            repo_id = repo["id"]
+            seen.add(repo_id)
+            fields = (repo.get("name", ""), repo.get("local_path", ""), repo.get("remote_url", ""))
+            entry = self.entries.get(repo_id)
+            if entry is None or entry[:3] != fields:
+                self.entries[repo_id] = fields + ("\n".join(fields).lower(),)
+        for repo_id in list(self.entries):
+            if repo_id not in seen:
+                del self.entries[repo_id]
+
+    def search(self, query):
+        """Renvoie les identifiants dont le nom, le chemin ou l'URL contiennent tous les termes"""
+        terms = query.lower().split()
+        if not terms:
+            return list(self.entries)
+        return [repo_id for repo_id, entry in self.entries.items()
+                if all(term in entry[3] for term in terms)]
+
+    def group_key(self, repo_id, mode):
+        """Renvoie la clé de regroupement d'un dépôt"""
+        name, local_path, remote_url, _ = self.entries[repo_id]
+        if mode == "parent":
+            return os.path.dirname(os.path.normpath(local_path)) or "(aucun)"
+        if mode == "host":
+            url = remote_url
+            if "://" in url:
+                url = url.split("://", 1)[1]
+            elif "@" in url:
+                # Syntaxe scp : git@hote:chemin
+                url = url.split("@", 1)[1].replace(":", "/", 1)
+            host = url.split("/", 1)[0]
+            return host or "(aucun distant)"
+        return None
+
+    def rows(self, query="", group_mode=None):
+        """Renvoie les lignes à afficher : liste ordonnée de (iid, parent, nom)"""
+        repo_ids = self.search(query)
+        repo_ids.sort(key=lambda repo_id: self.entries[repo_id][0].lower())
+        if not group_mode:
+            return [(repo_id, "", self.entries[repo_id][0]) for repo_id in repo_ids]
+
+        groups = {}
+        for repo_id in repo_ids:
+            groups.setdefault(self.group_key(repo_id, group_mode), []).append(repo_id)
+        rows = []
+        for key in sorted(groups, key=str.lower):
+            group_iid = f"group:{key}"
+            rows.append((group_iid, "", f"{key} ({len(groups[key])})"))
+            rows.extend((repo_id, group_iid, self.entries[repo_id][0]) for repo_id in groups[key])
+        return rows
+
+class RepoDiscovery:
+    """Recherche en parallèle des dépôts Git sous un dossier, sans lancer git"""
+
+    REMOTE_SECTION = re.compile(r'^\s*\[\s*remote\s+"([^"]*)"\s*\]')
+    SECTION = re.compile(r'^\s*\[')
+    URL_LINE = re.compile(r'^\s*url\s*=\s*(.*?)\s*$', re.IGNORECASE)
+
+    def __init__(self, excluded_dirs=IMPORT_SKIP_DIRS, workers=IMPORT_SCAN_WORKERS):
+        self.excluded_dirs = {d.strip().strip("/\\") for d in excluded_dirs if d.strip()}
+        self.workers = max(1, workers)
+        self.cancelled = False
+
+    def _scan_dir(self, path):
+        """Lit un dossier : renvoie (dépôt trouvé ou None, sous-dossiers à parcourir)"""
+        subdirs = []
         try:
-            # Utiliser directement une police système pour plus de sécurité
-            self.text_id = self.canvas.create_text(int(width/2) - 2, int(height/2) - 2, text=text, 
-                                           fill=text_color if self.state_normal else COLORS['text_secondary'],
-                                           font=("System", 10))
-        except:
-            # Fallback sûr
-            self.text_id = self.canvas.create_text(int(width/2) - 2, int(height/2) - 2, text=text, 
-                                           fill=text_color if self.state_normal else COLORS['text_secondary'])
-        
-        # Lier les événements
-        self.canvas.bind("<Enter>", self.on_enter)
-        self.canvas.bind("<Leave>", self.on_leave)
-        self.canvas.bind("<ButtonPress-1>", self.on_press)
-        self.canvas.bind("<ButtonRelease-1>", self.on_release)
-    
-    def on_enter(self, event):
-        if self.state_normal:
-            # Effet de transition douce lors du survol
-            self.canvas.itemconfig(self.rect_id, fill=self.hover_color)
-            self.canvas.itemconfig(self.shadow_id, fill='#D0D0D0')
-    
-    def on_leave(self, event):
-        if self.state_normal:
-            self.canvas.itemconfig(self.rect_id, fill=self.bg_color)
-            self.canvas.itemconfig(self.shadow_id, fill='#DDDDDD')
-    
-    def on_press(self, event):
-        if self.state_normal:
-            # Effet d'enfoncement
-            self.canvas.move(self.text_id, 1, 1)
-            self.canvas.move(self.rect_id, 1, 1)
-            self.canvas.itemconfig(self.shadow_id, fill='#EEEEEE')
-    
-    def on_release(self, event):
-        if self.state_normal:
-            # Restaurer la position
-            self.canvas.move(self.text_id, -1, -1)
-            self.canvas.move(self.rect_id, -1, -1)
-            self.canvas.itemconfig(self.shadow_id, fill='#DDDDDD')
-            if self.command:
-                self.command()
-    
-    def configure(self, **kwargs):
-        if 'state' in kwargs:
-            self.state_normal = kwargs['state'] == tk.NORMAL
-            self.canvas.itemconfig(self.rect_id, 
-                               fill=self.bg_color if self.state_normal else COLORS['divider'])
-            self.canvas.itemconfig(self.text_id, 
-                               fill=self.text_color if self.state_normal else COLORS['text_secondary'])
-        
-        if 'text' in kwargs:
-            self.canvas.itemconfig(self.text_id, text=kwargs['text'])
-            
-    # Alias pour compatibilité
-    config = configure 
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.name == ".git":
+                        # Dossier ou fichier .git (copie liée, sous-module) : on s'arrête ici
+                        return path, []
+                    try:
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                    except OSError:
+                        continue
+                    if entry.name in self.excluded_dirs or entry.name.startswith("."):
+                        continue
+                    subdirs.append(entry.path)
+        except OSError:
+            return None, []
+        return None, subdirs
 
-# Frame avec effet d'ombre
-class ShadowFrame(ttk.Frame):
-    def __init__(self, parent, **kwargs):
-        style_name = kwargs.pop('style', 'TFrame')
-        super().__init__(parent, style=style_name, **kwargs)
-        
-        # Créer un cadre d'ombre sous le frame principal
-        self.shadow = ttk.Frame(parent, style='Shadow.TFrame')
-        
-        # Configurer le positionnement
-        self.bind("<Map>", self._on_map)
-        self.bind("<Configure>", self._on_configure)
-    
-    def _on_map(self, event):
-        self.shadow.lift(self)
-    
-    def _on_configure(self, event):
-        x, y = self.winfo_x(), self.winfo_y()
-        width, height = self.winfo_width(), self.winfo_height()
-        # Utiliser des coordonnées entières pour l'ombre
-        self.shadow.place(x=int(x+4), y=int(y+4), width=int(width), height=int(height)) 
+    def find(self, root, progress=None):
+        """Parcourt root et renvoie la liste triée des dossiers contenant un .git"""
+        found = []
+        scanned = 0
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="repo-scan") as executor:
+            pending = {executor.submit(self._scan_dir, os.path.abspath(root))}
+            while pending and not self.cancelled:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    repo_path, subdirs = future.result()
+                    scanned += 1
+                    if repo_path:
+                        found.append(repo_path)
+                    for subdir in subdirs:
+                        pending.add(executor.submit(self._scan_dir, subdir))
+                if progress:
+                    progress(scanned, len(found))
+            for future in pending:
+                future.cancel()
+        return sorted(found)
 
-class GitApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Github.py - Gestion de dépôts Git")
-        self.root.geometry("1000x700")
-        self.root.minsize(900, 650)
-        
-        # Désactiver la mise à l'échelle pour un rendu net
-        disable_dpi_scaling()
-        
-        # Configurer l'anticrénelage pour les polices
-        Fonts.init_fonts()
-        
-        # Variables
-        self.repo_config = RepoConfig()
-        self.current_repo = None
-        self.git_repo = None
-        self.operation_running = False
-        
-        # Configurer le thème de l'application
-        self.setup_theme()
-        
-        # Create widgets
-        self.create_widgets()
-        
-        # Center the window
-        self.center_window()
-    
-    def setup_theme(self):
-        """Configure le thème global de l'application"""
-        self.root.configure(bg=COLORS['bg_light'])
-        
-        # Configurer le style global
-        style = ttk.Style()
+    @staticmethod
+    def git_dirs(repo_path):
+        """Renvoie (git_dir, common_dir) en suivant un fichier .git « gitdir: » et commondir"""
+        git_dir = os.path.join(repo_path, ".git")
+        if os.path.isfile(git_dir):
+            with open(git_dir, "r", encoding="utf-8") as f:
+                content = f.read().strip()
+            if not content.startswith("gitdir:"):
+                raise ValueError("Fichier .git invalide")
+            git_dir = os.path.normpath(os.path.join(repo_path, content[len("gitdir:"):].strip()))
+        common_dir = git_dir
+        commondir_file = os.path.join(git_dir, "commondir")
+        if os.path.exists(commondir_file):
+            with open(commondir_file, "r", encoding="utf-8") as f:
+                common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+        return git_dir, common_dir
+
+    @classmethod
+    def remote_url(cls, config_file):
+        """Lit l'URL de origin (ou du premier distant) dans un fichier config Git"""
+        urls = {}
+        current = None
+        try:
+            with open(config_file, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    match = cls.REMOTE_SECTION.match(line)
+                    if match:
+                        current = match.group(1)
+                        continue
+                    if cls.SECTION.match(line):
+                        current = None
+                        continue
+                    if current is not None and current not in urls:
+                        match = cls.URL_LINE.match(line)
+                        if match:
+                            urls[current] = match.group(1).strip('"')
+        except OSError:
+            return ""
+        if "origin" in urls:
+            return urls["origin"]
+        return next(iter(urls.values()), "")
+
+    @staticmethod
+    def current_branch(git_dir):
+        """Lit la branche courante dans HEAD ; chaîne vide si HEAD est détachée"""
+        try:
+            with open(os.path.join(git_dir, "HEAD"), "r", encoding="utf-8") as f:
+                head = f.read().strip()
+        except OSError:
+            return ""
+        if head.startswith("ref: refs/heads/"):
+            return head[len("ref: refs/heads/"):]
+        return ""
+
+    def describe(self, repo_path):
+        """Renvoie les informations d'import d'un dépôt trouvé"""
+        info = {"local_path": repo_path, "name": os.path.basename(repo_path), "remote_url": "", "branch": ""}
+        try:
+            git_dir, common_dir = self.git_dirs(repo_path)
+        except (OSError, ValueError):
+            return info
+        info["remote_url"] = self.remote_url(os.path.join(common_dir, "config"))
+        info["branch"] = self.current_branch(git_dir)
+        return info
+
+    def discover(self, root, progress=None):
+        """Trouve les dépôts sous root et lit leurs informations (distant, branche) en parallèle"""
+        with METRICS.span("discover repos", repo=os.path.basename(os.path.abspath(root))):
+            paths = self.find(root, progress)
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="repo-scan") as executor:
+                return list(executor.map(self.describe, paths))
+
+class GitOperations:
+    """Opérations git de base, sans interface, partagées par l'application et les benchmarks"""
+
+    def __init__(self, git_repo):
+        self.git_repo = git_repo
+
+    def commit_history(self, author="", message="", limit=50):
+        """Renvoie l'historique sous forme de tuples (hash, auteur, date, message)"""
+        log_args = [f'--max-count={limit}', '--pretty=format:%H|%an|%ad|%s', '--date=format:%Y-%m-%d %H:%M:%S']
+
+        if author:
+            log_args.append(f'--author={author}')
+
+        if message:
+            log_args.append(f'--grep={message}')
+
+        commits = []
+        for line in self.git_repo.git.log(*log_args).splitlines():
+            parts = line.split('|', 3)
+            if len(parts) >= 4:
+                commits.append(tuple(parts))
+        return commits
+
+    def commit_page(self, author="", message="", limit=50, skip=0):
+        """Renvoie une page d'historique avec les parents, pour l'affichage du graphe"""
+        log_args = [f'--max-count={limit}', f'--skip={skip}', '--date-order',
+                    '--pretty=format:%H|%P|%an|%ad|%s', '--date=format:%Y-%m-%d %H:%M:%S']
+
+        if author:
+            log_args.append(f'--author={author}')
+
+        if message:
+            log_args.append(f'--grep={message}')
+
+        rows = []
+        for line in self.git_repo.git.log(*log_args).splitlines():
+            parts = line.split('|', 4)
+            if len(parts) >= 5:
+                sha, parents, author_name, date, subject = parts
+                rows.append({"sha": sha, "parents": parents.split(), "author": author_name,
+                             "date": date, "subject": subject})
+        return rows
+
+    def write_commit_graph(self):
+        """Écrit le fichier commit-graph pour accélérer les parcours d'historique"""
+        return self.git_repo.git.commit_graph('write', '--reachable')
+
+    def list_branches(self):
+        """Renvoie les noms des branches locales"""
+        return [b.name for b in self.git_repo.branches]
+
+    def is_dirty(self):
+        """Indique si la copie de travail contient des modifications non commitées"""
+        return self.git_repo.is_dirty()
+
+    def unmerged_files(self):
+        """Renvoie la liste triée des fichiers en conflit"""
+        output = self.git_repo.git.ls_files('--unmerged')
+        # Format : "<mode> <hash> <étape>\t<chemin>"
+        return sorted({line.split('\t', 1)[1] for line in output.splitlines() if '\t' in line})
+
+    def commit_all(self, message):
+        """Indexe toutes les modifications et crée un commit"""
+        self.git_repo.git.add('-A')
+        return self.git_repo.git.commit('-m', message)
+
+    def push(self, remote_name, branch):
+        """Pousse une branche vers le dépôt distant"""
+        return self.git_repo.git.push(remote_name, branch)
+
+    @staticmethod
+    def push_refspecs(branches):
+        return [f'refs/heads/{b}:refs/heads/{b}' for b in branches]
+
+    def push_branches(self, remote_name, branches):
+        """Pousse plusieurs branches en une seule invocation (une seule connexion au distant)"""
+        if not branches:
+            return ""
+        return self.git_repo.git.push(remote_name, *self.push_refspecs(branches))
+
+    def branch_tracking(self):
+        """Renvoie {branche: (en avance, en retard, référence suivie)} en un seul for-each-ref"""
+        output = self.git_repo.git.for_each_ref(
+            'refs/heads', '--format=%(refname:short)%09%(upstream)%09%(upstream:track,nobracket)')
+        tracking = {}
+        for line in output.splitlines():
+            name, upstream, track = (line.split('\t') + ["", ""])[:3]
+            ahead = behind = 0
+            for part in track.split(','):
+                word, _, count = part.strip().partition(' ')
+                if word == 'ahead':
+                    ahead = int(count)
+                elif word == 'behind':
+                    behind = int(count)
+            tracking[name] = (ahead, behind, upstream or None)
+        return tracking
+
+    def upstream_ref(self, branch, remote_name):
+        """Référence suivie par la branche, à défaut celle du même nom sur le distant, sinon None"""
+        try:
+            return self.git_repo.git.rev_parse('--symbolic-full-name', f'{branch}@{{upstream}}')
+        except git.GitCommandError:
+            ref = f'refs/remotes/{remote_name}/{branch}'
+            try:
+                self.git_repo.git.rev_parse('--verify', '--quiet', ref)
+                return ref
+            except git.GitCommandError:
+                return None
+
+    def outgoing_summary(self, branch, remote_name, max_commits=200):
+        """Résumé local de ce qu'un push enverrait : commits, fichiers et taille estimée du pack
+
+        Calculé uniquement à partir des références de suivi locales, sans accès réseau.
+        """
+        local = f'refs/heads/{branch}'
+        upstream = self.upstream_ref(branch, remote_name)
+        # Sans référence suivie (nouvelle branche), tout ce qu'aucune branche du distant ne contient
+        excluded = [upstream] if upstream else [f'--remotes={remote_name}']
+        if upstream:
+            behind, ahead = (int(n) for n in self.git_repo.git.rev_list(
+                '--left-right', '--count', f'{upstream}...{local}').split())
+        else:
+            behind, ahead = 0, int(self.git_repo.git.rev_list('--count', local, '--not', *excluded))
+
+        commits = []
+        files = []
+        size = None
+        if ahead:
+            output = self.git_repo.git.log(f'--max-count={max_commits}', '--format=%H%x1f%an%x1f%ad%x1f%s',
+                                           '--date=format:%Y-%m-%d %H:%M', local, '--not', *excluded)
+            commits = [tuple(line.split('\x1f', 3)) for line in output.splitlines() if line.count('\x1f') >= 3]
+
+            output = self.git_repo.git.log('--name-only', '--format=', local, '--not', *excluded)
+            files = sorted({line for line in output.splitlines() if line})
+
+            # Objets absents de toutes les références de suivi du distant : approximation du pack envoyé
+            try:
+                size = int(self.git_repo.git.rev_list('--objects', '--disk-usage', local,
+                                                      '--not', f'--remotes={remote_name}', *excluded))
+            except (git.GitCommandError, ValueError):
+                pass  # git < 2.31 : taille inconnue
+        return {"branch": branch, "upstream": upstream, "ahead": ahead, "behind": behind,
+                "commits": commits, "files": files, "size": size}
+
+class NativeReaderUnavailable(Exception):
+    """Le dépôt ne peut pas être lu par le lecteur natif (format non pris en charge)"""
+
+class PackFile:
+    """Fichier pack et son index, accessibles par projection mémoire"""
+
+    def __init__(self, idx_path):
+        self.idx_path = idx_path
+        self.pack_path = idx_path[:-4] + ".pack"
+        with open(idx_path, "rb") as f:
+            self.idx = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(self.pack_path, "rb") as f:
+            self.pack = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.idx[:4] == b"\377tOc":
+            if struct.unpack(">I", self.idx[4:8])[0] != 2:
+                raise NativeReaderUnavailable(f"Version d'index non prise en charge: {idx_path}")
+            self.version = 2
+            self.fanout_offset = 8
+        else:
+            self.version = 1
+            self.fanout_offset = 0
+        self.count = self._fanout(255)
+        table = self.fanout_offset + 256 * 4
+        if self.version == 2:
+            self.sha_offset = table
+            self.offset_offset = table + self.count * 24
+            self.large_offset = self.offset_offset + self.count * 4
+        else:
+            self.entries_offset = table
+
+    def _fanout(self, byte):
+        if byte < 0:
+            return 0
+        pos = self.fanout_offset + byte * 4
+        return struct.unpack(">I", self.idx[pos:pos + 4])[0]
+
+    def _sha_at(self, i):
+        if self.version == 2:
+            pos = self.sha_offset + i * 20
+        else:
+            pos = self.entries_offset + i * 24 + 4
+        return self.idx[pos:pos + 20]
+
+    def _offset_at(self, i):
+        if self.version == 1:
+            pos = self.entries_offset + i * 24
+            return struct.unpack(">I", self.idx[pos:pos + 4])[0]
+        pos = self.offset_offset + i * 4
+        offset = struct.unpack(">I", self.idx[pos:pos + 4])[0]
+        if offset & 0x80000000:
+            pos = self.large_offset + (offset & 0x7FFFFFFF) * 8
+            offset = struct.unpack(">Q", self.idx[pos:pos + 8])[0]
+        return offset
+
+    def find(self, sha):
+        """Renvoie la position de l'objet (binaire, 20 octets) dans le pack, ou None"""
+        low, high = self._fanout(sha[0] - 1), self._fanout(sha[0])
+        while low < high:
+            mid = (low + high) // 2
+            candidate = self._sha_at(mid)
+            if candidate < sha:
+                low = mid + 1
+            elif candidate > sha:
+                high = mid
+            else:
+                return self._offset_at(mid)
+        return None
+
+    def close(self):
+        self.idx.close()
+        self.pack.close()
+
+class GitObjectStore:
+    """Lecture seule des objets git (objets isolés et packs) sans lancer de sous-processus"""
+
+    TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+
+    def __init__(self, objects_dir, cache_bytes=NATIVE_DELTA_CACHE_BYTES):
+        self.objects_dir = objects_dir
+        self.packs = {}
+        self.cache = OrderedDict()
+        self.cache_size = 0
+        self.cache_bytes = cache_bytes
+        self.lock = threading.RLock()
+        self.alternates = []
+        alternates_file = os.path.join(objects_dir, "info", "alternates")
+        if os.path.exists(alternates_file):
+            with open(alternates_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        path = line if os.path.isabs(line) else os.path.join(objects_dir, line)
+                        self.alternates.append(GitObjectStore(os.path.normpath(path), cache_bytes))
+        self.refresh_packs()
+
+    def refresh_packs(self):
+        """Prend en compte les packs ajoutés ou supprimés (après un fetch ou un gc)"""
+        with self.lock:
+            current = set(glob.glob(os.path.join(self.objects_dir, "pack", "*.idx")))
+            for path in list(self.packs):
+                if path not in current:
+                    self.packs.pop(path).close()
+            for path in current:
+                if path not in self.packs and os.path.exists(path[:-4] + ".pack"):
+                    self.packs[path] = PackFile(path)
+
+    def close(self):
+        with self.lock:
+            for pack in self.packs.values():
+                pack.close()
+            self.packs = {}
+            self.cache.clear()
+            self.cache_size = 0
+        for store in self.alternates:
+            store.close()
+
+    def read(self, hexsha):
+        """Renvoie (type, contenu) d'un objet à partir de son hash hexadécimal"""
+        with self.lock:
+            result = self._read(bytes.fromhex(hexsha), hexsha)
+            if result is None:
+                # Le dépôt a pu être repacké depuis l'ouverture
+                self.refresh_packs()
+                result = self._read(bytes.fromhex(hexsha), hexsha)
+        if result is None:
+            for store in self.alternates:
+                try:
+                    return store.read(hexsha)
+                except KeyError:
+                    pass
+            raise KeyError(hexsha)
+        return result
+
+    def _read(self, sha, hexsha):
+        for pack in self.packs.values():
+            offset = pack.find(sha)
+            if offset is not None:
+                return self._read_packed(pack, offset)
+        loose_path = os.path.join(self.objects_dir, hexsha[:2], hexsha[2:])
+        if os.path.exists(loose_path):
+            with open(loose_path, "rb") as f:
+                raw = zlib.decompress(f.read())
+            header, _, content = raw.partition(b"\0")
+            return header.split(b" ", 1)[0].decode(), content
+        return None
+
+    @staticmethod
+    def _inflate(data, pos, size):
+        decompressor = zlib.decompressobj()
+        chunks = []
+        chunk_size = max(4096, size + 64)
+        while not decompressor.eof:
+            block = data[pos:pos + chunk_size]
+            if not block:
+                raise ValueError("Objet compressé tronqué")
+            chunks.append(decompressor.decompress(block))
+            pos += chunk_size
+        return b"".join(chunks)
+
+    def _read_packed(self, pack, offset):
+        """Lit un objet dans un pack, en résolvant les deltas"""
+        data = pack.pack
+        pos = offset
+        byte = data[pos]
+        pos += 1
+        object_type = (byte >> 4) & 7
+        size = byte & 0x0F
+        shift = 4
+        while byte & 0x80:
+            byte = data[pos]
+            pos += 1
+            size |= (byte & 0x7F) << shift
+            shift += 7
+
+        if object_type == 6:
+            # Delta par rapport à un objet situé plus haut dans le même pack
+            byte = data[pos]
+            pos += 1
+            base_distance = byte & 0x7F
+            while byte & 0x80:
+                byte = data[pos]
+                pos += 1
+                base_distance = ((base_distance + 1) << 7) | (byte & 0x7F)
+            base_type, base = self._delta_base(pack, offset - base_distance)
+            return base_type, self._apply_delta(base, self._inflate(data, pos, size))
+        if object_type == 7:
+            # Delta par rapport à un objet désigné par son hash
+            base_hex = data[pos:pos + 20].hex()
+            base_type, base = self.read(base_hex)
+            return base_type, self._apply_delta(base, self._inflate(data, pos + 20, size))
+        return self.TYPES[object_type], self._inflate(data, pos, size)
+
+    def _delta_base(self, pack, offset):
+        """Lit une base de delta en passant par le cache LRU borné"""
+        key = (pack.idx_path, offset)
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.cache.move_to_end(key)
+            return entry
+        entry = self._read_packed(pack, offset)
+        size = len(entry[1])
+        if size <= self.cache_bytes // 4:
+            self.cache[key] = entry
+            self.cache_size += size
+            while self.cache_size > self.cache_bytes:
+                _, (_, evicted) = self.cache.popitem(last=False)
+                self.cache_size -= len(evicted)
+        return entry
+
+    @staticmethod
+    def _apply_delta(base, delta):
+        def varint(pos):
+            value = shift = 0
+            while True:
+                byte = delta[pos]
+                pos += 1
+                value |= (byte & 0x7F) << shift
+                shift += 7
+                if not byte & 0x80:
+                    return value, pos
+
+        _, pos = varint(0)
+        target_size, pos = varint(pos)
+        out = bytearray()
+        end = len(delta)
+        while pos < end:
+            op = delta[pos]
+            pos += 1
+            if op & 0x80:
+                # Copie depuis la base
+                copy_offset = copy_size = 0
+                for i in range(4):
+                    if op & (1 << i):
+                        copy_offset |= delta[pos] << (8 * i)
+                        pos += 1
+                for i in range(3):
+                    if op & (0x10 << i):
+                        copy_size |= delta[pos] << (8 * i)
+                        pos += 1
+                out += base[copy_offset:copy_offset + (copy_size or 0x10000)]
+            elif op:
+                # Insertion de données littérales
+                out += delta[pos:pos + op]
+                pos += op
+            else:
+                raise ValueError("Instruction de delta invalide")
+        if len(out) != target_size:
+            raise ValueError("Taille de delta incohérente")
+        return bytes(out)
+
+class CommitGraph:
+    """Lecture du fichier commit-graph : numéros de génération et parents sans lire les commits"""
+
+    GENERATION_INFINITY = 0xFFFFFFFF
+    PARENT_NONE = 0x70000000
+    PARENT_EXTRA_EDGES = 0x80000000
+
+    def __init__(self, paths):
+        self.layers = []
+        total = 0
+        try:
+            for path in paths:
+                layer = self._open_layer(path)
+                layer["base"] = total
+                total += layer["count"]
+                self.layers.append(layer)
+        except Exception:
+            self.close()
+            raise
+        self.count = total
+
+    @classmethod
+    def open(cls, objects_dir):
+        """Ouvre le commit-graph du dépôt (fichier unique ou chaîne), ou renvoie None s'il n'existe pas"""
+        info_dir = os.path.join(objects_dir, "info")
+        chain_file = os.path.join(info_dir, "commit-graphs", "commit-graph-chain")
+        if os.path.exists(chain_file):
+            with open(chain_file, "r", encoding="utf-8") as f:
+                hashes = [line.strip() for line in f if line.strip()]
+            return cls([os.path.join(info_dir, "commit-graphs", f"graph-{h}.graph") for h in hashes])
+        single_file = os.path.join(info_dir, "commit-graph")
+        if os.path.exists(single_file):
+            return cls([single_file])
+        return None
+
+    @staticmethod
+    def _open_layer(path):
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if data[:4] != b"CGPH" or data[4] != 1 or data[5] != 1:
+            data.close()
+            raise NativeReaderUnavailable(f"Format de commit-graph non pris en charge: {path}")
+        chunk_count = data[6]
+        chunks = {}
+        for i in range(chunk_count):
+            pos = 8 + i * 12
+            chunks[data[pos:pos + 4]] = struct.unpack(">Q", data[pos + 4:pos + 12])[0]
+        for required in (b"OIDF", b"OIDL", b"CDAT"):
+            if required not in chunks:
+                data.close()
+                raise NativeReaderUnavailable(f"Commit-graph incomplet: {path}")
+        fanout = chunks[b"OIDF"]
+        return {
+            "data": data,
+            "fanout": fanout,
+            "oids": chunks[b"OIDL"],
+            "cdat": chunks[b"CDAT"],
+            "edges": chunks.get(b"EDGE"),
+            "count": struct.unpack(">I", data[fanout + 255 * 4:fanout + 256 * 4])[0],
+        }
+
+    def close(self):
+        for layer in self.layers:
+            layer["data"].close()
+        self.layers = []
+
+    def _layer_for(self, position):
+        for layer in self.layers:
+            if position < layer["base"] + layer["count"]:
+                return layer, position - layer["base"]
+        raise IndexError(position)
+
+    def lookup(self, hexsha):
+        """Renvoie la position globale du commit dans le graphe, ou None"""
+        sha = bytes.fromhex(hexsha)
+        for layer in self.layers:
+            data, fanout = layer["data"], layer["fanout"]
+            first = sha[0]
+            low = struct.unpack(">I", data[fanout + (first - 1) * 4:fanout + first * 4])[0] if first else 0
+            high = struct.unpack(">I", data[fanout + first * 4:fanout + first * 4 + 4])[0]
+            while low < high:
+                mid = (low + high) // 2
+                pos = layer["oids"] + mid * 20
+                candidate = data[pos:pos + 20]
+                if candidate < sha:
+                    low = mid + 1
+                elif candidate > sha:
+                    high = mid
+                else:
+                    return layer["base"] + mid
+        return None
+
+    def oid(self, position):
+        """Renvoie le hash hexadécimal du commit à cette position"""
+        layer, index = self._layer_for(position)
+        pos = layer["oids"] + index * 20
+        return layer["data"][pos:pos + 20].hex()
+
+    def _commit_data(self, position):
+        layer, index = self._layer_for(position)
+        pos = layer["cdat"] + index * 36
+        parent1, parent2, generation_time = struct.unpack(">IIQ", layer["data"][pos + 20:pos + 36])
+        return layer, parent1, parent2, generation_time
+
+    def generation(self, position):
+        """Numéro de génération (niveau topologique) : toujours supérieur à celui des parents"""
+        return self._commit_data(position)[3] >> 34
+
+    def commit_time(self, position):
+        return self._commit_data(position)[3] & 0x3FFFFFFFF
+
+    def parents(self, position):
+        """Renvoie les positions des parents"""
+        layer, parent1, parent2, _ = self._commit_data(position)
+        parents = []
+        if parent1 != self.PARENT_NONE:
+            parents.append(parent1)
+        if parent2 == self.PARENT_NONE:
+            return parents
+        if not parent2 & self.PARENT_EXTRA_EDGES:
+            parents.append(parent2)
+            return parents
+        # Commit de fusion à plus de deux parents : liste dans le chunk EDGE
+        data, pos = layer["data"], layer["edges"] + (parent2 & 0x7FFFFFFF) * 4
+        while True:
+            edge = struct.unpack(">I", data[pos:pos + 4])[0]
+            parents.append(edge & 0x7FFFFFFF)
+            if edge & self.PARENT_EXTRA_EDGES:
+                return parents
+            pos += 4
+
+class GraphLaneLayout:
+    """Calcul incrémental des colonnes du graphe de l'historique, ligne par ligne"""
+
+    def __init__(self):
+        # Pour chaque colonne : hash du commit attendu, ou None si la colonne est libre
+        self.lanes = []
+
+    def _free_lane(self, start=0):
+        for i in range(start, len(self.lanes)):
+            if self.lanes[i] is None:
+                return i
+        self.lanes.append(None)
+        return len(self.lanes) - 1
+
+    def add(self, sha, parents):
+        """Place un commit (enfants avant parents) et renvoie le dessin de sa ligne"""
+        converging = [i for i, lane in enumerate(self.lanes) if lane == sha]
+        column = converging[0] if converging else self._free_lane()
+        self.lanes[column] = sha
+
+        cells = []
+        for i, lane in enumerate(self.lanes):
+            if i == column:
+                cells.append("◆" if len(parents) > 1 else "●")
+            elif i in converging:
+                cells.append("┘")
+            elif lane is None:
+                cells.append(" ")
+            else:
+                cells.append("│")
+
+        # Les colonnes qui convergeaient vers ce commit se libèrent
+        for i in converging[1:]:
+            self.lanes[i] = None
+        self.lanes[column] = parents[0] if parents else None
+
+        # Les parents supplémentaires d'une fusion ouvrent de nouvelles colonnes
+        for parent in parents[1:]:
+            if parent in self.lanes:
+                continue
+            lane = self._free_lane(column + 1)
+            self.lanes[lane] = parent
+            while len(cells) <= lane:
+                cells.append(" ")
+            cells[lane] = "┐"
+
+        while self.lanes and self.lanes[-1] is None:
+            self.lanes.pop()
+        return " ".join(cells).rstrip()
+
+class CommitHistoryPager:
+    """Chargement de l'historique page par page (lecteur natif, ou git log en repli)
+
+    L'ordre de git log --date-order n'est pas celui du parcours natif (numéros de génération puis
+    date) : en cas de repli en cours de parcours, git log reprend donc du début et les commits déjà
+    renvoyés par le lecteur natif sont écartés, au lieu de sauter les N premiers avec --skip.
+    """
+
+    def __init__(self, reader, git_ops, author="", message="", page_size=50):
+        self.reader = reader
+        self.git_ops = git_ops
+        self.author = author
+        self.message = message
+        self.page_size = page_size
+        self.loaded = 0
+        self.exhausted = False
+        self.iterator = reader.iter_commits(author, message) if reader is not None else None
+        self.native_shas = set()  # commits déjà produits par le lecteur natif
+        self.git_offset = 0  # position dans la sortie de git log après un repli
+
+    def _read_native(self, count, rows=None):
+        """Lit jusqu'à count commits natifs ; renvoie False si le lecteur a échoué (repli sur git)"""
+        try:
+            for row in itertools.islice(self.iterator, count):
+                self.native_shas.add(row["sha"])
+                if rows is not None:
+                    rows.append(row)
+        except Exception:
+            # Pack remplacé par un repack, objet illisible... : les lignes déjà lues sont gardées
+            self.iterator = None
+            return False
+        return True
+
+    def skip(self, count):
+        """Passe les count premiers commits (vue recréée qui reprend à une position donnée)
+
+        Si le lecteur natif échoue pendant le saut, les commits qu'il n'a pas encore produits ne
+        sont pas connus : ils peuvent réapparaître dans la suite, mais aucun n'est perdu.
+        """
+        if self.iterator is not None:
+            self._read_native(count)
+        else:
+            self.git_offset = count
+        self.loaded = count
+
+    def next_page(self):
+        """Renvoie la page suivante : liste de dictionnaires sha, parents, author, date, subject"""
+        if self.exhausted:
+            return []
+        rows = []
+        if self.iterator is not None and self._read_native(self.page_size, rows) and len(rows) < self.page_size:
+            self.exhausted = True
+        if self.iterator is None:
+            self._read_git(rows)
+        self.loaded += len(rows)
+        return rows
+
+    def _read_git(self, rows):
+        """Complète rows avec git log, sans les commits déjà produits par le lecteur natif"""
+        while len(rows) < self.page_size:
+            batch = self.git_ops.commit_page(self.author, self.message, self.page_size, self.git_offset)
+            start = self.git_offset
+            for row in batch:
+                if len(rows) == self.page_size:
+                    break
+                self.git_offset += 1
+                if row["sha"] not in self.native_shas:
+                    rows.append(row)
+            if len(batch) < self.page_size and self.git_offset == start + len(batch):
+                self.exhausted = True
+                break
+
+class NativeGitReader:
+    """Requêtes en lecture seule (historique, branches, détails) faites en Python, sans sous-processus"""
+
+    def __init__(self, repo_path):
+        git_dir = os.path.join(repo_path, ".git")
+        if os.path.isfile(git_dir):
+            # Copie de travail liée : le fichier .git pointe vers le vrai répertoire
+            with open(git_dir, "r", encoding="utf-8") as f:
+                content = f.read().strip()
+            if not content.startswith("gitdir:"):
+                raise NativeReaderUnavailable("Fichier .git invalide")
+            git_dir = os.path.normpath(os.path.join(repo_path, content[len("gitdir:"):].strip()))
+        elif not os.path.isdir(git_dir):
+            git_dir = repo_path  # Dépôt nu
+        self.git_dir = git_dir
+        self.common_dir = git_dir
+        commondir_file = os.path.join(git_dir, "commondir")
+        if os.path.exists(commondir_file):
+            with open(commondir_file, "r", encoding="utf-8") as f:
+                self.common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+
+        self._check_format()
+        self.store = GitObjectStore(os.path.join(self.common_dir, "objects"))
+        self.commit_graph = None
+        self.refresh_commit_graph()
+        self.shallow = set()
+        shallow_file = os.path.join(self.common_dir, "shallow")
+        if os.path.exists(shallow_file):
+            with open(shallow_file, "r", encoding="utf-8") as f:
+                self.shallow = {line.strip() for line in f if line.strip()}
+        self.packed_refs = {}
+        self.packed_refs_mtime = None
+
+    def _check_format(self):
+        config_file = os.path.join(self.common_dir, "config")
+        if os.path.exists(config_file):
+            with open(config_file, "r", encoding="utf-8", errors="replace") as f:
+                config = f.read().lower()
+            if re.search(r"objectformat\s*=\s*sha256", config):
+                raise NativeReaderUnavailable("Les dépôts SHA-256 ne sont pas pris en charge")
+
+    def close(self):
+        self.store.close()
+        if self.commit_graph is not None:
+            self.commit_graph.close()
+            self.commit_graph = None
+
+    def refresh_commit_graph(self):
+        """(Re)charge le fichier commit-graph s'il existe"""
+        if self.commit_graph is not None:
+            self.commit_graph.close()
+            self.commit_graph = None
+        try:
+            self.commit_graph = CommitGraph.open(os.path.join(self.common_dir, "objects"))
+        except Exception:
+            self.commit_graph = None
+        return self.commit_graph is not None
+
+    # --- Références ---
+
+    def _load_packed_refs(self):
+        path = os.path.join(self.common_dir, "packed-refs")
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        if mtime == self.packed_refs_mtime:
+            return self.packed_refs
+        refs = {}
+        if mtime is not None:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("#") or line.startswith("^"):
+                        continue
+                    parts = line.strip().split(" ", 1)
+                    if len(parts) == 2:
+                        refs[parts[1]] = parts[0]
+        self.packed_refs = refs
+        self.packed_refs_mtime = mtime
+        return refs
+
+    def read_ref(self, name, depth=0):
+        """Résout une référence (HEAD, refs/heads/...) en hash de commit"""
+        if depth > 10:
+            raise ValueError(f"Références symboliques en boucle: {name}")
+        base_dir = self.git_dir if name == "HEAD" or not name.startswith("refs/") else self.common_dir
+        path = os.path.join(base_dir, name)
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                value = f.read().strip()
+            if value.startswith("ref:"):
+                return self.read_ref(value[4:].strip(), depth + 1)
+            return value
+        value = self._load_packed_refs().get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def resolve(self, revision):
+        """Résout HEAD, un nom de branche, de tag ou un hash complet"""
+        if re.fullmatch(r"[0-9a-f]{40}", revision):
+            return revision
+        for name in (revision, f"refs/heads/{revision}", f"refs/tags/{revision}", f"refs/remotes/{revision}"):
+            try:
+                sha = self.read_ref(name)
+            except KeyError:
+                continue
+            # Déréférencer les tags annotés
+            object_type, content = self.store.read(sha)
+            while object_type == "tag":
+                sha = content.split(b"\n", 1)[0].split(b" ", 1)[1].decode()
+                object_type, content = self.store.read(sha)
+            return sha
+        raise KeyError(revision)
+
+    def list_branches(self):
+        """Renvoie les noms des branches locales, triés"""
+        names = {name[len("refs/heads/"):] for name in self._load_packed_refs() if name.startswith("refs/heads/")}
+        heads_dir = os.path.join(self.common_dir, "refs", "heads")
+        for directory, _, files in os.walk(heads_dir):
+            for file_name in files:
+                full_path = os.path.join(directory, file_name)
+                names.add(os.path.relpath(full_path, heads_dir).replace(os.sep, "/"))
+        return sorted(names)
+
+    # --- Objets ---
+
+    def read_commit(self, sha):
+        """Renvoie un dictionnaire décrivant le commit"""
+        object_type, content = self.store.read(sha)
+        if object_type != "commit":
+            raise ValueError(f"{sha} n'est pas un commit")
+        header, _, message = content.partition(b"\n\n")
+        commit = {"sha": sha, "parents": [], "tree": None, "message": message.decode("utf-8", "replace")}
+        for line in header.split(b"\n"):
+            key, _, value = line.partition(b" ")
+            if key == b"tree":
+                commit["tree"] = value.decode()
+            elif key == b"parent":
+                commit["parents"].append(value.decode())
+            elif key in (b"author", b"committer"):
+                commit[key.decode()] = self._parse_person(value.decode("utf-8", "replace"))
+        if sha in self.shallow:
+            commit["parents"] = []
+        return commit
+
+    @staticmethod
+    def _parse_person(value):
+        # Format : "Nom <email> horodatage fuseau"
+        name, _, rest = value.partition(" <")
+        email, _, when = rest.partition("> ")
+        timestamp, _, offset = when.partition(" ")
+        try:
+            minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+            if offset.startswith("-"):
+                minutes = -minutes
+        except ValueError:
+            minutes = 0
+        return {"name": name, "email": email, "time": int(timestamp or 0), "offset": minutes}
+
+    @staticmethod
+    def format_date(person):
+        """Formate la date dans le fuseau du commit, comme git log --date=format:"""
+        tz = timezone(timedelta(minutes=person["offset"]))
+        return datetime.fromtimestamp(person["time"], tz).strftime("%Y-%m-%d %H:%M:%S")
+
+    @staticmethod
+    def subject(message):
+        """Renvoie le sujet du message (premier paragraphe sur une ligne, comme %s)"""
+        return " ".join(message.split("\n\n", 1)[0].strip().splitlines())
+
+    def read_tree(self, sha):
+        """Renvoie {nom: (mode, hash)} pour un arbre"""
+        object_type, content = self.store.read(sha)
+        entries = {}
+        pos = 0
+        while pos < len(content):
+            space = content.index(b" ", pos)
+            nul = content.index(b"\0", space)
+            mode = content[pos:space].decode()
+            name = content[space + 1:nul].decode("utf-8", "replace")
+            entries[name] = (mode, content[nul + 1:nul + 21].hex())
+            pos = nul + 21
+        return entries
+
+    def diff_trees(self, old_tree, new_tree, prefix=""):
+        """Renvoie les chemins différents entre deux arbres, sans descendre dans les sous-arbres identiques"""
+        old = self.read_tree(old_tree) if old_tree else {}
+        new = self.read_tree(new_tree) if new_tree else {}
+        paths = []
+        for name in sorted(set(old) | set(new)):
+            old_entry, new_entry = old.get(name), new.get(name)
+            if old_entry == new_entry:
+                continue
+            old_is_tree = old_entry is not None and old_entry[0] == "40000"
+            new_is_tree = new_entry is not None and new_entry[0] == "40000"
+            if old_is_tree or new_is_tree:
+                paths.extend(self.diff_trees(old_entry[1] if old_is_tree else None,
+                                             new_entry[1] if new_is_tree else None,
+                                             f"{prefix}{name}/"))
+                if (old_entry and not old_is_tree) or (new_entry and not new_is_tree):
+                    paths.append(prefix + name)
+            else:
+                paths.append(prefix + name)
+        return paths
+
+    def changed_files(self, sha):
+        """Renvoie les fichiers modifiés par rapport à chaque parent"""
+        commit = self.read_commit(sha)
+        paths = []
+        for parent in commit["parents"]:
+            paths.extend(self.diff_trees(self.read_commit(parent)["tree"], commit["tree"]))
+        return paths
+
+    def walk(self, start="HEAD"):
+        """Parcourt l'historique en plaçant toujours les enfants avant leurs parents.
+
+        Avec un commit-graph, l'ordre suit les numéros de génération et les parents sont
+        lus dans le graphe ; les commits ne sont lus qu'au moment d'être renvoyés.
+        Sans commit-graph, l'ordre suit la date de commit.
+        """
+        graph = self.commit_graph
+        counter = itertools.count()
+
+        def entry(sha):
+            position = graph.lookup(sha) if graph is not None else None
+            if position is not None:
+                return (-graph.generation(position), -graph.commit_time(position), next(counter), sha, position, None)
+            commit = self.read_commit(sha)
+            generation = CommitGraph.GENERATION_INFINITY if graph is not None else 0
+            return (-generation, -commit["committer"]["time"], next(counter), sha, None, commit)
+
+        tip = self.resolve(start)
+        seen = {tip}
+        heap = [entry(tip)]
+        while heap:
+            _, _, _, sha, position, commit = heapq.heappop(heap)
+            if commit is None:
+                commit = self.read_commit(sha)
+                commit["parents"] = [graph.oid(p) for p in graph.parents(position)]
+            yield commit
+            for parent in commit["parents"]:
+                if parent not in seen:
+                    seen.add(parent)
+                    heapq.heappush(heap, entry(parent))
+
+    def iter_commits(self, author="", message="", start="HEAD"):
+        """Renvoie les commits filtrés, au fil du parcours, sous forme de dictionnaires d'affichage"""
+        def compile_pattern(pattern):
+            try:
+                return re.compile(pattern, re.M)
+            except re.error:
+                return re.compile(re.escape(pattern), re.M)
+
+        author_re = compile_pattern(author) if author else None
+        message_re = compile_pattern(message) if message else None
+        for commit in self.walk(start):
+            person = commit["author"]
+            if author_re and not author_re.search(f"{person['name']} <{person['email']}>"):
+                continue
+            if message_re and not message_re.search(commit["message"]):
+                continue
+            yield {
+                "sha": commit["sha"],
+                "parents": commit["parents"],
+                "author": person["name"],
+                "date": self.format_date(person),
+                "subject": self.subject(commit["message"]),
+            }
+
+    def commit_history(self, author="", message="", limit=50, start="HEAD"):
+        """Équivalent de GitOperations.commit_history, calculé sans sous-processus"""
+        return [(row["sha"], row["author"], row["date"], row["subject"])
+                for row in itertools.islice(self.iter_commits(author, message, start), limit)]
+
+class CommitSearchIndex:
+    """Index inversé (SQLite FTS5) des messages, auteurs, chemins et dates des commits d'un dépôt"""
+
+    # Colonnes non indexées d'abord (affichage), puis colonnes indexées
+    COLUMNS = ("sha", "date_text", "subject", "author_name", "message", "author", "paths", "dates")
+    # Poids bm25 dans l'ordre des colonnes
+    WEIGHTS = (0, 0, 0, 0, 1.0, 2.0, 0.5, 0.5)
+    FIELDS = {"author": "author", "auteur": "author", "path": "paths", "chemin": "paths", "date": "dates"}
+    BATCH_SIZE = 5000
+    # Au-delà de ce nombre de résultats, le classement bm25 coûte plus qu'il n'apporte :
+    # on renvoie alors les commits les plus récents, que FTS5 parcourt sans tout trier
+    RANK_LIMIT = 20000
+
+    def __init__(self, git_repo, repo_path):
+        self.git_repo = git_repo
+        os.makedirs(SEARCH_INDEX_DIR, exist_ok=True)
+        key = hashlib.sha1(os.path.normcase(os.path.abspath(repo_path)).encode("utf-8")).hexdigest()
+        self.path = os.path.join(SEARCH_INDEX_DIR, f"{key}.db")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS commits USING fts5("
+                    "sha UNINDEXED, date_text UNINDEXED, subject UNINDEXED, author_name UNINDEXED, "
+                    "message, author, paths, dates, tokenize='unicode61 remove_diacritics 2')")
+                self.conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS commits_vocab USING fts5vocab(commits, 'row')")
+                self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+                # Hash -> ligne FTS5 : la colonne sha n'étant pas indexée, c'est cette table qui
+                # garantit qu'un commit n'est indexé qu'une fois et permet de retirer ses lignes
+                created = not self.conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'shas'").fetchone()
+                self.conn.execute("CREATE TABLE IF NOT EXISTS shas (sha TEXT PRIMARY KEY, doc INTEGER NOT NULL)")
+                if created:
+                    # Index créé avant cette table : on la remplit et on supprime les doublons
+                    self.conn.execute("INSERT INTO shas (sha, doc) SELECT sha, MIN(rowid) FROM commits GROUP BY sha")
+                    self.conn.execute("DELETE FROM commits WHERE rowid NOT IN (SELECT doc FROM shas)")
+                    self._set_meta("count", self.conn.execute("SELECT COUNT(*) FROM shas").fetchone()[0])
+        except sqlite3.OperationalError as e:
+            self.conn.close()
+            raise NativeReaderUnavailable(f"SQLite sans FTS5, recherche indexée indisponible: {e}")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def _meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def count(self):
+        with self.lock:
+            return self._meta("count", 0)
+
+    def _current_tips(self):
+        output = self.git_repo.git.for_each_ref('refs/heads', 'refs/remotes', '--format=%(objectname)')
+        tips = set(output.split())
+        try:
+            tips.add(self.git_repo.git.rev_parse('HEAD'))
+        except git.GitCommandError:
+            pass  # Dépôt vide
+        return sorted(tips)
+
+    def _existing(self, shas):
+        """Sous-ensemble des objets encore présents dans le dépôt (une pointe peut avoir été élaguée par gc)"""
+        if not shas:
+            return []
+        proc = self.git_repo.git.cat_file('--batch-check=%(objectname) %(objecttype)',
+                                          as_process=True, istream=subprocess.PIPE)
+        output, _ = proc.communicate("".join(f"{sha}\n" for sha in shas).encode("ascii"))
+        return [line.split()[0] for line in output.decode("ascii", "replace").splitlines()
+                if not line.endswith(" missing")]
+
+    def _rev_list(self, revisions):
+        """git rev-list des révisions données ("^hash" pour exclure), passées sur l'entrée standard :
+        des milliers de références ne dépassent pas la longueur maximale d'une ligne de commande"""
+        proc = self.git_repo.git.rev_list('--stdin', as_process=True, istream=subprocess.PIPE)
+        output, error = proc.communicate("".join(f"{revision}\n" for revision in revisions).encode("ascii"))
+        if proc.returncode:
+            raise git.GitCommandError(['git', 'rev-list', '--stdin'], proc.returncode, error)
+        return output.decode("ascii", "replace").split()
+
+    def _prune(self, indexed_tips, tips):
+        """Retire les commits qui ne sont plus accessibles depuis les pointes courantes ; renvoie leur nombre"""
+        old = [tip for tip in indexed_tips if tip not in tips]
+        if not old:
+            return 0
+        existing = self._existing(old)
+        if len(existing) == len(old):
+            # Cas courant (avance rapide, rebase, branche supprimée) : seuls les commits des
+            # anciennes pointes absents des nouvelles sont parcourus
+            gone = self._rev_list(existing + [f"^{tip}" for tip in tips])
+        else:
+            # Une ancienne pointe a disparu : ses commits ne sont plus énumérables, on compare
+            # l'index à l'ensemble des commits accessibles
+            reachable = set(self._rev_list(tips)) if tips else set()
+            with self.lock:
+                gone = [sha for (sha,) in self.conn.execute("SELECT sha FROM shas") if sha not in reachable]
+        removed = 0
+        with self.lock, self.conn:
+            for start in range(0, len(gone), 500):
+                chunk = gone[start:start + 500]
+                marks = ", ".join("?" * len(chunk))
+                self.conn.execute(f"DELETE FROM commits WHERE rowid IN (SELECT doc FROM shas WHERE sha IN ({marks}))",
+                                  chunk)
+                removed += self.conn.execute(f"DELETE FROM shas WHERE sha IN ({marks})", chunk).rowcount
+            self._set_meta("count", self._meta("count", 0) - removed)
+            self._set_meta("tips", [tip for tip in indexed_tips if tip not in old])
+        return removed
+
+    @staticmethod
+    def date_terms(timestamp):
+        """Jetons de tranche de date : année, mois et jour"""
+        day = datetime.fromtimestamp(timestamp)
+        return f"y{day:%Y} m{day:%Y%m} d{day:%Y%m%d}"
+
+    def update(self, progress=None):
+        """Indexe les commits apparus depuis les dernières pointes indexées et retire ceux devenus
+        inaccessibles ; renvoie le nombre ajouté"""
+        with self.lock:
+            indexed_tips = self._meta("tips", [])
+        tips = self._current_tips()
+        if set(tips) == set(indexed_tips):
+            return 0
+        self._prune(indexed_tips, tips)
+        if not tips:
+            return 0
+
+        # Ne parcourir que les commits non accessibles depuis les pointes déjà indexées ; un
+        # parcours interrompu ou une pointe élaguée font revoir des commits, que _insert ignore
+        args = ['--branches', '--remotes', 'HEAD', '--name-only', '--stdin',
+                '--format=%x1e%H%x1f%an%x1f%ae%x1f%at%x1f%B%x1f']
+        # Les exclusions passent par l'entrée standard : pas de limite de longueur de ligne de commande
+        known = ([tip for tip in indexed_tips if tip in tips]
+                 + self._existing([tip for tip in indexed_tips if tip not in tips]))
+        added = 0
+        batch = []
+        with METRICS.span("search-index", os.path.basename(self.git_repo.working_dir or "")) as info:
+            proc = self.git_repo.git.log(*args, as_process=True, istream=subprocess.PIPE)
+            proc.stdin.write("".join(f"^{tip}\n" for tip in known).encode("ascii"))
+            proc.stdin.close()
+            decoder = codecs.getincrementaldecoder("utf-8")("replace")
+            buffer = ""
+            try:
+                for raw in iter(lambda: proc.stdout.read(1 << 16), b""):
+                    info["bytes"] += len(raw)
+                    buffer += decoder.decode(raw)
+                    records = buffer.split("\x1e")
+                    buffer = records.pop()
+                    for record in records:
+                        row = self._parse_record(record)
+                        if row:
+                            batch.append(row)
+                    if len(batch) >= self.BATCH_SIZE:
+                        added += self._insert(batch)
+                        batch = []
+                        if progress:
+                            progress(added)
+                row = self._parse_record(buffer)
+                if row:
+                    batch.append(row)
+                added += self._insert(batch)
+            finally:
+                proc.wait()
+        with self.lock, self.conn:
+            self._set_meta("tips", tips)
+        return added
+
+    def _parse_record(self, record):
+        fields = record.split("\x1f")
+        if len(fields) < 6:
+            return None
+        sha, name, email, timestamp, message, names = fields[:6]
+        timestamp = int(timestamp or 0)
+        paths = " ".join(line for line in names.splitlines() if line)
+        subject = " ".join(message.split("\n\n", 1)[0].strip().splitlines())
+        date_text = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        return (sha, date_text, subject, name, message, f"{name} {email}", paths, self.date_terms(timestamp))
+
+    def _insert(self, rows):
+        """Insère les commits pas encore indexés, avec leur hash et le compteur, dans une même transaction"""
+        if not rows:
+            return 0
+        with self.lock, self.conn:
+            known = set()
+            for start in range(0, len(rows), 500):
+                chunk = [row[0] for row in rows[start:start + 500]]
+                known.update(sha for (sha,) in self.conn.execute(
+                    f"SELECT sha FROM shas WHERE sha IN ({', '.join('?' * len(chunk))})", chunk))
+            rows = [row for row in rows if row[0] not in known]
+            if not rows:
+                return 0
+            last = self.conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM commits").fetchone()[0]
+            self.conn.executemany(f"INSERT INTO commits ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})", rows)
+            self.conn.execute("INSERT INTO shas (sha, doc) SELECT sha, rowid FROM commits WHERE rowid > ?", (last,))
+            self._set_meta("count", self._meta("count", 0) + len(rows))
+        return len(rows)
+
+    def rebuild(self, progress=None):
+        """Vide l'index puis le reconstruit entièrement"""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM commits")
+            self.conn.execute("DELETE FROM shas")
+            self.conn.execute("DELETE FROM meta")
+        return self.update(progress)
+
+    @classmethod
+    def parse_query(cls, text):
+        """Découpe 'mots author:nom path:fichier date:2024-05 préfixe*' en (colonne, terme, préfixe)"""
+        terms = []
+        for token in text.split():
+            column = "{message author paths}"
+            field, sep, value = token.partition(":")
+            if sep and field.lower() in cls.FIELDS and value:
+                column = cls.FIELDS[field.lower()]
+                token = value
+            prefix = token.endswith("*")
+            token = token.rstrip("*")
+            if column == "dates":
+                digits = token.replace("-", "")
+                token = {4: "y", 6: "m", 8: "d"}.get(len(digits), "d") + digits
+            if token:
+                terms.append((column, token, prefix))
+        return terms
+
+    @classmethod
+    def build_query(cls, terms):
+        """Construit l'expression FTS5 (termes combinés par AND)"""
+        return " AND ".join(f'{column} : "{token.replace(chr(34), chr(34) * 2)}"' + (" *" if prefix else "")
+                            for column, token, prefix in terms)
+
+    @staticmethod
+    def normalize(token):
+        """Normalise un terme comme le tokenizer unicode61 (minuscules, sans accents)"""
+        decomposed = unicodedata.normalize("NFKD", token.lower())
+        return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+    def _document_frequency(self, token, prefix):
+        """Estime le nombre de commits contenant le terme, d'après le vocabulaire"""
+        term = self.normalize(token)
+        if prefix:
+            row = self.conn.execute("SELECT MAX(doc) FROM commits_vocab WHERE term >= ? AND term < ?",
+                                    (term, term + "\U0010ffff")).fetchone()
+        else:
+            row = self.conn.execute("SELECT doc FROM commits_vocab WHERE term = ?", (term,)).fetchone()
+        return row[0] or 0 if row else 0
+
+    def search(self, text, limit=100):
+        """Recherche multi-termes classée (bm25) ; renvoie des tuples (hash, auteur, date, sujet)"""
+        terms = self.parse_query(text)
+        if not terms:
+            return []
+        query = self.build_query(terms)
+        weights = ", ".join(str(w) for w in self.WEIGHTS)
+        with self.lock:
+            # Le terme le plus rare borne le nombre de résultats
+            rarest = min(self._document_frequency(token, prefix) for _, token, prefix in terms)
+            order = "rowid DESC" if rarest > self.RANK_LIMIT else f"bm25(commits, {weights})"
+            return self.conn.execute(
+                f"SELECT sha, author_name, date_text, subject FROM commits WHERE commits MATCH ? "
+                f"ORDER BY {order} LIMIT ?", (query, limit)).fetchall()
+
+    def complete(self, prefix, limit=10):
+        """Propose les termes les plus fréquents commençant par le préfixe"""
+        prefix = prefix.lower()
+        if not prefix:
+            return []
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT term FROM commits_vocab WHERE term >= ? AND term < ? ORDER BY doc DESC LIMIT ?",
+                (prefix, prefix + "\U0010ffff", limit)).fetchall()
+        return [row[0] for row in rows]
+
+class TagManager:
+    """Opérations groupées sur les tags d'un dépôt (une seule commande git par lot)"""
+
+    # Champs séparés par '|', le message d'annotation en dernier car il peut contenir '|'
+    TAG_FORMAT = ("%(refname:short)|%(objecttype)|%(objectname)|%(*objectname)|"
+                  "%(creatordate:format:%Y-%m-%d %H:%M:%S)|%(contents:subject)")
+
+    def __init__(self, git_repo):
+        self.git_repo = git_repo
+        self.tags = []
+
+    def load_tags(self):
+        """Charge tous les tags avec leur cible, date et annotation en un seul for-each-ref"""
+        output = self.git_repo.git.for_each_ref('refs/tags', '--sort=-creatordate',
+                                                f'--format={self.TAG_FORMAT}')
+        self.tags = []
+        for line in output.splitlines():
+            parts = line.split('|', 5)
+            if len(parts) < 6:
+                continue
+            name, object_type, object_name, peeled, date, subject = parts
+            annotated = object_type == 'tag'
+            self.tags.append({
+                "name": name,
+                # Pour un tag annoté, la cible est l'objet pointé par le tag
+                "target": peeled if annotated and peeled else object_name,
+                "date": date,
+                "annotation": subject if annotated else "",
+                "annotated": annotated,
+            })
+        return self.tags
+
+    def page_count(self, page_size=TAG_PAGE_SIZE):
+        """Renvoie le nombre de pages pour la liste chargée"""
+        return max(1, (len(self.tags) + page_size - 1) // page_size)
+
+    def get_page(self, page, page_size=TAG_PAGE_SIZE):
+        """Renvoie les tags de la page demandée (numérotée à partir de 0)"""
+        start = page * page_size
+        return self.tags[start:start + page_size]
+
+    def create_tag(self, name, commit=None, message=None):
+        """Crée un tag léger ou annoté, sans le pousser"""
+        args = ['-a', name, '-m', message] if message else [name]
+        if commit:
+            args.append(commit)
+        self.git_repo.git.tag(*args)
+
+    def push_tags(self, names, remote='origin'):
+        """Pousse plusieurs tags en une seule opération distante"""
+        if not names:
+            return ""
+        refspecs = [f'refs/tags/{name}:refs/tags/{name}' for name in names]
+        return self.git_repo.git.push(remote, *refspecs)
+
+    def delete_tags(self, names, remote=None):
+        """Supprime plusieurs tags localement, et sur le distant en une seule opération si demandé"""
+        if not names:
+            return
+        self.git_repo.git.tag('-d', *names)
+        if remote:
+            self.git_repo.git.push(remote, '--delete', *[f'refs/tags/{name}' for name in names])
+        deleted = set(names)
+        self.tags = [tag for tag in self.tags if tag["name"] not in deleted]
+
+class StashManager:
+    """Liste, prévisualisation et nettoyage des stashs, dont ceux créés au changement de branche"""
+
+    AUTO_PREFIX = "Auto-stash avant de basculer sur "
+    # Sujet du reflog : "On <branche>: <message>" ou "WIP on <branche>: <commit>"
+    SUBJECT = re.compile(r"^(?:WIP on|On) (.+?): (.*)$")
+
+    def __init__(self, git_repo):
+        self.git_repo = git_repo
+        self.stats = {}  # hash -> (fichiers, ajouts, suppressions) ; un stash ne change jamais
+
+    def list_stashes(self):
+        """Tous les stashs en une seule lecture du reflog de refs/stash"""
+        try:
+            output = self.git_repo.git.log('-g', '--format=%gd%x1f%H%x1f%ct%x1f%gs', 'refs/stash')
+        except git.GitCommandError:
+            return []  # Aucun stash
+        stashes = []
+        for line in output.splitlines():
+            parts = line.split('\x1f', 3)
+            if len(parts) < 4:
+                continue
+            ref, sha, timestamp, subject = parts
+            match = self.SUBJECT.match(subject)
+            branch, message = match.groups() if match else ("", subject)
+            stashes.append({"ref": ref, "index": len(stashes), "sha": sha, "time": int(timestamp),
+                            "branch": branch, "message": message,
+                            "auto": message.startswith(self.AUTO_PREFIX)})
+        return stashes
+
+    def diff_stat(self, sha):
+        """Renvoie (fichiers, lignes ajoutées, lignes supprimées) du stash, calculé à la demande"""
+        if sha not in self.stats:
+            output = self.git_repo.git.diff('--numstat', f'{sha}^1', sha)
+            files = added = removed = 0
+            for line in output.splitlines():
+                insertions, deletions, _ = line.split('\t', 2)
+                files += 1
+                # Fichiers binaires : "-" au lieu d'un nombre de lignes
+                added += int(insertions) if insertions.isdigit() else 0
+                removed += int(deletions) if deletions.isdigit() else 0
+            self.stats[sha] = (files, added, removed)
+        return self.stats[sha]
+
+    def diff_files(self, sha):
+        """Renvoie le --numstat détaillé du stash (prévisualisation)"""
+        return self.git_repo.git.diff('--numstat', f'{sha}^1', sha)
+
+    def create_auto_stash(self, target_branch):
+        """Met de côté les modifications avant de basculer sur target_branch"""
+        self.git_repo.git.stash('push', '-m', f'{self.AUTO_PREFIX}{target_branch}')
+
+    def find_auto_stash(self, branch):
+        """Auto-stash le plus récent créé depuis cette branche, ou None"""
+        return next((stash for stash in self.list_stashes() if stash["auto"] and stash["branch"] == branch), None)
+
+    def _selector(self, sha):
+        # Les indices stash@{n} se décalent : les retrouver au dernier moment à partir du hash
+        for stash in self.list_stashes():
+            if stash["sha"] == sha:
+                return stash["ref"]
+        raise ValueError(f"Stash {sha[:8]} introuvable")
+
+    def pop(self, sha):
+        return self.git_repo.git.stash('pop', self._selector(sha))
+
+    def apply(self, sha):
+        return self.git_repo.git.stash('apply', self._selector(sha))
+
+    def drop(self, shas):
+        """Supprime plusieurs stashs en une seule réécriture du reflog ; renvoie le nombre supprimé"""
+        wanted = set(shas)
+        indexes = sorted((stash["index"] for stash in self.list_stashes() if stash["sha"] in wanted), reverse=True)
+        if not indexes:
+            return 0
+        # Du plus ancien au plus récent : chaque suppression ne décale pas les indices restants
+        self.git_repo.git.reflog('delete', '--updateref', '--rewrite', *[f'refs/stash@{{{i}}}' for i in indexes])
+        if not self.list_stashes():
+            # Reflog vide (refs/stash@{0} se résout encore sur la référence) : la supprimer, comme git stash drop
+            self.git_repo.git.update_ref('-d', 'refs/stash')
+        for sha in wanted:
+            self.stats.pop(sha, None)
+        return len(indexes)
+
+    def gc_auto_stashes(self, max_age_days=AUTO_STASH_MAX_AGE_DAYS):
+        """Supprime les auto-stashs plus anciens que max_age_days ; renvoie le nombre supprimé"""
+        cutoff = time.time() - max_age_days * 86400
+        return self.drop([stash["sha"] for stash in self.list_stashes() if stash["auto"] and stash["time"] < cutoff])
+
+class UndoManager:
+    """Annulation d'une opération à partir des valeurs de références avant/après enregistrées au journal
+
+    Rien n'est recalculé : les références reprennent leur valeur d'avant en une seule transaction
+    update-ref (ce qui laisse une trace dans le reflog), HEAD est replacé par un checkout, la branche
+    extraite est ramenée par reset --keep (index et copie de travail suivent) et les stashs sont
+    réappliqués ou remis dans la pile à partir de leur hash.
+    """
+
+    NOT_UNDOABLE = ("clone", "push", "push-tags", "undo")
+
+    def __init__(self, git_repo):
+        self.git_repo = git_repo
+
+    @staticmethod
+    def local_refs(entry):
+        """Références locales modifiées par l'opération (les références distantes ne sont pas restaurées)"""
+        return {ref: values for ref, values in entry.get("refs", {}).items()
+                if ref != "HEAD" and ref != "refs/stash" and ref.startswith("refs/")
+                and not ref.startswith("refs/remotes/")}
+
+    @classmethod
+    def is_undoable(cls, entry):
+        if entry.get("outcome") != "success" or entry.get("operation") in cls.NOT_UNDOABLE:
+            return False
+        refs = entry.get("refs", {})
+        return bool(cls.local_refs(entry)) or "HEAD" in refs or any(ref.startswith("stash:") for ref in refs)
+
+    @staticmethod
+    def _short(ref):
+        for prefix, label in (("refs/heads/", "branche"), ("refs/tags/", "tag")):
+            if ref.startswith(prefix):
+                return f"{label} '{ref[len(prefix):]}'"
+        return ref
+
+    @staticmethod
+    def _head_label(value):
+        if value.startswith("ref: refs/heads/"):
+            return f"la branche '{value[len('ref: refs/heads/'):]}'"
+        return f"le commit {value[:8]} (HEAD détachée)"
+
+    @staticmethod
+    def _checked_out(entry, current):
+        """Branche extraite une fois HEAD restaurée, ou None si HEAD est détachée"""
+        head = entry.get("refs", {}).get("HEAD")
+        value = head[0] if head and head[0] else current.get("HEAD") or ""
+        return value[len("ref: "):] if value.startswith("ref: ") else None
+
+    def preview(self, entry):
+        """Renvoie (actions prévues, problèmes bloquants, éléments non restaurés) sous forme de textes"""
+        current = OperationJournal.ref_state(self.git_repo)
+        checked_out = self._checked_out(entry, current)
+        refs = entry.get("refs", {})
+        actions, problems, skipped = [], [], []
+
+        head = refs.get("HEAD")
+        if head:
+            before, after = head
+            if current.get("HEAD") != after:
+                problems.append("HEAD a changé depuis l'opération")
+            elif before:
+                actions.append(f"Revenir sur {self._head_label(before)}")
+
+        for ref, (before, after) in sorted(self.local_refs(entry).items()):
+            if current.get(ref) != after:
+                problems.append(f"La {self._short(ref)} a changé depuis l'opération")
+            elif before is None:
+                actions.append(f"Supprimer la {self._short(ref)} ({after[:8]})")
+            elif after is None:
+                actions.append(f"Recréer la {self._short(ref)} sur {before[:8]}")
+            elif ref == checked_out:
+                actions.append(f"Ramener la {self._short(ref)} sur {before[:8]} (actuellement {after[:8]}) par "
+                               f"reset --keep : index et copie de travail suivent, les modifications locales "
+                               f"sont conservées ou l'annulation est refusée")
+            else:
+                actions.append(f"Remettre la {self._short(ref)} sur {before[:8]} (actuellement {after[:8]})")
+
+        for ref, (before, after) in sorted(refs.items()):
+            if not ref.startswith("stash:"):
+                continue
+            sha = ref[len("stash:"):]
+            if before is None and ref not in current:
+                problems.append(f"Le stash {sha[:8]} n'existe plus")
+            elif before is None:
+                actions.append(f"Réappliquer puis retirer le stash {sha[:8]} ({after})")
+            elif after is None and ref not in current:
+                actions.append(f"Remettre le stash {sha[:8]} dans la liste ({before})")
+                if self._applied_unchanged(sha):
+                    actions.append("Retirer ses modifications de la copie de travail (inchangées depuis)")
+                elif head:
+                    problems.append(f"Les modifications du stash {sha[:8]} ont changé dans la copie de travail")
+
+        remote = sorted(ref for ref in refs if ref.startswith("refs/remotes/"))
+        if remote:
+            skipped.append(f"{len(remote)} référence(s) distante(s) : {', '.join(remote)}")
+        return actions, problems, skipped
+
+    def _applied_unchanged(self, sha):
+        """Vrai si la copie de travail contient exactement les modifications du stash (rien d'autre)"""
+        try:
+            self.git_repo.git.diff('--quiet', sha)
+        except git.GitCommandError:
+            return False
+        return self.git_repo.is_dirty()
+
+    def undo(self, entry):
+        """Restaure l'état d'avant l'opération ; lève ValueError si l'état actuel ne correspond plus"""
+        _, problems, _ = self.preview(entry)
+        if problems:
+            raise ValueError("; ".join(problems))
+        refs = entry.get("refs", {})
+        message = f"undo: {entry['operation']} {' '.join(entry.get('args', []))}".strip()
+        stashes = StashManager(self.git_repo)
+        current = OperationJournal.ref_state(self.git_repo)
+
+        # Stashs retirés par l'opération : les remettre dans la liste, et retirer leurs modifications
+        # de la copie de travail si elles y sont encore telles quelles (elles restent dans le stash)
+        for ref, (before, after) in refs.items():
+            if ref.startswith("stash:") and after is None and ref not in current:
+                sha = ref[len("stash:"):]
+                discard = self._applied_unchanged(sha)
+                self.git_repo.git.stash('store', '-m', before, sha)
+                if discard:
+                    self.git_repo.git.reset('--hard', '--quiet')
+
+        # Puis HEAD : une branche créée puis extraite doit être quittée avant d'être supprimée
+        head = refs.get("HEAD")
+        if head and head[0]:
+            before = head[0]
+            if before.startswith("ref: refs/heads/"):
+                target = before[len("ref: refs/heads/"):]
+                # La branche peut avoir été supprimée par l'opération : la recréer avant le checkout
+                recreate = self.local_refs(entry).get(f"refs/heads/{target}")
+                if recreate and recreate[1] is None:
+                    self.git_repo.git.update_ref('-m', message, f"refs/heads/{target}", recreate[0], "")
+                self.git_repo.git.checkout(target)
+            else:
+                self.git_repo.git.checkout('--detach', before)
+
+        # La branche extraite est ramenée par reset --keep : avec update-ref seul, l'index et la
+        # copie de travail resteraient sur l'ancien commit et apparaîtraient comme des modifications
+        # indexées inverses. reset --keep échoue plutôt que d'écraser une modification locale.
+        current = OperationJournal.ref_state(self.git_repo)
+        checked_out = self._checked_out(entry, current)
+        values = self.local_refs(entry).get(checked_out)
+        if values and values[0] and values[1] and current.get(checked_out) == values[1]:
+            self.git_repo.git.reset('--keep', '--quiet', values[0], env={"GIT_REFLOG_ACTION": message})
+            current = OperationJournal.ref_state(self.git_repo)
+
+        # Les autres références locales en une seule transaction atomique
+        commands = []
+        for ref, (before, after) in self.local_refs(entry).items():
+            if current.get(ref) == before:
+                continue  # Déjà restaurée (branche recréée pour le checkout ou branche extraite)
+            if before is None:
+                commands.append(f"delete {ref} {after}\n")
+            elif after is None:
+                commands.append(f"create {ref} {before}\n")
+            else:
+                commands.append(f"update {ref} {before} {after}\n")
+        if commands:
+            proc = self.git_repo.git.update_ref('--stdin', '-m', message, as_process=True, istream=subprocess.PIPE)
+            proc.stdin.write("".join(commands).encode("utf-8"))
+            proc.stdin.close()
+            proc.wait()
+
+        # Enfin les stashs créés par l'opération sont réappliqués sur la branche d'origine
+        for ref, (before, after) in refs.items():
+            if ref.startswith("stash:") and before is None:
+                stashes.pop(ref[len("stash:"):])
+
+class WorktreePool:
+    """Checkouts git worktree des branches récemment utilisées, pour changer de branche sans réécrire les fichiers
+
+    Le pool est borné en nombre et en espace disque ; les checkouts les moins récemment utilisés
+    sont supprimés, sauf s'ils contiennent des modifications non commitées.
+    """
+
+    def __init__(self, git_repo, repo_path, max_worktrees=WORKTREE_POOL_SIZE, disk_budget=WORKTREE_DISK_BUDGET):
+        self.git_repo = git_repo
+        self.repo_path = os.path.normcase(os.path.abspath(repo_path))
+        self.max_worktrees = max_worktrees
+        self.disk_budget = disk_budget
+        key = hashlib.sha1(self.repo_path.encode("utf-8")).hexdigest()[:16]
+        self.root = os.path.join(WORKTREE_DIR, key)
+        self.state_file = os.path.join(self.root, "pool.json")
+        self.lock = threading.RLock()
+        self.entries = {}  # chemin -> {"last_used": horodatage, "size": octets ou None}
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def _save(self):
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".pool.", suffix=".tmp", dir=self.root)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=4)
+            os.replace(tmp_path, self.state_file)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def checkouts(self):
+        """Renvoie {branche: chemin} de tous les checkouts du dépôt (principal compris)"""
+        output = self.git_repo.git.worktree('list', '--porcelain')
+        checkouts = {}
+        path = None
+        for line in output.splitlines():
+            if line.startswith("worktree "):
+                path = os.path.normcase(os.path.abspath(line[len("worktree "):]))
+            elif line.startswith("branch refs/heads/") and path:
+                checkouts[line[len("branch refs/heads/"):]] = path
+        return checkouts
+
+    def is_pooled(self, path):
+        return os.path.normcase(os.path.abspath(path)) in self.entries
+
+    def touch(self, path):
+        with self.lock:
+            path = os.path.normcase(os.path.abspath(path))
+            if path in self.entries:
+                self.entries[path]["last_used"] = time.time()
+                self._save()
+
+    def workspace_for(self, branch):
+        """Chemin où la branche est déjà extraite, ou None"""
+        return self.checkouts().get(branch)
+
+    def _path_for(self, branch):
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", branch)[:60]
+        return os.path.join(self.root, f"{safe}-{hashlib.sha1(branch.encode('utf-8')).hexdigest()[:8]}")
+
+    def acquire(self, branch, keep=()):
+        """Renvoie un checkout de la branche, créé dans le pool si nécessaire"""
+        with self.lock:
+            existing = self.workspace_for(branch)
+            if existing is not None:
+                self.touch(existing)
+                return existing
+            self.git_repo.git.worktree('prune')
+            path = os.path.normcase(self._path_for(branch))
+            os.makedirs(self.root, exist_ok=True)
+            self.git_repo.git.worktree('add', path, branch)
+            self.entries[path] = {"last_used": time.time(), "size": None}
+            self._save()
+            self.evict(keep=set(keep) | {path})
+            return path
+
+    @staticmethod
+    def disk_usage(path):
+        """Taille des fichiers du checkout (parcours os.scandir itératif)"""
+        total = 0
+        stack = [path]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name != ".git":
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                pass
+        return total
+
+    def _is_clean(self, path):
+        try:
+            return not Repo(path).git.status('--porcelain', '--untracked-files=no')
+        except Exception:
+            return False
+
+    def remove(self, path):
+        """Supprime un checkout du pool (refusé par git s'il contient des modifications)"""
+        with self.lock:
+            self.git_repo.git.worktree('remove', path)
+            self.entries.pop(os.path.normcase(os.path.abspath(path)), None)
+            self._save()
+
+    def evict(self, keep=()):
+        """Supprime les checkouts les moins récemment utilisés au-delà du nombre ou du budget disque"""
+        keep = {os.path.normcase(os.path.abspath(path)) for path in keep}
+        evicted = []
+        with self.lock:
+            for path in list(self.entries):
+                if not os.path.isdir(path):
+                    self.entries.pop(path)
+                elif self.entries[path]["size"] is None:
+                    self.entries[path]["size"] = self.disk_usage(path)
+            for path in sorted(self.entries, key=lambda p: self.entries[p]["last_used"]):
+                total = sum(entry["size"] or 0 for entry in self.entries.values())
+                if len(self.entries) <= self.max_worktrees and total <= self.disk_budget:
+                    break
+                if path in keep or not self._is_clean(path):
+                    continue
+                try:
+                    self.remove(path)
+                    evicted.append(path)
+                except git.GitCommandError:
+                    pass  # Fichiers non suivis ou verrou : conserver ce checkout
+            self._save()
+        return evicted
+
+class LargeFileScanner:
+    """Repère les fichiers volumineux avant un commit ou un push"""
+
+    def __init__(self, git_repo, threshold=LARGE_FILE_THRESHOLD):
+        self.git_repo = git_repo
+        self.threshold = threshold
+
+    def scan_outgoing(self, branches, remote_name):
+        """Taille de tous les blobs sortants, en un seul pipeline rev-list --objects | cat-file --batch-check
+
+        Renvoie (fichiers au-dessus du seuil [(chemin, taille, hash)], nombre de blobs, taille totale).
+        Seuls les fichiers volumineux sont conservés en mémoire.
+        """
+        refs = [f'refs/heads/{branch}' for branch in branches]
+        large = []
+        count = total = 0
+        with METRICS.span("large-file-scan", os.path.basename(self.git_repo.working_dir or ""),
+                          " ".join(branches)) as info:
+            rev_list = self.git_repo.git.rev_list('--objects', *refs, '--not', f'--remotes={remote_name}',
+                                                  as_process=True)
+            cat_file = self.git_repo.git.execute(
+                [self.git_repo.git.GIT_PYTHON_GIT_EXECUTABLE or "git", 'cat-file',
+                 '--batch-check=%(objecttype) %(objectname) %(objectsize) %(rest)'],
+                istream=rev_list.stdout, as_process=True)
+            # Le pipeline appartient désormais à cat-file : ne pas garder l'extrémité de lecture
+            rev_list.stdout.close()
+            try:
+                for raw in cat_file.stdout:
+                    info["bytes"] += len(raw)
+                    if not raw.startswith(b"blob "):
+                        continue
+                    _, sha, size, path = (raw.decode("utf-8", "replace").rstrip("\n").split(" ", 3) + [""])[:4]
+                    size = int(size)
+                    count += 1
+                    total += size
+                    if size >= self.threshold:
+                        large.append((path, size, sha))
+            finally:
+                cat_file.wait()
+                rev_list.wait()
+        large.sort(key=lambda item: item[1], reverse=True)
+        return large, count, total
+
+    def pending_paths(self, staged_only=True):
+        """Chemins qui seraient commités : l'index seul, ou toutes les modifications (git add -A)"""
+        if staged_only:
+            output = self.git_repo.git.diff('--cached', '--name-only', '-z', '--diff-filter=ACMR')
+            return [path for path in output.split("\0") if path]
+        output = self.git_repo.git.status('--porcelain', '-z', '--untracked-files=all')
+        paths = []
+        entries = iter(output.split("\0"))
+        for entry in entries:
+            if len(entry) < 4:
+                continue
+            status, path = entry[:2], entry[3:]
+            if "R" in status or "C" in status:
+                next(entries, None)  # Ancien chemin d'un renommage
+            if "D" not in status:
+                paths.append(path)
+        return paths
+
+    def scan_paths(self, paths):
+        """Vérification rapide par os.stat (sans lire ni hacher les fichiers)"""
+        root = self.git_repo.working_dir
+        large = []
+        for path in paths:
+            try:
+                size = os.stat(os.path.join(root, path)).st_size
+            except OSError:
+                continue
+            if size >= self.threshold:
+                large.append((path, size, None))
+        large.sort(key=lambda item: item[1], reverse=True)
+        return large
+
+class IgnoreChecker:
+    """Un unique git check-ignore --stdin -z gardé ouvert : un lot de chemins coûte un aller-retour, pas un processus
+
+    Avec --non-matching --verbose, chaque chemin reçoit exactement quatre champs (source, ligne, motif,
+    chemin) : la fin de la réponse à un lot se repère sans fermer l'entrée. --no-index teste aussi les
+    fichiers suivis, que check-ignore laisse sinon de côté.
+    """
+
+    BATCH_SIZE = 4096  # chemins écrits par appel à write
+    AUDIT_STEP = 50000  # chemins entre deux rapports de progression
+
+    def __init__(self, git_repo):
+        self.git_repo = git_repo
+        self.lock = threading.Lock()
+        self.proc = None
+        self.buffer = b""
+
+    def _start(self):
+        self.proc = self.git_repo.git.execute(
+            [self.git_repo.git.GIT_PYTHON_GIT_EXECUTABLE or "git", 'check-ignore', '--stdin', '-z',
+             '--non-matching', '--verbose', '--no-index'],
+            istream=subprocess.PIPE, as_process=True, env={"GIT_FLUSH": "1"})
+        self.buffer = b""
+
+    def _read_fields(self, count):
+        """Lit exactement count champs terminés par NUL"""
+        fields = []
+        while len(fields) < count:
+            chunk = self.proc.stdout.read1(65536)
+            if not chunk:
+                raise git.GitCommandError(['check-ignore', '--stdin'], self.proc.poll() or 1,
+                                          "Arrêt inattendu de git check-ignore")
+            *complete, self.buffer = (self.buffer + chunk).split(b"\0")
+            fields.extend(complete)
+        return fields
+
+    def check(self, paths):
+        """Renvoie {chemin: (source, ligne, motif)} des chemins (relatifs à la racine) ignorés"""
+        paths = [path for path in paths if path]
+        if not paths:
+            return {}
+        encoded = [path.encode("utf-8", "surrogateescape") for path in paths]
+        with self.lock:
+            if self.proc is None or self.proc.poll() is not None:
+                self._start()
+            stdin = self.proc.stdin
+
+            def write():
+                # Écrire depuis un autre thread : la sortie est lue pendant ce temps, sans interblocage
+                try:
+                    for start in range(0, len(encoded), self.BATCH_SIZE):
+                        stdin.write(b"\0".join(encoded[start:start + self.BATCH_SIZE]) + b"\0")
+                    stdin.flush()
+                except OSError:
+                    pass
+            writer = threading.Thread(target=write, daemon=True)
+            writer.start()
+            try:
+                fields = self._read_fields(4 * len(encoded))
+            except BaseException:
+                self._stop()
+                raise
+            finally:
+                writer.join()
+
+        ignored = {}
+        for i, path in enumerate(paths):
+            source, line, pattern = fields[4 * i:4 * i + 3]
+            # Un motif « ! » correspond au chemin mais le ré-inclut
+            if pattern and not pattern.startswith(b"!"):
+                ignored[path] = (source.decode("utf-8", "replace"), int(line or 0), pattern.decode("utf-8", "replace"))
+        return ignored
+
+    def tracked_ignored(self, progress=None):
+        """Fichiers suivis que les règles d'exclusion actuelles ignorent : [(chemin, source, ligne, motif)]"""
+        results = []
+        with METRICS.span("check-ignore audit", os.path.basename(self.git_repo.working_dir or "")) as info:
+            output = self.git_repo.git.ls_files('-z')
+            info["bytes"] = len(output)
+            paths = [path for path in output.split("\0") if path]
+            for start in range(0, len(paths), self.AUDIT_STEP):
+                chunk = paths[start:start + self.AUDIT_STEP]
+                for path, (source, line, pattern) in self.check(chunk).items():
+                    results.append((path, source, line, pattern))
+                if progress:
+                    progress(start + len(chunk), len(paths))
+        results.sort()
+        return results, len(paths)
+
+    def _stop(self):
+        proc, self.proc = self.proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait()
+        except Exception:
+            pass
+
+    def close(self):
+        """Arrête le processus ; le suivant relira les fichiers .gitignore modifiés"""
+        with self.lock:
+            self._stop()
+
+class GitIgnoreSync:
+    """Garde la liste excluded_files de la configuration et le .gitignore du dépôt alignés
+
+    Fusion à trois voies avec la liste retenue à la dernière synchronisation (clé "excluded_synced") :
+    un motif ajouté ou retiré d'un côté l'est aussi de l'autre. Les commentaires et l'ordre du
+    fichier sont conservés ; les nouveaux motifs sont ajoutés à la fin.
+    """
+
+    def __init__(self, repo_path):
+        self.path = os.path.join(repo_path, ".gitignore")
+
+    def read(self):
+        """Renvoie (lignes du fichier, fin de ligne utilisée)"""
+        if not os.path.exists(self.path):
+            return [], "\n"
+        with open(self.path, "rb") as f:
+            content = f.read().decode("utf-8", "replace")
+        newline = "\r\n" if "\r\n" in content else "\n"
+        return content.splitlines(), newline
+
+    @staticmethod
+    def patterns(lines):
+        return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+    def merge(self, config, base=None):
+        """Renvoie (motifs fusionnés, motifs à ajouter au fichier, motifs à retirer du fichier)
+
+        Sans base (jamais synchronisé), le résultat est l'union des deux listes.
+        """
+        current = self.patterns(self.read()[0])
+        config = [pattern.strip() for pattern in config if pattern.strip()]
+        base = set(base or [])
+        removed = (base - set(config)) | (base - set(current))
+        merged = []
+        for pattern in current + config:
+            if pattern not in removed and pattern not in merged:
+                merged.append(pattern)
+        in_file = set(current)
+        to_add = [pattern for pattern in merged if pattern not in in_file]
+        to_remove = in_file & removed
+        return merged, to_add, to_remove
+
+    def write(self, to_add, to_remove):
+        """Applique les ajouts et retraits au .gitignore, de manière atomique"""
+        lines, newline = self.read()
+        lines = [line for line in lines if line.strip() not in to_remove]
+        lines.extend(to_add)
+        directory = os.path.dirname(self.path)
+        fd, tmp_path = tempfile.mkstemp(prefix=".gitignore.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write((newline.join(lines) + newline if lines else "").encode("utf-8"))
+            if os.path.exists(self.path):
+                shutil.copymode(self.path, tmp_path)
+            else:
+                os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+class WorkingTreeStatus:
+    """État de la copie de travail lu avec git status --porcelain=v2 -z, renvoyé sous forme de différences
+
+    Chaque rafraîchissement ne renvoie que les entrées ajoutées, modifiées ou disparues depuis le
+    précédent : l'interface met à jour ces lignes sans reconstruire la liste. Le status est lancé avec
+    --no-optional-locks pour ne jamais prendre index.lock pendant une commande de l'utilisateur.
+    """
+
+    LABELS = {"M": "modifié", "T": "type modifié", "A": "ajouté", "D": "supprimé", "R": "renommé",
+              "C": "copié", "U": "conflit", "?": "non suivi", "!": "ignoré"}
+
+    def __init__(self, git_repo):
+        self.git_repo = git_repo
+        self.entries = None  # {chemin: (XY, ancien chemin)}
+
+    @staticmethod
+    def parse(output):
+        """Renvoie ({en-tête: valeur}, {chemin: (XY, ancien chemin)}) d'une sortie --porcelain=v2 -z"""
+        headers = {}
+        entries = {}
+        records = iter(output.split("\0"))
+        for record in records:
+            kind = record[:1]
+            if kind == "1":
+                parts = record.split(" ", 8)
+                entries[parts[8]] = (parts[1], "")
+            elif kind == "2":
+                # Renommage ou copie : l'ancien chemin suit dans l'enregistrement suivant
+                parts = record.split(" ", 9)
+                entries[parts[9]] = (parts[1], next(records, ""))
+            elif kind == "u":
+                parts = record.split(" ", 10)
+                entries[parts[10]] = (parts[1], "")
+            elif kind in ("?", "!"):
+                entries[record[2:]] = (kind * 2, "")
+            elif kind == "#":
+                key, _, value = record[2:].partition(" ")
+                headers[key] = value
+        return headers, entries
+
+    @classmethod
+    def labels(cls, xy):
+        """Libellés (index, copie de travail) d'un code XY ; "." signifie inchangé"""
+        if xy in ("??", "!!"):
+            return "", cls.LABELS[xy[0]]
+        if "U" in xy or xy in ("AA", "DD"):
+            return cls.LABELS["U"], cls.LABELS["U"]
+        return cls.LABELS.get(xy[0], ""), cls.LABELS.get(xy[1], "")
+
+    def refresh(self):
+        """Relance git status et renvoie les différences avec l'état précédent
+
+        Renvoie {"reset": premier état, "changed": {chemin: (XY, ancien)}, "removed": [chemins],
+        "headers": {...}, "count": nombre d'entrées}.
+        """
+        git_cmd = self.git_repo.git.GIT_PYTHON_GIT_EXECUTABLE or "git"
+        with METRICS.span("status", os.path.basename(self.git_repo.working_dir or "")) as info:
+            output = self.git_repo.git.execute([git_cmd, '--no-optional-locks', 'status', '--porcelain=v2', '-z',
+                                                '--branch', '--untracked-files=all'])
+            info["bytes"] = len(output)
+        headers, entries = self.parse(output)
+        previous = self.entries
+        self.entries = entries
+        if previous is None:
+            return {"reset": True, "changed": entries, "removed": [], "headers": headers, "count": len(entries)}
+        changed = {path: entry for path, entry in entries.items() if previous.get(path) != entry}
+        removed = [path for path in previous if path not in entries]
+        return {"reset": False, "changed": changed, "removed": removed, "headers": headers, "count": len(entries)}
+
+    # --- Accélérateurs optionnels, enregistrés dans la configuration du dépôt ---
+
+    def _config(self, key):
+        try:
+            return self.git_repo.git.config('--get', key)
+        except git.GitCommandError:
+            return ""
+
+    def settings(self):
+        """Renvoie (cache des fichiers non suivis actif, fsmonitor actif)"""
+        fsmonitor = self._config('core.fsmonitor')
+        return (self._config('core.untrackedCache').lower() == "true",
+                bool(fsmonitor) and fsmonitor.lower() != "false")
+
+    def fsmonitor_supported(self):
+        """Vrai si ce git embarque le démon fsmonitor intégré"""
+        try:
+            return "fsmonitor--daemon" in self.git_repo.git.version('--build-options')
+        except git.GitCommandError:
+            return False
+
+    def set_untracked_cache(self, enabled):
+        if enabled:
+            self.git_repo.git.config('core.untrackedCache', 'true')
+            self.git_repo.git.update_index('--untracked-cache')
+            # Un premier status avec verrous enregistre le cache dans l'index
+            self.git_repo.git.status('--porcelain', '--untracked-files=all')
+        else:
+            self.git_repo.git.config('core.untrackedCache', 'false')
+            self.git_repo.git.update_index('--no-untracked-cache')
+
+    def set_fsmonitor(self, enabled):
+        if enabled:
+            if not self.fsmonitor_supported():
+                raise ValueError("Le démon fsmonitor intégré n'est pas disponible avec ce git sur cette plateforme")
+            self.git_repo.git.config('core.fsmonitor', 'true')
+            self.git_repo.git.status('--porcelain', '--untracked-files=no')
+        else:
+            try:
+                self.git_repo.git.fsmonitor__daemon('stop')
+            except git.GitCommandError:
+                pass  # Démon déjà arrêté ou non pris en charge
+            try:
+                self.git_repo.git.config('--unset', 'core.fsmonitor')
+            except git.GitCommandError:
+                pass  # Option absente
+
+class RepoAnalytics:
+    """Statistiques de taille d'un dépôt, calculées en un seul parcours de l'historique
+
+    rev-list --objects --all alimente un unique cat-file --batch-check ; les compteurs sont des
+    tableaux compacts indexés par type, dossier ou mois (aucun dictionnaire par objet). Le résultat
+    est mis en cache sur disque avec l'empreinte des packs, des objets isolés et des références.
+    """
+
+    TYPES = ("commit", "tree", "blob", "tag")
+
+    def __init__(self, git_repo, repo_path, top_count=ANALYTICS_TOP_COUNT):
+        self.git_repo = git_repo
+        self.top_count = top_count
+        key = hashlib.sha1(os.path.normcase(os.path.abspath(repo_path)).encode("utf-8")).hexdigest()
+        self.path = os.path.join(ANALYTICS_DIR, f"{key}.json")
+        self.result = None
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.result = json.load(f)
+            except (OSError, ValueError):
+                self.result = None
+
+    def object_counts(self):
+        """Objets isolés et packs d'après git count-objects -v (tailles en octets)"""
+        stats = {}
+        for line in self.git_repo.git.count_objects('-v').splitlines():
+            key, _, value = line.partition(": ")
+            if value.isdigit():
+                stats[key] = int(value)
+        return {"loose_objects": stats.get("count", 0), "loose_size": stats.get("size", 0) * 1024,
+                "packs": stats.get("packs", 0), "pack_size": stats.get("size-pack", 0) * 1024,
+                "packed_objects": stats.get("in-pack", 0)}
+
+    def fingerprint(self, counts=None):
+        """Empreinte des packs (nom, taille, date), des objets isolés et des références"""
+        digest = hashlib.sha1()
+        pack_dir = os.path.join(self.git_repo.common_dir, "objects", "pack")
+        try:
+            entries = sorted((entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+                             for entry in os.scandir(pack_dir) if entry.name.endswith(".pack"))
+        except OSError:
+            entries = []
+        digest.update(repr(entries).encode("utf-8"))
+        counts = counts or self.object_counts()
+        digest.update(f"{counts['loose_objects']} {counts['loose_size']}".encode("utf-8"))
+        digest.update(self.git_repo.git.for_each_ref('--format=%(objectname) %(refname)').encode("utf-8"))
+        return digest.hexdigest()
+
+    def cached(self):
+        """Renvoie le dernier résultat s'il correspond encore à l'état du dépôt, sinon None"""
+        if self.result and self.result.get("fingerprint") == self.fingerprint():
+            return self.result
+        return None
+
+    def analyze(self, progress=None):
+        """Parcourt tous les objets accessibles et renvoie le rapport (dictionnaire sérialisable en JSON)
+
+        --in-commit-order --reverse place chaque arbre et fichier juste après le plus ancien commit qui
+        l'introduit, ce qui permet d'attribuer la croissance au mois de ce commit.
+        """
+        start = time.perf_counter()
+        counts = self.object_counts()
+        fingerprint = self.fingerprint(counts)
+
+        type_index = {name: i for i, name in enumerate(self.TYPES)}
+        type_counts = array.array('Q', [0] * len(self.TYPES))
+        type_sizes = array.array('Q', [0] * len(self.TYPES))
+        type_disk = array.array('Q', [0] * len(self.TYPES))
+        dir_index = {}
+        dir_blobs = array.array('Q')
+        dir_disk = array.array('Q')
+        month_index = {}
+        month_commits = array.array('Q')
+        month_disk = array.array('Q')
+        largest = []  # tas des top_count plus gros fichiers : (taille, disque, hash, chemin)
+        timestamps = deque()
+        month = None
+
+        git_cmd = self.git_repo.git.GIT_PYTHON_GIT_EXECUTABLE or "git"
+        with METRICS.span("analytics", os.path.basename(self.git_repo.working_dir or "")) as info:
+            rev_list = self.git_repo.git.rev_list('--objects', '--all', '--in-commit-order', '--reverse',
+                                                  '--timestamp', as_process=True)
+            cat_file = self.git_repo.git.execute(
+                [git_cmd, 'cat-file', '--batch-check=%(objecttype) %(objectname) %(objectsize) '
+                                      '%(objectsize:disk) %(rest)', '--buffer'],
+                istream=subprocess.PIPE, as_process=True)
+
+            def relay():
+                # Les lignes de commit sont « date hash » : la date est mise de côté, dans l'ordre,
+                # pour être associée à la réponse de cat-file correspondante
+                try:
+                    for raw in rev_list.stdout:
+                        first, _, rest = raw.partition(b" ")
+                        if len(first) < 40:
+                            timestamps.append(int(first))
+                            cat_file.stdin.write(rest)
+                        else:
+                            cat_file.stdin.write(raw)
+                finally:
+                    try:
+                        cat_file.stdin.close()
+                    except OSError:
+                        pass
+            relay_thread = threading.Thread(target=relay, daemon=True)
+            relay_thread.start()
+
+            processed = 0
+            try:
+                for raw in cat_file.stdout:
+                    info["bytes"] += len(raw)
+                    kind, sha, size, disk, path = (raw.decode("utf-8", "replace").rstrip("\n").split(" ", 4) + [""])[:5]
+                    position = type_index.get(kind)
+                    if position is None:
+                        continue
+                    size = int(size)
+                    disk = int(disk)
+                    type_counts[position] += 1
+                    type_sizes[position] += size
+                    type_disk[position] += disk
+                    if kind == "commit":
+                        key = datetime.fromtimestamp(timestamps.popleft()).strftime("%Y-%m")
+                        month = month_index.get(key)
+                        if month is None:
+                            month = month_index[key] = len(month_commits)
+                            month_commits.append(0)
+                            month_disk.append(0)
+                        month_commits[month] += 1
+                    if month is not None:
+                        month_disk[month] += disk
+                    if kind == "blob":
+                        item = (size, disk, sha, path)
+                        if len(largest) < self.top_count:
+                            heapq.heappush(largest, item)
+                        elif size > largest[0][0]:
+                            heapq.heapreplace(largest, item)
+                        # Chaque fichier compte dans tous ses dossiers parents
+                        directory = path
+                        while "/" in directory:
+                            directory = directory.rsplit("/", 1)[0]
+                            slot = dir_index.get(directory)
+                            if slot is None:
+                                slot = dir_index[directory] = len(dir_blobs)
+                                dir_blobs.append(0)
+                                dir_disk.append(0)
+                            dir_blobs[slot] += 1
+                            dir_disk[slot] += disk
+                    processed += 1
+                    if progress and processed % 50000 == 0:
+                        progress(processed)
+            finally:
+                relay_thread.join()
+                cat_file.wait()
+                rev_list.wait()
+
+        directories = sorted(dir_index.items(), key=lambda item: dir_disk[item[1]], reverse=True)
+        self.result = {
+            "fingerprint": fingerprint,
+            "time": time.time(),
+            "duration": time.perf_counter() - start,
+            "counts": counts,
+            "types": {name: {"count": type_counts[i], "size": type_sizes[i], "disk": type_disk[i]}
+                      for i, name in enumerate(self.TYPES)},
+            "largest": [[path, size, disk, sha] for size, disk, sha, path in sorted(largest, reverse=True)],
+            "directories": [[name, dir_disk[slot], dir_blobs[slot]]
+                            for name, slot in directories[:self.top_count]],
+            "growth": [[key, month_commits[slot], month_disk[slot]] for key, slot in sorted(month_index.items())],
+        }
+        self.save()
+        return self.result
+
+    def save(self):
+        """Écrit le dernier résultat de manière atomique"""
+        data = json.dumps(self.result)
+        os.makedirs(ANALYTICS_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".analytics.", suffix=".tmp", dir=ANALYTICS_DIR)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+class MaintenanceScheduler:
+    """Maintenance des dépôts configurés pendant l'inactivité, avec un nombre limité de dépôts à la fois
+
+    Les commandes git sont lancées avec une priorité CPU réduite (nice) sur les systèmes POSIX.
+    """
+
+    # Les objets isolés sont empaquetés d'abord, pour que le multi-pack-index couvre le nouveau pack
+    TASKS = (
+        ("loose-objects", "Objets isolés",
+         [["maintenance", "run", "--task=loose-objects", "--quiet"], ["prune", "--expire=2.weeks.ago"]]),
+        ("multi-pack-index", "Multi-pack-index", [["multi-pack-index", "write"]]),
+        ("incremental-repack", "Repack incrémental", [["maintenance", "run", "--task=incremental-repack", "--quiet"]]),
+        ("commit-graph", "Commit-graph",
+         [["commit-graph", "write", "--reachable", "--split", "--changed-paths"]]),
+        ("untracked-cache", "Cache des fichiers non suivis",
+         [["config", "core.untrackedCache", "true"], ["update-index", "--untracked-cache"]]),
+    )
+
+    def __init__(self, concurrency=MAINTENANCE_CONCURRENCY, niceness=MAINTENANCE_NICENESS,
+                 interval=MAINTENANCE_INTERVAL, state_file=MAINTENANCE_STATE_FILE):
+        self.semaphore = threading.Semaphore(concurrency)
+        self.niceness = niceness
+        # Préfixe « nice -n N » plutôt qu'un preexec_fn, qui n'est pas sûr avec des threads
+        self.nice_command = shutil.which("nice") if os.name == "posix" and niceness else None
+        self.interval = interval
+        self.state_file = state_file
+        self.lock = threading.Lock()
+        self.running = set()
+        self.state = {"enabled": True, "repos": {}}
+        if os.path.exists(state_file):
+            try:
+                with open(state_file, "r", encoding="utf-8") as f:
+                    self.state.update(json.load(f))
+            except (OSError, ValueError):
+                pass
+
+    def _save(self):
+        with self.lock:
+            data = json.dumps(self.state, indent=4, ensure_ascii=False)
+        directory = os.path.dirname(self.state_file)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".maintenance.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.state_file)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @property
+    def enabled(self):
+        return self.state.get("enabled", True)
+
+    def set_enabled(self, enabled):
+        with self.lock:
+            self.state["enabled"] = enabled
+        self._save()
+
+    def report(self, repo_path):
+        with self.lock:
+            return self.state["repos"].get(os.path.abspath(repo_path))
+
+    def is_running(self, repo_path):
+        with self.lock:
+            return os.path.abspath(repo_path) in self.running
+
+    def due(self, repos):
+        """Dépôts existants dont la dernière maintenance complète date de plus de interval"""
+        now = time.time()
+        due = []
+        for repo in repos:
+            path = os.path.abspath(repo["local_path"])
+            if repo.get("maintenance", True) is False or not os.path.isdir(os.path.join(path, ".git")):
+                continue
+            report = self.report(path)
+            if (report is None or now - report.get("completed", 0) > self.interval) and not self.is_running(path):
+                due.append(repo)
+        return due
+
+    def _git(self, git_repo, args):
+        command = [git_repo.git.GIT_PYTHON_GIT_EXECUTABLE or "git", *args]
+        if self.nice_command:
+            command = [self.nice_command, "-n", str(self.niceness), *command]
+        return git_repo.git.execute(command)
+
+    def measure(self, git_repo):
+        """Taille des objets et durée d'un parcours d'historique et d'un status"""
+        stats = {}
+        for line in self._git(git_repo, ["count-objects", "-v"]).splitlines():
+            key, _, value = line.partition(": ")
+            if value.isdigit():
+                stats[key] = int(value)
+        start = time.perf_counter()
+        try:
+            self._git(git_repo, ["rev-list", "--max-count=10000", "HEAD"])
+        except git.GitCommandError:
+            pass  # Dépôt vide
+        stats["log_time"] = time.perf_counter() - start
+        start = time.perf_counter()
+        self._git(git_repo, ["status", "--porcelain"])
+        stats["status_time"] = time.perf_counter() - start
+        return {"loose_objects": stats.get("count", 0), "loose_size": stats.get("size", 0) * 1024,
+                "packs": stats.get("packs", 0), "pack_size": stats.get("size-pack", 0) * 1024,
+                "log_time": stats["log_time"], "status_time": stats["status_time"]}
+
+    def run_repo(self, repo, should_continue=lambda: True):
+        """Exécute les tâches sur un dépôt et enregistre le rapport avant/après"""
+        path = os.path.abspath(repo["local_path"])
+        with self.lock:
+            if path in self.running:
+                return None
+            self.running.add(path)
+        try:
+            git_repo = Repo(path)
+            report = {"name": repo["name"], "time": time.time(), "before": self.measure(git_repo),
+                      "tasks": {}, "complete": False}
+            for name, label, commands in self.TASKS:
+                # L'utilisateur est revenu : ne pas lancer de nouvelle tâche
+                if not should_continue():
+                    break
+                start = time.perf_counter()
+                try:
+                    with METRICS.span(f"maintenance {name}", repo["name"]):
+                        for args in commands:
+                            self._git(git_repo, args)
+                    report["tasks"][name] = {"duration": time.perf_counter() - start}
+                except git.GitCommandError as e:
+                    report["tasks"][name] = {"duration": time.perf_counter() - start,
+                                             "error": str(e.stderr or e).strip()[:200]}
+            else:
+                report["complete"] = True
+            # Une maintenance interrompue ne repousse pas la suivante
+            previous = self.report(path) or {}
+            report["completed"] = report["time"] if report["complete"] else previous.get("completed", 0)
+            report["after"] = self.measure(git_repo)
+            with self.lock:
+                self.state["repos"][path] = report
+            self._save()
+            return report
+        finally:
+            with self.lock:
+                self.running.discard(path)
+
+    def start(self, repos, should_continue=lambda: True, on_report=None):
+        """Lance la maintenance de chaque dépôt dans un thread, au plus concurrency à la fois"""
+        def worker(repo):
+            with self.semaphore:
+                if not should_continue():
+                    return
+                try:
+                    report = self.run_repo(repo, should_continue)
+                except Exception as e:
+                    report = {"name": repo["name"], "error": str(e)}
+                if on_report and report is not None:
+                    on_report(repo, report)
+        for repo in repos:
+            threading.Thread(target=lambda repo=repo: worker(repo), daemon=True).start()
+
+class RemoteRefCache:
+    """Instantanés de git ls-remote par distant, valables pendant une durée configurable
+
+    Les dialogues lisent l'instantané sans attendre le réseau ; il est rafraîchi en arrière-plan
+    et corrigé localement après nos propres push et suppressions.
+    """
+
+    BADGES = {"absent": "absent du distant", "exists": "sur le distant", "same": "à jour",
+              "remote_ahead": "distant en avance", "local_ahead": "à pousser", "diverged": "divergé"}
+
+    def __init__(self, git_repo, repo_path, ttl=REMOTE_REFS_TTL):
+        self.git_repo = git_repo
+        self.ttl = ttl
+        key = hashlib.sha1(os.path.normcase(os.path.abspath(repo_path)).encode("utf-8")).hexdigest()
+        self.path = os.path.join(REMOTE_REFS_DIR, f"{key}.json")
+        self.lock = threading.Lock()
+        self.refreshing = set()
+        self.snapshots = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.snapshots = json.load(f)
+            except (OSError, ValueError):
+                self.snapshots = {}
+
+    def get(self, remote):
+        """Renvoie {référence: hash} du dernier instantané, ou None s'il n'y en a jamais eu"""
+        with self.lock:
+            snapshot = self.snapshots.get(remote)
+            return dict(snapshot["refs"]) if snapshot else None
+
+    def age(self, remote):
+        with self.lock:
+            snapshot = self.snapshots.get(remote)
+            return time.time() - snapshot["time"] if snapshot else None
+
+    def is_stale(self, remote):
+        age = self.age(remote)
+        return age is None or age > self.ttl
+
+    def _begin_refresh(self, remote):
+        with self.lock:
+            if remote in self.refreshing:
+                return False
+            self.refreshing.add(remote)
+            return True
+
+    def _end_refresh(self, remote, output=None):
+        """Enregistre la sortie de git ls-remote (si elle est fournie) et libère le distant"""
+        try:
+            if output is not None:
+                refs = {}
+                for line in output.splitlines():
+                    sha, _, ref = line.partition("\t")
+                    # Les tags annotés apparaissent aussi déréférencés (ref^{}) : garder l'objet tag
+                    if ref and not ref.endswith("^{}"):
+                        refs[ref] = sha
+                with self.lock:
+                    self.snapshots[remote] = {"time": time.time(), "refs": refs}
+                self.save()
+        finally:
+            with self.lock:
+                self.refreshing.discard(remote)
+
+    def refresh(self, remote, source=None):
+        """Interroge le distant (réseau) ; renvoie False si un rafraîchissement est déjà en cours
+
+        source permet de lire les références ailleurs, par exemple dans un miroir local du distant.
+        """
+        if not self._begin_refresh(remote):
+            return False
+        output = None
+        try:
+            with METRICS.span("ls-remote", os.path.basename(self.git_repo.working_dir or ""), remote):
+                output = self.git_repo.git.ls_remote('--heads', '--tags', source or remote)
+        finally:
+            self._end_refresh(remote, output)
+        return True
+
+    async def refresh_async(self, runner, remote, source=None):
+        """Comme refresh, sur la boucle asyncio de runner (AsyncGit), sans bloquer de thread"""
+        if not self._begin_refresh(remote):
+            return False
+        output = None
+        try:
+            output = await runner.run(self.git_repo.working_dir, ['ls-remote', '--heads', '--tags', source or remote],
+                                      repo_name=os.path.basename(self.git_repo.working_dir or ""))
+        finally:
+            self._end_refresh(remote, output)
+        return True
+
+    def record_push(self, remote, refs):
+        """Reporte dans l'instantané les références que nous venons de pousser ({référence: hash})"""
+        with self.lock:
+            snapshot = self.snapshots.get(remote)
+            if snapshot is None:
+                return
+            snapshot["refs"].update(refs)
+        self.save()
+
+    def record_delete(self, remote, refs):
+        """Retire de l'instantané les références que nous venons de supprimer sur le distant"""
+        with self.lock:
+            snapshot = self.snapshots.get(remote)
+            if snapshot is None:
+                return
+            for ref in refs:
+                snapshot["refs"].pop(ref, None)
+        self.save()
+
+    def save(self):
+        """Écrit les instantanés de manière atomique"""
+        with self.lock:
+            data = json.dumps(self.snapshots)
+        os.makedirs(REMOTE_REFS_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".remote_refs.", suffix=".tmp", dir=REMOTE_REFS_DIR)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def local_refs(self, patterns=('refs/heads', 'refs/tags')):
+        """Renvoie {référence: hash} des références locales, en un seul for-each-ref"""
+        output = self.git_repo.git.for_each_ref(*patterns, '--format=%(refname) %(objectname)')
+        refs = {}
+        for line in output.splitlines():
+            ref, _, sha = line.partition(" ")
+            refs[ref] = sha
+        return refs
+
+    def _has_object(self, sha):
+        try:
+            self.git_repo.git.cat_file('-e', sha)
+            return True
+        except git.GitCommandError:
+            return False
+
+    def compare(self, remote, refs):
+        """Compare des références locales à l'instantané, sans accès réseau
+
+        Renvoie {référence: statut} avec un statut de BADGES, ou None si le distant n'a jamais été lu.
+        """
+        snapshot = self.get(remote)
+        if snapshot is None:
+            return None
+        local = self.local_refs()
+        statuses = {}
+        for ref in refs:
+            remote_sha = snapshot.get(ref)
+            local_sha = local.get(ref)
+            if remote_sha is None:
+                statuses[ref] = "absent"
+            elif local_sha is None:
+                statuses[ref] = "exists"
+            elif remote_sha == local_sha:
+                statuses[ref] = "same"
+            elif ref.startswith("refs/tags/"):
+                statuses[ref] = "diverged"
+            elif not self._has_object(remote_sha) or self.git_repo.is_ancestor(local_sha, remote_sha):
+                # Commit inconnu localement : le distant a reçu des commits depuis notre dernier fetch
+                statuses[ref] = "remote_ahead"
+            elif self.git_repo.is_ancestor(remote_sha, local_sha):
+                statuses[ref] = "local_ahead"
+            else:
+                statuses[ref] = "diverged"
+        return statuses
+
+class ByteBudgetCache:
+    """Cache LRU borné par la taille approximative (en octets) de ses entrées"""
+
+    def __init__(self, max_bytes=FILE_HISTORY_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size):
+        # Une entrée trop grosse viderait tout le cache : on ne la garde pas
+        if size > self.max_bytes // 4:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self.entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= evicted
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+class BlameResult:
+    """Blame compact d'un fichier : table des commits et indice de commit par ligne (4 octets/ligne)"""
+
+    UNKNOWN = 0xFFFFFFFF
+
+    def __init__(self, line_count):
+        self.commits = []  # (hash, auteur, horodatage, résumé)
+        self.commit_positions = {}
+        self.lines = array.array("I", [self.UNKNOWN]) * line_count
+        self.complete = False
+
+    def add_commit(self, sha, author, timestamp, summary):
+        position = self.commit_positions.get(sha)
+        if position is None:
+            position = len(self.commits)
+            self.commits.append((sha, author, timestamp, summary))
+            self.commit_positions[sha] = position
+        return position
+
+    def assign(self, start, count, position):
+        end = min(start + count, len(self.lines))
+        self.lines[start:end] = array.array("I", [position]) * (end - start)
+
+    def blocks(self):
+        """Renvoie les blocs (première ligne, nombre de lignes, indice du commit) dans l'ordre du fichier"""
+        blocks = []
+        for position, group in itertools.groupby(enumerate(self.lines), key=lambda item: item[1]):
+            group = list(group)
+            if position != self.UNKNOWN:
+                blocks.append((group[0][0], len(group), position))
+        return blocks
+
+    def byte_size(self):
+        return self.lines.itemsize * len(self.lines) + 120 * len(self.commits)
+
+class FileHistory:
+    """Historique d'un fichier (git log --follow) et blame incrémental, diffusés par lots"""
+
+    LOG_FORMAT = "%x1e%H%x1f%an%x1f%at%x1f%s"
+    LOG_BATCH = 200
+
+    def __init__(self, git_repo, cache):
+        self.git_repo = git_repo
+        self.cache = cache
+        self.repo_key = os.path.normcase(os.path.abspath(git_repo.working_dir or git_repo.git_dir))
+
+    def resolve(self, revision="HEAD"):
+        return self.git_repo.git.rev_parse('--verify', f'{revision}^{{commit}}')
+
+    def content(self, path, commit):
+        """Contenu du fichier à ce commit (bytes), mis en cache"""
+        key = (self.repo_key, "blob", path, commit)
+        data = self.cache.get(key)
+        if data is None:
+            data = self.git_repo.git.cat_file('blob', f'{commit}:{path}', stdout_as_string=False)
+            self.cache.put(key, data, len(data))
+        return data
+
+    @staticmethod
+    def is_binary(data):
+        return b"\0" in data[:8000]
+
+    @staticmethod
+    def _stop(proc, cancel):
+        if cancel is not None and cancel.is_set():
+            # Interrompu volontairement : le code de sortie n'a pas d'importance
+            if proc.poll() is None:
+                proc.kill()
+            try:
+                proc.wait()
+            except git.GitCommandError:
+                pass
+            return
+        proc.wait()
+
+    def cached_log(self, path, commit):
+        return self.cache.get((self.repo_key, "log", path, commit))
+
+    def stream_log(self, path, commit, on_batch, cancel=None):
+        """Diffuse les commits du fichier (renommages suivis) ; renvoie la liste complète ou None si annulé
+
+        Chaque entrée vaut (hash, auteur, date, sujet, chemin du fichier à ce commit).
+        """
+        key = (self.repo_key, "log", path, commit)
+        entries = self.cache.get(key)
+        if entries is not None:
+            on_batch(entries)
+            return entries
+
+        entries = []
+        batch = []
+        last_flush = 0.0
+
+        def parse(record):
+            fields = record.split("\x1f", 3)
+            if len(fields) < 4:
+                return None
+            sha, author, timestamp, rest = fields
+            subject, _, names = rest.partition("\n")
+            old_path = next((line for line in names.splitlines() if line), path)
+            date = datetime.fromtimestamp(int(timestamp or 0)).strftime("%Y-%m-%d %H:%M")
+            return (sha, author, date, subject, old_path)
+
+        with METRICS.span("file-log", os.path.basename(self.repo_key), path) as info:
+            proc = self.git_repo.git.log(f'--format={self.LOG_FORMAT}', '--follow', '--name-only',
+                                         commit, '--', path, as_process=True)
+            decoder = codecs.getincrementaldecoder("utf-8")("replace")
+            buffer = ""
+            try:
+                for raw in iter(lambda: proc.stdout.read(1 << 14), b""):
+                    if cancel is not None and cancel.is_set():
+                        return None
+                    info["bytes"] += len(raw)
+                    buffer += decoder.decode(raw)
+                    records = buffer.split("\x1e")
+                    buffer = records.pop()
+                    batch.extend(entry for entry in map(parse, records) if entry)
+                    # Premier lot envoyé immédiatement, les suivants regroupés
+                    if batch and (len(batch) >= self.LOG_BATCH or time.monotonic() - last_flush >= STREAM_FLUSH_INTERVAL):
+                        entries.extend(batch)
+                        on_batch(batch)
+                        batch = []
+                        last_flush = time.monotonic()
+                entry = parse(buffer + decoder.decode(b"", final=True))
+                if entry:
+                    batch.append(entry)
+                if batch:
+                    entries.extend(batch)
+                    on_batch(batch)
+            finally:
+                self._stop(proc, cancel)
+        self.cache.put(key, entries, sum(len(entry[3]) + len(entry[4]) + 80 for entry in entries))
+        return entries
+
+    def cached_blame(self, path, commit):
+        result = self.cache.get((self.repo_key, "blame", path, commit))
+        return result if result is not None and result.complete else None
+
+    def stream_blame(self, path, commit, line_count, on_batch, cancel=None):
+        """Diffuse git blame --incremental ; renvoie le BlameResult complet ou None si annulé
+
+        on_batch reçoit (résultat, [(première ligne, nombre de lignes, indice du commit), ...]),
+        lignes numérotées à partir de 0, dans l'ordre où git les attribue.
+        """
+        key = (self.repo_key, "blame", path, commit)
+        result = self.cached_blame(path, commit)
+        if result is not None:
+            on_batch(result, result.blocks())
+            return result
+
+        result = BlameResult(line_count)
+        batch = []
+        last_flush = 0.0
+        header = None
+        details = {}
+        with METRICS.span("blame", os.path.basename(self.repo_key), path) as info:
+            proc = self.git_repo.git.blame('--incremental', commit, '--', path, as_process=True)
+            try:
+                for raw in proc.stdout:
+                    if cancel is not None and cancel.is_set():
+                        return None
+                    info["bytes"] += len(raw)
+                    line = raw.decode("utf-8", "replace").rstrip("\n")
+                    if header is None:
+                        # "<hash> <ligne d'origine> <ligne finale> <nombre de lignes>"
+                        parts = line.split(" ")
+                        header = (parts[0], int(parts[2]) - 1, int(parts[3]))
+                        continue
+                    name, _, value = line.partition(" ")
+                    if name != "filename":
+                        details[name] = value
+                        continue
+                    # "filename" termine chaque bloc
+                    sha, start, count = header
+                    if sha not in result.commit_positions:
+                        result.add_commit(sha, details.get("author", ""),
+                                          int(details.get("author-time", 0) or 0), details.get("summary", ""))
+                    position = result.commit_positions[sha]
+                    result.assign(start, count, position)
+                    batch.append((start, count, position))
+                    header = None
+                    details = {}
+                    if time.monotonic() - last_flush >= STREAM_FLUSH_INTERVAL:
+                        on_batch(result, batch)
+                        batch = []
+                        last_flush = time.monotonic()
+                if batch:
+                    on_batch(result, batch)
+            finally:
+                self._stop(proc, cancel)
+        result.complete = True
+        self.cache.put(key, result, result.byte_size())
+        return result
+
+class DiffPager:
+    """Diff d'un commit chargé fichier par fichier, puis page de hunks par page, avec plafond d'octets"""
+
+    def __init__(self, git_repo, commit, file_max_bytes=DIFF_FILE_MAX_BYTES, page_lines=DIFF_PAGE_LINES):
+        self.git_repo = git_repo
+        self.commit = commit
+        self.file_max_bytes = file_max_bytes
+        self.page_lines = page_lines
+        parents = git_repo.git.rev_list('--parents', '-n', '1', commit).split()[1:]
+        # Pour un commit de fusion, le diff est calculé par rapport au premier parent
+        self.revisions = [parents[0], commit] if parents else ['--root', commit]
+        self.files = []  # (statut, chemin, ancien chemin)
+        self.position = 0
+        self.pages = None
+
+    def load_files(self):
+        """Liste des fichiers modifiés, sans lire leur contenu"""
+        output = self.git_repo.git.diff_tree('-r', '-z', '--name-status', '-M', '--no-commit-id', *self.revisions)
+        tokens = output.split("\0")
+        self.files = []
+        i = 0
+        while i < len(tokens) and tokens[i]:
+            status = tokens[i]
+            if status[0] in "RC":
+                self.files.append((status[0], tokens[i + 2], tokens[i + 1]))
+                i += 3
+            else:
+                self.files.append((status[0], tokens[i + 1], None))
+                i += 2
+        return self.files
+
+    def seek(self, index):
+        """Repart du fichier d'indice donné"""
+        self.position = index
+        self.pages = None
+
+    def exhausted(self):
+        return self.pages is None and self.position >= len(self.files)
+
+    def _read_file(self, path, old_path):
+        """Lit le diff d'un fichier jusqu'au plafond ; renvoie (hunks, tronqué, binaire)"""
+        paths = [path] + ([old_path] if old_path else [])
+        hunks = []
+        truncated = binary = False
+        size = 0
+        with METRICS.span("diff", os.path.basename(self.git_repo.working_dir or ""), path) as info:
+            proc = self.git_repo.git.diff_tree('-p', '-M', '--no-color', '--no-ext-diff', '--no-commit-id',
+                                               *self.revisions, '--', *paths, as_process=True)
+            try:
+                while True:
+                    # Lecture bornée au reste du plafond : une seule ligne géante (fichier minifié)
+                    # ne peut pas être chargée entièrement en mémoire
+                    raw = proc.stdout.readline(self.file_max_bytes - size + 1)
+                    if not raw:
+                        break
+                    size += len(raw)
+                    if size > self.file_max_bytes:
+                        truncated = True
+                        break
+                    line = raw.decode("utf-8", "replace").rstrip("\n")
+                    if line.startswith("@@"):
+                        hunks.append([line])
+                    elif hunks:
+                        hunks[-1].append(line)
+                    elif line.startswith("Binary files"):
+                        binary = True
+                info["bytes"] = size
+            finally:
+                if truncated and proc.poll() is None:
+                    proc.kill()
+                try:
+                    proc.wait()
+                except git.GitCommandError:
+                    if not truncated:
+                        raise
+        return hunks, truncated, binary
+
+    def _paginate(self, hunks):
+        """Découpe les hunks en pages d'environ page_lines lignes, en coupant de préférence entre deux hunks"""
+        page = []
+        for hunk in hunks:
+            if page and len(page) + len(hunk) > self.page_lines:
+                yield page
+                page = []
+            for start in range(0, len(hunk), self.page_lines):
+                page.extend(hunk[start:start + self.page_lines])
+                if len(page) >= self.page_lines:
+                    yield page
+                    page = []
+        if page:
+            yield page
+
+    def next_page(self):
+        """Renvoie la page suivante (dict) ou None à la fin ; une page ne couvre jamais deux fichiers"""
+        first = self.pages is None
+        if first:
+            if self.position >= len(self.files):
+                return None
+            status, path, old_path = self.files[self.position]
+            hunks, truncated, binary = self._read_file(path, old_path)
+            self.current = {"index": self.position, "status": status, "path": path, "old_path": old_path,
+                            "truncated": truncated, "binary": binary}
+            self.pages = self._paginate(hunks)
+            self.pending = next(self.pages, None)
+        lines = self.pending
+        # Lire une page d'avance pour savoir si celle-ci est la dernière du fichier
+        self.pending = next(self.pages, None)
+        last = self.pending is None
+        if last:
+            self.pages = None
+            self.position += 1
+        return dict(self.current, first=first, last=last, lines=lines or [])
+
+class DiffHighlighter:
+    """Calcule hors du thread Tk les plages de coloration syntaxique et de différences par mot"""
+
+    KEYWORDS = {
+        "py": "and as assert async await break class continue def del elif else except False finally for "
+              "from global if import in is lambda None nonlocal not or pass raise return True try while with yield",
+        "js": "async await break case catch class const continue default delete do else export extends false "
+              "finally for function if import in instanceof let new null return super switch this throw true "
+              "try typeof undefined var void while yield",
+        "c": "auto break case char class const continue default do double else enum extern false float for "
+             "goto if inline int long namespace new private protected public return short signed sizeof static "
+             "struct switch template this true typedef union unsigned using virtual void volatile while",
+        "java": "abstract boolean break byte case catch char class continue default do double else enum extends "
+                "false final finally float for if implements import instanceof int interface long new null "
+                "package private protected public return short static super switch this throw throws true try "
+                "void while",
+        "go": "break case chan const continue default defer else fallthrough for func go goto if import "
+              "interface map nil package range return select struct switch type var",
+        "rs": "as break const continue crate else enum false fn for if impl in let loop match mod move mut pub "
+              "ref return self Self static struct super trait true type unsafe use where while",
+        "sh": "case do done elif else esac export fi for function if in local return then until while",
+    }
+    EXTENSIONS = {".py": "py", ".pyw": "py", ".js": "js", ".jsx": "js", ".ts": "js", ".tsx": "js",
+                  ".c": "c", ".h": "c", ".cc": "c", ".cpp": "c", ".hpp": "c", ".cs": "java", ".java": "java",
+                  ".kt": "java", ".go": "go", ".rs": "rs", ".sh": "sh", ".bash": "sh"}
+    COMMENTS = {"py": "#", "sh": "#"}
+    # Lignes trop longues (fichiers minifiés) : pas d'analyse, le coût serait disproportionné
+    MAX_LINE = 1000
+    MAX_WORD_DIFF_LINE = 500
+    WORD = re.compile(r"\w+|\s+|[^\w\s]")
+    _patterns = {}
+
+    @classmethod
+    def pattern(cls, path):
+        language = cls.EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if language is None:
+            return None
+        if language not in cls._patterns:
+            comment = re.escape(cls.COMMENTS.get(language, "//"))
+            keywords = "|".join(cls.KEYWORDS[language].split())
+            cls._patterns[language] = re.compile(
+                rf"(?P<syn_comment>{comment}.*$)"
+                r"|(?P<syn_string>\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')"
+                rf"|(?P<syn_keyword>\b(?:{keywords})\b)"
+                r"|(?P<syn_number>\b\d+(?:\.\d+)?\b)")
+        return cls._patterns[language]
+
+    @classmethod
+    def highlight(cls, path, lines):
+        """Renvoie {tag: [(ligne, début, fin), ...]} pour une page (lignes numérotées à partir de 0)"""
+        ranges = {}
+        pattern = cls.pattern(path)
+        if pattern is not None:
+            for number, line in enumerate(lines):
+                if line.startswith("@@") or len(line) > cls.MAX_LINE:
+                    continue
+                # La première colonne est le marqueur +/-/espace
+                for match in pattern.finditer(line, 1):
+                    ranges.setdefault(match.lastgroup, []).append((number, match.start(), match.end()))
+
+        # Différences par mot : chaque bloc de lignes supprimées est apparié au bloc ajouté qui le suit
+        number = 0
+        while number < len(lines):
+            if not lines[number].startswith("-"):
+                number += 1
+                continue
+            removed_start = number
+            while number < len(lines) and lines[number].startswith("-"):
+                number += 1
+            added_start = number
+            while number < len(lines) and lines[number].startswith("+"):
+                number += 1
+            for old, new in zip(range(removed_start, added_start), range(added_start, number)):
+                cls._word_diff(lines[old], lines[new], old, new, ranges)
+        return ranges
+
+    @classmethod
+    def _word_diff(cls, old_line, new_line, old_number, new_number, ranges):
+        if len(old_line) > cls.MAX_WORD_DIFF_LINE or len(new_line) > cls.MAX_WORD_DIFF_LINE:
+            return
+        old_words = cls.WORD.findall(old_line[1:])
+        new_words = cls.WORD.findall(new_line[1:])
+        matcher = difflib.SequenceMatcher(None, old_words, new_words, autojunk=False)
+        # Lignes sans rapport : surligner chaque mot n'apporterait rien
+        if matcher.ratio() < 0.3:
+            return
+        old_offsets = list(itertools.accumulate((len(word) for word in old_words), initial=1))
+        new_offsets = list(itertools.accumulate((len(word) for word in new_words), initial=1))
+        for opcode, i1, i2, j1, j2 in matcher.get_opcodes():
+            if opcode == "equal":
+                continue
+            if i2 > i1:
+                ranges.setdefault("word_del", []).append((old_number, old_offsets[i1], old_offsets[i2]))
+            if j2 > j1:
+                ranges.setdefault("word_add", []).append((new_number, new_offsets[j1], new_offsets[j2]))
+
+class ParsePool:
+    """Petit pool de processus pour l'analyse coûteuse en CPU (historique, détails, diffs, statistiques)
+
+    L'analyse en Python garde le GIL : même dans un thread, elle fait saccader la boucle Tk. Chaque
+    processus a sa propre file ; une tâche avec une clé revient toujours au même processus, qui peut
+    ainsi garder un état (un parcours d'historique en cours). Les arguments et les résultats sont des
+    types simples (chemins, tuples). Si les processus ne peuvent pas être utilisés, les tâches
+    s'exécutent dans le thread appelant.
+    """
+
+    def __init__(self, workers=PARSE_POOL_WORKERS):
+        self.workers = workers
+        self.executors = []
+        self.lock = threading.Lock()
+        self.counter = itertools.count()
+        self.disabled = workers <= 0
+        atexit.register(self.shutdown)
+
+    def _executor(self, key):
+        with self.lock:
+            if not self.executors:
+                # spawn : ne pas dupliquer par fork un processus Tk qui a déjà des threads
+                context = multiprocessing.get_context("spawn")
+                self.executors = [ProcessPoolExecutor(max_workers=1, mp_context=context)
+                                  for _ in range(self.workers)]
+            slot = zlib.crc32(key.encode("utf-8")) if key is not None else next(self.counter)
+            return self.executors[slot % self.workers]
+
+    def run(self, func, *args, key=None):
+        """Exécute func(*args) dans un processus du pool et renvoie son résultat
+
+        Appel bloquant, à faire depuis un thread de travail : l'attente ne garde pas le GIL.
+        """
+        with METRICS.span(f"parse {func.__name__}"):
+            if not self.disabled:
+                try:
+                    return self._executor(key).submit(func, *args).result()
+                except (BrokenProcessPool, OSError, pickle.PicklingError):
+                    # Processus impossibles à lancer (ou tués) : continuer sans le pool
+                    self.disabled = True
+                    self.shutdown()
+            return func(*args)
+
+    def shutdown(self):
+        with self.lock:
+            executors, self.executors = self.executors, []
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+# --- Tâches exécutées dans les processus de ParsePool ---
+# État propre à chaque processus : lecteurs natifs par dépôt et parcours d'historique en cours
+_worker_readers = {}
+_worker_pagers = OrderedDict()
+_worker_statuses = OrderedDict()
+
+def _worker_reader(repo_path):
+    if repo_path not in _worker_readers:
+        try:
+            _worker_readers[repo_path] = NativeGitReader(repo_path)
+        except Exception:
+            _worker_readers[repo_path] = None
+    return _worker_readers[repo_path]
+
+def parse_commit_details(repo_path, commit_hash):
+    """Renvoie (hash, auteur, email, date, message, fichiers modifiés) d'un commit"""
+    reader = _worker_reader(repo_path)
+    if reader is not None:
+        try:
+            reader.store.refresh_packs()
+            commit = reader.read_commit(commit_hash)
+            return (commit["sha"], commit["author"]["name"], commit["author"]["email"],
+                    commit["committer"]["time"], commit["message"], tuple(reader.changed_files(commit_hash)))
+        except Exception:
+            pass  # Repli sur GitPython
+    commit = Repo(repo_path).commit(commit_hash)
+    files = tuple(diff.a_path for parent in commit.parents for diff in parent.diff(commit))
+    return (commit.hexsha, commit.author.name, commit.author.email, commit.committed_date, commit.message, files)
+
+def parse_history_page(repo_path, view, author, message, page_size, skip, need_graph):
+    """Renvoie une page d'historique [(hash, parents, auteur, date, sujet)] à partir de skip
+
+    Le parcours de chaque vue reste ouvert dans le processus : la page suivante reprend là où
+    la précédente s'est arrêtée.
+    """
+    pager = _worker_pagers.get(view)
+    if pager is None or pager.loaded != skip:
+        reader = _worker_reader(repo_path)
+        if reader is not None:
+            # Nouvelle vue : prendre en compte les packs et le commit-graph écrits depuis
+            reader.store.refresh_packs()
+            reader.refresh_commit_graph()
+            # Sans commit-graph, le parcours natif par date ne garantit pas l'ordre topologique
+            # nécessaire au graphe : git log --date-order prend alors le relais
+            if need_graph and reader.commit_graph is None:
+                reader = None
+        pager = CommitHistoryPager(reader, GitOperations(Repo(repo_path)), author, message, page_size)
+        if skip:
+            pager.skip(skip)
+        _worker_pagers[view] = pager
+    _worker_pagers.move_to_end(view)
+    while len(_worker_pagers) > PARSE_POOL_VIEWS:
+        _worker_pagers.popitem(last=False)
+    return [(row["sha"], tuple(row["parents"]), row["author"], row["date"], row["subject"])
+            for row in pager.next_page()]
+
+def parse_diff_highlight(path, lines):
+    """Plages de coloration d'une page de diff : [(tag, [(ligne, début, fin), ...])]"""
+    return list(DiffHighlighter.highlight(path, lines).items())
+
+def parse_repo_analytics(repo_path, top_count=ANALYTICS_TOP_COUNT):
+    """Calcule (et enregistre) les statistiques de taille d'un dépôt"""
+    return RepoAnalytics(Repo(repo_path), repo_path, top_count).analyze()
+
+def parse_worktree_status(repo_path, view):
+    """Différences de l'état de la copie de travail depuis le dernier appel pour cette vue
+
+    L'état précédent reste dans le processus : seules les lignes modifiées reviennent à l'interface.
+    """
+    status = _worker_statuses.get(view)
+    if status is None:
+        status = _worker_statuses[view] = WorkingTreeStatus(Repo(repo_path))
+    _worker_statuses.move_to_end(view)
+    while len(_worker_statuses) > PARSE_POOL_VIEWS:
+        _worker_statuses.popitem(last=False)
+    return status.refresh()
+
+class AsyncGit:
+    """Boucle asyncio dans un unique thread, à côté de Tk, pour les commandes git réseau
+
+    Chaque commande est lancée par asyncio.create_subprocess_exec et ses sorties, dont la progression
+    écrite sur stderr, sont lues au fil de l'eau : de nombreux fetch, push et ls-remote peuvent tourner
+    ensemble sans un thread par opération. Des sémaphores limitent les commandes simultanées, au total
+    et par dépôt. Les rappels s'exécutent dans le thread de la boucle : passer par root.after pour Tk.
+    """
+
+    PROGRESS = re.compile(r"(\d+)% \(")
+
+    def __init__(self, concurrency=ASYNC_GIT_CONCURRENCY, per_repo=ASYNC_GIT_PER_REPO):
+        self.concurrency = concurrency
+        self.per_repo = per_repo
+        self.executable = git.Git.GIT_PYTHON_GIT_EXECUTABLE or "git"
+        self.lock = threading.Lock()
+        self.loop = None
+        # Créés dans la boucle, au premier usage
+        self.semaphore = None
+        self.repo_semaphores = {}
+        atexit.register(self.shutdown)
+
+    def _ensure_loop(self):
+        with self.lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                threading.Thread(target=self.loop.run_forever, name="async-git", daemon=True).start()
+            return self.loop
+
+    def submit(self, coro, on_done=None, on_error=None):
+        """Planifie une coroutine ; on_done(résultat) ou on_error(exception) sont appelés à la fin"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+        def finished(future):
+            try:
+                result = future.result()
+            except BaseException as e:
+                if on_error:
+                    on_error(e)
+                return
+            if on_done:
+                on_done(result)
+        future.add_done_callback(finished)
+        return future
+
+    async def run(self, repo_path, args, on_progress=None, repo_name=""):
+        """Exécute git args dans repo_path et renvoie la sortie standard ; lève GitCommandError en cas d'échec
+
+        on_progress(ligne, pourcentage ou None) reçoit chaque ligne de stderr, y compris les mises à
+        jour de progression séparées par \\r.
+        """
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+        key = os.path.normcase(os.path.abspath(repo_path))
+        repo_semaphore = self.repo_semaphores.get(key)
+        if repo_semaphore is None:
+            repo_semaphore = self.repo_semaphores[key] = asyncio.Semaphore(self.per_repo)
+
+        async with self.semaphore, repo_semaphore:
+            start = time.perf_counter()
+            # Pas d'invite de mot de passe dans un terminal invisible : échouer plutôt que bloquer
+            env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+            proc = await asyncio.create_subprocess_exec(
+                self.executable, *args, cwd=repo_path, env=env, stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+
+            stderr_bytes = 0
+
+            async def read_stderr():
+                nonlocal stderr_bytes
+                lines = deque(maxlen=200)
+                pending = b""
+                while True:
+                    chunk = await proc.stderr.read(4096)
+                    if not chunk:
+                        break
+                    stderr_bytes += len(chunk)
+                    *complete, pending = re.split(rb"[\r\n]", pending + chunk)
+                    for raw in complete:
+                        line = raw.decode("utf-8", "replace").strip()
+                        if not line:
+                            continue
+                        lines.append(line)
+                        if on_progress:
+                            match = self.PROGRESS.search(line)
+                            on_progress(line, int(match.group(1)) if match else None)
+                if pending.strip():
+                    lines.append(pending.decode("utf-8", "replace").strip())
+                return lines
+
+            try:
+                stdout, stderr_lines = await asyncio.gather(proc.stdout.read(), read_stderr())
+                status = await proc.wait()
+            except asyncio.CancelledError:
+                proc.kill()
+                raise
+            # Options globales (--git-dir=...) écartées : la mesure porte le nom de la sous-commande
+            subcommand = next((arg for arg in args if not arg.startswith("-")), "")
+            METRICS.record(f"git {subcommand}", repo_name, " ".join(args), time.perf_counter() - start,
+                           len(stdout) + stderr_bytes, status)
+            if status != 0:
+                raise git.GitCommandError([self.executable, *args], status,
+                                          "\n".join(stderr_lines), stdout.decode("utf-8", "replace"))
+            return stdout.decode("utf-8", "replace")
+
+    def shutdown(self):
+        with self.lock:
+            loop, self.loop = self.loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+class MirrorManager:
+    """Copies nues (--mirror) des URL distantes configurées, synchronisées en arrière-plan
+
+    Chaque miroir est initialisé dans un dossier temporaire renommé une fois configuré, puis rempli
+    par git fetch : une première synchronisation interrompue reprend là où elle s'est arrêtée et les
+    suivantes ne transfèrent que les nouveaux objets. Les
+    miroirs servent de source locale pour les clones (--reference-if-able), les badges des références
+    distantes et les branches de suivi. Les synchronisations passent par AsyncGit et sont limitées à
+    concurrency à la fois.
+    """
+
+    LABELS = {"absent": "aucun", "syncing": "synchro...", "ready": "à jour", "stale": "ancien", "error": "erreur"}
+
+    def __init__(self, directory=MIRROR_DIR, concurrency=MIRROR_CONCURRENCY, interval=MIRROR_INTERVAL):
+        self.directory = directory
+        self.concurrency = concurrency
+        self.interval = interval
+        self.state_file = os.path.join(directory, "mirrors.json")
+        self.lock = threading.Lock()
+        self.syncing = set()
+        # Créé dans la boucle d'AsyncGit, au premier usage
+        self.semaphore = None
+        self.state = {"enabled": False, "mirrors": {}}
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, "r", encoding="utf-8") as f:
+                    self.state.update(json.load(f))
+            except (OSError, ValueError):
+                pass
+
+    def _save(self):
+        with self.lock:
+            data = json.dumps(self.state, indent=4, ensure_ascii=False)
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".mirrors.", suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.state_file)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @property
+    def enabled(self):
+        return self.state.get("enabled", False)
+
+    def set_enabled(self, enabled):
+        with self.lock:
+            self.state["enabled"] = enabled
+        self._save()
+
+    def path_for(self, url):
+        """Dossier du miroir d'une URL : fin lisible de l'URL suivie d'un hash pour l'unicité"""
+        tail = url.rstrip("/").rsplit("/", 1)[-1].rsplit(":", 1)[-1]
+        if tail.endswith(".git"):
+            tail = tail[:-4]
+        tail = re.sub(r"[^A-Za-z0-9._-]+", "_", tail)[:40] or "mirror"
+        return os.path.join(self.directory, f"{tail}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]}.git")
+
+    def info(self, url):
+        with self.lock:
+            return dict(self.state["mirrors"].get(url) or {})
+
+    def age(self, url):
+        """Secondes depuis la dernière synchronisation réussie, ou None"""
+        synced = self.info(url).get("time")
+        return time.time() - synced if synced else None
+
+    def mirror_for(self, url, max_age=None):
+        """Chemin du miroir s'il a déjà été synchronisé (et depuis moins de max_age secondes), sinon None"""
+        if not url:
+            return None
+        age = self.age(url)
+        if age is None or (max_age is not None and age > max_age):
+            return None
+        path = self.path_for(url)
+        return path if os.path.isdir(path) else None
+
+    def status(self, url):
+        """Renvoie l'état du miroir (clé de LABELS) et un libellé court pour la liste des dépôts"""
+        if not url:
+            return None, ""
+        with self.lock:
+            syncing = url in self.syncing
+        if syncing:
+            return "syncing", self.LABELS["syncing"]
+        info = self.info(url)
+        age = self.age(url)
+        if info.get("error"):
+            return "error", self.LABELS["error"]
+        if age is None or not os.path.isdir(self.path_for(url)):
+            return "absent", self.LABELS["absent"]
+        state = "ready" if age <= self.interval else "stale"
+        if age < 3600:
+            when = f"{int(age // 60)} min"
+        elif age < 86400:
+            when = f"{int(age // 3600)} h"
+        else:
+            when = f"{int(age // 86400)} j"
+        return state, f"{self.LABELS[state]} ({when})"
+
+    def due(self, repos):
+        """URL distantes (sans doublon) dont le miroir est absent ou plus ancien que interval"""
+        urls = []
+        for repo in repos:
+            url = repo.get("remote_url")
+            if not url or url in urls or repo.get("mirror", True) is False:
+                continue
+            with self.lock:
+                if url in self.syncing:
+                    continue
+            age = self.age(url)
+            if age is None or age > self.interval:
+                urls.append(url)
+        return urls
+
+    async def _initialized(self, runner, path, url):
+        """Vrai si path est un miroir complet de url : HEAD, config et remote.origin.url présents"""
+        if not (os.path.isfile(os.path.join(path, "HEAD")) and os.path.isfile(os.path.join(path, "config"))):
+            return False
+        try:
+            configured = await runner.run(path, [f'--git-dir={path}', 'config', '--get', 'remote.origin.url'],
+                                          repo_name=os.path.basename(path))
+        except git.GitCommandError as e:
+            # Statut 1 : clé absente. Toute autre erreur est remontée plutôt que d'effacer le miroir
+            if e.status == 1:
+                return False
+            raise
+        return configured.strip() == url
+
+    async def _create(self, runner, path, url):
+        """Équivalent de clone --mirror sans transfert : initialisé à côté, puis renommé d'un bloc"""
+        loop = asyncio.get_running_loop()
+        # Reste d'une initialisation interrompue ou échouée
+        await loop.run_in_executor(None, lambda: shutil.rmtree(path, ignore_errors=True))
+        tmp_path = f"{path}.init-{uuid.uuid4().hex[:8]}"
+        name = os.path.basename(path)
+        os.makedirs(tmp_path)
+        try:
+            git_dir = f'--git-dir={tmp_path}'
+            await runner.run(tmp_path, [git_dir, 'init', '--quiet', '--bare'], repo_name=name)
+            await runner.run(tmp_path, [git_dir, 'config', 'remote.origin.url', url], repo_name=name)
+            await runner.run(tmp_path, [git_dir, 'config', 'remote.origin.fetch', '+refs/*:refs/*'], repo_name=name)
+            await runner.run(tmp_path, [git_dir, 'config', 'remote.origin.mirror', 'true'], repo_name=name)
+            os.replace(tmp_path, path)
+        except BaseException:
+            await loop.run_in_executor(None, lambda: shutil.rmtree(tmp_path, ignore_errors=True))
+            raise
+
+    async def sync(self, runner, url, on_progress=None):
+        """Crée ou met à jour le miroir de url ; renvoie False si une synchronisation est déjà en cours"""
+        with self.lock:
+            if url in self.syncing:
+                return False
+            self.syncing.add(url)
+        path = self.path_for(url)
+        name = os.path.basename(path)
+        start = time.time()
+        error = None
+        try:
+            if self.semaphore is None:
+                self.semaphore = asyncio.Semaphore(self.concurrency)
+            async with self.semaphore:
+                if not await self._initialized(runner, path, url):
+                    await self._create(runner, path, url)
+                # --git-dir : un miroir incomplet ne doit jamais laisser git remonter vers un dépôt parent
+                await runner.run(path, [f'--git-dir={path}', 'fetch', '--prune', '--progress', 'origin'],
+                                 on_progress, repo_name=name)
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            with self.lock:
+                info = self.state["mirrors"].setdefault(url, {})
+                info["path"] = path
+                info["duration"] = time.time() - start
+                info["error"] = error
+                if error is None:
+                    info["time"] = time.time()
+                self.syncing.discard(url)
+            self._save()
+        return True
+
+    def clone_options(self, url):
+        """Options de Repo.clone_from pour emprunter les objets du miroir puis s'en détacher"""
+        path = self.mirror_for(url)
+        return {"reference_if_able": path, "dissociate": True} if path else {}
+
+    async def update_tracking(self, runner, repo_path, remote, url, repo_name=""):
+        """Met à jour refs/remotes/<remote>/* depuis le miroir, sans accès réseau"""
+        path = self.mirror_for(url)
+        if path is None:
+            return False
+        with METRICS.span("mirror fetch", repo_name, remote):
+            await runner.run(repo_path, ['fetch', '--quiet', '--prune', '--no-tags', path,
+                                         f'+refs/heads/*:refs/remotes/{remote}/*'], repo_name=repo_name)
+        return True
+
+class PooledHistoryPager:
+    """Même interface que CommitHistoryPager, le parcours ayant lieu dans un processus de ParsePool"""
+
+    def __init__(self, pool, repo_path, author="", message="", page_size=50, need_graph=False):
+        self.pool = pool
+        self.repo_path = repo_path
+        self.view = uuid.uuid4().hex
+        self.author = author
+        self.message = message
+        self.page_size = page_size
+        self.need_graph = need_graph
+        self.loaded = 0
+        self.exhausted = False
+        self.loading = False
+
+    def next_page(self):
+        if self.exhausted:
+            return []
+        rows = self.pool.run(parse_history_page, self.repo_path, self.view, self.author, self.message,
+                             self.page_size, self.loaded, self.need_graph, key=self.view)
+        self.loaded += len(rows)
+        if len(rows) < self.page_size:
+            self.exhausted = True
+        return [{"sha": sha, "parents": list(parents), "author": author, "date": date, "subject": subject}
+                for sha, parents, author, date, subject in rows]
+
+# Widget personnalisé pour un bouton moderne avec coins arrondis et ombre
+class ModernButton(tk.Frame):
+    def __init__(self, parent, text, command=None, width=120, height=36, bg_color=COLORS['primary'], 
+                 hover_color=COLORS['button_hover'], text_color=COLORS['text_light'], state=tk.NORMAL):
+        # Correction pour éviter l'erreur
+        super().__init__(parent, width=width, height=height)
+        self.configure(background=COLORS['bg_light'])
+        
+        self.bg_color = bg_color
+        self.hover_color = hover_color
+        self.text_color = text_color
+        self.state_normal = state == tk.NORMAL
+        self.command = command
+        
+        # Créer le canvas pour le bouton
+        self.canvas = tk.Canvas(self, width=width, height=height, 
+                              highlightthickness=0, bd=0, bg=COLORS['bg_light'])
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        
+        # Créer l'ombre
+        self.shadow_id = self.canvas.create_rounded_rectangle(4, 4, width-1, height-1, 12, 
+                                                      fill='#DDDDDD', outline='')
+        
+        # Créer le rectangle du bouton
+        self.rect_id = self.canvas.create_rounded_rectangle(0, 0, width-4, height-4, 12, 
+                                                        fill=bg_color if self.state_normal else COLORS['divider'],
+                                                        outline='')
+        
+        # Ajouter le texte - Utiliser une configuration de police sûre
+        try:
+            # Utiliser directement une police système pour plus de sécurité
+            self.text_id = self.canvas.create_text(int(width/2) - 2, int(height/2) - 2, text=text, 
+                                           fill=text_color if self.state_normal else COLORS['text_secondary'],
+                                           font=("System", 10))
+        except:
+            # Fallback sûr
+            self.text_id = self.canvas.create_text(int(width/2) - 2, int(height/2) - 2, text=text, 
+                                           fill=text_color if self.state_normal else COLORS['text_secondary'])
+        
+        # Lier les événements
+        self.canvas.bind("<Enter>", self.on_enter)
+        self.canvas.bind("<Leave>", self.on_leave)
+        self.canvas.bind("<ButtonPress-1>", self.on_press)
+        self.canvas.bind("<ButtonRelease-1>", self.on_release)
+    
+    def on_enter(self, event):
+        if self.state_normal:
+            # Effet de transition douce lors du survol
+            self.canvas.itemconfig(self.rect_id, fill=self.hover_color)
+            self.canvas.itemconfig(self.shadow_id, fill='#D0D0D0')
+    
+    def on_leave(self, event):
+        if self.state_normal:
+            self.canvas.itemconfig(self.rect_id, fill=self.bg_color)
+            self.canvas.itemconfig(self.shadow_id, fill='#DDDDDD')
+    
+    def on_press(self, event):
+        if self.state_normal:
+            # Effet d'enfoncement
+            self.canvas.move(self.text_id, 1, 1)
+            self.canvas.move(self.rect_id, 1, 1)
+            self.canvas.itemconfig(self.shadow_id, fill='#EEEEEE')
+    
+    def on_release(self, event):
+        if self.state_normal:
+            # Restaurer la position
+            self.canvas.move(self.text_id, -1, -1)
+            self.canvas.move(self.rect_id, -1, -1)
+            self.canvas.itemconfig(self.shadow_id, fill='#DDDDDD')
+            if self.command:
+                self.command()
+    
+    def configure(self, **kwargs):
+        if 'state' in kwargs:
+            self.state_normal = kwargs['state'] == tk.NORMAL
+            self.canvas.itemconfig(self.rect_id, 
+                               fill=self.bg_color if self.state_normal else COLORS['divider'])
+            self.canvas.itemconfig(self.text_id, 
+                               fill=self.text_color if self.state_normal else COLORS['text_secondary'])
+        
+        if 'text' in kwargs:
+            self.canvas.itemconfig(self.text_id, text=kwargs['text'])
+            
+    # Alias pour compatibilité
+    config = configure 
+
+# Frame avec effet d'ombre
+class ShadowFrame(ttk.Frame):
+    def __init__(self, parent, **kwargs):
+        style_name = kwargs.pop('style', 'TFrame')
+        super().__init__(parent, style=style_name, **kwargs)
+        
+        # Créer un cadre d'ombre sous le frame principal
+        self.shadow = ttk.Frame(parent, style='Shadow.TFrame')
+        
+        # Configurer le positionnement
+        self.bind("<Map>", self._on_map)
+        self.bind("<Configure>", self._on_configure)
+    
+    def _on_map(self, event):
+        self.shadow.lift(self)
+    
+    def _on_configure(self, event):
+        x, y = self.winfo_x(), self.winfo_y()
+        width, height = self.winfo_width(), self.winfo_height()
+        # Utiliser des coordonnées entières pour l'ombre
+        self.shadow.place(x=int(x+4), y=int(y+4), width=int(width), height=int(height)) 
+
+class GitApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Github.py - Gestion de dépôts Git")
+        self.root.geometry("1000x700")
+        self.root.minsize(900, 650)
+        
+        # Désactiver la mise à l'échelle pour un rendu net
+        disable_dpi_scaling()
+        
+        # Configurer l'anticrénelage pour les polices
+        Fonts.init_fonts()
+        
+        # Variables
+        self.repo_config = RepoConfig()
+        self.current_repo = None
+        self.git_repo = None
+        self.native_reader = None
+        self.history_pagers = {}
+        self.search_indexes = {}
+        self.file_history_cache = ByteBudgetCache(FILE_HISTORY_CACHE_BYTES)
+        self.remote_ref_caches = {}
+        self.worktree_pools = {}
+        self.repo_analytics = {}
+        self.ignore_checkers = {}
+        self.operation_running = False
+        self.maintenance = MaintenanceScheduler()
+        self.journal = OperationJournal()
+        self.parse_pool = ParsePool()
+        self.async_git = AsyncGit()
+        self.mirrors = MirrorManager()
+        self.last_activity = time.time()
+        
+        # Configurer le thème de l'application
+        self.setup_theme()
+        
+        # Create widgets
+        self.create_widgets()
+        
+        # Center the window
+        self.center_window()
+
+        # Suivre l'activité de l'utilisateur pour ne lancer la maintenance que pendant l'inactivité
+        for sequence in ("<Any-KeyPress>", "<Any-ButtonPress>", "<MouseWheel>"):
+            self.root.bind_all(sequence, self._on_user_activity, add="+")
+        self.root.after(60000, self.maintenance_tick)
+        self.root.after(5000, self.mirror_tick)
+    
+    def setup_theme(self):
+        """Configure le thème global de l'application"""
+        self.root.configure(bg=COLORS['bg_light'])
+        
+        # Configurer le style global
+        style = ttk.Style()
+        
+        # Configurer les styles de base avec des polices sûres
+        style.configure(".", font=Fonts.DEFAULT, background=COLORS['bg_light'])
+        
+        # Boutons avec coins arrondis et effet de relief
+        style.configure("TButton", font=Fonts.DEFAULT, foreground=COLORS['text_dark'], 
+                      background=COLORS['primary'], borderwidth=0, focuscolor=COLORS['primary'], 
+                      relief=tk.RAISED, padding=(10, 5))
+        style.map("TButton", 
+                background=[('active', COLORS['button_hover']), ('disabled', COLORS['divider'])],
+                foreground=[('disabled', COLORS['text_secondary'])])
+        
+        # Étiquettes et cadres
+        style.configure("TLabel", font=Fonts.DEFAULT, background=COLORS['bg_light'], foreground=COLORS['text_dark'])
+        style.configure("TFrame", background=COLORS['bg_light'])
+        style.configure("Shadow.TFrame", background='#DDDDDD')  # Style pour l'ombre
+        
+        # Cadres avec étiquette
+        style.configure("TLabelframe", background=COLORS['bg_light'], foreground=COLORS['text_dark'], borderwidth=1)
+        style.configure("TLabelframe.Label", font=Fonts.HEADING, background=COLORS['bg_light'], foreground=COLORS['primary'])
+        
+        # Configurer les styles personnalisés
+        style.configure("Title.TLabel", font=Fonts.HEADING, background=COLORS['bg_light'], foreground=COLORS['primary'])
+        style.configure("Card.TFrame", background=COLORS['card'])
+        
+        # En-tête avec dégradé
+        style.configure("Header.TFrame", background=COLORS['header_bg'], padx=15, pady=8)
+        style.configure("Header.TLabel", font=Fonts.DEFAULT, foreground=COLORS['text_light'], background=COLORS['header_bg'])
+        
+        # Style pour la liste des dépôts
+        style.configure("Treeview", 
+                     font=Fonts.DEFAULT, 
+                     rowheight=30, 
+                     background=COLORS['card'], 
+                     fieldbackground=COLORS['card'],
+                     borderwidth=0)
+        style.configure("Treeview.Heading", 
+                      font=Fonts.HEADING, 
+                      background=COLORS['primary_light'], 
+                      foreground=COLORS['text_dark'],
+                      relief=tk.FLAT)
+        style.map("Treeview", 
+                background=[('selected', COLORS['primary'])],
+                foreground=[('selected', COLORS['text_light'])])
+        
+        # Style pour les entrées
+        style.configure("TEntry", font=Fonts.DEFAULT, padding=8, relief=tk.FLAT)
+        style.configure("TCombobox", font=Fonts.DEFAULT, padding=8)
+        
+        # Style pour le texte
+        self.root.option_add("*TScrolledText*Font", Fonts.FIXED)
+        
+        # Style pour la barre de progression avec contours nets
+        style.configure("Horizontal.TProgressbar", 
+                      foreground=COLORS['primary'], 
+                      background=COLORS['primary'],
+                      troughcolor=COLORS['bg_light'],
+                      thickness=8,
+                      borderwidth=0)
+    
+    def create_widgets(self):
+        """Crée les widgets de l'interface"""
+        # Frame principal avec marge et padding
+        main_container = ttk.Frame(self.root, style="TFrame")
+        main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        
+        # En-tête de l'application avec effet d'ombre
+        header_frame = ttk.Frame(main_container, style="Header.TFrame")
+        header_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        # Logo/Icône (représenté par un texte stylisé)
+        title_label = ttk.Label(header_frame, text="Github.py", style="Header.TLabel")
+        title_label.pack(side=tk.LEFT)
+        
+        # Sous-titre
+        subtitle_label = ttk.Label(header_frame, text="Gestion de dépôts Git", 
+                                foreground=COLORS['text_light'], background=COLORS['header_bg'],
+                                font=("Segoe UI", 10))
+        subtitle_label.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Container pour les dépôts et les actions avec espacement
+        top_container = ttk.Frame(main_container, style="TFrame")
+        top_container.pack(fill=tk.X, pady=(0, 20))
+        
+        # Frame pour les dépôts avec style "carte" et ombre
+        repo_frame = ttk.LabelFrame(top_container, text="Dépôts", padding=15)
+        repo_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        # Recherche et regroupement des dépôts
+        search_frame = ttk.Frame(repo_frame)
+        search_frame.pack(side=tk.TOP, fill=tk.X, pady=(0, 8))
+        ttk.Label(search_frame, text="Rechercher:").pack(side=tk.LEFT, padx=(0, 5))
+        self.repo_search_var = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=self.repo_search_var, width=30).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.repo_group_var = tk.StringVar(value="Aucun")
+        ttk.Combobox(search_frame, textvariable=self.repo_group_var, values=list(RepoListIndex.GROUP_MODES),
+                     state="readonly", width=15).pack(side=tk.RIGHT)
+        ttk.Label(search_frame, text="Grouper par:").pack(side=tk.RIGHT, padx=(10, 5))
+
+        # Filtrage en direct, regroupé pour ne pas recalculer à chaque frappe
+        self.repo_filter_job = None
+        self.repo_search_var.trace_add("write", lambda *args: self.schedule_repo_list_refresh())
+        self.repo_group_var.trace_add("write", lambda *args: self.schedule_repo_list_refresh())
+
+        # Liste des dépôts avec style moderne
+        self.repo_list = ttk.Treeview(repo_frame, columns=("name", "mirror"), show="headings", height=3)
+        self.repo_list.heading("name", text="Nom du dépôt")
+        self.repo_list.heading("mirror", text="Miroir")
+        self.repo_list.column("name", width=200)
+        self.repo_list.column("mirror", width=110)
+        self.repo_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        scrollbar = ttk.Scrollbar(repo_frame, orient="vertical", command=self.repo_list.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.repo_list.configure(yscrollcommand=scrollbar.set)
+        self.repo_list.tag_configure("group", background=COLORS['primary_light'], foreground=COLORS['primary_dark'])
+
+        # État affiché de la liste, pour n'appliquer que les différences
+        self.repo_list_index = RepoListIndex()
+        self.repo_rows = {}
+        self.repo_row_order = {}
+
+        self.repo_list.bind("<<TreeviewSelect>>", self.on_repo_select)
+        
+        # Frame pour les boutons de gestion des dépôts
+        repo_buttons_frame = ttk.Frame(top_container)
+        repo_buttons_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(15, 0))
+        
+        # Utilisation de boutons modernes personnalisés avec espacements
+        add_btn = ModernButton(repo_buttons_frame, text="Ajouter un dépôt", command=self.add_repo_dialog, 
+                            width=150, height=40, bg_color=COLORS['primary'], 
+                            text_color=COLORS['text_light'])
+        add_btn.pack(fill=tk.X, pady=5)
+        
+        edit_btn = ModernButton(repo_buttons_frame, text="Modifier", command=self.edit_repo_dialog,
+                             width=150, height=40, bg_color=COLORS['primary'],
+                             text_color=COLORS['text_light'])
+        edit_btn.pack(fill=tk.X, pady=5)
+        
+        fetch_all_btn = ModernButton(repo_buttons_frame, text="Tout récupérer", command=self.fetch_all_repos,
+                                   width=150, height=40, bg_color=COLORS['secondary'])
+        fetch_all_btn.pack(fill=tk.X, pady=5)
+
+        import_btn = ModernButton(repo_buttons_frame, text="Importer un dossier", command=self.import_repos_dialog,
+                                width=150, height=40, bg_color=COLORS['secondary'])
+        import_btn.pack(fill=tk.X, pady=5)
+
+        delete_btn = ModernButton(repo_buttons_frame, text="Supprimer", command=self.delete_repo,
+                               width=150, height=40, bg_color=COLORS['primary'],
+                               text_color=COLORS['text_light'])
+        delete_btn.pack(fill=tk.X, pady=5)
+
+        self.mirror_var = tk.BooleanVar(value=self.mirrors.enabled)
+        ttk.Checkbutton(repo_buttons_frame, text="Miroirs locaux", variable=self.mirror_var,
+                        command=self.toggle_mirrors).pack(anchor=tk.W, pady=5)
+        
+        # Frame pour les actions avec plus d'espace
+        action_frame = ttk.LabelFrame(main_container, text="Actions", padding=15)
+        action_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        # Conteneur d'actions avec espacement équitable
+        action_container = ttk.Frame(action_frame)
+        action_container.pack(fill=tk.X, pady=5)
+        
+        # Utiliser des boutons ModernButton pour les actions
+        btn_width = 150
+        btn_height = 40
+        
+        self.clone_btn = ModernButton(action_container, text="Cloner un dépôt", command=self.clone_repo,
+                                    width=btn_width, height=btn_height, bg_color=COLORS['primary'])
+        self.clone_btn.pack(side=tk.LEFT, padx=(0, 8), fill=tk.X, expand=True)
+        
+        self.commit_btn = ModernButton(action_container, text="Créer un commit", command=self.create_commit,
+                                    width=btn_width, height=btn_height, bg_color=COLORS['primary'],
+                                    state=tk.DISABLED)
+        self.commit_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+        
+        self.branch_btn = ModernButton(action_container, text="Nouvelle branche", command=self.create_branch,
+                                   width=btn_width, height=btn_height, bg_color=COLORS['success'],
+                                   state=tk.DISABLED)
+        self.branch_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+        
+        self.merge_btn = ModernButton(action_container, text="Fusionner", command=self.merge_branches,
+                                     width=btn_width, height=btn_height, bg_color=COLORS['warning'],
+                                     text_color=COLORS['text_dark'], state=tk.DISABLED)
+        self.merge_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+        
+        self.pull_btn = ModernButton(action_container, text="Pull", command=self.pull_changes,
+                                    width=btn_width, height=btn_height, bg_color=COLORS['primary'],
+                                    state=tk.DISABLED)
+        self.pull_btn.pack(side=tk.LEFT, padx=(8, 0), fill=tk.X, expand=True)
+        
+        # Ajout du bouton Push
+        self.push_btn = ModernButton(action_container, text="Push", command=self.push_changes,
+                                    width=btn_width, height=btn_height, bg_color=COLORS['success'],
+                                    state=tk.DISABLED)
+        self.push_btn.pack(side=tk.LEFT, padx=(8, 0), fill=tk.X, expand=True)
+        
+        # Deuxième rangée d'actions
+        action_container2 = ttk.Frame(action_frame)
+        action_container2.pack(fill=tk.X, pady=5)
+        
+        self.switch_btn = ModernButton(action_container2, text="Changer de branche", command=self.switch_branch,
+                                     width=btn_width, height=btn_height, bg_color=COLORS['primary'],
+                                     state=tk.DISABLED)
+        self.switch_btn.pack(side=tk.LEFT, padx=(0, 8), fill=tk.X, expand=True)
+        
+        self.delete_branch_btn = ModernButton(action_container2, text="Supprimer branche", command=self.delete_branch,
+                                           width=btn_width, height=btn_height, bg_color=COLORS['error'],
+                                           state=tk.DISABLED)
+        self.delete_branch_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+        
+        self.resolve_btn = ModernButton(action_container2, text="Résoudre conflits", command=self.resolve_conflicts,
+                                     width=btn_width, height=btn_height, bg_color=COLORS['warning'],
+                                     text_color=COLORS['text_dark'], state=tk.DISABLED)
+        self.resolve_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+        
+        self.history_btn = ModernButton(action_container2, text="Historique", command=self.show_commit_history,
+                                      width=btn_width, height=btn_height, bg_color=COLORS['primary'],
+                                      state=tk.DISABLED)
+        self.history_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+        
+        self.status_btn = ModernButton(action_container2, text="Modifications", command=self.show_status_panel,
+                                     width=btn_width, height=btn_height, bg_color=COLORS['primary'],
+                                     state=tk.DISABLED)
+        self.status_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+
+        self.tag_btn = ModernButton(action_container2, text="Taguer version", command=self.create_tag,
+                                  width=btn_width, height=btn_height, bg_color=COLORS['primary'],
+                                  state=tk.DISABLED)
+        self.tag_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+
+        self.undo_btn = ModernButton(action_container2, text="Annuler l'opération", command=self.show_undo_dialog,
+                                   width=btn_width, height=btn_height, bg_color=COLORS['warning'],
+                                   text_color=COLORS['text_dark'], state=tk.DISABLED)
+        self.undo_btn.pack(side=tk.LEFT, padx=(8, 0), fill=tk.X, expand=True)
+
+        # Troisième rangée d'actions
+        action_container3 = ttk.Frame(action_frame)
+        action_container3.pack(fill=tk.X, pady=5)
+
+        self.tag_browser_btn = ModernButton(action_container3, text="Gérer les tags", command=self.show_tag_browser,
+                                          width=btn_width, height=btn_height, bg_color=COLORS['primary'],
+                                          state=tk.DISABLED)
+        self.tag_browser_btn.pack(side=tk.LEFT, padx=(0, 8), fill=tk.X, expand=True)
+
+        self.file_history_btn = ModernButton(action_container3, text="Historique de fichier",
+                                           command=self.show_file_history, width=btn_width, height=btn_height,
+                                           bg_color=COLORS['primary'], state=tk.DISABLED)
+        self.file_history_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+
+        self.stash_btn = ModernButton(action_container3, text="Gérer les stashs", command=self.show_stash_manager,
+                                    width=btn_width, height=btn_height, bg_color=COLORS['primary'],
+                                    state=tk.DISABLED)
+        self.stash_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+
+        self.analytics_btn = ModernButton(action_container3, text="Taille du dépôt", command=self.show_repo_analytics,
+                                        width=btn_width, height=btn_height, bg_color=COLORS['primary'],
+                                        state=tk.DISABLED)
+        self.analytics_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+
+        self.ignore_btn = ModernButton(action_container3, text="Fichiers ignorés", command=self.show_ignore_panel,
+                                     width=btn_width, height=btn_height, bg_color=COLORS['primary'],
+                                     state=tk.DISABLED)
+        self.ignore_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+
+        self.metrics_btn = ModernButton(action_container3, text="Performances", command=self.show_metrics_panel,
+                                      width=btn_width, height=btn_height, bg_color=COLORS['secondary'])
+        self.metrics_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+
+        self.maintenance_btn = ModernButton(action_container3, text="Maintenance", command=self.show_maintenance_panel,
+                                          width=btn_width, height=btn_height, bg_color=COLORS['secondary'])
+        self.maintenance_btn.pack(side=tk.LEFT, padx=(8, 0), fill=tk.X, expand=True)
+
+        # Frame pour les logs avec style carte et plus d'espacement
+        log_frame = ttk.LabelFrame(main_container, text="Journal", padding=15)
+        log_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Journal avec coloration syntaxique et une police moderne
+        self.log_text = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD, bg=COLORS['card'], 
+                                         relief=tk.FLAT, borderwidth=0, highlightthickness=0,
+                                         padx=10, pady=10)
+        self.log_text.pack(fill=tk.BOTH, expand=True)
+        self.log_text.config(state=tk.DISABLED)
+        
+        # Configurer les tags pour la coloration du texte
+        self.log_text.tag_configure("info", foreground=COLORS['text_dark'])
+        self.log_text.tag_configure("error", foreground=COLORS['error'])
+        self.log_text.tag_configure("success", foreground=COLORS['success'])
+        self.log_text.tag_configure("warning", foreground=COLORS['warning'])
+        self.log_text.tag_configure("highlight", foreground=COLORS['primary'])
+        
+        # Barre de statut moderne avec plus d'espacement
+        status_frame = ttk.Frame(main_container, style="Card.TFrame")
+        status_frame.pack(fill=tk.X, pady=(20, 0))
+        
+        # Ajouter un subtil effet de séparateur au-dessus
+        separator = ttk.Separator(main_container, orient='horizontal')
+        separator.pack(fill=tk.X, pady=(15, 0))
+        
+        status_container = ttk.Frame(status_frame)
+        status_container.pack(fill=tk.X, padx=10, pady=10)
+        
+        self.status_label = ttk.Label(status_container, text="Prêt")
+        self.status_label.pack(side=tk.LEFT)
+        
+        # Barre de progression moderne avec coins arrondis
+        self.progress_bar = ttk.Progressbar(status_container, mode="determinate", length=200, 
+                                      style="Horizontal.TProgressbar")
+        self.progress_bar.pack(side=tk.RIGHT)
+        
+        # Charger la liste des dépôts
+        self.load_repo_list()
+    
+    def load_repo_list(self):
+        """Charge la liste des dépôts en n'appliquant que les différences avec l'affichage"""
+        if self.repo_filter_job:
+            self.root.after_cancel(self.repo_filter_job)
+            self.repo_filter_job = None
+
+        self.repo_list_index.update(self.repo_config.get_repos())
+        group_mode = RepoListIndex.GROUP_MODES.get(self.repo_group_var.get())
+        rows = self.repo_list_index.rows(self.repo_search_var.get(), group_mode)
+
+        desired = {}
+        order = {}
+        for iid, parent, name in rows:
+            desired[iid] = (parent, name)
+            order.setdefault(parent, []).append(iid)
+
+        # Suppressions (les enfants d'un groupe supprimé disparaissent avec lui)
+        for iid in [iid for iid in self.repo_rows if iid not in desired]:
+            if self.repo_list.exists(iid):
+                # Sortir d'abord les dépôts encore affichés, ils seront replacés plus bas
+                for child in self.repo_list.get_children(iid):
+                    if child in desired:
+                        self.repo_list.move(child, "", "end")
+                        self.repo_rows[child] = ("", self.repo_rows[child][1])
+                self.repo_list.delete(iid)
+            del self.repo_rows[iid]
+
+        # Insertions et mises à jour
+        for iid, parent, name in rows:
+            tags = ("group",) if iid.startswith("group:") else ()
+            current = self.repo_rows.get(iid)
+            if current is None:
+                self.repo_list.insert(parent, "end", iid=iid, values=(name, self.mirror_label(iid)), tags=tags,
+                                      open=True)
+            elif current != (parent, name):
+                if current[1] != name:
+                    self.repo_list.set(iid, "name", name)
+                if current[0] != parent:
+                    self.repo_list.move(iid, parent, "end")
+            self.repo_rows[iid] = (parent, name)
+
+        # Réordonner uniquement les niveaux dont l'ordre a changé
+        for parent, iids in order.items():
+            if self.repo_row_order.get(parent) != iids and list(self.repo_list.get_children(parent)) != iids:
+                for position, iid in enumerate(iids):
+                    self.repo_list.move(iid, parent, position)
+        self.repo_row_order = order
+
+    def mirror_label(self, iid):
+        """Libellé de l'état du miroir pour une ligne de la liste des dépôts (vide pour un groupe)"""
+        repo = self.repo_config.find_by_id(iid)
+        if repo is None or not self.mirrors.enabled:
+            return ""
+        return self.mirrors.status(repo.get("remote_url"))[1]
+
+    def update_mirror_column(self):
+        """Met à jour la colonne Miroir sans reconstruire la liste"""
+        for iid in self.repo_rows:
+            if self.repo_list.exists(iid):
+                label = self.mirror_label(iid)
+                if self.repo_list.set(iid, "mirror") != label:
+                    self.repo_list.set(iid, "mirror", label)
+
+    def schedule_repo_list_refresh(self, delay=150):
+        """Programme le rafraîchissement de la liste après une courte pause de saisie"""
+        if self.repo_filter_job:
+            self.root.after_cancel(self.repo_filter_job)
+        self.repo_filter_job = self.root.after(delay, self.load_repo_list)
+
+    def on_repo_select(self, event):
+        """Gère la sélection d'un dépôt dans la liste"""
+        selection = self.repo_list.selection()
+        if selection:
+            repo = self.repo_config.find_by_id(selection[0])
+            if repo is not None:
+                self.current_repo = repo
+                self.log(f"Dépôt sélectionné: {self.current_repo['name']}")
+                
+                # Activer les boutons appropriés
+                # Le lecteur natif garde les packs projetés en mémoire : le libérer au changement de dépôt
+                self.close_native_reader()
+
+                if os.path.exists(os.path.join(self.current_repo['local_path'], '.git')):
+                    try:
+                        self.git_repo = Repo(self.current_repo['local_path'])
+                        # Reprendre le checkout du pool utilisé en dernier, s'il existe encore
+                        workspace = self.current_repo.get("active_worktree")
+                        if workspace and os.path.isdir(workspace):
+                            self.git_repo = Repo(workspace)
+                            self.log(f"Espace de travail: {workspace}", "info")
+                        self.commit_btn.config(state=tk.NORMAL)
+                        self.branch_btn.config(state=tk.NORMAL)
+                        self.merge_btn.config(state=tk.NORMAL)
+                        self.pull_btn.config(state=tk.NORMAL)
+                        self.push_btn.config(state=tk.NORMAL)
+                        self.switch_btn.config(state=tk.NORMAL)
+                        self.delete_branch_btn.config(state=tk.NORMAL)
+                        self.resolve_btn.config(state=tk.NORMAL)
+                        self.history_btn.config(state=tk.NORMAL)
+                        self.status_btn.config(state=tk.NORMAL)
+                        self.tag_btn.config(state=tk.NORMAL)
+                        self.undo_btn.config(state=tk.NORMAL)
+                        self.tag_browser_btn.config(state=tk.NORMAL)
+                        self.file_history_btn.config(state=tk.NORMAL)
+                        self.stash_btn.config(state=tk.NORMAL)
+                        self.analytics_btn.config(state=tk.NORMAL)
+                        self.ignore_btn.config(state=tk.NORMAL)
+
+                        # Afficher la branche actuelle
+                        current_branch = self.git_repo.active_branch.name
+                        self.log(f"Branche actuelle: {current_branch}", "info")
+
+                        # Reporter dans la configuration ou le .gitignore les exclusions modifiées de l'autre côté
+                        try:
+                            self.sync_excluded_files(self.current_repo)
+                        except Exception as e:
+                            self.log(f"Synchronisation du .gitignore impossible: {e}", "warning")
+
+                        # Rafraîchir en arrière-plan les références distantes périmées
+                        self.refresh_remote_refs()
+                    except Exception as e:
+                        self.log(f"Erreur lors de l'ouverture du dépôt Git: {e}", "error")
+                else:
+                    self.git_repo = None
+                    self.commit_btn.config(state=tk.DISABLED)
+                    self.branch_btn.config(state=tk.DISABLED)
+                    self.merge_btn.config(state=tk.DISABLED)
+                    self.pull_btn.config(state=tk.DISABLED)
+                    self.push_btn.config(state=tk.DISABLED)
+                    self.switch_btn.config(state=tk.DISABLED)
+                    self.delete_branch_btn.config(state=tk.DISABLED)
+                    self.resolve_btn.config(state=tk.DISABLED)
+                    self.history_btn.config(state=tk.DISABLED)
+                    self.status_btn.config(state=tk.DISABLED)
+                    self.tag_btn.config(state=tk.DISABLED)
+                    self.undo_btn.config(state=tk.DISABLED)
+                    self.tag_browser_btn.config(state=tk.DISABLED)
+                    self.file_history_btn.config(state=tk.DISABLED)
+                    self.stash_btn.config(state=tk.DISABLED)
+                    self.analytics_btn.config(state=tk.DISABLED)
+                    self.ignore_btn.config(state=tk.DISABLED)
+
+    def add_repo_dialog(self):
+        """Affiche la boîte de dialogue pour ajouter un dépôt"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Ajouter un dépôt")
+        dialog.geometry("750x750")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        dialog.configure(bg=COLORS['bg_light'])
+        
+        # Centrer la boîte de dialogue
+        self.center_window(dialog)
+        
+        # Frame principal avec marge
+        main_frame = ttk.Frame(dialog, padding="25")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Titre plus visible sans icône
+        title_label = ttk.Label(main_frame, text="Ajouter un nouveau dépôt Git", style="Title.TLabel")
+        title_label.pack(anchor=tk.W, pady=(0, 25))
+        
+        # Conteneur pour les formulaires
+        form_container = ttk.Frame(main_frame)
+        form_container.pack(fill=tk.BOTH, expand=True)
+        
+        # Style pour les labels de formulaire - plus d'espace
+        form_label_style = {"anchor": tk.W, "padding": (0, 12, 0, 6)}
+        
+        # Champs de formulaire avec plus d'espace et meilleure présentation
+        ttk.Label(form_container, text="Nom du dépôt:", **form_label_style).grid(row=0, column=0, sticky=tk.W)
+        name_var = tk.StringVar()
+        ttk.Entry(form_container, textvariable=name_var, width=50).grid(row=0, column=1, sticky=tk.W, pady=6)
+        
+        ttk.Label(form_container, text="Dossier local:", **form_label_style).grid(row=1, column=0, sticky=tk.W)
+        local_path_var = tk.StringVar(value=os.getcwd())
+        local_path_entry = ttk.Entry(form_container, textvariable=local_path_var, width=50)
+        local_path_entry.grid(row=1, column=1, sticky=tk.W, pady=6)
+        
+        browse_btn = ModernButton(form_container, text="Parcourir...", 
+                                command=lambda: local_path_var.set(filedialog.askdirectory()),
+                                width=120, height=36)
+        browse_btn.grid(row=1, column=2, sticky=tk.W, pady=6, padx=(12, 0))
+        
+        ttk.Label(form_container, text="URL du dépôt distant:", **form_label_style).grid(row=2, column=0, sticky=tk.W)
+        remote_url_var = tk.StringVar()
+        ttk.Entry(form_container, textvariable=remote_url_var, width=50).grid(row=2, column=1, sticky=tk.W, pady=6)
+        
+        ttk.Label(form_container, text="Branche par défaut:", **form_label_style).grid(row=3, column=0, sticky=tk.W)
+        branch_var = tk.StringVar(value="main")
+        ttk.Entry(form_container, textvariable=branch_var, width=50).grid(row=3, column=1, sticky=tk.W, pady=6)
+        
+        ttk.Label(form_container, text="Fichiers/dossiers à exclure:", **form_label_style).grid(row=4, column=0, sticky=tk.W)
+        
+        # Cadre avec ombre pour la zone de texte
+        excluded_frame = ttk.Frame(form_container)
+        excluded_frame.grid(row=5, column=0, columnspan=3, sticky=tk.W+tk.E, pady=6)
+        
+        # Zone de texte avec bordure et fond blanc plus élégante
+        excluded_text = scrolledtext.ScrolledText(excluded_frame, wrap=tk.WORD, width=55, height=15,
+                                              bg=COLORS['card'], relief=tk.FLAT, 
+                                              borderwidth=1, highlightthickness=1,
+                                              highlightbackground=COLORS['divider'],
+                                              padx=10, pady=10)
+        excluded_text.pack(fill=tk.BOTH, expand=True)
+        excluded_text.insert(tk.END, "__pycache__/\n*.py[cod]\n*$py.class\n*.so\n.env\n.venv\nenv/\nvenv/\nENV/\nenv.bak/\nvenv.bak/\n.idea/\n.vscode/")
+        
+        # Boutons pour parcourir les fichiers/dossiers à exclure
+        exclude_btn_frame = ttk.Frame(form_container)
+        exclude_btn_frame.grid(row=6, column=0, columnspan=3, sticky=tk.W, pady=(8, 18))
+        
+        def add_exclude_files():
+            fichiers = filedialog.askopenfilenames(title="Sélectionner des fichiers à exclure")
+            if fichiers:
+                # Extraire les noms des fichiers du chemin complet
+                for fichier in fichiers:
+                    nom_fichier = os.path.basename(fichier)
+                    excluded_text.insert(tk.END, f"\n{nom_fichier}")
+        
+        def add_exclude_dir():
+            dossier = filedialog.askdirectory(title="Sélectionner un dossier à exclure")
+            if dossier:
+                # Extraire le nom du dossier du chemin complet
+                nom_dossier = os.path.basename(dossier)
+                excluded_text.insert(tk.END, f"\n{nom_dossier}/")
+        
+        # Boutons avec meilleur espacement
+        add_files_btn = ModernButton(exclude_btn_frame, text="Ajouter fichiers...", 
+                                   command=add_exclude_files, width=150, height=36)
+        add_files_btn.pack(side=tk.LEFT, padx=(0, 12))
+        
+        add_dir_btn = ModernButton(exclude_btn_frame, text="Ajouter dossier...", 
+                                 command=add_exclude_dir, width=150, height=36)
+        add_dir_btn.pack(side=tk.LEFT)
+        
+        # Séparateur plus visible
+        separator = ttk.Separator(main_frame, orient='horizontal')
+        separator.pack(fill=tk.X, pady=18)
+        
+        # Boutons d'action plus élégants avec style ModernButton
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(fill=tk.X)
+        
+        # Option pour initialiser ou pas un nouveau dépôt
+        init_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(btn_frame, text="Initialiser un nouveau dépôt Git", variable=init_var).pack(side=tk.LEFT)
+        
+        cancel_btn = ModernButton(btn_frame, text="Annuler", command=dialog.destroy,
+                               width=150, height=40, bg_color=COLORS['bg_dark'],
+                               hover_color='#455A64')
+        cancel_btn.pack(side=tk.RIGHT)
+        
+        save_btn = ModernButton(btn_frame, text="Enregistrer", 
+                             command=lambda: self.save_new_repo(
+                                 name_var.get(), local_path_var.get(), remote_url_var.get(), 
+                                 branch_var.get(), excluded_text.get("1.0", tk.END).splitlines(),
+                                 init_var.get(), dialog
+                             ),
+                             width=150, height=40, bg_color=COLORS['primary'])
+        save_btn.pack(side=tk.RIGHT, padx=(0, 12))
+    
+    def save_new_repo(self, name, local_path, remote_url, branch, excluded_files, init_repo, dialog):
+        """Sauvegarde un nouveau dépôt"""
+        if not name or not local_path:
+            messagebox.showerror("Erreur", "Le nom du dépôt et le dossier local sont obligatoires", parent=dialog)
+            return
+        
+        # Nettoyer la liste des fichiers exclus (enlever les lignes vides)
+        excluded_files = [f.strip() for f in excluded_files if f.strip()]
+        
+        try:
+            # Créer le dossier local s'il n'existe pas
+            if not os.path.exists(local_path):
+                os.makedirs(local_path)
+            
+            # Initialiser un nouveau dépôt si demandé
+            if init_repo:
+                if not os.path.exists(os.path.join(local_path, '.git')):
+                    self.log(f"Initialisation d'un nouveau dépôt Git dans {local_path}", "info")
+                    repo = Repo.init(local_path)
+                    
+                    # Créer un fichier .gitignore avec les exclusions
+                    if excluded_files:
+                        with open(os.path.join(local_path, '.gitignore'), 'w') as f:
+                            f.write('\n'.join(excluded_files))
+                        
+                        # Ajouter le .gitignore au dépôt
+                        repo.git.add('.gitignore')
+                        repo.git.commit('-m', 'Initial commit: Add .gitignore')
+                    
+                    # Configurer l'URL distante si fournie
+                    if remote_url:
+                        repo.create_remote('origin', remote_url)
+                else:
+                    self.log(f"Un dépôt Git existe déjà dans {local_path}", "warning")
+            
+            # Ajouter le dépôt à la configuration
+            self.repo_config.add_repo(name, local_path, remote_url, branch, excluded_files)
+            
+            # Recharger la liste
+            self.load_repo_list()
+            
+            # Fermer la boîte de dialogue
+            dialog.destroy()
+            
+            self.log(f"Dépôt ajouté: {name} ({local_path})", "success")
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors de la création du dépôt: {str(e)}", parent=dialog)
+            self.log(f"Erreur lors de la création du dépôt: {str(e)}", "error")
+    
+    def import_repos_dialog(self):
+        """Recherche les dépôts Git sous un dossier et les ajoute en une seule fois"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Importer un dossier")
+        dialog.geometry("850x600")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        dialog.configure(bg=COLORS['bg_light'])
+
+        # Centrer la boîte de dialogue
+        self.center_window(dialog)
+
+        # Frame principal
+        main_frame = ttk.Frame(dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Titre
+        title_label = ttk.Label(main_frame, text="Importer les dépôts d'un dossier", style="Title.TLabel")
+        title_label.pack(anchor=tk.W, pady=(0, 15))
+
+        # Dossier racine et dossiers ignorés
+        form_frame = ttk.Frame(main_frame)
+        form_frame.pack(fill=tk.X, pady=(0, 10))
+
+        ttk.Label(form_frame, text="Dossier:").grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
+        root_var = tk.StringVar(value=os.getcwd())
+        ttk.Entry(form_frame, textvariable=root_var, width=60).grid(row=0, column=1, sticky=tk.W, pady=4)
+
+        def browse():
+            folder = filedialog.askdirectory(parent=dialog, initialdir=root_var.get())
+            if folder:
+                root_var.set(folder)
+
+        ModernButton(form_frame, text="Parcourir...", command=browse,
+                     width=120, height=32).grid(row=0, column=2, sticky=tk.W, padx=(10, 0))
+
+        ttk.Label(form_frame, text="Dossiers ignorés:").grid(row=1, column=0, sticky=tk.W, padx=(0, 10))
+        skip_var = tk.StringVar(value=", ".join(IMPORT_SKIP_DIRS))
+        ttk.Entry(form_frame, textvariable=skip_var, width=60).grid(row=1, column=1, sticky=tk.W, pady=4)
+
+        # Dépôts trouvés (sélection multiple, les nouveaux sont présélectionnés)
+        list_frame = ttk.Frame(main_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+
+        columns = ("name", "path", "branch", "remote")
+        found_list = ttk.Treeview(list_frame, columns=columns, show="headings", height=12, selectmode="extended")
+        found_list.heading("name", text="Nom")
+        found_list.heading("path", text="Dossier")
+        found_list.heading("branch", text="Branche")
+        found_list.heading("remote", text="Distant")
+        found_list.column("name", width=140)
+        found_list.column("path", width=300)
+        found_list.column("branch", width=100)
+        found_list.column("remote", width=260)
+        found_list.tag_configure("configured", foreground=COLORS['text_secondary'])
+
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=found_list.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        found_list.configure(yscrollcommand=scrollbar.set)
+        found_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        status_var = tk.StringVar(value="Choisissez un dossier puis lancez la recherche")
+        ttk.Label(main_frame, textvariable=status_var).pack(anchor=tk.W, pady=(0, 10))
+
+        state = {"repos": {}, "discovery": None}
+
+        def unique_name(info, root, taken):
+            # Le nom du dossier, ou son chemin relatif à la racine s'il est déjà utilisé
+            name = info["name"]
+            if name in taken:
+                name = os.path.relpath(info["local_path"], root).replace(os.sep, "/")
+            base, n = name, 2
+            while name in taken:
+                name = f"{base}-{n}"
+                n += 1
+            taken.add(name)
+            return name
+
+        def show(root, repos):
+            if not dialog.winfo_exists():
+                return
+            state["discovery"] = None
+            found_list.delete(*found_list.get_children())
+            state["repos"] = {}
+            taken = {repo.get("name") for repo in self.repo_config.get_repos()}
+            new_items = []
+            for info in repos:
+                configured = self.repo_config.find_by_path(info["local_path"]) is not None
+                if not configured:
+                    info["name"] = unique_name(info, root, taken)
+                item = found_list.insert("", tk.END, values=(info["name"], info["local_path"],
+                                                             info["branch"] or "(détachée)", info["remote_url"]),
+                                         tags=("configured",) if configured else ())
+                if not configured:
+                    state["repos"][item] = info
+                    new_items.append(item)
+            found_list.selection_set(new_items)
+            status_var.set(f"{len(repos)} dépôt(s) trouvé(s), {len(new_items)} nouveau(x)")
+
+        def search():
+            root = root_var.get().strip()
+            if not root or not os.path.isdir(root):
+                messagebox.showerror("Erreur", "Veuillez choisir un dossier existant", parent=dialog)
+                return
+            if state["discovery"]:
+                return
+            discovery = RepoDiscovery(skip_var.get().split(","))
+            state["discovery"] = discovery
+            status_var.set("Recherche en cours...")
+
+            def progress(scanned, found):
+                self.root.after(0, lambda: status_var.set(f"Recherche en cours... {scanned} dossier(s) lu(s), "
+                                                          f"{found} dépôt(s)") if dialog.winfo_exists() else None)
+
+            def worker():
+                try:
+                    repos = discovery.discover(root, progress)
+                    self.root.after(0, lambda: show(os.path.abspath(root), repos))
+                except Exception as e:
+                    state["discovery"] = None
+                    self.root.after(0, lambda error=str(e): status_var.set(f"Erreur: {error}") if dialog.winfo_exists() else None)
+            threading.Thread(target=worker, daemon=True).start()
+
+        def import_selected():
+            selected = [state["repos"][item] for item in found_list.selection() if item in state["repos"]]
+            if not selected:
+                messagebox.showinfo("Information", "Aucun nouveau dépôt sélectionné", parent=dialog)
+                return
+            # Une seule écriture de la configuration pour tout le lot
+            with self.repo_config.batch():
+                for info in selected:
+                    self.repo_config.add_repo(info["name"], info["local_path"], info["remote_url"],
+                                              info["branch"] or "main", [])
+            self.load_repo_list()
+            dialog.destroy()
+            self.log(f"{len(selected)} dépôt(s) importé(s) depuis {root_var.get()}", "success")
+
+        def close():
+            if state["discovery"]:
+                state["discovery"].cancelled = True
+            dialog.destroy()
+
+        dialog.protocol("WM_DELETE_WINDOW", close)
+
+        # Boutons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
+
+        ModernButton(button_frame, text="Annuler", command=close,
+                     width=120, height=36, bg_color=COLORS['bg_dark']).pack(side=tk.RIGHT, padx=(10, 0))
+        ModernButton(button_frame, text="Importer la sélection", command=import_selected,
+                     width=180, height=36, bg_color=COLORS['primary'],
+                     text_color=COLORS['text_light']).pack(side=tk.RIGHT, padx=(10, 0))
+        ModernButton(button_frame, text="Rechercher", command=search,
+                     width=130, height=36, bg_color=COLORS['secondary']).pack(side=tk.RIGHT)
+
+    def edit_repo_dialog(self):
+        """Ouvre la boîte de dialogue pour modifier un dépôt"""
+        # Implémentation de la boîte de dialogue pour modifier un dépôt
+        pass
+    
+    def delete_repo(self):
+        """Supprime le dépôt sélectionné"""
+        # Implémentation de la suppression du dépôt
+        pass
+    
+    def clone_repo(self):
+        """Affiche la boîte de dialogue pour cloner un dépôt distant"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Cloner un dépôt")
+        dialog.geometry("600x450")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        dialog.configure(bg=COLORS['bg_light'])
         
-        # Configurer les styles de base avec des polices sûres
-        style.configure(".", font=Fonts.DEFAULT, background=COLORS['bg_light'])
+        # Centrer la boîte de dialogue
+        self.center_window(dialog)
         
-        # Boutons avec coins arrondis et effet de relief
-        style.configure("TButton", font=Fonts.DEFAULT, foreground=COLORS['text_dark'], 
-                      background=COLORS['primary'], borderwidth=0, focuscolor=COLORS['primary'], 
-                      relief=tk.RAISED, padding=(10, 5))
-        style.map("TButton", 
-                background=[('active', COLORS['button_hover']), ('disabled', COLORS['divider'])],
-                foreground=[('disabled', COLORS['text_secondary'])])
+        # Frame principal avec marge
+        main_frame = ttk.Frame(dialog, padding="25")
+        main_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Étiquettes et cadres
-        style.configure("TLabel", font=Fonts.DEFAULT, background=COLORS['bg_light'], foreground=COLORS['text_dark'])
-        style.configure("TFrame", background=COLORS['bg_light'])
-        style.configure("Shadow.TFrame", background='#DDDDDD')  # Style pour l'ombre
+        # Titre
+        title_label = ttk.Label(main_frame, text="Cloner un dépôt Git distant", style="Title.TLabel")
+        title_label.pack(anchor=tk.W, pady=(0, 25))
         
-        # Cadres avec étiquette
-        style.configure("TLabelframe", background=COLORS['bg_light'], foreground=COLORS['text_dark'], borderwidth=1)
-        style.configure("TLabelframe.Label", font=Fonts.HEADING, background=COLORS['bg_light'], foreground=COLORS['primary'])
+        # Conteneur pour les formulaires
+        form_container = ttk.Frame(main_frame)
+        form_container.pack(fill=tk.BOTH, expand=True)
+        
+        # Style pour les labels de formulaire
+        form_label_style = {"anchor": tk.W, "padding": (0, 12, 0, 6)}
+        
+        # Champs de formulaire
+        ttk.Label(form_container, text="Nom du dépôt:", **form_label_style).grid(row=0, column=0, sticky=tk.W)
+        name_var = tk.StringVar()
+        ttk.Entry(form_container, textvariable=name_var, width=50).grid(row=0, column=1, sticky=tk.W, pady=6)
+        
+        ttk.Label(form_container, text="URL du dépôt distant:", **form_label_style).grid(row=1, column=0, sticky=tk.W)
+        remote_url_var = tk.StringVar()
+        ttk.Entry(form_container, textvariable=remote_url_var, width=50).grid(row=1, column=1, sticky=tk.W, pady=6)
+        
+        ttk.Label(form_container, text="Dossier local:", **form_label_style).grid(row=2, column=0, sticky=tk.W)
+        local_path_var = tk.StringVar(value=os.getcwd())
+        local_path_entry = ttk.Entry(form_container, textvariable=local_path_var, width=50)
+        local_path_entry.grid(row=2, column=1, sticky=tk.W, pady=6)
+        
+        browse_btn = ModernButton(form_container, text="Parcourir...", 
+                                command=lambda: local_path_var.set(filedialog.askdirectory()),
+                                width=120, height=36)
+        browse_btn.grid(row=2, column=2, sticky=tk.W, pady=6, padx=(12, 0))
+        
+        ttk.Label(form_container, text="Branche:", **form_label_style).grid(row=3, column=0, sticky=tk.W)
+        branch_var = tk.StringVar(value="main")
+        ttk.Entry(form_container, textvariable=branch_var, width=50).grid(row=3, column=1, sticky=tk.W, pady=6)
+        
+        # Séparateur
+        separator = ttk.Separator(main_frame, orient='horizontal')
+        separator.pack(fill=tk.X, pady=18)
+        
+        # Boutons d'action
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(fill=tk.X)
+        
+        cancel_btn = ModernButton(btn_frame, text="Annuler", command=dialog.destroy,
+                               width=150, height=40, bg_color=COLORS['bg_dark'],
+                               hover_color='#455A64')
+        cancel_btn.pack(side=tk.RIGHT)
+        
+        clone_btn = ModernButton(btn_frame, text="Cloner", 
+                              command=lambda: self.do_clone_repo(
+                                  name_var.get(), remote_url_var.get(), 
+                                  local_path_var.get(), branch_var.get(), dialog
+                              ),
+                              width=150, height=40, bg_color=COLORS['primary'])
+        clone_btn.pack(side=tk.RIGHT, padx=(0, 12))
+    
+    def do_clone_repo(self, name, remote_url, local_path, branch, dialog):
+        """Clone un dépôt distant"""
+        if not name or not remote_url or not local_path:
+            messagebox.showerror("Erreur", "Tous les champs sont obligatoires", parent=dialog)
+            return
+        
+        # Désactiver le bouton de clonage pendant l'opération
+        for widget in dialog.winfo_children():
+            widget.configure(state=tk.DISABLED)
+        
+        # Lancer le clonage dans un thread séparé
+        threading.Thread(target=lambda: self._clone_thread(name, remote_url, local_path, branch, dialog)).start()
+    
+    def _clone_thread(self, name, remote_url, local_path, branch, dialog):
+        """Thread pour cloner un dépôt"""
+        try:
+            with METRICS.span("clone", name), \
+                    self.journal.operation("clone", name, [remote_url, local_path, branch]) as journal_entry:
+                self.log(f"Clonage de {remote_url} dans {local_path}...", "info")
+            
+                # Créer le dossier parent si nécessaire
+                if not os.path.exists(os.path.dirname(local_path)):
+                    os.makedirs(os.path.dirname(local_path))
+            
+                # Cloner le dépôt
+                # Emprunter les objets du miroir local s'il existe : seul le complément passe par le réseau
+                repo = Repo.clone_from(remote_url, local_path, branch=branch, **self.mirrors.clone_options(remote_url))
+                journal_entry["git_repo"] = repo
+            
+                # Extraire les fichiers exclus du .gitignore
+                excluded_files = []
+                gitignore_path = os.path.join(local_path, '.gitignore')
+                if os.path.exists(gitignore_path):
+                    with open(gitignore_path, 'r') as f:
+                        excluded_files = [line.strip() for line in f.readlines() if line.strip() and not line.startswith('#')]
+            
+                # Ajouter le dépôt à la configuration
+                self.repo_config.add_repo(name, local_path, remote_url, branch, excluded_files)
+            
+                # Mettre à jour l'interface dans le thread principal
+                self.root.after(0, lambda: self._clone_completed(dialog))
+            
+        except Exception as e:
+            # Gérer les erreurs dans le thread principal
+            self.root.after(0, lambda: self._clone_error(dialog, str(e)))
+    
+    def _clone_completed(self, dialog):
+        """Gère la fin d'un clonage réussi"""
+        self.log("Clonage terminé avec succès", "success")
+        self.load_repo_list()
+        dialog.destroy()
+        
+        # Afficher un message de succès
+        messagebox.showinfo("Succès", "Le dépôt a été cloné avec succès")
+    
+    def _clone_error(self, dialog, error_msg):
+        """Gère une erreur de clonage"""
+        self.log(f"Erreur lors du clonage: {error_msg}", "error")
+        
+        # Réactiver les widgets du dialogue
+        for widget in dialog.winfo_children():
+            try:
+                widget.configure(state=tk.NORMAL)
+            except:
+                pass  # Certains widgets n'ont pas d'état
+        
+        # Afficher l'erreur
+        messagebox.showerror("Erreur de clonage", error_msg, parent=dialog)
+    
+    def create_commit(self):
+        """Crée un commit pour le dépôt sélectionné"""
+        if not self.current_repo or not self.git_repo:
+            messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
+            return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Créer un commit")
+        dialog.geometry("550x380")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        dialog.configure(bg=COLORS['bg_light'])
+
+        # Centrer la boîte de dialogue
+        self.center_window(dialog)
+
+        # Frame principal
+        main_frame = ttk.Frame(dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Titre
+        title_label = ttk.Label(main_frame, text="Nouveau commit", style="Title.TLabel")
+        title_label.pack(anchor=tk.W, pady=(0, 15))
+
+        ttk.Label(main_frame, text="Message:").pack(anchor=tk.W)
+        message_text = tk.Text(main_frame, height=6, wrap=tk.WORD, bg=COLORS['card'], relief=tk.FLAT,
+                               borderwidth=0, highlightthickness=1, font=Fonts.DEFAULT)
+        message_text.pack(fill=tk.BOTH, expand=True, pady=(5, 15))
+        message_text.focus_set()
+
+        add_all_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(main_frame, text="Indexer toutes les modifications (git add -A)",
+                        variable=add_all_var).pack(anchor=tk.W, pady=(0, 15))
+
+        def confirm():
+            message = message_text.get("1.0", tk.END).strip()
+            if not message:
+                messagebox.showerror("Erreur", "Veuillez saisir un message de commit", parent=dialog)
+                return
+            add_all = add_all_var.get()
+            dialog.destroy()
+
+            # Vérification rapide par os.stat des fichiers qui seront commités
+            scanner = LargeFileScanner(self.git_repo, self.large_file_threshold())
+            self.confirm_large_files(lambda: scanner.scan_paths(scanner.pending_paths(staged_only=not add_all)),
+                                     lambda: self.do_create_commit(message, add_all), "créer ce commit")
+
+        # Boutons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
+
+        cancel_btn = ModernButton(button_frame, text="Annuler", command=dialog.destroy,
+                               width=150, height=40, bg_color=COLORS['bg_dark'])
+        cancel_btn.pack(side=tk.RIGHT)
+
+        commit_btn = ModernButton(button_frame, text="Valider", command=confirm,
+                               width=150, height=40, bg_color=COLORS['success'])
+        commit_btn.pack(side=tk.RIGHT, padx=(0, 12))
+
+    def do_create_commit(self, message, add_all):
+        """Lance la création du commit"""
+        self.operation_running = True
+        self.status_label.config(text="Création du commit...")
+        self.progress_bar["value"] = 20
+        threading.Thread(target=lambda: self._commit_thread(message, add_all)).start()
+
+    def _commit_thread(self, message, add_all):
+        """Thread pour créer un commit"""
+        try:
+            with METRICS.span("commit", self.current_repo["name"]), \
+                    self.journal.operation("commit", self.current_repo["name"], [message], self.git_repo):
+                os.chdir(self.current_repo["local_path"])
+                if add_all:
+                    GitOperations(self.git_repo).commit_all(message)
+                else:
+                    self.git_repo.git.commit('-m', message)
+                self.progress_bar["value"] = 100
+                self.log(f"Commit créé: {message.splitlines()[0]}", "success")
+                self.root.after(0, self._commit_completed)
+        except Exception as e:
+            self.root.after(0, lambda error=str(e): self._commit_error(error))
+
+    def _commit_completed(self):
+        """Gère la fin d'un commit réussi"""
+        self.operation_running = False
+        self.status_label.config(text="Prêt")
+
+    def _commit_error(self, error_msg):
+        """Gère une erreur lors d'un commit"""
+        self.operation_running = False
+        self.status_label.config(text="Erreur")
+        self.progress_bar["value"] = 0
+        self.log(f"Erreur lors du commit: {error_msg}", "error")
+        messagebox.showerror("Erreur", f"Erreur lors du commit: {error_msg}")
+
+    def large_file_threshold(self):
+        return self.current_repo.get("large_file_threshold", LARGE_FILE_THRESHOLD)
+
+    def confirm_large_files(self, scan, on_confirm, action_label):
+        """Exécute scan() dans un thread, puis demande confirmation si des fichiers dépassent le seuil"""
+        threshold = self.large_file_threshold()
+        self.status_label.config(text="Recherche de fichiers volumineux...")
+
+        def worker():
+            try:
+                large = scan()
+            except Exception as e:
+                self.root.after(0, lambda error=str(e): self.log(f"Recherche de fichiers volumineux impossible: {error}", "warning"))
+                large = []
+
+            def decide():
+                self.status_label.config(text="Prêt")
+                if large:
+                    listing = "\n".join(f"- {path} ({format_size(size)})" for path, size, _ in large[:15])
+                    if len(large) > 15:
+                        listing += f"\n... et {len(large) - 15} autre(s)"
+                    self.log(f"{len(large)} fichier(s) de plus de {format_size(threshold)} détecté(s)", "warning")
+                    if not messagebox.askyesno("Fichiers volumineux",
+                                               f"{len(large)} fichier(s) dépassent {format_size(threshold)} :\n\n"
+                                               f"{listing}\n\nVoulez-vous vraiment {action_label}?"):
+                        self.log("Opération annulée", "info")
+                        return
+                on_confirm()
+            self.root.after(0, decide)
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def create_branch(self):
+        """Crée une nouvelle branche"""
+        if not self.current_repo or not self.git_repo:
+            messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
+            return
+        
+        # Demander le nom de la branche
+        branch_name = simpledialog.askstring("Nouvelle branche", "Nom de la nouvelle branche:", parent=self.root)
+        if not branch_name:
+            return
+        
+        # Vérifier si la branche existe déjà
+        existing_branches = [b.name for b in self.git_repo.branches]
+        if branch_name in existing_branches:
+            messagebox.showerror("Erreur", f"La branche '{branch_name}' existe déjà")
+            return
+        
+        # Demander si l'utilisateur veut basculer sur la nouvelle branche
+        switch_to = messagebox.askyesno("Basculer", f"Basculer sur la nouvelle branche '{branch_name}' après sa création?")
+        
+        # Créer la branche dans un thread
+        self.operation_running = True
+        self.status_label.config(text="Création de la branche...")
+        self.progress_bar["value"] = 20
         
-        # Configurer les styles personnalisés
-        style.configure("Title.TLabel", font=Fonts.HEADING, background=COLORS['bg_light'], foreground=COLORS['primary'])
-        style.configure("Card.TFrame", background=COLORS['card'])
+        threading.Thread(target=lambda: self._create_branch_thread(branch_name, switch_to)).start()
+    
+    def _create_branch_thread(self, branch_name, switch_to):
+        """Thread pour créer une nouvelle branche"""
+        try:
+            with METRICS.span("branch", self.current_repo["name"]), \
+                    self.journal.operation("branch", self.current_repo["name"], [branch_name], self.git_repo):
+                # Aller dans le répertoire du dépôt
+                os.chdir(self.current_repo["local_path"])
+            
+                # Créer la branche
+                self.log(f"Création de la branche '{branch_name}'...", "info")
+                current_branch = self.git_repo.active_branch.name
+            
+                # Créer à partir de la branche courante
+                self.git_repo.git.branch(branch_name)
+            
+                self.progress_bar["value"] = 70
+            
+                # Basculer sur la nouvelle branche si demandé
+                if switch_to:
+                    self.log(f"Basculement sur la branche '{branch_name}'...", "info")
+                    self.git_repo.git.checkout(branch_name)
+            
+                self.progress_bar["value"] = 100
+                self.log(f"Branche '{branch_name}' créée avec succès", "success")
+            
+                # Mettre à jour l'interface
+                self.root.after(0, self._branch_operation_completed)
+            
+        except Exception as e:
+            self.root.after(0, lambda: self._branch_operation_error(str(e)))
+    
+    def switch_branch(self):
+        """Change de branche"""
+        if not self.current_repo or not self.git_repo:
+            messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
+            return
         
-        # En-tête avec dégradé
-        style.configure("Header.TFrame", background=COLORS['header_bg'], padx=15, pady=8)
-        style.configure("Header.TLabel", font=Fonts.DEFAULT, foreground=COLORS['text_light'], background=COLORS['header_bg'])
+        # Récupérer la liste des branches
+        branches = self.list_branches()
         
-        # Style pour la liste des dépôts
-        style.configure("Treeview", 
-                     font=Fonts.DEFAULT, 
-                     rowheight=30, 
-                     background=COLORS['card'], 
-                     fieldbackground=COLORS['card'],
-                     borderwidth=0)
-        style.configure("Treeview.Heading", 
-                      font=Fonts.HEADING, 
-                      background=COLORS['primary_light'], 
-                      foreground=COLORS['text_dark'],
-                      relief=tk.FLAT)
-        style.map("Treeview", 
-                background=[('selected', COLORS['primary'])],
-                foreground=[('selected', COLORS['text_light'])])
+        if not branches:
+            messagebox.showinfo("Information", "Aucune branche disponible")
+            return
         
-        # Style pour les entrées
-        style.configure("TEntry", font=Fonts.DEFAULT, padding=8, relief=tk.FLAT)
-        style.configure("TCombobox", font=Fonts.DEFAULT, padding=8)
+        # Créer la boîte de dialogue pour sélectionner une branche
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Changer de branche")
+        dialog.geometry("500x400")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        dialog.configure(bg=COLORS['bg_light'])
         
-        # Style pour le texte
-        self.root.option_add("*TScrolledText*Font", Fonts.FIXED)
+        # Centrer la boîte de dialogue
+        self.center_window(dialog)
         
-        # Style pour la barre de progression avec contours nets
-        style.configure("Horizontal.TProgressbar", 
-                      foreground=COLORS['primary'], 
-                      background=COLORS['primary'],
-                      troughcolor=COLORS['bg_light'],
-                      thickness=8,
-                      borderwidth=0)
-    
-    def create_widgets(self):
-        """Crée les widgets de l'interface"""
-        # Frame principal avec marge et padding
-        main_container = ttk.Frame(self.root, style="TFrame")
-        main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        # Frame principal
+        main_frame = ttk.Frame(dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
         
-        # En-tête de l'application avec effet d'ombre
-        header_frame = ttk.Frame(main_container, style="Header.TFrame")
-        header_frame.pack(fill=tk.X, pady=(0, 20))
+        # Titre
+        title_label = ttk.Label(main_frame, text="Sélectionner une branche", style="Title.TLabel")
+        title_label.pack(anchor=tk.W, pady=(0, 15))
         
-        # Logo/Icône (représenté par un texte stylisé)
-        title_label = ttk.Label(header_frame, text="Github.py", style="Header.TLabel")
-        title_label.pack(side=tk.LEFT)
+        # Liste des branches
+        branch_frame = ttk.Frame(main_frame)
+        branch_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
         
-        # Sous-titre
-        subtitle_label = ttk.Label(header_frame, text="Gestion de dépôts Git", 
-                                foreground=COLORS['text_light'], background=COLORS['header_bg'],
-                                font=("Segoe UI", 10))
-        subtitle_label.pack(side=tk.LEFT, padx=(10, 0))
+        # Listbox avec scrollbar
+        branch_list = tk.Listbox(branch_frame, height=15, width=50, font=Fonts.DEFAULT)
+        branch_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        # Container pour les dépôts et les actions avec espacement
-        top_container = ttk.Frame(main_container, style="TFrame")
-        top_container.pack(fill=tk.X, pady=(0, 20))
+        scrollbar = ttk.Scrollbar(branch_frame, orient="vertical", command=branch_list.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        branch_list.configure(yscrollcommand=scrollbar.set)
         
-        # Frame pour les dépôts avec style "carte" et ombre
-        repo_frame = ttk.LabelFrame(top_container, text="Dépôts", padding=15)
-        repo_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # Remplir la liste des branches
+        current_branch = self.git_repo.active_branch.name
+        for i, branch in enumerate(branches):
+            branch_list.insert(tk.END, branch)
+            if branch == current_branch:
+                branch_list.selection_set(i)
+                branch_list.see(i)
+                branch_list.itemconfig(i, bg=COLORS['primary_light'], fg=COLORS['primary_dark'])
         
-        # Liste des dépôts avec style moderne
-        self.repo_list = ttk.Treeview(repo_frame, columns=("name"), show="headings", height=3)
-        self.repo_list.heading("name", text="Nom du dépôt")
-        self.repo_list.column("name", width=200)
-        self.repo_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # Badges de présence sur le distant, sans attendre le réseau
+        self.load_remote_badges([f"refs/heads/{b}" for b in branches],
+                                lambda labels: self.apply_listbox_badges(branch_list, branches, labels))
+
+        # Label pour afficher la branche actuelle
+        current_label = ttk.Label(main_frame, text=f"Branche actuelle: {current_branch}", font=Fonts.DEFAULT)
+        current_label.pack(anchor=tk.W, pady=(0, 15))
         
-        scrollbar = ttk.Scrollbar(repo_frame, orient="vertical", command=self.repo_list.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.repo_list.configure(yscrollcommand=scrollbar.set)
+        # Options
+        options_frame = ttk.Frame(main_frame)
+        options_frame.pack(fill=tk.X, pady=(0, 15))
         
-        self.repo_list.bind("<<TreeviewSelect>>", self.on_repo_select)
+        stash_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options_frame, text="Mettre de côté les modifications non commitées", variable=stash_var).pack(anchor=tk.W)
+
+        # Option mémorisée par dépôt
+        auto_pop_var = tk.BooleanVar(value=self.current_repo.get("auto_pop_stash", False))
+        ttk.Checkbutton(options_frame, text="Réappliquer l'auto-stash au retour sur une branche",
+                        variable=auto_pop_var,
+                        command=lambda: self.repo_config.update_repo(self.repo_config.index_of(self.current_repo),
+                                                                     auto_pop_stash=auto_pop_var.get())
+                        ).pack(anchor=tk.W)
+
+        worktree_var = tk.BooleanVar(value=self.current_repo.get("worktree_pool", False))
+        ttk.Checkbutton(options_frame, text="Garder un checkout (git worktree) par branche récente",
+                        variable=worktree_var,
+                        command=lambda: self.repo_config.update_repo(self.repo_config.index_of(self.current_repo),
+                                                                     worktree_pool=worktree_var.get())
+                        ).pack(anchor=tk.W)
         
-        # Frame pour les boutons de gestion des dépôts
-        repo_buttons_frame = ttk.Frame(top_container)
-        repo_buttons_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(15, 0))
+        # Boutons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
         
-        # Utilisation de boutons modernes personnalisés avec espacements
-        add_btn = ModernButton(repo_buttons_frame, text="Ajouter un dépôt", command=self.add_repo_dialog, 
-                            width=150, height=40, bg_color=COLORS['primary'], 
-                            text_color=COLORS['text_light'])
-        add_btn.pack(fill=tk.X, pady=5)
+        cancel_btn = ModernButton(button_frame, text="Annuler", command=dialog.destroy,
+                               width=150, height=40, bg_color=COLORS['bg_dark'])
+        cancel_btn.pack(side=tk.RIGHT)
         
-        edit_btn = ModernButton(repo_buttons_frame, text="Modifier", command=self.edit_repo_dialog,
-                             width=150, height=40, bg_color=COLORS['primary'],
-                             text_color=COLORS['text_light'])
-        edit_btn.pack(fill=tk.X, pady=5)
+        switch_btn = ModernButton(button_frame, text="Changer", 
+                               command=lambda: self.do_switch_branch(
+                                   branches[branch_list.curselection()[0]] if branch_list.curselection() else None,
+                                   stash_var.get(), dialog
+                               ),
+                               width=150, height=40, bg_color=COLORS['primary'])
+        switch_btn.pack(side=tk.RIGHT, padx=(0, 12))
         
-        delete_btn = ModernButton(repo_buttons_frame, text="Supprimer", command=self.delete_repo,
-                               width=150, height=40, bg_color=COLORS['primary'],
-                               text_color=COLORS['text_light'])
-        delete_btn.pack(fill=tk.X, pady=5)
+        # Double-clic pour changer de branche
+        branch_list.bind("<Double-Button-1>", lambda e: self.do_switch_branch(
+            branches[branch_list.curselection()[0]] if branch_list.curselection() else None,
+            stash_var.get(), dialog
+        ))
+    
+    def do_switch_branch(self, branch_name, stash, dialog):
+        """Effectue le changement de branche"""
+        if not branch_name:
+            messagebox.showerror("Erreur", "Veuillez sélectionner une branche", parent=dialog)
+            return
         
-        # Frame pour les actions avec plus d'espace
-        action_frame = ttk.LabelFrame(main_container, text="Actions", padding=15)
-        action_frame.pack(fill=tk.X, pady=(0, 20))
+        # Vérifier si c'est la branche actuelle
+        current_branch = self.git_repo.active_branch.name
+        if branch_name == current_branch:
+            messagebox.showinfo("Information", f"Vous êtes déjà sur la branche '{branch_name}'", parent=dialog)
+            dialog.destroy()
+            return
         
-        # Conteneur d'actions avec espacement équitable
-        action_container = ttk.Frame(action_frame)
-        action_container.pack(fill=tk.X, pady=5)
+        dialog.destroy()
+        self.operation_running = True
+        self.status_label.config(text="Changement de branche...")
+        self.progress_bar["value"] = 20
         
-        # Utiliser des boutons ModernButton pour les actions
-        btn_width = 150
-        btn_height = 40
+        # Lancer l'opération dans un thread
+        threading.Thread(target=lambda: self._switch_branch_thread(branch_name, stash)).start()
+    
+    def _switch_branch_thread(self, branch_name, stash):
+        """Thread pour changer de branche"""
+        try:
+            with METRICS.span("checkout", self.current_repo["name"]), \
+                    self.journal.operation("checkout", self.current_repo["name"], [branch_name], self.git_repo):
+                # Aller dans le répertoire du dépôt
+                os.chdir(self.current_repo["local_path"])
+
+                # Branche déjà extraite dans un checkout (ou à placer dans le pool) : y basculer sans checkout
+                pool = self.get_worktree_pool()
+                workspace = pool.workspace_for(branch_name)
+                if workspace is None and self.current_repo.get("worktree_pool", False):
+                    self.log(f"Création d'un checkout pour la branche '{branch_name}'...", "info")
+                    workspace = pool.acquire(branch_name, keep=[self.git_repo.working_dir])
+                if workspace is not None:
+                    pool.touch(workspace)
+                    self.progress_bar["value"] = 100
+                    self.root.after(0, lambda: self.set_workspace(workspace))
+                    self.log(f"Changement de branche réussi. Branche actuelle: {branch_name} ({workspace})", "success")
+                    self.root.after(0, self._branch_operation_completed)
+                    return
+            
+                # Vérifier s'il y a des modifications non commitées
+                stash_manager = StashManager(self.git_repo)
+                if self.git_repo.is_dirty():
+                    if stash:
+                        self.log("Mise de côté des modifications non commitées...", "info")
+                        stash_manager.create_auto_stash(branch_name)
+                    else:
+                        raise Exception("Il y a des modifications non commitées. Veuillez les commiter ou utiliser l'option de mise de côté.")
+            
+                self.progress_bar["value"] = 50
+            
+                # Changer de branche
+                self.log(f"Basculement sur la branche '{branch_name}'...", "info")
+                self.git_repo.git.checkout(branch_name)
+
+                # Retour sur une branche quittée avec un auto-stash : le réappliquer si demandé
+                if self.current_repo.get("auto_pop_stash", False):
+                    auto_stash = stash_manager.find_auto_stash(branch_name)
+                    if auto_stash is not None:
+                        self.progress_bar["value"] = 80
+                        self.log(f"Réapplication de l'auto-stash {auto_stash['ref']}...", "info")
+                        try:
+                            stash_manager.pop(auto_stash["sha"])
+                        except git.GitCommandError as e:
+                            # En cas de conflit, git conserve le stash : rien n'est perdu
+                            self.log(f"Réapplication de l'auto-stash impossible, stash conservé: {e}", "warning")
+            
+                self.progress_bar["value"] = 100
+                self.log(f"Changement de branche réussi. Branche actuelle: {branch_name}", "success")
+            
+                # Mettre à jour l'interface
+                self.root.after(0, self._branch_operation_completed)
+            
+        except Exception as e:
+            self.root.after(0, lambda: self._branch_operation_error(str(e)))
+    
+    def delete_branch(self):
+        """Supprime une branche"""
+        if not self.current_repo or not self.git_repo:
+            messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
+            return
         
-        self.clone_btn = ModernButton(action_container, text="Cloner un dépôt", command=self.clone_repo,
-                                    width=btn_width, height=btn_height, bg_color=COLORS['primary'])
-        self.clone_btn.pack(side=tk.LEFT, padx=(0, 8), fill=tk.X, expand=True)
+        # Récupérer la liste des branches
+        branches = self.list_branches()
+        current_branch = self.git_repo.active_branch.name
         
-        self.commit_btn = ModernButton(action_container, text="Créer un commit", command=self.create_commit,
-                                    width=btn_width, height=btn_height, bg_color=COLORS['primary'],
-                                    state=tk.DISABLED)
-        self.commit_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+        # Exclure la branche courante
+        branches = [b for b in branches if b != current_branch]
         
-        self.branch_btn = ModernButton(action_container, text="Nouvelle branche", command=self.create_branch,
-                                   width=btn_width, height=btn_height, bg_color=COLORS['success'],
-                                   state=tk.DISABLED)
-        self.branch_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+        if not branches:
+            messagebox.showinfo("Information", "Aucune branche disponible à supprimer")
+            return
         
-        self.merge_btn = ModernButton(action_container, text="Fusionner", command=self.merge_branches,
-                                     width=btn_width, height=btn_height, bg_color=COLORS['warning'],
-                                     text_color=COLORS['text_dark'], state=tk.DISABLED)
-        self.merge_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+        # Créer la boîte de dialogue pour sélectionner une branche
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Supprimer une branche")
+        dialog.geometry("500x400")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        dialog.configure(bg=COLORS['bg_light'])
         
-        self.pull_btn = ModernButton(action_container, text="Pull", command=self.pull_changes,
-                                    width=btn_width, height=btn_height, bg_color=COLORS['primary'],
-                                    state=tk.DISABLED)
-        self.pull_btn.pack(side=tk.LEFT, padx=(8, 0), fill=tk.X, expand=True)
+        # Centrer la boîte de dialogue
+        self.center_window(dialog)
         
-        # Ajout du bouton Push
-        self.push_btn = ModernButton(action_container, text="Push", command=self.push_changes,
-                                    width=btn_width, height=btn_height, bg_color=COLORS['success'],
-                                    state=tk.DISABLED)
-        self.push_btn.pack(side=tk.LEFT, padx=(8, 0), fill=tk.X, expand=True)
+        # Frame principal
+        main_frame = ttk.Frame(dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Deuxième rangée d'actions
-        action_container2 = ttk.Frame(action_frame)
-        action_container2.pack(fill=tk.X, pady=5)
+        # Titre
+        title_label = ttk.Label(main_frame, text="Sélectionner une branche à supprimer", style="Title.TLabel")
+        title_label.pack(anchor=tk.W, pady=(0, 15))
         
-        self.switch_btn = ModernButton(action_container2, text="Changer de branche", command=self.switch_branch,
-                                     width=btn_width, height=btn_height, bg_color=COLORS['primary'],
-                                     state=tk.DISABLED)
-        self.switch_btn.pack(side=tk.LEFT, padx=(0, 8), fill=tk.X, expand=True)
+        # Liste des branches
+        branch_frame = ttk.Frame(main_frame)
+        branch_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
         
-        self.delete_branch_btn = ModernButton(action_container2, text="Supprimer branche", command=self.delete_branch,
-                                           width=btn_width, height=btn_height, bg_color=COLORS['error'],
-                                           state=tk.DISABLED)
-        self.delete_branch_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+        # Listbox avec scrollbar
+        branch_list = tk.Listbox(branch_frame, height=15, width=50, font=Fonts.DEFAULT)
+        branch_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        self.resolve_btn = ModernButton(action_container2, text="Résoudre conflits", command=self.resolve_conflicts,
-                                     width=btn_width, height=btn_height, bg_color=COLORS['warning'],
-                                     text_color=COLORS['text_dark'], state=tk.DISABLED)
-        self.resolve_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+        scrollbar = ttk.Scrollbar(branch_frame, orient="vertical", command=branch_list.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        branch_list.configure(yscrollcommand=scrollbar.set)
         
-        self.history_btn = ModernButton(action_container2, text="Historique", command=self.show_commit_history,
-                                      width=btn_width, height=btn_height, bg_color=COLORS['primary'],
-                                      state=tk.DISABLED)
-        self.history_btn.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+        # Remplir la liste des branches
+        for branch in branches:
+            branch_list.insert(tk.END, branch)
+        self.load_remote_badges([f"refs/heads/{b}" for b in branches],
+                                lambda labels: self.apply_listbox_badges(branch_list, branches, labels))
         
-        self.tag_btn = ModernButton(action_container2, text="Taguer version", command=self.create_tag,
-                                  width=btn_width, height=btn_height, bg_color=COLORS['primary'],
-                                  state=tk.DISABLED)
-        self.tag_btn.pack(side=tk.LEFT, padx=(8, 0), fill=tk.X, expand=True)
+        # Label pour afficher la branche actuelle
+        current_label = ttk.Label(main_frame, text=f"Branche actuelle: {current_branch} (non supprimable)", font=Fonts.DEFAULT)
+        current_label.pack(anchor=tk.W, pady=(0, 15))
         
-        # Frame pour les logs avec style carte et plus d'espacement
-        log_frame = ttk.LabelFrame(main_container, text="Journal", padding=15)
-        log_frame.pack(fill=tk.BOTH, expand=True)
+        # Options
+        options_frame = ttk.Frame(main_frame)
+        options_frame.pack(fill=tk.X, pady=(0, 15))
         
-        # Journal avec coloration syntaxique et une police moderne
-        self.log_text = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD, bg=COLORS['card'], 
-                                         relief=tk.FLAT, borderwidth=0, highlightthickness=0,
-                                         padx=10, pady=10)
-        self.log_text.pack(fill=tk.BOTH, expand=True)
-        self.log_text.config(state=tk.DISABLED)
+        force_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Forcer la suppression (même si non fusionnée)", variable=force_var).pack(anchor=tk.W)
         
-        # Configurer les tags pour la coloration du texte
-        self.log_text.tag_configure("info", foreground=COLORS['text_dark'])
-        self.log_text.tag_configure("error", foreground=COLORS['error'])
-        self.log_text.tag_configure("success", foreground=COLORS['success'])
-        self.log_text.tag_configure("warning", foreground=COLORS['warning'])
-        self.log_text.tag_configure("highlight", foreground=COLORS['primary'])
+        remote_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Supprimer également la branche distante", variable=remote_var).pack(anchor=tk.W)
         
-        # Barre de statut moderne avec plus d'espacement
-        status_frame = ttk.Frame(main_container, style="Card.TFrame")
-        status_frame.pack(fill=tk.X, pady=(20, 0))
+        # Boutons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
         
-        # Ajouter un subtil effet de séparateur au-dessus
-        separator = ttk.Separator(main_container, orient='horizontal')
-        separator.pack(fill=tk.X, pady=(15, 0))
+        cancel_btn = ModernButton(button_frame, text="Annuler", command=dialog.destroy,
+                               width=150, height=40, bg_color=COLORS['bg_dark'])
+        cancel_btn.pack(side=tk.RIGHT)
         
-        status_container = ttk.Frame(status_frame)
-        status_container.pack(fill=tk.X, padx=10, pady=10)
+        delete_btn = ModernButton(button_frame, text="Supprimer", 
+                               command=lambda: self.do_delete_branch(
+                                   branches[branch_list.curselection()[0]] if branch_list.curselection() else None,
+                                   force_var.get(), remote_var.get(), dialog
+                               ),
+                               width=150, height=40, bg_color=COLORS['error'])
+        delete_btn.pack(side=tk.RIGHT, padx=(0, 12))
+    
+    def do_delete_branch(self, branch_name, force, remote, dialog):
+        """Effectue la suppression de la branche"""
+        if not branch_name:
+            messagebox.showerror("Erreur", "Veuillez sélectionner une branche", parent=dialog)
+            return
         
-        self.status_label = ttk.Label(status_container, text="Prêt")
-        self.status_label.pack(side=tk.LEFT)
+        # Demander confirmation
+        if not messagebox.askyesno("Confirmation", f"Voulez-vous vraiment supprimer la branche '{branch_name}'?", parent=dialog):
+            return
         
-        # Barre de progression moderne avec coins arrondis
-        self.progress_bar = ttk.Progressbar(status_container, mode="determinate", length=200, 
-                                      style="Horizontal.TProgressbar")
-        self.progress_bar.pack(side=tk.RIGHT)
+        dialog.destroy()
+        self.operation_running = True
+        self.status_label.config(text="Suppression de la branche...")
+        self.progress_bar["value"] = 20
         
-        # Charger la liste des dépôts
-        self.load_repo_list()
+        # Lancer l'opération dans un thread
+        threading.Thread(target=lambda: self._delete_branch_thread(branch_name, force, remote)).start()
     
-    def load_repo_list(self):
-        """Charge la liste des dépôts"""
-        # Effacer la liste actuelle
-        for item in self.repo_list.get_children():
-            self.repo_list.delete(item)
-        
-        # Ajouter les dépôts
-        repos = self.repo_config.get_repos()
-        for i, repo in enumerate(repos):
-            self.repo_list.insert("", "end", values=(repo["name"]), iid=str(i))
+    def _delete_branch_thread(self, branch_name, force, remote):
+        """Thread pour supprimer une branche"""
+        try:
+            with METRICS.span("delete-branch", self.current_repo["name"]), \
+                    self.journal.operation("delete-branch", self.current_repo["name"],
+                                           [branch_name] + ([remote] if remote else []), self.git_repo):
+                # Aller dans le répertoire du dépôt
+                os.chdir(self.current_repo["local_path"])
+            
+                # Supprimer la branche locale
+                self.log(f"Suppression de la branche locale '{branch_name}'...", "info")
+            
+                if force:
+                    self.git_repo.git.branch('-D', branch_name)
+                else:
+                    self.git_repo.git.branch('-d', branch_name)
+            
+                self.progress_bar["value"] = 60
+            
+                # Supprimer la branche distante si demandé
+                if remote:
+                    self.log(f"Suppression de la branche distante '{branch_name}'...", "info")
+                    self.git_repo.git.push('origin', '--delete', branch_name)
+                    self.remember_remote_refs('origin', deleted=[f"refs/heads/{branch_name}"])
+            
+                self.progress_bar["value"] = 100
+                self.log(f"Branche '{branch_name}' supprimée avec succès", "success")
+            
+                # Mettre à jour l'interface
+                self.root.after(0, self._branch_operation_completed)
+            
+        except Exception as e:
+            self.root.after(0, lambda: self._branch_operation_error(str(e)))
     
-    def on_repo_select(self, event):
-        """Gère la sélection d'un dépôt dans la liste"""
-        selection = self.repo_list.selection()
-        if selection:
-            index = int(selection[0])
-            repos = self.repo_config.get_repos()
-            if 0 <= index < len(repos):
-                self.current_repo = repos[index]
-                self.log(f"Dépôt sélectionné: {self.current_repo['name']}")
-                
-                # Activer les boutons appropriés
-                if os.path.exists(os.path.join(self.current_repo['local_path'], '.git')):
-                    try:
-                        self.git_repo = Repo(self.current_repo['local_path'])
-                        self.commit_btn.config(state=tk.NORMAL)
-                        self.branch_btn.config(state=tk.NORMAL)
-                        self.merge_btn.config(state=tk.NORMAL)
-                        self.pull_btn.config(state=tk.NORMAL)
-                        self.push_btn.config(state=tk.NORMAL)
-                        self.switch_btn.config(state=tk.NORMAL)
-                        self.delete_branch_btn.config(state=tk.NORMAL)
-                        self.resolve_btn.config(state=tk.NORMAL)
-                        self.history_btn.config(state=tk.NORMAL)
-                        self.tag_btn.config(state=tk.NORMAL)
-                        
-                        # Afficher la branche actuelle
-                        current_branch = self.git_repo.active_branch.name
-                        self.log(f"Branche actuelle: {current_branch}", "info")
-                    except Exception as e:
-                        self.log(f"Erreur lors de l'ouverture du dépôt Git: {e}", "error")
+    def _branch_operation_completed(self):
+        """Gère la fin d'une opération sur les branches réussie"""
+        self.operation_running = False
+        self.status_label.config(text="Prêt")
+    
+    def _branch_operation_error(self, error_msg):
+        """Gère une erreur lors d'une opération sur les branches"""
+        self.operation_running = False
+        self.status_label.config(text="Erreur")
+        self.progress_bar["value"] = 0
+        self.log(f"Erreur: {error_msg}", "error")
+        messagebox.showerror("Erreur", error_msg)
+    
+    def merge_branches(self):
+        """Fusionne les branches pour le dépôt sélectionné"""
+        # Implémentation de la fusion des branches
+        pass
+    
+    def pull_changes(self):
+        """Pull les changements pour le dépôt sélectionné (fetch, puis avance rapide uniquement)"""
+        if not self.current_repo or not self.git_repo:
+            messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
+            return
+        if not self.git_repo.remotes:
+            messagebox.showerror("Erreur", "Aucun dépôt distant n'est configuré pour ce projet")
+            return
+        try:
+            branch = self.git_repo.active_branch.name
+        except TypeError:
+            messagebox.showerror("Erreur", "HEAD est détachée : aucune branche à mettre à jour")
+            return
+
+        self.operation_running = True
+        self.status_label.config(text="Pull en cours...")
+        self.progress_bar["value"] = 10
+        self.async_git.submit(self._pull_async(self.current_repo["name"], self.git_repo, branch,
+                                               self.git_repo.remotes[0].name))
+
+    async def _pull_async(self, repo_name, git_repo, branch, default_remote):
+        """Récupère le distant de la branche courante puis avance la branche si c'est possible sans fusion
+
+        Toutes les commandes passent par AsyncGit : rien ne bloque la boucle asyncio.
+        """
+        repo_path = git_repo.working_dir
+
+        async def optional(args):
+            try:
+                return (await self.async_git.run(repo_path, args, repo_name=repo_name)).strip() or None
+            except git.GitCommandError:
+                return None
+
+        try:
+            with METRICS.span("pull", repo_name, branch):
+                async with self.journal.operation_async("pull", repo_name, [branch], git_repo):
+                    remote = await optional(['config', '--get', f'branch.{branch}.remote']) or default_remote
+                    await self.async_git.run(repo_path, ['fetch', '--progress', '--prune', remote],
+                                             on_progress=lambda line, percent: self.show_git_progress(line, percent, 10, 80),
+                                             repo_name=repo_name)
+                    upstream = await optional(['rev-parse', '--abbrev-ref', f'{branch}@{{upstream}}'])
+                    if upstream:
+                        await self.async_git.run(repo_path, ['merge', '--ff-only', upstream], repo_name=repo_name)
+
+            def completed():
+                self.operation_running = False
+                self.progress_bar["value"] = 100
+                self.status_label.config(text="Prêt")
+                if upstream:
+                    self.log(f"Branche '{branch}' à jour avec '{upstream}'", "success")
                 else:
-                    self.git_repo = None
-                    self.commit_btn.config(state=tk.DISABLED)
-                    self.branch_btn.config(state=tk.DISABLED)
-                    self.merge_btn.config(state=tk.DISABLED)
-                    self.pull_btn.config(state=tk.DISABLED)
-                    self.push_btn.config(state=tk.DISABLED)
-                    self.switch_btn.config(state=tk.DISABLED)
-                    self.delete_branch_btn.config(state=tk.DISABLED)
-                    self.resolve_btn.config(state=tk.DISABLED)
-                    self.history_btn.config(state=tk.DISABLED)
-                    self.tag_btn.config(state=tk.DISABLED)
+                    self.log(f"'{remote}' récupéré ; la branche '{branch}' ne suit aucune branche distante", "info")
+                self.refresh_remote_refs(force=True)
+            self.root.after(0, completed)
+        except Exception as e:
+            self.root.after(0, lambda error=str(e): self._branch_operation_error(f"Erreur lors du pull: {error}"))
+
+    def fetch_all_repos(self):
+        """Récupère tous les distants de tous les dépôts configurés, en parallèle (dans les limites d'AsyncGit)"""
+        repos = [repo for repo in self.repo_config.get_repos()
+                 if os.path.exists(os.path.join(repo["local_path"], ".git"))]
+        if not repos:
+            messagebox.showinfo("Information", "Aucun dépôt local à récupérer")
+            return
+
+        state = {"done": 0, "errors": 0}
+        self.status_label.config(text=f"Récupération de {len(repos)} dépôt(s)...")
+        self.progress_bar["value"] = 0
+
+        def finished(repo, error=None):
+            state["done"] += 1
+            if error is None:
+                self.log(f"'{repo['name']}' récupéré", "success")
+            else:
+                state["errors"] += 1
+                self.log(f"Récupération de '{repo['name']}' impossible: {error}", "error")
+            self.progress_bar["value"] = 100 * state["done"] / len(repos)
+            if state["done"] == len(repos):
+                self.status_label.config(text="Prêt")
+                self.log(f"{len(repos) - state['errors']}/{len(repos)} dépôt(s) récupéré(s)",
+                         "success" if not state["errors"] else "warning")
+                self.refresh_remote_refs(force=True)
+
+        async def fetch(repo):
+            # L'ouverture du dépôt lit le disque : hors de la boucle
+            git_repo = await asyncio.get_running_loop().run_in_executor(None, Repo, repo["local_path"])
+            with METRICS.span("fetch", repo["name"]):
+                async with self.journal.operation_async("fetch", repo["name"], ["--all"], git_repo):
+                    await self.async_git.run(repo["local_path"], ['fetch', '--all', '--prune'],
+                                             repo_name=repo["name"])
+
+        for repo in repos:
+            self.async_git.submit(fetch(repo),
+                                  on_done=lambda result, repo=repo: self.root.after(0, lambda: finished(repo)),
+                                  on_error=lambda e, repo=repo: self.root.after(0, lambda: finished(repo, str(e))))
     
-    def add_repo_dialog(self):
-        """Affiche la boîte de dialogue pour ajouter un dépôt"""
+    def show_status_panel(self):
+        """Panneau des modifications de la copie de travail, rafraîchi en continu par différences"""
+        if not self.current_repo or not self.git_repo:
+            messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
+            return
+
+        repo_name = self.current_repo["name"]
+        repo_path = self.git_repo.working_dir
+        settings_status = WorkingTreeStatus(self.git_repo)
+
+        # Fenêtre non modale : elle reste ouverte pendant que l'on travaille
         dialog = tk.Toplevel(self.root)
-        dialog.title("Ajouter un dépôt")
-        dialog.geometry("750x750")
+        dialog.title(f"Modifications - {repo_name}")
+        dialog.geometry("850x600")
         dialog.transient(self.root)
-        dialog.grab_set()
         dialog.configure(bg=COLORS['bg_light'])
+
+        # Centrer la boîte de dialogue
+        self.center_window(dialog)
+
+        # Frame principal
+        main_frame = ttk.Frame(dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Titre
+        title_label = ttk.Label(main_frame, text="Modifications en cours", style="Title.TLabel")
+        title_label.pack(anchor=tk.W, pady=(0, 5))
+
+        branch_var = tk.StringVar()
+        ttk.Label(main_frame, textvariable=branch_var).pack(anchor=tk.W, pady=(0, 10))
+
+        # Accélérateurs de git status, propres à ce dépôt
+        options_frame = ttk.Frame(main_frame)
+        options_frame.pack(fill=tk.X, pady=(0, 10))
+        untracked_cache_var = tk.BooleanVar()
+        fsmonitor_var = tk.BooleanVar()
+        untracked_cache_check = ttk.Checkbutton(options_frame, text="Cache des fichiers non suivis",
+                                                variable=untracked_cache_var)
+        untracked_cache_check.pack(side=tk.LEFT)
+        fsmonitor_check = ttk.Checkbutton(options_frame, text="Surveillance des fichiers (fsmonitor)",
+                                          variable=fsmonitor_var)
+        fsmonitor_check.pack(side=tk.LEFT, padx=(20, 0))
+
+        # Liste des fichiers ; l'identifiant de chaque ligne est le chemin, pour la mise à jour en place
+        list_frame = ttk.Frame(main_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+
+        columns = ("path", "index", "worktree", "orig")
+        file_list = ttk.Treeview(list_frame, columns=columns, show="headings", height=15, selectmode="browse")
+        file_list.heading("path", text="Fichier")
+        file_list.heading("index", text="Index")
+        file_list.heading("worktree", text="Copie de travail")
+        file_list.heading("orig", text="Ancien chemin")
+        file_list.column("path", width=380)
+        file_list.column("index", width=100)
+        file_list.column("worktree", width=120)
+        file_list.column("orig", width=200)
+
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=file_list.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        file_list.configure(yscrollcommand=scrollbar.set)
+        file_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        status_var = tk.StringVar(value="Lecture de l'état...")
+        ttk.Label(main_frame, textvariable=status_var).pack(anchor=tk.W, pady=(0, 10))
+
+        # Chemins affichés, triés : position d'insertion des nouvelles lignes
+        order = []
+        view = f"status:{uuid.uuid4().hex}"
+        state = {"running": False, "job": None, "delay": STATUS_POLL_INTERVAL}
+
+        def apply(result, elapsed):
+            if not dialog.winfo_exists():
+                return
+            state["running"] = False
+            if result["reset"]:
+                # Nouvel état complet (premier appel ou processus relancé) : retirer ce qui n'y est plus
+                for path in [path for path in order if path not in result["changed"]]:
+                    result["removed"].append(path)
+            for path in result["removed"]:
+                if file_list.exists(path):
+                    file_list.delete(path)
+                    order.pop(bisect.bisect_left(order, path))
+            for path, (xy, orig) in result["changed"].items():
+                values = (path, *WorkingTreeStatus.labels(xy), orig)
+                if file_list.exists(path):
+                    file_list.item(path, values=values)
+                else:
+                    position = bisect.bisect_left(order, path)
+                    order.insert(position, path)
+                    file_list.insert("", position, iid=path, values=values)
+
+            headers = result["headers"]
+            branch = headers.get("branch.head", "")
+            text = f"Branche: {branch}" if branch != "(detached)" else "HEAD détachée"
+            if headers.get("branch.upstream"):
+                ahead, _, behind = headers.get("branch.ab", "+0 -0").partition(" ")
+                text += f"  -  suit {headers['branch.upstream']} ({ahead.lstrip('+')} à pousser, " \
+                        f"{behind.lstrip('-')} en retard)"
+            branch_var.set(text)
+            status_var.set(f"{result['count']} fichier(s) modifié(s) ou non suivi(s)  -  "
+                           f"état lu en {elapsed * 1000:.0f} ms")
+            # Espacer les lectures si git status est lent sur ce dépôt
+            state["delay"] = max(STATUS_POLL_INTERVAL, int(elapsed * 5000))
+            schedule()
+
+        def failed(error):
+            if not dialog.winfo_exists():
+                return
+            state["running"] = False
+            status_var.set(f"Erreur: {error}")
+            schedule()
+
+        def refresh():
+            if state["job"] is not None:
+                self.root.after_cancel(state["job"])
+                state["job"] = None
+            if state["running"] or not dialog.winfo_exists():
+                return
+            state["running"] = True
+
+            def worker():
+                start = time.perf_counter()
+                try:
+                    result = self.parse_pool.run(parse_worktree_status, repo_path, view, key=repo_path)
+                    elapsed = time.perf_counter() - start
+                    self.root.after(0, lambda: apply(result, elapsed))
+                except Exception as e:
+                    self.root.after(0, lambda error=str(e): failed(error))
+            threading.Thread(target=worker, daemon=True).start()
+
+        def schedule():
+            if state["job"] is None and dialog.winfo_exists():
+                state["job"] = self.root.after(state["delay"], refresh)
+
+        def load_settings():
+            untracked_cache, fsmonitor = settings_status.settings()
+            untracked_cache_var.set(untracked_cache)
+            fsmonitor_var.set(fsmonitor)
+
+        def toggle(setter, variable, label):
+            enabled = variable.get()
+            status_var.set(f"{label}: {'activation' if enabled else 'désactivation'}...")
+
+            def worker():
+                try:
+                    setter(enabled)
+                    self.root.after(0, lambda: self.log(
+                        f"{label} {'activé' if enabled else 'désactivé'} pour '{repo_name}'", "success"))
+                except Exception as e:
+                    self.root.after(0, lambda error=str(e): messagebox.showerror("Erreur", error, parent=dialog)
+                                    if dialog.winfo_exists() else None)
+                self.root.after(0, lambda: (load_settings(), refresh()) if dialog.winfo_exists() else None)
+            threading.Thread(target=worker, daemon=True).start()
+
+        untracked_cache_check.configure(command=lambda: toggle(settings_status.set_untracked_cache,
+                                                               untracked_cache_var, "Cache des fichiers non suivis"))
+        fsmonitor_check.configure(command=lambda: toggle(settings_status.set_fsmonitor, fsmonitor_var, "fsmonitor"))
+        load_settings()
+        if not fsmonitor_var.get() and not settings_status.fsmonitor_supported():
+            fsmonitor_check.configure(state=tk.DISABLED, text="Surveillance des fichiers (fsmonitor, non disponible)")
+
+        def close():
+            if state["job"] is not None:
+                self.root.after_cancel(state["job"])
+            dialog.destroy()
+
+        dialog.protocol("WM_DELETE_WINDOW", close)
+
+        # Boutons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
+
+        ModernButton(button_frame, text="Fermer", command=close,
+                     width=120, height=36, bg_color=COLORS['bg_dark']).pack(side=tk.RIGHT, padx=(10, 0))
+        ModernButton(button_frame, text="Actualiser", command=refresh,
+                     width=120, height=36, bg_color=COLORS['secondary']).pack(side=tk.RIGHT)
+
+        refresh()
+
+    def show_commit_history(self):
+        """Affiche l'historique des commits"""
+        if not self.current_repo or not self.git_repo:
+            messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
+            return
         
-        # Centrer la boîte de dialogue
-        self.center_window(dialog)
+        # Créer la fenêtre d'historique
+        history_window = tk.Toplevel(self.root)
+        history_window.title("Historique des commits")
+        history_window.geometry("900x700")
+        history_window.transient(self.root)
+        history_window.grab_set()
+        history_window.configure(bg=COLORS['bg_light'])
         
-        # Frame principal avec marge
-        main_frame = ttk.Frame(dialog, padding="25")
+        # Centrer la fenêtre
+        self.center_window(history_window)
+        
+        # Frame principal
+        main_frame = ttk.Frame(history_window, padding="20")
         main_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Titre plus visible sans icône
-        title_label = ttk.Label(main_frame, text="Ajouter un nouveau dépôt Git", style="Title.TLabel")
-        title_label.pack(anchor=tk.W, pady=(0, 25))
+        # Titre
+        title_label = ttk.Label(main_frame, text="Historique des commits", style="Title.TLabel")
+        title_label.pack(anchor=tk.W, pady=(0, 15))
         
-        # Conteneur pour les formulaires
-        form_container = ttk.Frame(main_frame)
-        form_container.pack(fill=tk.BOTH, expand=True)
+        # Informations sur le dépôt
+        info_frame = ttk.Frame(main_frame)
+        info_frame.pack(fill=tk.X, pady=(0, 15))
         
-        # Style pour les labels de formulaire - plus d'espace
-        form_label_style = {"anchor": tk.W, "padding": (0, 12, 0, 6)}
+        branch_label = ttk.Label(info_frame, text=f"Branche: {self.git_repo.active_branch.name}", font=Fonts.DEFAULT)
+        branch_label.pack(side=tk.LEFT)
         
-        # Champs de formulaire avec plus d'espace et meilleure présentation
-        ttk.Label(form_container, text="Nom du dépôt:", **form_label_style).grid(row=0, column=0, sticky=tk.W)
-        name_var = tk.StringVar()
-        ttk.Entry(form_container, textvariable=name_var, width=50).grid(row=0, column=1, sticky=tk.W, pady=6)
+        # Options de filtrage
+        filter_frame = ttk.LabelFrame(main_frame, text="Filtres", padding="10")
+        filter_frame.pack(fill=tk.X, pady=(0, 15))
         
-        ttk.Label(form_container, text="Dossier local:", **form_label_style).grid(row=1, column=0, sticky=tk.W)
-        local_path_var = tk.StringVar(value=os.getcwd())
-        local_path_entry = ttk.Entry(form_container, textvariable=local_path_var, width=50)
-        local_path_entry.grid(row=1, column=1, sticky=tk.W, pady=6)
+        # Filtre par auteur
+        author_frame = ttk.Frame(filter_frame)
+        author_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(author_frame, text="Auteur:").pack(side=tk.LEFT, padx=(0, 5))
+        author_var = tk.StringVar()
+        author_entry = ttk.Entry(author_frame, textvariable=author_var, width=30)
+        author_entry.pack(side=tk.LEFT)
         
-        browse_btn = ModernButton(form_container, text="Parcourir...", 
-                                command=lambda: local_path_var.set(filedialog.askdirectory()),
-                                width=120, height=36)
-        browse_btn.grid(row=1, column=2, sticky=tk.W, pady=6, padx=(12, 0))
+        # Filtre par message
+        message_frame = ttk.Frame(filter_frame)
+        message_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(message_frame, text="Message:").pack(side=tk.LEFT, padx=(0, 5))
+        message_var = tk.StringVar()
+        message_entry = ttk.Entry(message_frame, textvariable=message_var, width=30)
+        message_entry.pack(side=tk.LEFT)
         
-        ttk.Label(form_container, text="URL du dépôt distant:", **form_label_style).grid(row=2, column=0, sticky=tk.W)
-        remote_url_var = tk.StringVar()
-        ttk.Entry(form_container, textvariable=remote_url_var, width=50).grid(row=2, column=1, sticky=tk.W, pady=6)
+        # Nombre de commits à afficher
+        limit_frame = ttk.Frame(filter_frame)
+        limit_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(limit_frame, text="Nombre de commits:").pack(side=tk.LEFT, padx=(0, 5))
+        limit_var = tk.StringVar(value="50")
+        limit_entry = ttk.Entry(limit_frame, textvariable=limit_var, width=10)
+        limit_entry.pack(side=tk.LEFT)
         
-        ttk.Label(form_container, text="Branche par défaut:", **form_label_style).grid(row=3, column=0, sticky=tk.W)
-        branch_var = tk.StringVar(value="main")
-        ttk.Entry(form_container, textvariable=branch_var, width=50).grid(row=3, column=1, sticky=tk.W, pady=6)
+        # Recherche indexée (mots, author:, path:, date:AAAA-MM, préfixe*)
+        search_frame = ttk.Frame(filter_frame)
+        search_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(search_frame, text="Recherche:").pack(side=tk.LEFT, padx=(0, 5))
+        search_var = tk.StringVar()
+        search_entry = ttk.Combobox(search_frame, textvariable=search_var, width=40)
+        search_entry.pack(side=tk.LEFT)
+        index_label = ttk.Label(search_frame, text="Index: mise à jour...", foreground=COLORS['text_secondary'])
+        index_label.pack(side=tk.LEFT, padx=(10, 0))
+
+        def complete_search(event):
+            # Compléter le dernier mot saisi à partir du vocabulaire de l'index
+            index = self.search_indexes.get(self.current_repo["local_path"])
+            text = search_var.get()
+            if index is None or not text or text.endswith(" "):
+                return
+            head, _, word = text.rpartition(" ")
+            field, sep, term = word.rpartition(":")
+            try:
+                suggestions = index.complete(term)
+            except Exception:
+                return
+            base = (head + " " if head else "") + (field + sep if sep else "")
+            search_entry["values"] = [base + suggestion for suggestion in suggestions]
+
+        search_entry.bind("<KeyRelease>", complete_search)
+
+        # Bouton d'application des filtres
+        filter_btn = ModernButton(filter_frame, text="Appliquer les filtres", 
+                               command=lambda: self.load_commit_history(
+                                   history_list, author_var.get(), message_var.get(), limit_var.get(),
+                                   search_var.get()
+                               ),
+                               width=150, height=36, bg_color=COLORS['primary'])
+        filter_btn.pack(anchor=tk.E, pady=(5, 0))
         
-        ttk.Label(form_container, text="Fichiers/dossiers à exclure:", **form_label_style).grid(row=4, column=0, sticky=tk.W)
+        # Liste des commits
+        list_frame = ttk.Frame(main_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
         
-        # Cadre avec ombre pour la zone de texte
-        excluded_frame = ttk.Frame(form_container)
-        excluded_frame.grid(row=5, column=0, columnspan=3, sticky=tk.W+tk.E, pady=6)
+        columns = ("graph", "hash", "author", "date", "message")
+        history_list = ttk.Treeview(list_frame, columns=columns, show="headings", height=15)
         
-        # Zone de texte avec bordure et fond blanc plus élégante
-        excluded_text = scrolledtext.ScrolledText(excluded_frame, wrap=tk.WORD, width=55, height=15,
-                                              bg=COLORS['card'], relief=tk.FLAT, 
-                                              borderwidth=1, highlightthickness=1,
-                                              highlightbackground=COLORS['divider'],
-                                              padx=10, pady=10)
-        excluded_text.pack(fill=tk.BOTH, expand=True)
-        excluded_text.insert(tk.END, "__pycache__/\n*.py[cod]\n*$py.class\n*.so\n.env\n.venv\nenv/\nvenv/\nENV/\nenv.bak/\nvenv.bak/\n.idea/\n.vscode/")
+        # En-têtes
+        history_list.heading("graph", text="Graphe")
+        history_list.heading("hash", text="Hash")
+        history_list.heading("author", text="Auteur")
+        history_list.heading("date", text="Date")
+        history_list.heading("message", text="Message")
         
-        # Boutons pour parcourir les fichiers/dossiers à exclure
-        exclude_btn_frame = ttk.Frame(form_container)
-        exclude_btn_frame.grid(row=6, column=0, columnspan=3, sticky=tk.W, pady=(8, 18))
+        # Largeur des colonnes
+        history_list.column("graph", width=90, stretch=False)
+        history_list.column("hash", width=80)
+        history_list.column("author", width=150)
+        history_list.column("date", width=150)
+        history_list.column("message", width=400)
         
-        def add_exclude_files():
-            fichiers = filedialog.askopenfilenames(title="Sélectionner des fichiers à exclure")
-            if fichiers:
-                # Extraire les noms des fichiers du chemin complet
-                for fichier in fichiers:
-                    nom_fichier = os.path.basename(fichier)
-                    excluded_text.insert(tk.END, f"\n{nom_fichier}")
+        # Scrollbar
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=history_list.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Charger la page suivante quand on approche de la fin de la liste
+        def on_history_scroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) > 0.9:
+                history_window.after_idle(lambda: self.load_history_page(history_list))
+
+        history_list.configure(yscrollcommand=on_history_scroll)
+        history_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        history_list.bind("<Destroy>", lambda e: self.history_pagers.pop(str(history_list), None))
+
+        # Proposer d'écrire le commit-graph s'il est absent
+        reader = self.get_native_reader()
+        if reader is not None and reader.commit_graph is None:
+            graph_label = ttk.Label(info_frame, text="Pas de fichier commit-graph : le graphe est calculé par git log.",
+                                    foreground=COLORS['text_secondary'])
+            graph_label.pack(side=tk.LEFT, padx=(20, 10))
+            graph_btn = ModernButton(info_frame, text="Écrire le commit-graph",
+                                     command=lambda: self.write_commit_graph(
+                                         history_list, author_var.get(), message_var.get(), limit_var.get(),
+                                         [graph_label, graph_btn]),
+                                     width=180, height=32, bg_color=COLORS['primary'])
+            graph_btn.pack(side=tk.LEFT)
         
-        def add_exclude_dir():
-            dossier = filedialog.askdirectory(title="Sélectionner un dossier à exclure")
-            if dossier:
-                # Extraire le nom du dossier du chemin complet
-                nom_dossier = os.path.basename(dossier)
-                excluded_text.insert(tk.END, f"\n{nom_dossier}/")
+        # Zone de détails du commit
+        details_frame = ttk.LabelFrame(main_frame, text="Détails du commit", padding="10")
+        details_frame.pack(fill=tk.X, pady=(0, 15))
         
-        # Boutons avec meilleur espacement
-        add_files_btn = ModernButton(exclude_btn_frame, text="Ajouter fichiers...", 
-                                   command=add_exclude_files, width=150, height=36)
-        add_files_btn.pack(side=tk.LEFT, padx=(0, 12))
+        details_text = scrolledtext.ScrolledText(details_frame, wrap=tk.WORD, height=10)
+        details_text.pack(fill=tk.BOTH, expand=True)
+        details_text.config(state=tk.DISABLED)
         
-        add_dir_btn = ModernButton(exclude_btn_frame, text="Ajouter dossier...", 
-                                 command=add_exclude_dir, width=150, height=36)
-        add_dir_btn.pack(side=tk.LEFT)
+        # Fonction pour afficher les détails d'un commit
+        details_state = {"selected": None}
+
+        def show_commit_details(event):
+            selection = history_list.selection()
+            if not selection:
+                return
+            
+            # L'identifiant de la ligne est le hash complet du commit
+            commit_hash = selection[0]
+            details_state["selected"] = commit_hash
+
+            def display(text):
+                # Ignorer la réponse si un autre commit a été sélectionné entre-temps
+                if details_state["selected"] != commit_hash or not details_text.winfo_exists():
+                    return
+                details_text.config(state=tk.NORMAL)
+                details_text.delete(1.0, tk.END)
+                details_text.insert(tk.END, text)
+                details_text.config(state=tk.DISABLED)
+
+            def worker():
+                try:
+                    details = self.get_commit_details(commit_hash)
+                except Exception as e:
+                    details = f"Erreur lors de la récupération des détails: {str(e)}"
+                self.root.after(0, lambda: display(details))
+            threading.Thread(target=worker, daemon=True).start()
+        
+        # Lier l'événement de sélection ; le double-clic ouvre le diff du commit
+        history_list.bind("<<TreeviewSelect>>", show_commit_details)
+        history_list.bind("<Double-1>", lambda event: history_list.selection() and
+                          self.show_diff_viewer(history_list.selection()[0]))
         
-        # Séparateur plus visible
-        separator = ttk.Separator(main_frame, orient='horizontal')
-        separator.pack(fill=tk.X, pady=18)
+        # Boutons d'action
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
         
-        # Boutons d'action plus élégants avec style ModernButton
-        btn_frame = ttk.Frame(main_frame)
-        btn_frame.pack(fill=tk.X)
+        close_btn = ModernButton(button_frame, text="Fermer", command=history_window.destroy,
+                              width=150, height=40, bg_color=COLORS['bg_dark'])
+        close_btn.pack(side=tk.RIGHT)
         
-        # Option pour initialiser ou pas un nouveau dépôt
-        init_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(btn_frame, text="Initialiser un nouveau dépôt Git", variable=init_var).pack(side=tk.LEFT)
+        tag_btn = ModernButton(button_frame, text="Créer un tag", 
+                            command=lambda: self.create_tag_from_commit(
+                                history_list.selection()[0] if history_list.selection() else None
+                            ),
+                            width=150, height=40, bg_color=COLORS['primary'])
+        tag_btn.pack(side=tk.RIGHT, padx=(0, 12))
+
+        diff_btn = ModernButton(button_frame, text="Voir le diff",
+                             command=lambda: history_list.selection() and
+                             self.show_diff_viewer(history_list.selection()[0]),
+                             width=150, height=40, bg_color=COLORS['primary'])
+        diff_btn.pack(side=tk.RIGHT, padx=(0, 12))
         
-        cancel_btn = ModernButton(btn_frame, text="Annuler", command=dialog.destroy,
-                               width=150, height=40, bg_color=COLORS['bg_dark'],
-                               hover_color='#455A64')
-        cancel_btn.pack(side=tk.RIGHT)
+        # Charger l'historique et mettre l'index de recherche à jour en arrière-plan
+        self.load_commit_history(history_list, "", "", "50")
+        self.update_search_index(
+            lambda count: index_label.winfo_exists() and index_label.config(text=f"Index: {count} commits"))
+    
+    def load_commit_history(self, history_list, author, message, limit, search=""):
+        """Charge la première page de l'historique avec les filtres spécifiés"""
+        # Vider la liste
+        for item in history_list.get_children():
+            history_list.delete(item)
+
+        # Convertir la limite (taille de page) en entier
+        try:
+            page_size = max(1, int(limit))
+        except ValueError:
+            page_size = 50
+
+        if search.strip():
+            index = self.search_indexes.get(self.current_repo["local_path"])
+            if index is not None:
+                self.history_pagers.pop(str(history_list), None)
+                try:
+                    with METRICS.span("search", self.current_repo["name"], search):
+                        results = index.search(search, page_size)
+                    for commit_hash, author_name, date, subject in results:
+                        history_list.insert("", "end", iid=commit_hash,
+                                            values=("", commit_hash[:8], author_name, date, subject))
+                except Exception as e:
+                    messagebox.showerror("Erreur", f"Erreur lors de la recherche: {str(e)}")
+                return
+            # Index indisponible : repli sur git log --grep
+            self.log("Index de recherche indisponible, recherche par git log --grep", "warning")
+            message = message or search
+
+        # Le graphe n'a de sens que sur l'historique complet, sans filtre
+        layout = GraphLaneLayout() if not author and not message else None
+
+        # Le parcours (natif ou git log) et l'analyse des commits ont lieu dans un processus du pool
+        pager = PooledHistoryPager(self.parse_pool, self.git_repo.working_dir, author, message, page_size,
+                                   need_graph=layout is not None)
+        self.history_pagers[str(history_list)] = (pager, layout)
+        self.load_history_page(history_list)
+
+    def load_history_page(self, history_list):
+        """Charge la page suivante de l'historique dans un thread, puis l'ajoute et prolonge le graphe"""
+        state = self.history_pagers.get(str(history_list))
+        if state is None or state[0].exhausted or state[0].loading:
+            return
+        pager, layout = state
+        pager.loading = True
+        repo_name = self.current_repo["name"]
+
+        def append(rows):
+            pager.loading = False
+            # Vue fermée ou rechargée entre-temps
+            if self.history_pagers.get(str(history_list)) is not state:
+                return
+            for row in rows:
+                graph = layout.add(row["sha"], row["parents"]) if layout is not None else ""
+                history_list.insert("", "end", iid=row["sha"],
+                                    values=(graph, row["sha"][:8], row["author"], row["date"], row["subject"]))
+
+        def failed(error_msg):
+            pager.loading = False
+            pager.exhausted = True
+            messagebox.showerror("Erreur", f"Erreur lors du chargement de l'historique: {error_msg}")
+
+        def worker():
+            try:
+                with METRICS.span("history", repo_name):
+                    rows = pager.next_page()
+                self.root.after(0, lambda: append(rows))
+            except Exception as e:
+                self.root.after(0, lambda error=str(e): failed(error))
+        threading.Thread(target=worker, daemon=True).start()
+
+    def update_search_index(self, callback=None):
+        """Met à jour l'index de recherche du dépôt courant dans un thread"""
+        repo_path = self.current_repo["local_path"]
+        git_repo = self.git_repo
+
+        def worker():
+            try:
+                index = self.search_indexes.get(repo_path)
+                if index is None:
+                    index = CommitSearchIndex(git_repo, repo_path)
+                    self.search_indexes[repo_path] = index
+                added = index.update()
+                if added:
+                    self.log(f"Index de recherche: {added} commit(s) ajouté(s)", "info")
+                if callback:
+                    count = index.count()
+                    self.root.after(0, lambda: callback(count))
+            except Exception as e:
+                self.root.after(0, lambda error=str(e): self.log(f"Erreur lors de l'indexation: {error}", "error"))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def write_commit_graph(self, history_list, author, message, limit, widgets):
+        """Écrit le fichier commit-graph puis recharge l'historique"""
+        self.operation_running = True
+        self.status_label.config(text="Écriture du commit-graph...")
+        self.progress_bar["value"] = 20
+
+        # Libérer l'ancien fichier projeté en mémoire avant que git ne le remplace
+        reader = self.get_native_reader()
+        if reader is not None and reader.commit_graph is not None:
+            reader.commit_graph.close()
+            reader.commit_graph = None
+
+        def worker():
+            try:
+                with METRICS.span("commit-graph", self.current_repo["name"]):
+                    GitOperations(self.git_repo).write_commit_graph()
+                self.progress_bar["value"] = 100
+                self.log("Fichier commit-graph écrit avec succès", "success")
+                self.root.after(0, completed)
+            except Exception as e:
+                self.root.after(0, lambda error=str(e): self._branch_operation_error(error))
+
+        def completed():
+            self.operation_running = False
+            self.status_label.config(text="Prêt")
+            if reader is not None:
+                reader.refresh_commit_graph()
+            for widget in widgets:
+                widget.destroy()
+            if history_list.winfo_exists():
+                self.load_commit_history(history_list, author, message, limit)
+
+        threading.Thread(target=worker).start()
+
+    def get_native_reader(self):
+        """Renvoie le lecteur d'objets natif du dépôt courant, ou None s'il n'est pas utilisable"""
+        if self.native_reader is None and self.current_repo:
+            try:
+                # Espace de travail courant : un checkout du pool a son propre HEAD
+                self.native_reader = NativeGitReader(self.git_repo.working_dir if self.git_repo
+                                                     else self.current_repo["local_path"])
+            except Exception as e:
+                self.log(f"Lecteur natif indisponible, utilisation de git: {e}", "warning")
+                return None
+        return self.native_reader
+
+    def close_native_reader(self):
+        """Libère les packs projetés en mémoire par le lecteur natif"""
+        if self.native_reader is not None:
+            self.native_reader.close()
+            self.native_reader = None
+
+    def list_branches(self):
+        """Renvoie les branches locales sans sous-processus, avec repli sur GitPython"""
+        reader = self.get_native_reader()
+        if reader is not None:
+            try:
+                return reader.list_branches()
+            except Exception:
+                pass
+        return GitOperations(self.git_repo).list_branches()
+
+    def get_worktree_pool(self):
+        """Renvoie le pool de checkouts du dépôt courant"""
+        repo_path = self.current_repo["local_path"]
+        pool = self.worktree_pools.get(repo_path)
+        if pool is None:
+            pool = WorktreePool(Repo(repo_path), repo_path,
+                                self.current_repo.get("worktree_pool_size", WORKTREE_POOL_SIZE),
+                                self.current_repo.get("worktree_disk_budget", WORKTREE_DISK_BUDGET))
+            self.worktree_pools[repo_path] = pool
+        return pool
+
+    def set_workspace(self, path):
+        """Fait pointer l'application sur un autre checkout du dépôt courant"""
+        self.close_native_reader()
+        self.git_repo = Repo(path)
+        main_path = os.path.normcase(os.path.abspath(self.current_repo["local_path"]))
+        active = None if os.path.normcase(os.path.abspath(path)) == main_path else path
+        if self.current_repo.get("active_worktree") != active:
+            self.repo_config.update_repo(self.repo_config.index_of(self.current_repo), active_worktree=active)
+        self.log(f"Espace de travail: {path}", "info")
+
+    def get_remote_ref_cache(self):
+        """Renvoie le cache des références distantes du dépôt courant"""
+        repo_path = self.current_repo["local_path"]
+        cache = self.remote_ref_caches.get(repo_path)
+        if cache is None or cache.git_repo is not self.git_repo:
+            cache = RemoteRefCache(self.git_repo, repo_path,
+                                   self.current_repo.get("remote_refs_ttl", REMOTE_REFS_TTL))
+            self.remote_ref_caches[repo_path] = cache
+        return cache
+
+    def get_repo_analytics(self):
+        """Renvoie les statistiques de taille du dépôt courant (résultat mis en cache)"""
+        repo_path = self.current_repo["local_path"]
+        analytics = self.repo_analytics.get(repo_path)
+        if analytics is None or analytics.git_repo is not self.git_repo:
+            analytics = RepoAnalytics(self.git_repo, repo_path)
+            self.repo_analytics[repo_path] = analytics
+        return analytics
+
+    def default_remote(self):
+        return self.git_repo.remotes[0].name if self.git_repo and self.git_repo.remotes else None
+
+    def refresh_remote_refs(self, callback=None, force=False):
+        """Lance git ls-remote, en parallèle sur la boucle asyncio, pour chaque distant dont l'instantané est périmé"""
+        if not self.git_repo or not self.git_repo.remotes:
+            return
+        cache = self.get_remote_ref_cache()
+        for remote in self.git_repo.remotes:
+            if force or cache.is_stale(remote.name):
+                # Un miroir synchronisé depuis moins de ttl évite l'accès réseau
+                source = self.mirrors.mirror_for(self.current_repo.get("remote_url"), cache.ttl) \
+                    if self.current_repo and remote.url == self.current_repo.get("remote_url") else None
+                remote = remote.name
+                self.async_git.submit(
+                    cache.refresh_async(self.async_git, remote, source),
+                    on_done=lambda refreshed, remote=remote: refreshed and callback and self.root.after(
+                        0, lambda: callback(remote)),
+                    on_error=lambda e, remote=remote: self.root.after(0, lambda: self.log(
+                        f"Lecture des références de '{remote}' impossible: {str(e)}", "warning")))
+
+    def load_remote_badges(self, refs, apply, remote=None):
+        """Calcule les badges des références depuis l'instantané, puis à nouveau après rafraîchissement
+
+        apply reçoit {référence: libellé} dans le thread Tk ; aucun appel réseau ne le retarde.
+        """
+        remote = remote or self.default_remote()
+        if remote is None or not refs:
+            return
+        cache = self.get_remote_ref_cache()
+
+        def compute():
+            try:
+                statuses = cache.compare(remote, refs)
+                if statuses is not None:
+                    labels = {ref: RemoteRefCache.BADGES[status] for ref, status in statuses.items()}
+                    self.root.after(0, lambda: apply(labels))
+            except Exception as e:
+                self.root.after(0, lambda error=str(e): self.log(f"Comparaison avec le distant impossible: {error}", "warning"))
+
+        def worker():
+            compute()
+            if cache.is_stale(remote):
+                # Interrogation du distant sur la boucle asyncio, puis nouvelle comparaison locale
+                self.async_git.submit(
+                    cache.refresh_async(self.async_git, remote),
+                    on_done=lambda refreshed: refreshed and threading.Thread(target=compute, daemon=True).start(),
+                    on_error=lambda e: self.root.after(0, lambda: self.log(
+                        f"Lecture des références de '{remote}' impossible: {str(e)}", "warning")))
+        threading.Thread(target=worker, daemon=True).start()
+
+    @staticmethod
+    def apply_listbox_badges(listbox, names, labels, prefix="refs/heads/"):
+        """Réécrit les lignes d'une Listbox avec leur badge, en conservant sélection et couleurs"""
+        if not listbox.winfo_exists():
+            return
+        selection = set(listbox.curselection())
+        for i, name in enumerate(names):
+            badge = labels.get(prefix + name)
+            colors = {option: listbox.itemcget(i, option) for option in ("bg", "fg")}
+            listbox.delete(i)
+            listbox.insert(i, f"{name}    [{badge}]" if badge else name)
+            listbox.itemconfig(i, **{option: value for option, value in colors.items() if value})
+            if i in selection:
+                listbox.selection_set(i)
+
+    def remember_remote_refs(self, remote, pushed=(), deleted=()):
+        """Reporte nos propres push et suppressions dans l'instantané, sans interroger le distant"""
+        try:
+            cache = self.get_remote_ref_cache()
+            if pushed:
+                local = cache.local_refs()
+                cache.record_push(remote, {ref: local[ref] for ref in pushed if ref in local})
+            if deleted:
+                cache.record_delete(remote, deleted)
+        except Exception as e:
+            self.log(f"Mise à jour du cache des références distantes impossible: {str(e)}", "warning")
+
+    def get_commit_details(self, commit_hash):
+        """Construit le texte de détail d'un commit (lu dans un processus du pool, à appeler hors du thread Tk)"""
+        sha, author_name, email, timestamp, message, files = self.parse_pool.run(
+            parse_commit_details, self.git_repo.working_dir, commit_hash)
+
+        details = f"Commit: {sha}\n"
+        details += f"Auteur: {author_name} <{email}>\n"
+        details += f"Date: {datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')}\n"
+        details += f"Message:\n{message}\n\n"
+
+        details += "Fichiers modifiés:\n"
+        for path in files:
+            details += f"- {path}\n"
+        return details
+
+    def create_tag_from_commit(self, commit_hash):
+        """Crée un tag à partir d'un commit spécifique"""
+        if not commit_hash:
+            messagebox.showerror("Erreur", "Veuillez sélectionner un commit")
+            return
         
-        save_btn = ModernButton(btn_frame, text="Enregistrer", 
-                             command=lambda: self.save_new_repo(
-                                 name_var.get(), local_path_var.get(), remote_url_var.get(), 
-                                 branch_var.get(), excluded_text.get("1.0", tk.END).splitlines(),
-                                 init_var.get(), dialog
-                             ),
-                             width=150, height=40, bg_color=COLORS['primary'])
-        save_btn.pack(side=tk.RIGHT, padx=(0, 12))
-    
-    def save_new_repo(self, name, local_path, remote_url, branch, excluded_files, init_repo, dialog):
-        """Sauvegarde un nouveau dépôt"""
-        if not name or not local_path:
-            messagebox.showerror("Erreur", "Le nom du dépôt et le dossier local sont obligatoires", parent=dialog)
+        # Demander le nom du tag
+        tag_name = simpledialog.askstring("Nouveau tag", "Nom du tag:", parent=self.root)
+        if not tag_name:
             return
         
-        # Nettoyer la liste des fichiers exclus (enlever les lignes vides)
-        excluded_files = [f.strip() for f in excluded_files if f.strip()]
+        # Demander un message pour le tag
+        tag_message = simpledialog.askstring("Message du tag", "Message (optionnel):", parent=self.root)
         
+        # Demander si on veut pousser le tag
+        push_tag = messagebox.askyesno("Pousser le tag", "Voulez-vous pousser ce tag vers le dépôt distant?")
+
+        self.operation_running = True
+        self.status_label.config(text="Création du tag...")
+        self.progress_bar["value"] = 20
+
+        # Lancer l'opération dans un thread pour ne pas bloquer l'interface
+        threading.Thread(target=lambda: self._create_tag_from_commit_thread(
+            tag_name, commit_hash, tag_message, push_tag)).start()
+
+    def _create_tag_from_commit_thread(self, tag_name, commit_hash, tag_message, push_tag):
+        """Thread pour créer un tag sur un commit spécifique"""
         try:
-            # Créer le dossier local s'il n'existe pas
-            if not os.path.exists(local_path):
-                os.makedirs(local_path)
-            
-            # Initialiser un nouveau dépôt si demandé
-            if init_repo:
-                if not os.path.exists(os.path.join(local_path, '.git')):
-                    self.log(f"Initialisation d'un nouveau dépôt Git dans {local_path}", "info")
-                    repo = Repo.init(local_path)
-                    
-                    # Créer un fichier .gitignore avec les exclusions
-                    if excluded_files:
-                        with open(os.path.join(local_path, '.gitignore'), 'w') as f:
-                            f.write('\n'.join(excluded_files))
-                        
-                        # Ajouter le .gitignore au dépôt
-                        repo.git.add('.gitignore')
-                        repo.git.commit('-m', 'Initial commit: Add .gitignore')
-                    
-                    # Configurer l'URL distante si fournie
-                    if remote_url:
-                        repo.create_remote('origin', remote_url)
-                else:
-                    self.log(f"Un dépôt Git existe déjà dans {local_path}", "warning")
-            
-            # Ajouter le dépôt à la configuration
-            self.repo_config.add_repo(name, local_path, remote_url, branch, excluded_files)
-            
-            # Recharger la liste
-            self.load_repo_list()
-            
-            # Fermer la boîte de dialogue
-            dialog.destroy()
-            
-            self.log(f"Dépôt ajouté: {name} ({local_path})", "success")
+            with METRICS.span("tag", self.current_repo["name"]), \
+                    self.journal.operation("tag", self.current_repo["name"], [tag_name, commit_hash], self.git_repo):
+                os.chdir(self.current_repo["local_path"])
+                tag_manager = TagManager(self.git_repo)
+
+                # Créer le tag
+                tag_manager.create_tag(tag_name, commit_hash, tag_message)
+                self.log(f"Tag '{tag_name}' créé sur le commit {commit_hash}", "success")
+
+                self.progress_bar["value"] = 60
+
+                # Pousser le tag si demandé
+                if push_tag:
+                    tag_manager.push_tags([tag_name])
+                    self.remember_remote_refs('origin', pushed=[f"refs/tags/{tag_name}"])
+                    self.log(f"Tag '{tag_name}' poussé vers le dépôt distant", "success")
+
+                self.progress_bar["value"] = 100
+                self.root.after(0, self._tag_operation_completed)
         except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors de la création du dépôt: {str(e)}", parent=dialog)
-            self.log(f"Erreur lors de la création du dépôt: {str(e)}", "error")
-    
-    def edit_repo_dialog(self):
-        """Ouvre la boîte de dialogue pour modifier un dépôt"""
-        # Implémentation de la boîte de dialogue pour modifier un dépôt
-        pass
-    
-    def delete_repo(self):
-        """Supprime le dépôt sélectionné"""
-        # Implémentation de la suppression du dépôt
-        pass
+            self.root.after(0, lambda error=str(e): self._tag_operation_error(error))
     
-    def clone_repo(self):
-        """Affiche la boîte de dialogue pour cloner un dépôt distant"""
+    def create_tag(self):
+        """Crée un tag sur le commit actuel (HEAD)"""
+        if not self.current_repo or not self.git_repo:
+            messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
+            return
+        
+        # Afficher la boîte de dialogue pour créer un tag
         dialog = tk.Toplevel(self.root)
-        dialog.title("Cloner un dépôt")
-        dialog.geometry("600x450")
+        dialog.title("Créer un tag")
+        dialog.geometry("500x300")
         dialog.transient(self.root)
         dialog.grab_set()
         dialog.configure(bg=COLORS['bg_light'])
@@ -764,832 +6934,1733 @@ class GitApp:
         # Centrer la boîte de dialogue
         self.center_window(dialog)
         
-        # Frame principal avec marge
-        main_frame = ttk.Frame(dialog, padding="25")
+        # Frame principal
+        main_frame = ttk.Frame(dialog, padding="20")
         main_frame.pack(fill=tk.BOTH, expand=True)
         
         # Titre
-        title_label = ttk.Label(main_frame, text="Cloner un dépôt Git distant", style="Title.TLabel")
-        title_label.pack(anchor=tk.W, pady=(0, 25))
-        
-        # Conteneur pour les formulaires
-        form_container = ttk.Frame(main_frame)
-        form_container.pack(fill=tk.BOTH, expand=True)
+        title_label = ttk.Label(main_frame, text="Créer un nouveau tag", style="Title.TLabel")
+        title_label.pack(anchor=tk.W, pady=(0, 15))
         
-        # Style pour les labels de formulaire
-        form_label_style = {"anchor": tk.W, "padding": (0, 12, 0, 6)}
+        # Formulaire
+        form_frame = ttk.Frame(main_frame)
+        form_frame.pack(fill=tk.X, pady=(0, 15))
         
-        # Champs de formulaire
-        ttk.Label(form_container, text="Nom du dépôt:", **form_label_style).grid(row=0, column=0, sticky=tk.W)
+        # Nom du tag
+        name_frame = ttk.Frame(form_frame)
+        name_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(name_frame, text="Nom du tag:").pack(side=tk.LEFT, padx=(0, 5))
         name_var = tk.StringVar()
-        ttk.Entry(form_container, textvariable=name_var, width=50).grid(row=0, column=1, sticky=tk.W, pady=6)
-        
-        ttk.Label(form_container, text="URL du dépôt distant:", **form_label_style).grid(row=1, column=0, sticky=tk.W)
-        remote_url_var = tk.StringVar()
-        ttk.Entry(form_container, textvariable=remote_url_var, width=50).grid(row=1, column=1, sticky=tk.W, pady=6)
+        ttk.Entry(name_frame, textvariable=name_var, width=30).pack(side=tk.LEFT, fill=tk.X, expand=True)
         
-        ttk.Label(form_container, text="Dossier local:", **form_label_style).grid(row=2, column=0, sticky=tk.W)
-        local_path_var = tk.StringVar(value=os.getcwd())
-        local_path_entry = ttk.Entry(form_container, textvariable=local_path_var, width=50)
-        local_path_entry.grid(row=2, column=1, sticky=tk.W, pady=6)
+        # Message du tag
+        message_frame = ttk.Frame(form_frame)
+        message_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(message_frame, text="Message:").pack(anchor=tk.W)
+        message_text = scrolledtext.ScrolledText(message_frame, wrap=tk.WORD, width=50, height=5)
+        message_text.pack(fill=tk.X, pady=(5, 0))
         
-        browse_btn = ModernButton(form_container, text="Parcourir...", 
-                                command=lambda: local_path_var.set(filedialog.askdirectory()),
-                                width=120, height=36)
-        browse_btn.grid(row=2, column=2, sticky=tk.W, pady=6, padx=(12, 0))
+        # Options
+        options_frame = ttk.Frame(main_frame)
+        options_frame.pack(fill=tk.X, pady=(0, 15))
         
-        ttk.Label(form_container, text="Branche:", **form_label_style).grid(row=3, column=0, sticky=tk.W)
-        branch_var = tk.StringVar(value="main")
-        ttk.Entry(form_container, textvariable=branch_var, width=50).grid(row=3, column=1, sticky=tk.W, pady=6)
+        push_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options_frame, text="Pousser le tag vers le dépôt distant", variable=push_var).pack(anchor=tk.W)
         
-        # Séparateur
-        separator = ttk.Separator(main_frame, orient='horizontal')
-        separator.pack(fill=tk.X, pady=18)
+        lightweight_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_frame, text="Tag léger (sans message)", variable=lightweight_var).pack(anchor=tk.W)
         
-        # Boutons d'action
-        btn_frame = ttk.Frame(main_frame)
-        btn_frame.pack(fill=tk.X)
+        # Boutons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
         
-        cancel_btn = ModernButton(btn_frame, text="Annuler", command=dialog.destroy,
-                               width=150, height=40, bg_color=COLORS['bg_dark'],
-                               hover_color='#455A64')
+        cancel_btn = ModernButton(button_frame, text="Annuler", command=dialog.destroy,
+                               width=150, height=40, bg_color=COLORS['bg_dark'])
         cancel_btn.pack(side=tk.RIGHT)
         
-        clone_btn = ModernButton(btn_frame, text="Cloner", 
-                              command=lambda: self.do_clone_repo(
-                                  name_var.get(), remote_url_var.get(), 
-                                  local_path_var.get(), branch_var.get(), dialog
-                              ),
-                              width=150, height=40, bg_color=COLORS['primary'])
-        clone_btn.pack(side=tk.RIGHT, padx=(0, 12))
-    
-    def do_clone_repo(self, name, remote_url, local_path, branch, dialog):
-        """Clone un dépôt distant"""
-        if not name or not remote_url or not local_path:
-            messagebox.showerror("Erreur", "Tous les champs sont obligatoires", parent=dialog)
-            return
-        
-        # Désactiver le bouton de clonage pendant l'opération
-        for widget in dialog.winfo_children():
-            widget.configure(state=tk.DISABLED)
-        
-        # Lancer le clonage dans un thread séparé
-        threading.Thread(target=lambda: self._clone_thread(name, remote_url, local_path, branch, dialog)).start()
-    
-    def _clone_thread(self, name, remote_url, local_path, branch, dialog):
-        """Thread pour cloner un dépôt"""
-        try:
-            self.log(f"Clonage de {remote_url} dans {local_path}...", "info")
-            
-            # Créer le dossier parent si nécessaire
-            if not os.path.exists(os.path.dirname(local_path)):
-                os.makedirs(os.path.dirname(local_path))
-            
-            # Cloner le dépôt
-            repo = Repo.clone_from(remote_url, local_path, branch=branch)
-            
-            # Extraire les fichiers exclus du .gitignore
-            excluded_files = []
-            gitignore_path = os.path.join(local_path, '.gitignore')
-            if os.path.exists(gitignore_path):
-                with open(gitignore_path, 'r') as f:
-                    excluded_files = [line.strip() for line in f.readlines() if line.strip() and not line.startswith('#')]
-            
-            # Ajouter le dépôt à la configuration
-            self.repo_config.add_repo(name, local_path, remote_url, branch, excluded_files)
-            
-            # Mettre à jour l'interface dans le thread principal
-            self.root.after(0, lambda: self._clone_completed(dialog))
-            
-        except Exception as e:
-            # Gérer les erreurs dans le thread principal
-            self.root.after(0, lambda: self._clone_error(dialog, str(e)))
-    
-    def _clone_completed(self, dialog):
-        """Gère la fin d'un clonage réussi"""
-        self.log("Clonage terminé avec succès", "success")
-        self.load_repo_list()
-        dialog.destroy()
-        
-        # Afficher un message de succès
-        messagebox.showinfo("Succès", "Le dépôt a été cloné avec succès")
-    
-    def _clone_error(self, dialog, error_msg):
-        """Gère une erreur de clonage"""
-        self.log(f"Erreur lors du clonage: {error_msg}", "error")
-        
-        # Réactiver les widgets du dialogue
-        for widget in dialog.winfo_children():
-            try:
-                widget.configure(state=tk.NORMAL)
-            except:
-                pass  # Certains widgets n'ont pas d'état
-        
-        # Afficher l'erreur
-        messagebox.showerror("Erreur de clonage", error_msg, parent=dialog)
-    
-    def create_commit(self):
-        """Crée un commit pour le dépôt sélectionné"""
-        # Implémentation de la création d'un commit
-        pass
+        create_btn = ModernButton(button_frame, text="Créer", 
+                               command=lambda: self.do_create_tag(
+                                   name_var.get(), message_text.get("1.0", tk.END).strip(),
+                                   lightweight_var.get(), push_var.get(), dialog
+                               ),
+                               width=150, height=40, bg_color=COLORS['primary'])
+        create_btn.pack(side=tk.RIGHT, padx=(0, 12))
     
-    def create_branch(self):
-        """Crée une nouvelle branche"""
-        if not self.current_repo or not self.git_repo:
-            messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
-            return
-        
-        # Demander le nom de la branche
-        branch_name = simpledialog.askstring("Nouvelle branche", "Nom de la nouvelle branche:", parent=self.root)
-        if not branch_name:
+    def do_create_tag(self, name, message, lightweight, push, dialog):
+        """Crée effectivement le tag"""
+        if not name:
+            messagebox.showerror("Erreur", "Le nom du tag est obligatoire", parent=dialog)
             return
         
-        # Vérifier si la branche existe déjà
-        existing_branches = [b.name for b in self.git_repo.branches]
-        if branch_name in existing_branches:
-            messagebox.showerror("Erreur", f"La branche '{branch_name}' existe déjà")
+        if not lightweight and not message:
+            messagebox.showerror("Erreur", "Le message est obligatoire pour un tag annoté", parent=dialog)
             return
         
-        # Demander si l'utilisateur veut basculer sur la nouvelle branche
-        switch_to = messagebox.askyesno("Basculer", f"Basculer sur la nouvelle branche '{branch_name}' après sa création?")
-        
-        # Créer la branche dans un thread
+        dialog.destroy()
         self.operation_running = True
-        self.status_label.config(text="Création de la branche...")
+        self.status_label.config(text="Création du tag...")
         self.progress_bar["value"] = 20
         
-        threading.Thread(target=lambda: self._create_branch_thread(branch_name, switch_to)).start()
+        # Lancer l'opération dans un thread
+        threading.Thread(target=lambda: self._create_tag_thread(name, message, lightweight, push)).start()
     
-    def _create_branch_thread(self, branch_name, switch_to):
-        """Thread pour créer une nouvelle branche"""
+    def _create_tag_thread(self, name, message, lightweight, push):
+        """Thread pour créer un tag"""
         try:
-            # Aller dans le répertoire du dépôt
-            os.chdir(self.current_repo["local_path"])
+            with METRICS.span("tag", self.current_repo["name"]), \
+                    self.journal.operation("tag", self.current_repo["name"], [name], self.git_repo):
+                # Aller dans le répertoire du dépôt
+                os.chdir(self.current_repo["local_path"])
             
-            # Créer la branche
-            self.log(f"Création de la branche '{branch_name}'...", "info")
-            current_branch = self.git_repo.active_branch.name
-            
-            # Créer à partir de la branche courante
-            self.git_repo.git.branch(branch_name)
-            
-            self.progress_bar["value"] = 70
-            
-            # Basculer sur la nouvelle branche si demandé
-            if switch_to:
-                self.log(f"Basculement sur la branche '{branch_name}'...", "info")
-                self.git_repo.git.checkout(branch_name)
+                tag_manager = TagManager(self.git_repo)
+
+                # Créer le tag
+                if lightweight:
+                    self.log(f"Création d'un tag léger '{name}'...", "info")
+                    tag_manager.create_tag(name)
+                else:
+                    self.log(f"Création d'un tag annoté '{name}'...", "info")
+                    tag_manager.create_tag(name, message=message)
+
+                self.progress_bar["value"] = 60
+
+                # Pousser le tag si demandé (les tags non poussés peuvent l'être en lot depuis le gestionnaire)
+                if push:
+                    self.log(f"Push du tag '{name}' vers le dépôt distant...", "info")
+                    tag_manager.push_tags([name])
+                    self.remember_remote_refs('origin', pushed=[f"refs/tags/{name}"])
             
-            self.progress_bar["value"] = 100
-            self.log(f"Branche '{branch_name}' créée avec succès", "success")
+                self.progress_bar["value"] = 100
+                self.log(f"Tag '{name}' créé avec succès", "success")
             
-            # Mettre à jour l'interface
-            self.root.after(0, self._branch_operation_completed)
+                # Mettre à jour l'interface
+                self.root.after(0, self._tag_operation_completed)
             
         except Exception as e:
-            self.root.after(0, lambda: self._branch_operation_error(str(e)))
+            self.root.after(0, lambda: self._tag_operation_error(str(e)))
     
-    def switch_branch(self):
-        """Change de branche"""
+    def _tag_operation_completed(self):
+        """Gère la fin d'une opération de tag réussie"""
+        self.operation_running = False
+        self.status_label.config(text="Prêt")
+    
+    def _tag_operation_error(self, error_msg):
+        """Gère une erreur lors d'une opération de tag"""
+        self.operation_running = False
+        self.status_label.config(text="Erreur")
+        self.progress_bar["value"] = 0
+        self.log(f"Erreur lors de la création du tag: {error_msg}", "error")
+        messagebox.showerror("Erreur", f"Erreur lors de la création du tag: {error_msg}")
+
+    def show_undo_dialog(self):
+        """Prévisualise puis annule la dernière opération annulable du dépôt courant"""
+        if not self.current_repo or not self.git_repo:
+            messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
+            return
+
+        repo_name = self.current_repo["name"]
+        undo_manager = UndoManager(self.git_repo)
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Annuler la dernière opération")
+        dialog.geometry("700x450")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        dialog.configure(bg=COLORS['bg_light'])
+
+        # Centrer la boîte de dialogue
+        self.center_window(dialog)
+
+        # Frame principal
+        main_frame = ttk.Frame(dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Titre
+        title_label = ttk.Label(main_frame, text="Annuler la dernière opération", style="Title.TLabel")
+        title_label.pack(anchor=tk.W, pady=(0, 15))
+
+        operation_var = tk.StringVar(value="Lecture du journal...")
+        ttk.Label(main_frame, textvariable=operation_var, wraplength=640, justify=tk.LEFT).pack(anchor=tk.W,
+                                                                                              pady=(0, 10))
+
+        preview_text = scrolledtext.ScrolledText(main_frame, height=10, wrap=tk.WORD, font=Fonts.DEFAULT,
+                                                 bg=COLORS['card'], relief=tk.FLAT, borderwidth=0)
+        preview_text.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+        preview_text.tag_configure("problem", foreground=COLORS['error'])
+        preview_text.tag_configure("skipped", foreground=COLORS['text_secondary'])
+        preview_text.configure(state=tk.DISABLED)
+
+        state = {"entry": None}
+
+        def show(entry, actions, problems, skipped):
+            if not dialog.winfo_exists():
+                return
+            state["entry"] = entry if not problems else None
+            preview_text.configure(state=tk.NORMAL)
+            preview_text.delete("1.0", tk.END)
+            if entry is None:
+                operation_var.set("Aucune opération à annuler pour ce dépôt")
+            else:
+                when = datetime.fromtimestamp(entry["time"]).strftime("%Y-%m-%d %H:%M:%S")
+                operation_var.set(f"{entry['operation']} {' '.join(entry.get('args', []))} ({when})")
+                for line in actions:
+                    preview_text.insert(tk.END, f"• {line}\n")
+                for line in problems:
+                    preview_text.insert(tk.END, f"✗ {line}\n", "problem")
+                for line in skipped:
+                    preview_text.insert(tk.END, f"Non restauré : {line}\n", "skipped")
+            preview_text.configure(state=tk.DISABLED)
+
+        def load():
+            try:
+                entry = self.journal.last_undoable(repo_name)
+                preview = undo_manager.preview(entry) if entry else ([], [], [])
+                self.root.after(0, lambda: show(entry, *preview))
+            except Exception as e:
+                self.root.after(0, lambda error=str(e): operation_var.set(f"Erreur: {error}") if dialog.winfo_exists() else None)
+        threading.Thread(target=load, daemon=True).start()
+
+        def confirm():
+            entry = state["entry"]
+            if entry is None:
+                messagebox.showerror("Erreur", "Aucune opération ne peut être annulée", parent=dialog)
+                return
+            dialog.destroy()
+
+            self.operation_running = True
+            self.status_label.config(text="Annulation en cours...")
+            self.progress_bar["value"] = 20
+
+            def worker():
+                try:
+                    os.chdir(self.current_repo["local_path"])
+                    with METRICS.span("undo", repo_name, entry["operation"]), \
+                            self.journal.operation("undo", repo_name, [entry["id"]], self.git_repo):
+                        undo_manager.undo(entry)
+                    self.progress_bar["value"] = 100
+                    self.log(f"Opération '{entry['operation']}' annulée", "success")
+                    self.root.after(0, self._branch_operation_completed)
+                except Exception as e:
+                    self.root.after(0, lambda error=str(e): self._branch_operation_error(error))
+            threading.Thread(target=worker).start()
+
+        # Boutons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
+
+        cancel_btn = ModernButton(button_frame, text="Fermer", command=dialog.destroy,
+                               width=150, height=40, bg_color=COLORS['bg_dark'])
+        cancel_btn.pack(side=tk.RIGHT)
+
+        undo_btn = ModernButton(button_frame, text="Restaurer", command=confirm,
+                             width=150, height=40, bg_color=COLORS['warning'], text_color=COLORS['text_dark'])
+        undo_btn.pack(side=tk.RIGHT, padx=(0, 12))
+
+    def show_tag_browser(self):
+        """Affiche le gestionnaire de tags avec pagination et actions groupées"""
+        if not self.current_repo or not self.git_repo:
+            messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
+            return
+
+        tag_manager = TagManager(self.git_repo)
+        state = {"page": 0}
+
+        # Créer la fenêtre du gestionnaire
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Gestionnaire de tags")
+        dialog.geometry("900x600")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        dialog.configure(bg=COLORS['bg_light'])
+
+        # Centrer la fenêtre
+        self.center_window(dialog)
+
+        # Frame principal
+        main_frame = ttk.Frame(dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Titre
+        title_label = ttk.Label(main_frame, text="Tags du dépôt", style="Title.TLabel")
+        title_label.pack(anchor=tk.W, pady=(0, 15))
+
+        # Liste des tags (sélection multiple)
+        list_frame = ttk.Frame(main_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+
+        columns = ("name", "target", "date", "remote", "annotation")
+        tag_list = ttk.Treeview(list_frame, columns=columns, show="headings", height=15, selectmode="extended")
+        badges = {}
+
+        # En-têtes
+        tag_list.heading("name", text="Tag")
+        tag_list.heading("target", text="Cible")
+        tag_list.heading("date", text="Date")
+        tag_list.heading("remote", text="Distant")
+        tag_list.heading("annotation", text="Annotation")
+
+        # Largeur des colonnes
+        tag_list.column("name", width=150)
+        tag_list.column("target", width=80)
+        tag_list.column("date", width=150)
+        tag_list.column("remote", width=120)
+        tag_list.column("annotation", width=280)
+
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=tag_list.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tag_list.configure(yscrollcommand=scrollbar.set)
+        tag_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Pagination
+        page_frame = ttk.Frame(main_frame)
+        page_frame.pack(fill=tk.X, pady=(0, 10))
+
+        page_label = ttk.Label(page_frame, text="Chargement des tags...")
+
+        def show_page(page):
+            state["page"] = max(0, min(page, tag_manager.page_count() - 1))
+            for item in tag_list.get_children():
+                tag_list.delete(item)
+            for tag in tag_manager.get_page(state["page"]):
+                tag_list.insert("", "end", iid=tag["name"],
+                                values=(tag["name"], tag["target"][:8], tag["date"],
+                                        badges.get(f"refs/tags/{tag['name']}", ""), tag["annotation"]))
+            page_label.config(text=f"Page {state['page'] + 1}/{tag_manager.page_count()} "
+                                   f"({len(tag_manager.tags)} tags)")
+
+        prev_btn = ModernButton(page_frame, text="< Précédent", command=lambda: show_page(state["page"] - 1),
+                              width=120, height=36, bg_color=COLORS['primary'])
+        prev_btn.pack(side=tk.LEFT)
+        page_label.pack(side=tk.LEFT, padx=12)
+        next_btn = ModernButton(page_frame, text="Suivant >", command=lambda: show_page(state["page"] + 1),
+                              width=120, height=36, bg_color=COLORS['primary'])
+        next_btn.pack(side=tk.LEFT)
+
+        # Options
+        remote_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(page_frame, text="Supprimer aussi sur le dépôt distant",
+                        variable=remote_var).pack(side=tk.RIGHT)
+
+        def apply_badges(labels):
+            badges.update(labels)
+            if dialog.winfo_exists():
+                show_page(state["page"])
+
+        def load_tags():
+            def worker():
+                try:
+                    tag_manager.load_tags()
+                    self.root.after(0, lambda: show_page(0))
+                    self.root.after(0, lambda: self.load_remote_badges(
+                        [f"refs/tags/{tag['name']}" for tag in tag_manager.tags], apply_badges))
+                except Exception as e:
+                    self.root.after(0, lambda error=str(e): self.log(f"Erreur lors du chargement des tags: {error}", "error"))
+            threading.Thread(target=worker).start()
+
+        def run_batch(operation, action, names):
+            if not names:
+                messagebox.showerror("Erreur", "Veuillez sélectionner au moins un tag", parent=dialog)
+                return
+
+            self.operation_running = True
+            self.status_label.config(text="Opération sur les tags...")
+            self.progress_bar["value"] = 20
+
+            def worker():
+                try:
+                    os.chdir(self.current_repo["local_path"])
+                    with METRICS.span("tags", self.current_repo["name"], f"{len(names)} tag(s)"), \
+                            self.journal.operation(operation, self.current_repo["name"], names, self.git_repo):
+                        action(names)
+                    self.progress_bar["value"] = 100
+                    self.root.after(0, self._tag_operation_completed)
+                    self.root.after(0, lambda: show_page(state["page"]))
+                    self.root.after(0, lambda: self.load_remote_badges(
+                        [f"refs/tags/{name}" for name in names], apply_badges))
+                except Exception as e:
+                    self.root.after(0, lambda error=str(e): self._tag_operation_error(error))
+            threading.Thread(target=worker).start()
+
+        def push_selected():
+            names = list(tag_list.selection())
+            remote_name = self.git_repo.remotes[0].name if self.git_repo.remotes else 'origin'
+
+            def action(names):
+                self.log(f"Push de {len(names)} tag(s) vers '{remote_name}'...", "info")
+                tag_manager.push_tags(names, remote_name)
+                self.remember_remote_refs(remote_name, pushed=[f"refs/tags/{name}" for name in names])
+                self.log(f"{len(names)} tag(s) poussé(s) avec succès", "success")
+            run_batch("push-tags", action, names)
+
+        def delete_selected():
+            names = list(tag_list.selection())
+            if names and not messagebox.askyesno("Confirmation",
+                                                 f"Voulez-vous vraiment supprimer {len(names)} tag(s)?",
+                                                 parent=dialog):
+                return
+            remote_name = None
+            if remote_var.get():
+                remote_name = self.git_repo.remotes[0].name if self.git_repo.remotes else 'origin'
+
+            def action(names):
+                self.log(f"Suppression de {len(names)} tag(s)...", "info")
+                tag_manager.delete_tags(names, remote_name)
+                if remote_name:
+                    self.remember_remote_refs(remote_name, deleted=[f"refs/tags/{name}" for name in names])
+                self.log(f"{len(names)} tag(s) supprimé(s) avec succès", "success")
+            run_batch("delete-tags", action, names)
+
+        # Boutons d'action
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
+
+        close_btn = ModernButton(button_frame, text="Fermer", command=dialog.destroy,
+                              width=150, height=40, bg_color=COLORS['bg_dark'])
+        close_btn.pack(side=tk.RIGHT)
+
+        delete_btn = ModernButton(button_frame, text="Supprimer la sélection", command=delete_selected,
+                               width=180, height=40, bg_color=COLORS['error'])
+        delete_btn.pack(side=tk.RIGHT, padx=(0, 12))
+
+        push_btn = ModernButton(button_frame, text="Pousser la sélection", command=push_selected,
+                             width=180, height=40, bg_color=COLORS['success'])
+        push_btn.pack(side=tk.RIGHT, padx=(0, 12))
+
+        refresh_btn = ModernButton(button_frame, text="Actualiser", command=load_tags,
+                                width=150, height=40, bg_color=COLORS['primary'])
+        refresh_btn.pack(side=tk.LEFT)
+
+        load_tags()
+
+    def show_file_history(self, initial_path=""):
+        """Affiche l'historique d'un fichier et son blame, remplis au fur et à mesure"""
+        if not self.current_repo or not self.git_repo:
+            messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
+            return
+
+        file_history = FileHistory(self.git_repo, self.file_history_cache)
+        repo_path = self.current_repo["local_path"]
+        # Chaque blame et chaque historique reçoivent un jeton : les lots d'un affichage précédent sont ignorés
+        state = {"token": 0, "cancel": None, "log_token": 0, "log_cancel": None, "path": "", "paths": {}}
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Historique de fichier")
+        dialog.geometry("1200x750")
+        dialog.transient(self.root)
+        dialog.configure(bg=COLORS['bg_light'])
+
+        # Centrer la fenêtre
+        self.center_window(dialog)
+
+        # Frame principal
+        main_frame = ttk.Frame(dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Choix du fichier
+        path_frame = ttk.Frame(main_frame)
+        path_frame.pack(fill=tk.X, pady=(0, 10))
+        ttk.Label(path_frame, text="Fichier:").pack(side=tk.LEFT, padx=(0, 5))
+        path_var = tk.StringVar(value=initial_path)
+        path_entry = ttk.Entry(path_frame, textvariable=path_var, width=60)
+        path_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        def browse():
+            selected = filedialog.askopenfilename(parent=dialog, initialdir=repo_path)
+            if selected:
+                relative = os.path.relpath(selected, repo_path)
+                if relative.startswith(".."):
+                    messagebox.showerror("Erreur", "Le fichier doit se trouver dans le dépôt", parent=dialog)
+                    return
+                path_var.set(Path(relative).as_posix())
+                open_file()
+
+        status_label = ttk.Label(main_frame, text="", foreground=COLORS['text_secondary'])
+
+        # Historique à gauche, blame à droite
+        panes = ttk.PanedWindow(main_frame, orient=tk.HORIZONTAL)
+        panes.pack(fill=tk.BOTH, expand=True)
+
+        history_frame = ttk.Frame(panes)
+        columns = ("commit", "author", "date", "subject")
+        history_list = ttk.Treeview(history_frame, columns=columns, show="headings", selectmode="browse")
+        history_list.heading("commit", text="Commit")
+        history_list.heading("author", text="Auteur")
+        history_list.heading("date", text="Date")
+        history_list.heading("subject", text="Message")
+        history_list.column("commit", width=70)
+        history_list.column("author", width=100)
+        history_list.column("date", width=110)
+        history_list.column("subject", width=200)
+        history_scrollbar = ttk.Scrollbar(history_frame, orient="vertical", command=history_list.yview)
+        history_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        history_list.configure(yscrollcommand=history_scrollbar.set)
+        history_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        panes.add(history_frame, weight=1)
+
+        # Deux zones de texte synchronisées : annotations de blame et contenu du fichier
+        blame_frame = ttk.Frame(panes)
+        text_options = dict(wrap=tk.NONE, bg=COLORS['card'], relief=tk.FLAT, borderwidth=0,
+                            highlightthickness=0, font=("Consolas", 10), undo=False)
+        gutter = tk.Text(blame_frame, width=38, foreground=COLORS['text_secondary'], **text_options)
+        content = tk.Text(blame_frame, **text_options)
+        blame_scrollbar = ttk.Scrollbar(blame_frame, orient="vertical",
+                                        command=lambda *args: (gutter.yview(*args), content.yview(*args)))
+        blame_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        gutter.pack(side=tk.LEFT, fill=tk.Y)
+        content.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        def on_content_scroll(first, last):
+            blame_scrollbar.set(first, last)
+            gutter.yview_moveto(first)
+
+        def on_gutter_wheel(event):
+            # La molette sur les annotations fait défiler le contenu, qui entraîne la marge
+            delta = -1 if getattr(event, "num", 0) == 4 or getattr(event, "delta", 0) > 0 else 1
+            content.yview_scroll(delta * 3, "units")
+            return "break"
+
+        content.configure(yscrollcommand=on_content_scroll)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            gutter.bind(sequence, on_gutter_wheel)
+        gutter.tag_configure("commit", foreground=COLORS['primary'])
+        panes.add(blame_frame, weight=3)
+
+        status_label.pack(anchor=tk.W, pady=(10, 0))
+
+        def current(token):
+            return token == state["token"] and dialog.winfo_exists()
+
+        def set_status(token, text):
+            if current(token):
+                status_label.config(text=text)
+
+        def annotation(result, position):
+            sha, author, timestamp, summary = result.commits[position]
+            day = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d") if timestamp else ""
+            return f"{sha[:8]} {author[:14]:<14} {day}"
+
+        def apply_blame(token, result, blocks):
+            """Écrit les annotations d'un lot de blocs (première ligne du bloc uniquement)"""
+            if not current(token):
+                return
+            gutter.config(state=tk.NORMAL)
+            for start, count, position in blocks:
+                line = start + 1
+                gutter.delete(f"{line}.0", f"{line}.end")
+                gutter.insert(f"{line}.0", annotation(result, position), "commit")
+            gutter.config(state=tk.DISABLED)
+
+        def insert_content(token, lines, start=0, chunk=5000):
+            """Insère le contenu par tranches pour que les premières lignes s'affichent aussitôt"""
+            if not current(token):
+                return
+            content.config(state=tk.NORMAL)
+            content.insert(tk.END, "".join(lines[start:start + chunk]))
+            content.config(state=tk.DISABLED)
+            if start + chunk < len(lines):
+                dialog.after(1, lambda: insert_content(token, lines, start + chunk, chunk))
+
+        def add_history(token, entries):
+            if token != state["log_token"] or not dialog.winfo_exists():
+                return
+            for sha, author, date, subject, old_path in entries:
+                if not history_list.exists(sha):
+                    history_list.insert("", "end", iid=sha, values=(sha[:8], author, date, subject))
+                    state["paths"][sha] = old_path
+
+        def show_blame(path, commit):
+            """Affiche le fichier à ce commit puis diffuse son blame"""
+            state["token"] += 1
+            token = state["token"]
+            if state["cancel"] is not None:
+                state["cancel"].set()
+            cancel = threading.Event()
+            state["cancel"] = cancel
+            for widget in (gutter, content):
+                widget.config(state=tk.NORMAL)
+                widget.delete("1.0", tk.END)
+                widget.config(state=tk.DISABLED)
+            set_status(token, f"Chargement de {path} @ {commit[:8]}...")
+
+            def worker():
+                try:
+                    data = file_history.content(path, commit)
+                    if FileHistory.is_binary(data):
+                        self.root.after(0, lambda: set_status(token, f"{path}: fichier binaire, pas de blame"))
+                        return
+                    lines = data.decode("utf-8", "replace").splitlines(keepends=True)
+                    line_count = len(lines)
+
+                    def prepare():
+                        if not current(token):
+                            return
+                        # Marge pré-remplie de lignes vides, complétée à l'arrivée des blocs
+                        gutter.config(state=tk.NORMAL)
+                        gutter.insert("1.0", "\n" * max(0, line_count - 1))
+                        gutter.config(state=tk.DISABLED)
+                        insert_content(token, lines)
+                    self.root.after(0, prepare)
+
+                    start = time.perf_counter()
+                    result = file_history.stream_blame(
+                        path, commit, line_count,
+                        lambda result, blocks: self.root.after(0, lambda: apply_blame(token, result, blocks)),
+                        cancel)
+                    if result is not None:
+                        elapsed = time.perf_counter() - start
+                        self.root.after(0, lambda: set_status(
+                            token, f"{path} @ {commit[:8]} : {line_count} lignes, "
+                                   f"{len(result.commits)} commits ({elapsed * 1000:.0f} ms)"))
+                except Exception as e:
+                    self.root.after(0, lambda error=str(e): set_status(token, f"Erreur: {error}"))
+            threading.Thread(target=worker, daemon=True).start()
+
+        def open_file(event=None):
+            path = path_var.get().strip().replace("\\", "/")
+            if not path:
+                messagebox.showerror("Erreur", "Veuillez indiquer un fichier", parent=dialog)
+                return
+            try:
+                head = file_history.resolve("HEAD")
+            except Exception as e:
+                messagebox.showerror("Erreur", f"Impossible de lire HEAD: {str(e)}", parent=dialog)
+                return
+            history_list.delete(*history_list.get_children())
+            state["paths"] = {}
+            state["path"] = path
+            state["log_token"] += 1
+            token = state["log_token"]
+            if state["log_cancel"] is not None:
+                state["log_cancel"].set()
+            cancel = threading.Event()
+            state["log_cancel"] = cancel
+            show_blame(path, head)
+
+            def worker():
+                try:
+                    file_history.stream_log(
+                        path, head, lambda entries: self.root.after(0, lambda: add_history(token, entries)), cancel)
+                except Exception as e:
+                    self.root.after(0, lambda error=str(e): self.log(f"Erreur lors de la lecture de l'historique: {error}", "error"))
+            threading.Thread(target=worker, daemon=True).start()
+
+        def on_history_select(event):
+            selection = history_list.selection()
+            if not selection:
+                return
+            sha = selection[0]
+            # Le fichier a pu porter un autre nom à ce commit (renommage suivi)
+            show_blame(state["paths"].get(sha, state["path"]), sha)
+
+        history_list.bind("<<TreeviewSelect>>", on_history_select)
+        path_entry.bind("<Return>", open_file)
+
+        open_btn = ModernButton(path_frame, text="Ouvrir", command=open_file,
+                             width=100, height=32, bg_color=COLORS['primary'])
+        open_btn.pack(side=tk.LEFT, padx=(8, 0))
+        browse_btn = ModernButton(path_frame, text="Parcourir...", command=browse,
+                               width=120, height=32, bg_color=COLORS['secondary'])
+        browse_btn.pack(side=tk.LEFT, padx=(8, 0))
+
+        def on_close():
+            for cancel in (state["cancel"], state["log_cancel"]):
+                if cancel is not None:
+                    cancel.set()
+            dialog.destroy()
+
+        dialog.protocol("WM_DELETE_WINDOW", on_close)
+        if initial_path:
+            open_file()
+
+    def show_diff_viewer(self, commit_hash):
+        """Affiche le diff d'un commit, chargé page de hunks par page au fil du défilement"""
+        if not commit_hash or not self.git_repo:
+            return
+        try:
+            pager = DiffPager(self.git_repo, commit_hash)
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Impossible de lire le commit: {str(e)}")
+            return
+
+        # Le jeton change à chaque saut vers un fichier : les pages et couleurs en retard sont ignorées
+        state = {"token": 0, "loading": False, "bytes": 0, "starts": {}}
+        pager_lock = threading.Lock()
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title(f"Diff du commit {commit_hash[:8]}")
+        dialog.geometry("1200x750")
+        dialog.transient(self.root)
+        dialog.configure(bg=COLORS['bg_light'])
+
+        # Centrer la fenêtre
+        self.center_window(dialog)
+
+        # Frame principal
+        main_frame = ttk.Frame(dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        panes = ttk.PanedWindow(main_frame, orient=tk.HORIZONTAL)
+        panes.pack(fill=tk.BOTH, expand=True)
+
+        # Liste des fichiers modifiés
+        files_frame = ttk.Frame(panes)
+        file_list = ttk.Treeview(files_frame, columns=("status", "path"), show="headings", selectmode="browse")
+        file_list.heading("status", text="")
+        file_list.heading("path", text="Fichier")
+        file_list.column("status", width=30, anchor=tk.CENTER)
+        file_list.column("path", width=250)
+        files_scrollbar = ttk.Scrollbar(files_frame, orient="vertical", command=file_list.yview)
+        files_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        file_list.configure(yscrollcommand=files_scrollbar.set)
+        file_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        panes.add(files_frame, weight=1)
+
+        # Texte du diff
+        diff_frame = ttk.Frame(panes)
+        diff_text = tk.Text(diff_frame, wrap=tk.NONE, bg=COLORS['card'], relief=tk.FLAT, borderwidth=0,
+                            highlightthickness=0, font=("Consolas", 10), undo=False, state=tk.DISABLED)
+        diff_scrollbar = ttk.Scrollbar(diff_frame, orient="vertical", command=diff_text.yview)
+        diff_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        diff_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        panes.add(diff_frame, weight=4)
+
+        # Ordre de création = priorité : fond de ligne, puis syntaxe, puis différences par mot
+        diff_text.tag_configure("file", background=COLORS['primary_light'], foreground=COLORS['primary_dark'],
+                                font=("Consolas", 10, "bold"))
+        diff_text.tag_configure("hunk", foreground=COLORS['secondary'])
+        diff_text.tag_configure("add", background="#e6ffed")
+        diff_text.tag_configure("del", background="#ffeef0")
+        diff_text.tag_configure("note", foreground=COLORS['text_secondary'], font=("Consolas", 10, "italic"))
+        diff_text.tag_configure("syn_keyword", foreground="#0000aa")
+        diff_text.tag_configure("syn_string", foreground="#a31515")
+        diff_text.tag_configure("syn_comment", foreground="#008000")
+        diff_text.tag_configure("syn_number", foreground="#098658")
+        diff_text.tag_configure("word_add", background="#acf2bd")
+        diff_text.tag_configure("word_del", background="#fdb8c0")
+
+        status_label = ttk.Label(main_frame, text="Chargement des fichiers...", foreground=COLORS['text_secondary'])
+        status_label.pack(anchor=tk.W, pady=(10, 0))
+
+        def apply_ranges(token, base, ranges, batch=2000):
+            """Applique les plages calculées par le thread, par lots pour ne pas bloquer l'interface"""
+            if token != state["token"] or not dialog.winfo_exists():
+                return
+            budget = batch
+            while ranges and budget > 0:
+                tag, spans = ranges[-1]
+                chunk, ranges[-1] = spans[:budget], (tag, spans[budget:])
+                if not ranges[-1][1]:
+                    ranges.pop()
+                indexes = []
+                for line, start, end in chunk:
+                    indexes += (f"{base + line}.{start}", f"{base + line}.{end}")
+                diff_text.tag_add(tag, *indexes)
+                budget -= len(chunk)
+            if ranges:
+                dialog.after(1, lambda: apply_ranges(token, base, ranges, batch))
+
+        def append_page(token, page):
+            if token != state["token"] or not dialog.winfo_exists():
+                return
+            state["loading"] = False
+            diff_text.config(state=tk.NORMAL)
+            if page["first"]:
+                state["starts"][page["index"]] = diff_text.index("end-1c")
+                title = page["path"] if not page["old_path"] else f"{page['old_path']} → {page['path']}"
+                diff_text.insert(tk.END, f"{page['status']} {title}\n", "file")
+                if page["binary"]:
+                    diff_text.insert(tk.END, "Fichier binaire\n", "note")
+            base = int(diff_text.index("end-1c").split(".")[0])
+            # Fond de ligne posé à l'insertion ; la coloration fine arrive ensuite du thread
+            for line in page["lines"]:
+                tag = "hunk" if line.startswith("@@") else "add" if line.startswith("+") else \
+                    "del" if line.startswith("-") else ()
+                diff_text.insert(tk.END, line + "\n", tag)
+            if page["last"] and page["truncated"]:
+                diff_text.insert(tk.END, f"... diff tronqué au-delà de {DIFF_FILE_MAX_BYTES // 1024} Ko\n", "note")
+            diff_text.config(state=tk.DISABLED)
+            state["bytes"] += sum(len(line) + 1 for line in page["lines"])
+            status_label.config(text=f"{len(pager.files)} fichier(s) - {state['bytes'] // 1024} Ko affichés")
+
+            if page["lines"]:
+                def worker():
+                    ranges = self.parse_pool.run(parse_diff_highlight, page["path"], page["lines"])
+                    self.root.after(0, lambda: apply_ranges(token, base, ranges))
+                threading.Thread(target=worker, daemon=True).start()
+            # Si le texte ne remplit pas encore la vue, continuer à charger
+            dialog.after_idle(lambda: on_scroll(*diff_text.yview()))
+
+        def load_next_page(seek=None):
+            if state["loading"] or (seek is None and pager.exhausted()):
+                return
+            if state["bytes"] >= DIFF_VIEW_MAX_BYTES:
+                status_label.config(text=f"Limite d'affichage atteinte ({DIFF_VIEW_MAX_BYTES // (1024 * 1024)} Mo) : "
+                                         f"sélectionnez un fichier pour l'afficher")
+                return
+            state["loading"] = True
+            token = state["token"]
+
+            def done(text=None):
+                if token == state["token"] and dialog.winfo_exists():
+                    state["loading"] = False
+                    if text:
+                        status_label.config(text=text)
+
+            def worker():
+                try:
+                    with pager_lock:
+                        if seek is not None:
+                            pager.seek(seek)
+                        page = pager.next_page()
+                    if page is not None:
+                        self.root.after(0, lambda: append_page(token, page))
+                    else:
+                        self.root.after(0, done)
+                except Exception as e:
+                    self.root.after(0, lambda error=str(e): done(f"Erreur: {error}"))
+            threading.Thread(target=worker, daemon=True).start()
+
+        def on_scroll(first, last):
+            diff_scrollbar.set(first, last)
+            # Charger la page suivante à l'approche de la fin
+            if float(last) > 0.85:
+                load_next_page()
+
+        diff_text.configure(yscrollcommand=on_scroll)
+
+        def on_file_select(event):
+            selection = file_list.selection()
+            if not selection:
+                return
+            index = int(selection[0])
+            start = state["starts"].get(index)
+            if start is not None:
+                diff_text.yview(start)
+                return
+            # Fichier pas encore chargé : repartir de lui avec un texte vide
+            state["token"] += 1
+            state["bytes"] = 0
+            state["starts"] = {}
+            state["loading"] = False
+            diff_text.config(state=tk.NORMAL)
+            diff_text.delete("1.0", tk.END)
+            diff_text.config(state=tk.DISABLED)
+            load_next_page(seek=index)
+
+        file_list.bind("<<TreeviewSelect>>", on_file_select)
+
+        def load_files():
+            def worker():
+                try:
+                    files = pager.load_files()
+
+                    def show():
+                        if not dialog.winfo_exists():
+                            return
+                        for index, (status, path, old_path) in enumerate(files):
+                            file_list.insert("", "end", iid=str(index), values=(status, path))
+                        load_next_page()
+                    self.root.after(0, show)
+                except Exception as e:
+                    self.root.after(0, lambda error=str(e): self.log(f"Erreur lors de la lecture du diff: {error}", "error"))
+            threading.Thread(target=worker, daemon=True).start()
+
+        # Boutons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        close_btn = ModernButton(button_frame, text="Fermer", command=dialog.destroy,
+                              width=150, height=40, bg_color=COLORS['bg_dark'])
+        close_btn.pack(side=tk.RIGHT)
+
+        load_files()
+
+    def show_stash_manager(self):
+        """Affiche les stashs avec leurs statistiques chargées à la demande"""
+        if not self.current_repo or not self.git_repo:
+            messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
+            return
+
+        stash_manager = StashManager(self.git_repo)
+        state = {"stashes": {}, "pending": set()}
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Gestionnaire de stashs")
+        dialog.geometry("950x600")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        dialog.configure(bg=COLORS['bg_light'])
+
+        # Centrer la fenêtre
+        self.center_window(dialog)
+
+        # Frame principal
+        main_frame = ttk.Frame(dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Titre
+        title_label = ttk.Label(main_frame, text="Stashs du dépôt", style="Title.TLabel")
+        title_label.pack(anchor=tk.W, pady=(0, 15))
+
+        # Liste des stashs (sélection multiple)
+        list_frame = ttk.Frame(main_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+
+        columns = ("ref", "branch", "date", "stats", "message")
+        stash_list = ttk.Treeview(list_frame, columns=columns, show="headings", height=12, selectmode="extended")
+        stash_list.heading("ref", text="Stash")
+        stash_list.heading("branch", text="Branche")
+        stash_list.heading("date", text="Date")
+        stash_list.heading("stats", text="Modifications")
+        stash_list.heading("message", text="Message")
+        stash_list.column("ref", width=80)
+        stash_list.column("branch", width=120)
+        stash_list.column("date", width=130)
+        stash_list.column("stats", width=140)
+        stash_list.column("message", width=380)
+        stash_list.tag_configure("auto", foreground=COLORS['text_secondary'])
+
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=stash_list.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        stash_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Aperçu des fichiers du stash sélectionné
+        preview_text = scrolledtext.ScrolledText(main_frame, wrap=tk.NONE, height=8, bg=COLORS['card'],
+                                                 relief=tk.FLAT, borderwidth=0, highlightthickness=0,
+                                                 padx=10, pady=10, font=("Consolas", 10))
+        preview_text.pack(fill=tk.X, pady=(0, 10))
+        preview_text.config(state=tk.DISABLED)
+
+        def set_preview(text):
+            if not dialog.winfo_exists():
+                return
+            preview_text.config(state=tk.NORMAL)
+            preview_text.delete("1.0", tk.END)
+            preview_text.insert(tk.END, text)
+            preview_text.config(state=tk.DISABLED)
+
+        def show_stats(stats):
+            if not dialog.winfo_exists():
+                return
+            for sha, (files, added, removed) in stats.items():
+                state["pending"].discard(sha)
+                if stash_list.exists(sha):
+                    stash_list.set(sha, "stats", f"{files} fichier(s) +{added} -{removed}")
+
+        def load_visible_stats():
+            """Calcule les statistiques des seules lignes visibles qui ne les ont pas encore"""
+            shas = [sha for sha in stash_list.get_children()
+                    if stash_list.bbox(sha) and sha not in state["pending"] and stash_list.set(sha, "stats") == "..."]
+            if not shas:
+                return
+            state["pending"].update(shas)
+
+            def worker():
+                stats = {}
+                for sha in shas:
+                    try:
+                        stats[sha] = stash_manager.diff_stat(sha)
+                    except Exception as e:
+                        self.root.after(0, lambda e=e: self.log(f"Statistiques du stash indisponibles: {str(e)}", "warning"))
+                self.root.after(0, lambda: show_stats(stats))
+            threading.Thread(target=worker, daemon=True).start()
+
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            dialog.after_idle(load_visible_stats)
+
+        stash_list.configure(yscrollcommand=on_scroll)
+
+        def show_stashes(stashes):
+            if not dialog.winfo_exists():
+                return
+            stash_list.delete(*stash_list.get_children())
+            state["stashes"] = {stash["sha"]: stash for stash in stashes}
+            for stash in stashes:
+                date = datetime.fromtimestamp(stash["time"]).strftime("%Y-%m-%d %H:%M")
+                stats = stash_manager.stats.get(stash["sha"])
+                stats_text = f"{stats[0]} fichier(s) +{stats[1]} -{stats[2]}" if stats else "..."
+                stash_list.insert("", "end", iid=stash["sha"], tags=("auto",) if stash["auto"] else (),
+                                  values=(stash["ref"], stash["branch"], date, stats_text, stash["message"]))
+            count_label.config(text=f"{len(stashes)} stash(s), dont {sum(s['auto'] for s in stashes)} auto-stash(s)")
+            dialog.after_idle(load_visible_stats)
+
+        def load_stashes():
+            def worker():
+                try:
+                    stashes = stash_manager.list_stashes()
+                    self.root.after(0, lambda: show_stashes(stashes))
+                except Exception as e:
+                    self.root.after(0, lambda error=str(e): self.log(f"Erreur lors de la lecture des stashs: {error}", "error"))
+            threading.Thread(target=worker, daemon=True).start()
+
+        def on_select(event):
+            selection = stash_list.selection()
+            if len(selection) != 1:
+                return
+            sha = selection[0]
+
+            def worker():
+                try:
+                    text = stash_manager.diff_files(sha) or "(aucune modification suivie)"
+                except Exception as e:
+                    text = f"Erreur: {str(e)}"
+                self.root.after(0, lambda: set_preview(text))
+            threading.Thread(target=worker, daemon=True).start()
+
+        stash_list.bind("<<TreeviewSelect>>", on_select)
+
+        def run_action(label, action):
+            self.operation_running = True
+            self.status_label.config(text=f"{label}...")
+            self.progress_bar["value"] = 20
+
+            def worker():
+                try:
+                    os.chdir(self.current_repo["local_path"])
+                    with METRICS.span("stash", self.current_repo["name"], label), \
+                            self.journal.operation("stash", self.current_repo["name"], [label], self.git_repo):
+                        action()
+                    self.progress_bar["value"] = 100
+                    self.root.after(0, self._stash_operation_completed)
+                except Exception as e:
+                    self.root.after(0, lambda error=str(e): self._stash_operation_error(error))
+                self.root.after(0, load_stashes)
+            threading.Thread(target=worker).start()
+
+        def pop_selected():
+            selection = stash_list.selection()
+            if len(selection) != 1:
+                messagebox.showerror("Erreur", "Veuillez sélectionner un seul stash", parent=dialog)
+                return
+            stash = state["stashes"][selection[0]]
+
+            def action():
+                self.log(f"Réapplication du stash {stash['ref']}...", "info")
+                stash_manager.pop(stash["sha"])
+                self.log(f"Stash {stash['ref']} réappliqué et supprimé", "success")
+            run_action("Réapplication du stash", action)
+
+        def drop_selected():
+            shas = list(stash_list.selection())
+            if not shas:
+                messagebox.showerror("Erreur", "Veuillez sélectionner au moins un stash", parent=dialog)
+                return
+            if not messagebox.askyesno("Confirmation", f"Voulez-vous vraiment supprimer {len(shas)} stash(s)?",
+                                       parent=dialog):
+                return
+
+            def action():
+                dropped = stash_manager.drop(shas)
+                self.log(f"{dropped} stash(s) supprimé(s)", "success")
+            run_action("Suppression des stashs", action)
+
+        def gc_auto_stashes():
+            try:
+                days = int(age_var.get())
+            except ValueError:
+                messagebox.showerror("Erreur", "Veuillez indiquer un nombre de jours", parent=dialog)
+                return
+            cutoff = time.time() - days * 86400
+            count = sum(1 for s in state["stashes"].values() if s["auto"] and s["time"] < cutoff)
+            if not count:
+                messagebox.showinfo("Information", f"Aucun auto-stash de plus de {days} jour(s)", parent=dialog)
+                return
+            if not messagebox.askyesno("Confirmation",
+                                       f"Supprimer {count} auto-stash(s) de plus de {days} jour(s)?", parent=dialog):
+                return
+
+            def action():
+                dropped = stash_manager.gc_auto_stashes(days)
+                self.log(f"{dropped} auto-stash(s) ancien(s) supprimé(s)", "success")
+            run_action("Nettoyage des auto-stashs", action)
+
+        # Nettoyage par âge
+        gc_frame = ttk.Frame(main_frame)
+        gc_frame.pack(fill=tk.X, pady=(0, 10))
+        count_label = ttk.Label(gc_frame, text="Chargement des stashs...")
+        count_label.pack(side=tk.LEFT)
+        gc_btn = ModernButton(gc_frame, text="Nettoyer les auto-stashs", command=gc_auto_stashes,
+                           width=200, height=36, bg_color=COLORS['warning'], text_color=COLORS['text_dark'])
+        gc_btn.pack(side=tk.RIGHT)
+        ttk.Label(gc_frame, text="jour(s)").pack(side=tk.RIGHT, padx=(5, 12))
+        age_var = tk.StringVar(value=str(AUTO_STASH_MAX_AGE_DAYS))
+        ttk.Spinbox(gc_frame, from_=0, to=3650, textvariable=age_var, width=6).pack(side=tk.RIGHT)
+        ttk.Label(gc_frame, text="Plus de").pack(side=tk.RIGHT, padx=(0, 5))
+
+        # Boutons d'action
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
+
+        close_btn = ModernButton(button_frame, text="Fermer", command=dialog.destroy,
+                              width=150, height=40, bg_color=COLORS['bg_dark'])
+        close_btn.pack(side=tk.RIGHT)
+
+        drop_btn = ModernButton(button_frame, text="Supprimer la sélection", command=drop_selected,
+                             width=180, height=40, bg_color=COLORS['error'])
+        drop_btn.pack(side=tk.RIGHT, padx=(0, 12))
+
+        pop_btn = ModernButton(button_frame, text="Réappliquer", command=pop_selected,
+                            width=150, height=40, bg_color=COLORS['success'])
+        pop_btn.pack(side=tk.RIGHT, padx=(0, 12))
+
+        load_stashes()
+
+    def _stash_operation_completed(self):
+        """Gère la fin d'une opération sur les stashs réussie"""
+        self.operation_running = False
+        self.status_label.config(text="Prêt")
+
+    def _stash_operation_error(self, error_msg):
+        """Gère une erreur lors d'une opération sur les stashs"""
+        self.operation_running = False
+        self.status_label.config(text="Erreur")
+        self.progress_bar["value"] = 0
+        self.log(f"Erreur lors de l'opération sur les stashs: {error_msg}", "error")
+        messagebox.showerror("Erreur", f"Erreur lors de l'opération sur les stashs: {error_msg}")
+
+    def get_ignore_checker(self):
+        """Renvoie le processus check-ignore du dépôt courant (gardé ouvert entre deux audits)"""
+        repo_path = self.git_repo.working_dir
+        checker = self.ignore_checkers.get(repo_path)
+        if checker is None or checker.git_repo is not self.git_repo:
+            if checker is not None:
+                checker.close()
+            checker = IgnoreChecker(self.git_repo)
+            self.ignore_checkers[repo_path] = checker
+        return checker
+
+    def sync_excluded_files(self, repo):
+        """Aligne excluded_files et le .gitignore du dépôt ; renvoie la liste fusionnée"""
+        sync = GitIgnoreSync(repo["local_path"])
+        merged, to_add, to_remove = sync.merge(repo.get("excluded_files") or [], repo.get("excluded_synced"))
+        if to_add or to_remove:
+            sync.write(to_add, to_remove)
+            # check-ignore garde les règles déjà lues : le relancer au prochain audit
+            for checker in self.ignore_checkers.values():
+                checker.close()
+            self.log(f".gitignore de '{repo['name']}' mis à jour: {len(to_add)} motif(s) ajouté(s), "
+                     f"{len(to_remove)} retiré(s)", "info")
+        if merged != repo.get("excluded_files") or merged != repo.get("excluded_synced"):
+            self.repo_config.update_repo(self.repo_config.index_of(repo), excluded_files=merged,
+                                         excluded_synced=list(merged))
+        return merged
+
+    def show_ignore_panel(self):
+        """Édite les exclusions du dépôt et liste les fichiers suivis qu'elles ignorent"""
         if not self.current_repo or not self.git_repo:
             messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
             return
-        
-        # Récupérer la liste des branches
-        branches = [b.name for b in self.git_repo.branches]
-        
-        if not branches:
-            messagebox.showinfo("Information", "Aucune branche disponible")
-            return
-        
-        # Créer la boîte de dialogue pour sélectionner une branche
+
+        repo = self.current_repo
+        git_repo = self.git_repo
+        checker = self.get_ignore_checker()
+
         dialog = tk.Toplevel(self.root)
-        dialog.title("Changer de branche")
-        dialog.geometry("500x400")
+        dialog.title("Fichiers ignorés")
+        dialog.geometry("850x650")
         dialog.transient(self.root)
         dialog.grab_set()
         dialog.configure(bg=COLORS['bg_light'])
-        
+
         # Centrer la boîte de dialogue
         self.center_window(dialog)
-        
+
         # Frame principal
         main_frame = ttk.Frame(dialog, padding="20")
         main_frame.pack(fill=tk.BOTH, expand=True)
-        
+
         # Titre
-        title_label = ttk.Label(main_frame, text="Sélectionner une branche", style="Title.TLabel")
+        title_label = ttk.Label(main_frame, text=f"Fichiers ignorés - {repo['name']}", style="Title.TLabel")
         title_label.pack(anchor=tk.W, pady=(0, 15))
-        
-        # Liste des branches
-        branch_frame = ttk.Frame(main_frame)
-        branch_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
-        
-        # Listbox avec scrollbar
-        branch_list = tk.Listbox(branch_frame, height=15, width=50, font=Fonts.DEFAULT)
-        branch_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        scrollbar = ttk.Scrollbar(branch_frame, orient="vertical", command=branch_list.yview)
+
+        # Motifs d'exclusion (configuration et .gitignore synchronisés)
+        ttk.Label(main_frame, text="Motifs exclus (un par ligne, synchronisés avec le .gitignore):").pack(anchor=tk.W)
+        patterns_text = scrolledtext.ScrolledText(main_frame, height=6, wrap=tk.NONE, font=Fonts.DEFAULT,
+                                                  bg=COLORS['card'], relief=tk.FLAT, borderwidth=0)
+        patterns_text.pack(fill=tk.X, pady=(5, 10))
+        patterns_text.insert("1.0", "\n".join(repo.get("excluded_files") or []))
+
+        # Fichiers suivis correspondant à une règle d'exclusion
+        ttk.Label(main_frame, text="Fichiers suivis désormais ignorés:").pack(anchor=tk.W)
+        list_frame = ttk.Frame(main_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=(5, 10))
+
+        columns = ("path", "pattern", "source")
+        file_list = ttk.Treeview(list_frame, columns=columns, show="headings", height=12, selectmode="extended")
+        file_list.heading("path", text="Fichier")
+        file_list.heading("pattern", text="Motif")
+        file_list.heading("source", text="Règle")
+        file_list.column("path", width=420)
+        file_list.column("pattern", width=160)
+        file_list.column("source", width=180)
+
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=file_list.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        branch_list.configure(yscrollcommand=scrollbar.set)
-        
-        # Remplir la liste des branches
-        current_branch = self.git_repo.active_branch.name
-        for i, branch in enumerate(branches):
-            branch_list.insert(tk.END, branch)
-            if branch == current_branch:
-                branch_list.selection_set(i)
-                branch_list.see(i)
-                branch_list.itemconfig(i, bg=COLORS['primary_light'], fg=COLORS['primary_dark'])
-        
-        # Label pour afficher la branche actuelle
-        current_label = ttk.Label(main_frame, text=f"Branche actuelle: {current_branch}", font=Fonts.DEFAULT)
-        current_label.pack(anchor=tk.W, pady=(0, 15))
-        
-        # Options
-        options_frame = ttk.Frame(main_frame)
-        options_frame.pack(fill=tk.X, pady=(0, 15))
-        
-        stash_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(options_frame, text="Mettre de côté les modifications non commitées", variable=stash_var).pack(anchor=tk.W)
-        
+        file_list.configure(yscrollcommand=scrollbar.set)
+        file_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        status_var = tk.StringVar(value="Analyse en cours...")
+        ttk.Label(main_frame, textvariable=status_var).pack(anchor=tk.W, pady=(0, 10))
+
+        state = {"running": False}
+
+        def show(results, total):
+            if not dialog.winfo_exists():
+                return
+            state["running"] = False
+            file_list.delete(*file_list.get_children())
+            for path, source, line, pattern in results:
+                file_list.insert("", tk.END, iid=path, values=(path, pattern, f"{source}:{line}"))
+            status_var.set(f"{len(results)} fichier(s) suivi(s) ignoré(s) sur {total}")
+
+        def audit():
+            if state["running"]:
+                return
+            state["running"] = True
+            status_var.set("Analyse en cours...")
+
+            def progress(done, total):
+                self.root.after(0, lambda: status_var.set(f"Analyse en cours... {done}/{total}")
+                                if dialog.winfo_exists() else None)
+
+            def worker():
+                try:
+                    results, total = checker.tracked_ignored(progress)
+                    self.root.after(0, lambda: show(results, total))
+                except Exception as e:
+                    state["running"] = False
+                    self.root.after(0, lambda error=str(e): status_var.set(f"Erreur: {error}") if dialog.winfo_exists() else None)
+            threading.Thread(target=worker, daemon=True).start()
+
+        def save():
+            patterns = [line.strip() for line in patterns_text.get("1.0", tk.END).splitlines() if line.strip()]
+            try:
+                self.repo_config.update_repo(self.repo_config.index_of(repo), excluded_files=patterns)
+                merged = self.sync_excluded_files(repo)
+            except Exception as e:
+                messagebox.showerror("Erreur", f"Synchronisation impossible: {str(e)}", parent=dialog)
+                return
+            patterns_text.delete("1.0", tk.END)
+            patterns_text.insert("1.0", "\n".join(merged))
+            audit()
+
+        def untrack():
+            paths = list(file_list.selection())
+            if not paths:
+                messagebox.showinfo("Information", "Sélectionnez les fichiers à ne plus suivre", parent=dialog)
+                return
+            if not messagebox.askyesno("Confirmation",
+                                       f"Retirer {len(paths)} fichier(s) de l'index ? Les fichiers restent sur le disque.",
+                                       parent=dialog):
+                return
+            try:
+                with METRICS.span("untrack ignored", repo["name"], f"{len(paths)} fichier(s)"):
+                    proc = git_repo.git.rm('--cached', '-q', '--ignore-unmatch', '--pathspec-from-file=-',
+                                           '--pathspec-file-nul', as_process=True, istream=subprocess.PIPE)
+                    proc.stdin.write(b"".join(path.encode("utf-8") + b"\0" for path in paths))
+                    proc.stdin.close()
+                    proc.wait()
+            except Exception as e:
+                messagebox.showerror("Erreur", f"Impossible de retirer les fichiers: {str(e)}", parent=dialog)
+                return
+            file_list.delete(*paths)
+            self.log(f"{len(paths)} fichier(s) ignoré(s) retiré(s) de l'index (à commiter)", "success")
+
         # Boutons
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X)
-        
-        cancel_btn = ModernButton(button_frame, text="Annuler", command=dialog.destroy,
-                               width=150, height=40, bg_color=COLORS['bg_dark'])
-        cancel_btn.pack(side=tk.RIGHT)
-        
-        switch_btn = ModernButton(button_frame, text="Changer", 
-                               command=lambda: self.do_switch_branch(
-                                   branches[branch_list.curselection()[0]] if branch_list.curselection() else None,
-                                   stash_var.get(), dialog
-                               ),
-                               width=150, height=40, bg_color=COLORS['primary'])
-        switch_btn.pack(side=tk.RIGHT, padx=(0, 12))
-        
-        # Double-clic pour changer de branche
-        branch_list.bind("<Double-Button-1>", lambda e: self.do_switch_branch(
-            branches[branch_list.curselection()[0]] if branch_list.curselection() else None,
-            stash_var.get(), dialog
-        ))
-    
-    def do_switch_branch(self, branch_name, stash, dialog):
-        """Effectue le changement de branche"""
-        if not branch_name:
-            messagebox.showerror("Erreur", "Veuillez sélectionner une branche", parent=dialog)
-            return
-        
-        # Vérifier si c'est la branche actuelle
-        current_branch = self.git_repo.active_branch.name
-        if branch_name == current_branch:
-            messagebox.showinfo("Information", f"Vous êtes déjà sur la branche '{branch_name}'", parent=dialog)
-            dialog.destroy()
-            return
-        
-        dialog.destroy()
-        self.operation_running = True
-        self.status_label.config(text="Changement de branche...")
-        self.progress_bar["value"] = 20
-        
-        # Lancer l'opération dans un thread
-        threading.Thread(target=lambda: self._switch_branch_thread(branch_name, stash)).start()
-    
-    def _switch_branch_thread(self, branch_name, stash):
-        """Thread pour changer de branche"""
-        try:
-            # Aller dans le répertoire du dépôt
-            os.chdir(self.current_repo["local_path"])
-            
-            # Vérifier s'il y a des modifications non commitées
-            if self.git_repo.is_dirty():
-                if stash:
-                    self.log("Mise de côté des modifications non commitées...", "info")
-                    self.git_repo.git.stash('save', f'Auto-stash avant de basculer sur {branch_name}')
-                else:
-                    raise Exception("Il y a des modifications non commitées. Veuillez les commiter ou utiliser l'option de mise de côté.")
-            
-            self.progress_bar["value"] = 50
-            
-            # Changer de branche
-            self.log(f"Basculement sur la branche '{branch_name}'...", "info")
-            self.git_repo.git.checkout(branch_name)
-            
-            self.progress_bar["value"] = 100
-            self.log(f"Changement de branche réussi. Branche actuelle: {branch_name}", "success")
-            
-            # Mettre à jour l'interface
-            self.root.after(0, self._branch_operation_completed)
-            
-        except Exception as e:
-            self.root.after(0, lambda: self._branch_operation_error(str(e)))
-    
-    def delete_branch(self):
-        """Supprime une branche"""
+
+        ModernButton(button_frame, text="Fermer", command=dialog.destroy,
+                     width=120, height=36, bg_color=COLORS['bg_dark']).pack(side=tk.RIGHT, padx=(10, 0))
+        ModernButton(button_frame, text="Ne plus suivre", command=untrack,
+                     width=150, height=36, bg_color=COLORS['warning']).pack(side=tk.RIGHT, padx=(10, 0))
+        ModernButton(button_frame, text="Enregistrer et synchroniser", command=save,
+                     width=220, height=36, bg_color=COLORS['primary'],
+                     text_color=COLORS['text_light']).pack(side=tk.RIGHT, padx=(10, 0))
+        ModernButton(button_frame, text="Actualiser", command=audit,
+                     width=120, height=36, bg_color=COLORS['secondary']).pack(side=tk.RIGHT)
+
+        audit()
+
+    def show_repo_analytics(self):
+        """Affiche le nombre d'objets, la taille des packs, les plus gros fichiers et dossiers et la croissance"""
         if not self.current_repo or not self.git_repo:
             messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
             return
-        
-        # Récupérer la liste des branches
-        branches = [b.name for b in self.git_repo.branches]
-        current_branch = self.git_repo.active_branch.name
-        
-        # Exclure la branche courante
-        branches = [b for b in branches if b != current_branch]
-        
-        if not branches:
-            messagebox.showinfo("Information", "Aucune branche disponible à supprimer")
+
+        analytics = self.get_repo_analytics()
+        repo_path = self.current_repo["local_path"]
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title(f"Taille du dépôt - {self.current_repo['name']}")
+        dialog.geometry("900x620")
+        dialog.transient(self.root)
+        dialog.configure(bg=COLORS['bg_light'])
+
+        # Centrer la fenêtre
+        self.center_window(dialog)
+
+        # Frame principal
+        main_frame = ttk.Frame(dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Titre
+        title_label = ttk.Label(main_frame, text="Taille du dépôt", style="Title.TLabel")
+        title_label.pack(anchor=tk.W, pady=(0, 15))
+
+        summary_var = tk.StringVar(value="Calcul en cours...")
+        ttk.Label(main_frame, textvariable=summary_var, justify=tk.LEFT).pack(anchor=tk.W, pady=(0, 10))
+
+        notebook = ttk.Notebook(main_frame)
+        notebook.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+
+        def make_table(title, headings):
+            frame = ttk.Frame(notebook)
+            notebook.add(frame, text=title)
+            table = ttk.Treeview(frame, columns=tuple(headings), show="headings")
+            for column, (text, width, anchor) in headings.items():
+                table.heading(column, text=text)
+                table.column(column, width=width, anchor=anchor)
+            scrollbar = ttk.Scrollbar(frame, orient="vertical", command=table.yview)
+            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            table.configure(yscrollcommand=scrollbar.set)
+            table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            return table
+
+        types_list = make_table("Objets", {"type": ("Type", 150, tk.W), "count": ("Nombre", 120, tk.E),
+                                           "size": ("Taille", 150, tk.E), "disk": ("Sur disque", 150, tk.E)})
+        largest_list = make_table("Plus gros fichiers", {"path": ("Fichier", 420, tk.W),
+                                                         "size": ("Taille", 110, tk.E),
+                                                         "disk": ("Sur disque", 110, tk.E),
+                                                         "sha": ("Objet", 100, tk.W)})
+        dirs_list = make_table("Plus gros dossiers", {"path": ("Dossier", 480, tk.W),
+                                                      "disk": ("Sur disque", 130, tk.E),
+                                                      "blobs": ("Versions de fichiers", 150, tk.E)})
+        growth_list = make_table("Croissance", {"month": ("Mois", 150, tk.W), "commits": ("Commits", 120, tk.E),
+                                                "disk": ("Ajouté sur disque", 150, tk.E),
+                                                "total": ("Cumul", 150, tk.E)})
+
+        def show(result, from_cache):
+            if not dialog.winfo_exists():
+                return
+            counts = result["counts"]
+            computed = datetime.fromtimestamp(result["time"]).strftime("%Y-%m-%d %H:%M")
+            summary_var.set(f"{counts['packed_objects'] + counts['loose_objects']} objets stockés : "
+                            f"{counts['packs']} pack(s) de {format_size(counts['pack_size'])}, "
+                            f"{counts['loose_objects']} objet(s) isolé(s) de {format_size(counts['loose_size'])}\n"
+                            f"Calculé le {computed} en {result['duration']:.1f} s"
+                            f"{' (en cache)' if from_cache else ''}")
+            for table in (types_list, largest_list, dirs_list, growth_list):
+                table.delete(*table.get_children())
+            for name, stats in result["types"].items():
+                types_list.insert("", "end", values=(name, stats["count"], format_size(stats["size"]),
+                                                     format_size(stats["disk"])))
+            for path, size, disk, sha in result["largest"]:
+                largest_list.insert("", "end", values=(path, format_size(size), format_size(disk), sha[:10]))
+            for path, disk, blobs in result["directories"]:
+                dirs_list.insert("", "end", values=(path, format_size(disk), blobs))
+            total = 0
+            for month, commits, disk in result["growth"]:
+                total += disk
+                growth_list.insert("", "end", values=(month, commits, format_size(disk), format_size(total)))
+
+        def compute(force=False):
+            summary_var.set("Calcul en cours...")
+
+            def worker():
+                try:
+                    result = None if force else analytics.cached()
+                    from_cache = result is not None
+                    if result is None:
+                        # Le parcours de tous les objets a lieu dans un processus du pool
+                        result = analytics.result = self.parse_pool.run(
+                            parse_repo_analytics, repo_path, analytics.top_count)
+                    self.root.after(0, lambda: show(result, from_cache))
+                except Exception as e:
+                    self.root.after(0, lambda error=str(e): summary_var.set(f"Erreur: {error}") if dialog.winfo_exists() else None)
+                    self.log(f"Erreur lors de l'analyse de la taille du dépôt: {str(e)}", "error")
+            threading.Thread(target=worker, daemon=True).start()
+
+        # Boutons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
+
+        close_btn = ModernButton(button_frame, text="Fermer", command=dialog.destroy,
+                              width=150, height=40, bg_color=COLORS['bg_dark'])
+        close_btn.pack(side=tk.RIGHT)
+
+        refresh_btn = ModernButton(button_frame, text="Recalculer", command=lambda: compute(force=True),
+                                width=150, height=40, bg_color=COLORS['primary'])
+        refresh_btn.pack(side=tk.RIGHT, padx=(0, 12))
+
+        compute()
+
+    def _on_user_activity(self, event=None):
+        self.last_activity = time.time()
+
+    def is_idle(self):
+        """Vrai si aucune opération ni action de l'utilisateur depuis MAINTENANCE_IDLE_SECONDS"""
+        return not self.operation_running and time.time() - self.last_activity >= MAINTENANCE_IDLE_SECONDS
+
+    def maintenance_tick(self):
+        """Vérifie chaque minute si des dépôts peuvent être entretenus"""
+        try:
+            if self.maintenance.enabled and self.is_idle():
+                self.run_maintenance(self.maintenance.due(self.repo_config.get_repos()), self.is_idle)
+        finally:
+            self.root.after(60000, self.maintenance_tick)
+
+    def mirror_tick(self):
+        """Vérifie chaque minute si des miroirs doivent être synchronisés"""
+        try:
+            if self.mirrors.enabled:
+                self.sync_mirrors(self.mirrors.due(self.repo_config.get_repos()))
+        finally:
+            self.root.after(60000, self.mirror_tick)
+
+    def toggle_mirrors(self):
+        """Active ou désactive le mode miroir depuis la case de la liste des dépôts"""
+        self.mirrors.set_enabled(self.mirror_var.get())
+        self.update_mirror_column()
+        if self.mirrors.enabled:
+            self.sync_mirrors(self.mirrors.due(self.repo_config.get_repos()))
+
+    def sync_mirrors(self, urls):
+        """Synchronise les miroirs des URL données puis met à jour les branches de suivi des dépôts concernés"""
+        if not urls:
+            return
+
+        async def sync(url):
+            started = []
+
+            def progress(line, percent):
+                # Afficher l'état « synchro... » dès que le transfert commence
+                if not started:
+                    started.append(True)
+                    self.root.after(0, self.update_mirror_column)
+
+            if not await self.mirrors.sync(self.async_git, url, progress):
+                return
+
+            def tracking_remotes():
+                # Ouverture des dépôts et lecture de leur configuration : hors de la boucle asyncio
+                found = []
+                for repo in self.repo_config.get_repos():
+                    if repo.get("remote_url") != url or not os.path.isdir(os.path.join(repo["local_path"], ".git")):
+                        continue
+                    found += [(repo, remote.name) for remote in Repo(repo["local_path"]).remotes if remote.url == url]
+                return found
+
+            # Les dépôts locaux de ce distant profitent du miroir sans accès réseau
+            for repo, remote_name in await asyncio.get_running_loop().run_in_executor(None, tracking_remotes):
+                await self.mirrors.update_tracking(self.async_git, repo["local_path"], remote_name, url, repo["name"])
+
+        def finished(url, error=None):
+            if error is not None:
+                self.log(f"Synchronisation du miroir de {url} impossible: {error}", "warning")
+            self.update_mirror_column()
+
+        for url in urls:
+            self.async_git.submit(sync(url),
+                                  on_done=lambda result, url=url: self.root.after(0, lambda: finished(url)),
+                                  on_error=lambda e, url=url: self.root.after(0, lambda: finished(url, str(e))))
+        self.update_mirror_column()
+
+    def run_maintenance(self, repos, should_continue=lambda: True, on_report=None):
+        """Lance la maintenance des dépôts donnés en arrière-plan"""
+        if not repos:
             return
-        
-        # Créer la boîte de dialogue pour sélectionner une branche
+        self.log(f"Maintenance de {len(repos)} dépôt(s) en arrière-plan...", "info")
+
+        def report_done(repo, report):
+            def show():
+                if "error" in report:
+                    self.log(f"Maintenance de '{repo['name']}' impossible: {report['error']}", "error")
+                else:
+                    before, after = report["before"], report["after"]
+                    failed = [name for name, task in report["tasks"].items() if "error" in task]
+                    self.log(f"Maintenance de '{repo['name']}' : {before['loose_objects']} → {after['loose_objects']} "
+                             f"objets isolés, {before['packs']} → {after['packs']} pack(s), "
+                             f"status {before['status_time'] * 1000:.0f} → {after['status_time'] * 1000:.0f} ms"
+                             + (f" (échec: {', '.join(failed)})" if failed else "")
+                             + ("" if report["complete"] else " (interrompue)"),
+                             "warning" if failed else "success")
+                if on_report:
+                    on_report(repo, report)
+            self.root.after(0, show)
+        self.maintenance.start(repos, should_continue, report_done)
+
+    def show_maintenance_panel(self):
+        """Affiche le rapport de maintenance (avant/après) de chaque dépôt"""
         dialog = tk.Toplevel(self.root)
-        dialog.title("Supprimer une branche")
-        dialog.geometry("500x400")
+        dialog.title("Maintenance des dépôts")
+        dialog.geometry("1000x500")
         dialog.transient(self.root)
-        dialog.grab_set()
         dialog.configure(bg=COLORS['bg_light'])
-        
-        # Centrer la boîte de dialogue
+
+        # Centrer la fenêtre
         self.center_window(dialog)
-        
+
         # Frame principal
         main_frame = ttk.Frame(dialog, padding="20")
         main_frame.pack(fill=tk.BOTH, expand=True)
-        
+
         # Titre
-        title_label = ttk.Label(main_frame, text="Sélectionner une branche à supprimer", style="Title.TLabel")
+        title_label = ttk.Label(main_frame, text="Maintenance des dépôts", style="Title.TLabel")
         title_label.pack(anchor=tk.W, pady=(0, 15))
-        
-        # Liste des branches
-        branch_frame = ttk.Frame(main_frame)
-        branch_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
-        
-        # Listbox avec scrollbar
-        branch_list = tk.Listbox(branch_frame, height=15, width=50, font=Fonts.DEFAULT)
-        branch_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        scrollbar = ttk.Scrollbar(branch_frame, orient="vertical", command=branch_list.yview)
+
+        list_frame = ttk.Frame(main_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+
+        columns = ("name", "date", "loose", "packs", "size", "log", "status", "duration")
+        report_list = ttk.Treeview(list_frame, columns=columns, show="headings", height=12, selectmode="extended")
+        headings = {"name": ("Dépôt", 150), "date": ("Dernière maintenance", 140), "loose": ("Objets isolés", 110),
+                    "packs": ("Packs", 70), "size": ("Taille des objets", 170), "log": ("Historique (ms)", 110),
+                    "status": ("Status (ms)", 100), "duration": ("Durée", 70)}
+        for column, (text, width) in headings.items():
+            report_list.heading(column, text=text)
+            report_list.column(column, width=width)
+
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=report_list.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        branch_list.configure(yscrollcommand=scrollbar.set)
-        
-        # Remplir la liste des branches
-        for branch in branches:
-            branch_list.insert(tk.END, branch)
-        
-        # Label pour afficher la branche actuelle
-        current_label = ttk.Label(main_frame, text=f"Branche actuelle: {current_branch} (non supprimable)", font=Fonts.DEFAULT)
-        current_label.pack(anchor=tk.W, pady=(0, 15))
-        
+        report_list.configure(yscrollcommand=scrollbar.set)
+        report_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        repos = {repo["id"]: repo for repo in self.repo_config.get_repos() if "id" in repo}
+
+        def refresh(*args):
+            if not dialog.winfo_exists():
+                return
+            for repo_id, repo in repos.items():
+                report = self.maintenance.report(repo["local_path"])
+                if self.maintenance.is_running(repo["local_path"]):
+                    values = (repo["name"], "en cours...", "", "", "", "", "", "")
+                elif not report or "before" not in report:
+                    values = (repo["name"], "jamais", "", "", "", "", "", "")
+                else:
+                    before, after = report["before"], report["after"]
+                    duration = sum(task["duration"] for task in report["tasks"].values())
+                    values = (repo["name"], datetime.fromtimestamp(report["time"]).strftime("%Y-%m-%d %H:%M"),
+                              f"{before['loose_objects']} → {after['loose_objects']}",
+                              f"{before['packs']} → {after['packs']}",
+                              f"{format_size(before['loose_size'] + before['pack_size'])} → "
+                              f"{format_size(after['loose_size'] + after['pack_size'])}",
+                              f"{before['log_time'] * 1000:.0f} → {after['log_time'] * 1000:.0f}",
+                              f"{before['status_time'] * 1000:.0f} → {after['status_time'] * 1000:.0f}",
+                              f"{duration:.1f} s")
+                if report_list.exists(repo_id):
+                    report_list.item(repo_id, values=values)
+                else:
+                    report_list.insert("", "end", iid=repo_id, values=values)
+
+        def run_selected():
+            selected = [repos[repo_id] for repo_id in report_list.selection()] or list(repos.values())
+            self.run_maintenance(selected, on_report=refresh)
+            dialog.after(200, refresh)
+
         # Options
-        options_frame = ttk.Frame(main_frame)
-        options_frame.pack(fill=tk.X, pady=(0, 15))
-        
-        force_var = tk.BooleanVar(value=False)
-        ttk.Checkbutton(options_frame, text="Forcer la suppression (même si non fusionnée)", variable=force_var).pack(anchor=tk.W)
-        
-        remote_var = tk.BooleanVar(value=False)
-        ttk.Checkbutton(options_frame, text="Supprimer également la branche distante", variable=remote_var).pack(anchor=tk.W)
-        
+        enabled_var = tk.BooleanVar(value=self.maintenance.enabled)
+        ttk.Checkbutton(main_frame, text=f"Maintenance automatique après {MAINTENANCE_IDLE_SECONDS // 60} min "
+                                         f"d'inactivité (au plus une fois par jour et par dépôt)",
+                        variable=enabled_var,
+                        command=lambda: self.maintenance.set_enabled(enabled_var.get())).pack(anchor=tk.W, pady=(0, 10))
+
         # Boutons
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X)
-        
-        cancel_btn = ModernButton(button_frame, text="Annuler", command=dialog.destroy,
-                               width=150, height=40, bg_color=COLORS['bg_dark'])
-        cancel_btn.pack(side=tk.RIGHT)
-        
-        delete_btn = ModernButton(button_frame, text="Supprimer", 
-                               command=lambda: self.do_delete_branch(
-                                   branches[branch_list.curselection()[0]] if branch_list.curselection() else None,
-                                   force_var.get(), remote_var.get(), dialog
-                               ),
-                               width=150, height=40, bg_color=COLORS['error'])
-        delete_btn.pack(side=tk.RIGHT, padx=(0, 12))
-    
-    def do_delete_branch(self, branch_name, force, remote, dialog):
-        """Effectue la suppression de la branche"""
-        if not branch_name:
-            messagebox.showerror("Erreur", "Veuillez sélectionner une branche", parent=dialog)
-            return
-        
-        # Demander confirmation
-        if not messagebox.askyesno("Confirmation", f"Voulez-vous vraiment supprimer la branche '{branch_name}'?", parent=dialog):
-            return
-        
-        dialog.destroy()
-        self.operation_running = True
-        self.status_label.config(text="Suppression de la branche...")
-        self.progress_bar["value"] = 20
-        
-        # Lancer l'opération dans un thread
-        threading.Thread(target=lambda: self._delete_branch_thread(branch_name, force, remote)).start()
-    
-    def _delete_branch_thread(self, branch_name, force, remote):
-        """Thread pour supprimer une branche"""
-        try:
-            # Aller dans le répertoire du dépôt
-            os.chdir(self.current_repo["local_path"])
-            
-            # Supprimer la branche locale
-            self.log(f"Suppression de la branche locale '{branch_name}'...", "info")
-            
-            if force:
-                self.git_repo.git.branch('-D', branch_name)
-            else:
-                self.git_repo.git.branch('-d', branch_name)
-            
-            self.progress_bar["value"] = 60
-            
-            # Supprimer la branche distante si demandé
-            if remote:
-                self.log(f"Suppression de la branche distante '{branch_name}'...", "info")
-                self.git_repo.git.push('origin', '--delete', branch_name)
-            
-            self.progress_bar["value"] = 100
-            self.log(f"Branche '{branch_name}' supprimée avec succès", "success")
-            
-            # Mettre à jour l'interface
-            self.root.after(0, self._branch_operation_completed)
-            
-        except Exception as e:
-            self.root.after(0, lambda: self._branch_operation_error(str(e)))
-    
-    def _branch_operation_completed(self):
-        """Gère la fin d'une opération sur les branches réussie"""
-        self.operation_running = False
-        self.status_label.config(text="Prêt")
-    
-    def _branch_operation_error(self, error_msg):
-        """Gère une erreur lors d'une opération sur les branches"""
-        self.operation_running = False
-        self.status_label.config(text="Erreur")
-        self.progress_bar["value"] = 0
-        self.log(f"Erreur: {error_msg}", "error")
-        messagebox.showerror("Erreur", error_msg)
-    
-    def merge_branches(self):
-        """Fusionne les branches pour le dépôt sélectionné"""
-        # Implémentation de la fusion des branches
-        pass
-    
-    def pull_changes(self):
-        """Pull les changements pour le dépôt sélectionné"""
-        # Implémentation de la mise à jour du dépôt
-        pass
-    
-    def show_commit_history(self):
-        """Affiche l'historique des commits"""
-        if not self.current_repo or not self.git_repo:
-            messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
-            return
-        
-        # Créer la fenêtre d'historique
-        history_window = tk.Toplevel(self.root)
-        history_window.title("Historique des commits")
-        history_window.geometry("900x700")
-        history_window.transient(self.root)
-        history_window.grab_set()
-        history_window.configure(bg=COLORS['bg_light'])
-        
+
+        close_btn = ModernButton(button_frame, text="Fermer", command=dialog.destroy,
+                              width=150, height=40, bg_color=COLORS['bg_dark'])
+        close_btn.pack(side=tk.RIGHT)
+
+        run_btn = ModernButton(button_frame, text="Lancer maintenant", command=run_selected,
+                            width=180, height=40, bg_color=COLORS['primary'])
+        run_btn.pack(side=tk.RIGHT, padx=(0, 12))
+
+        refresh()
+
+    def show_metrics_panel(self):
+        """Affiche les durées p50/p95 par type d'opération"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Performances")
+        dialog.geometry("700x450")
+        dialog.transient(self.root)
+        dialog.configure(bg=COLORS['bg_light'])
+
         # Centrer la fenêtre
-        self.center_window(history_window)
-        
+        self.center_window(dialog)
+
         # Frame principal
-        main_frame = ttk.Frame(history_window, padding="20")
+        main_frame = ttk.Frame(dialog, padding="20")
         main_frame.pack(fill=tk.BOTH, expand=True)
-        
+
         # Titre
-        title_label = ttk.Label(main_frame, text="Historique des commits", style="Title.TLabel")
+        title_label = ttk.Label(main_frame, text="Durée des opérations", style="Title.TLabel")
         title_label.pack(anchor=tk.W, pady=(0, 15))
-        
-        # Informations sur le dépôt
-        info_frame = ttk.Frame(main_frame)
-        info_frame.pack(fill=tk.X, pady=(0, 15))
-        
-        branch_label = ttk.Label(info_frame, text=f"Branche: {self.git_repo.active_branch.name}", font=Fonts.DEFAULT)
-        branch_label.pack(side=tk.LEFT)
-        
-        # Options de filtrage
-        filter_frame = ttk.LabelFrame(main_frame, text="Filtres", padding="10")
-        filter_frame.pack(fill=tk.X, pady=(0, 15))
-        
-        # Filtre par auteur
-        author_frame = ttk.Frame(filter_frame)
-        author_frame.pack(fill=tk.X, pady=5)
-        ttk.Label(author_frame, text="Auteur:").pack(side=tk.LEFT, padx=(0, 5))
-        author_var = tk.StringVar()
-        author_entry = ttk.Entry(author_frame, textvariable=author_var, width=30)
-        author_entry.pack(side=tk.LEFT)
-        
-        # Filtre par message
-        message_frame = ttk.Frame(filter_frame)
-        message_frame.pack(fill=tk.X, pady=5)
-        ttk.Label(message_frame, text="Message:").pack(side=tk.LEFT, padx=(0, 5))
-        message_var = tk.StringVar()
-        message_entry = ttk.Entry(message_frame, textvariable=message_var, width=30)
-        message_entry.pack(side=tk.LEFT)
-        
-        # Nombre de commits à afficher
-        limit_frame = ttk.Frame(filter_frame)
-        limit_frame.pack(fill=tk.X, pady=5)
-        ttk.Label(limit_frame, text="Nombre de commits:").pack(side=tk.LEFT, padx=(0, 5))
-        limit_var = tk.StringVar(value="50")
-        limit_entry = ttk.Entry(limit_frame, textvariable=limit_var, width=10)
-        limit_entry.pack(side=tk.LEFT)
-        
-        # Bouton d'application des filtres
-        filter_btn = ModernButton(filter_frame, text="Appliquer les filtres", 
-                               command=lambda: self.load_commit_history(
-                                   history_list, author_var.get(), message_var.get(), limit_var.get()
-                               ),
-                               width=150, height=36, bg_color=COLORS['primary'])
-        filter_btn.pack(anchor=tk.E, pady=(5, 0))
-        
-        # Liste des commits
+
+        # Tableau des statistiques
         list_frame = ttk.Frame(main_frame)
         list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
-        
-        columns = ("hash", "author", "date", "message")
-        history_list = ttk.Treeview(list_frame, columns=columns, show="headings", height=15)
-        
-        # En-têtes
-        history_list.heading("hash", text="Hash")
-        history_list.heading("author", text="Auteur")
-        history_list.heading("date", text="Date")
-        history_list.heading("message", text="Message")
-        
-        # Largeur des colonnes
-        history_list.column("hash", width=80)
-        history_list.column("author", width=150)
-        history_list.column("date", width=150)
-        history_list.column("message", width=400)
-        
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=history_list.yview)
+
+        columns = ("operation", "count", "p50", "p95", "errors")
+        stats_list = ttk.Treeview(list_frame, columns=columns, show="headings", height=12)
+        stats_list.heading("operation", text="Opération")
+        stats_list.heading("count", text="Nombre")
+        stats_list.heading("p50", text="p50 (ms)")
+        stats_list.heading("p95", text="p95 (ms)")
+        stats_list.heading("errors", text="Erreurs")
+        stats_list.column("operation", width=250)
+        stats_list.column("count", width=80, anchor=tk.E)
+        stats_list.column("p50", width=100, anchor=tk.E)
+        stats_list.column("p95", width=100, anchor=tk.E)
+        stats_list.column("errors", width=80, anchor=tk.E)
+
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=stats_list.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        history_list.configure(yscrollcommand=scrollbar.set)
-        history_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        # Zone de détails du commit
-        details_frame = ttk.LabelFrame(main_frame, text="Détails du commit", padding="10")
-        details_frame.pack(fill=tk.X, pady=(0, 15))
-        
-        details_text = scrolledtext.ScrolledText(details_frame, wrap=tk.WORD, height=10)
-        details_text.pack(fill=tk.BOTH, expand=True)
-        details_text.config(state=tk.DISABLED)
-        
-        # Fonction pour afficher les détails d'un commit
-        def show_commit_details(event):
-            selection = history_list.selection()
-            if not selection:
+        stats_list.configure(yscrollcommand=scrollbar.set)
+        stats_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        def refresh():
+            if not dialog.winfo_exists():
                 return
-            
-            item = selection[0]
-            commit_hash = history_list.item(item, "values")[0]
-            
+            summary = METRICS.summary()
+            for operation in stats_list.get_children():
+                if operation not in summary:
+                    stats_list.delete(operation)
+            for operation in sorted(summary):
+                stats = summary[operation]
+                values = (operation, stats["count"], f"{stats['p50'] * 1000:.1f}",
+                          f"{stats['p95'] * 1000:.1f}", stats["errors"])
+                if stats_list.exists(operation):
+                    stats_list.item(operation, values=values)
+                else:
+                    stats_list.insert("", "end", iid=operation, values=values)
+            dialog.after(2000, refresh)
+
+        def export_metrics():
             try:
-                commit = self.git_repo.commit(commit_hash)
-                
-                details = f"Commit: {commit.hexsha}\n"
-                details += f"Auteur: {commit.author.name} <{commit.author.email}>\n"
-                details += f"Date: {datetime.fromtimestamp(commit.committed_date).strftime('%Y-%m-%d %H:%M:%S')}\n"
-                details += f"Message:\n{commit.message}\n\n"
-                
-                details += "Fichiers modifiés:\n"
-                for parent in commit.parents:
-                    for diff in parent.diff(commit):
-                        details += f"- {diff.a_path}\n"
-                
-                details_text.config(state=tk.NORMAL)
-                details_text.delete(1.0, tk.END)
-                details_text.insert(tk.END, details)
-                details_text.config(state=tk.DISABLED)
+                os.makedirs(os.path.dirname(METRICS_JSONL_FILE), exist_ok=True)
+                METRICS.export_jsonl(METRICS_JSONL_FILE)
+                METRICS.export_prometheus(METRICS_PROM_FILE)
+                self.log(f"Mesures exportées dans {METRICS_JSONL_FILE} et {METRICS_PROM_FILE}", "success")
             except Exception as e:
-                details_text.config(state=tk.NORMAL)
-                details_text.delete(1.0, tk.END)
-                details_text.insert(tk.END, f"Erreur lors de la récupération des détails: {str(e)}")
-                details_text.config(state=tk.DISABLED)
-        
-        # Lier l'événement de sélection
-        history_list.bind("<<TreeviewSelect>>", show_commit_details)
-        
-        # Boutons d'action
+                messagebox.showerror("Erreur", f"Erreur lors de l'export des mesures: {str(e)}", parent=dialog)
+
+        # Boutons
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X)
-        
-        close_btn = ModernButton(button_frame, text="Fermer", command=history_window.destroy,
+
+        close_btn = ModernButton(button_frame, text="Fermer", command=dialog.destroy,
                               width=150, height=40, bg_color=COLORS['bg_dark'])
         close_btn.pack(side=tk.RIGHT)
-        
-        tag_btn = ModernButton(button_frame, text="Créer un tag", 
-                            command=lambda: self.create_tag_from_commit(
-                                history_list.item(history_list.selection()[0], "values")[0] if history_list.selection() else None
-                            ),
-                            width=150, height=40, bg_color=COLORS['primary'])
-        tag_btn.pack(side=tk.RIGHT, padx=(0, 12))
-        
-        # Charger l'historique
-        self.load_commit_history(history_list, "", "", "50")
-    
-    def load_commit_history(self, history_list, author, message, limit):
-        """Charge l'historique des commits avec les filtres spécifiés"""
-        # Vider la liste
-        for item in history_list.get_children():
-            history_list.delete(item)
-        
-        try:
-            # Convertir la limite en entier
-            try:
-                limit_int = int(limit)
-            except ValueError:
-                limit_int = 50
-            
-            # Construire la commande git log
-            log_cmd = ['log', f'--max-count={limit_int}', '--pretty=format:%H|%an|%ad|%s', '--date=format:%Y-%m-%d %H:%M:%S']
-            
-            if author:
-                log_cmd.append(f'--author={author}')
-            
-            if message:
-                log_cmd.append(f'--grep={message}')
-            
-            # Exécuter la commande
-            logs = self.git_repo.git.execute(log_cmd)
-            
-            # Parser la sortie
-            for line in logs.splitlines():
-                parts = line.split('|', 3)
-                if len(parts) >= 4:
-                    commit_hash, author, date, msg = parts
-                    history_list.insert("", "end", values=(commit_hash[:8], author, date, msg))
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors du chargement de l'historique: {str(e)}")
-    
-    def create_tag_from_commit(self, commit_hash):
-        """Crée un tag à partir d'un commit spécifique"""
-        if not commit_hash:
-            messagebox.showerror("Erreur", "Veuillez sélectionner un commit")
-            return
-        
-        # Demander le nom du tag
-        tag_name = simpledialog.askstring("Nouveau tag", "Nom du tag:", parent=self.root)
-        if not tag_name:
-            return
-        
-        # Demander un message pour le tag
-        tag_message = simpledialog.askstring("Message du tag", "Message (optionnel):", parent=self.root)
-        
-        # Demander si on veut pousser le tag
-        push_tag = messagebox.askyesno("Pousser le tag", "Voulez-vous pousser ce tag vers le dépôt distant?")
-        
-        try:
-            os.chdir(self.current_repo["local_path"])
-            
-            # Créer le tag
-            if tag_message:
-                self.git_repo.git.tag('-a', tag_name, commit_hash, '-m', tag_message)
-            else:
-                self.git_repo.git.tag(tag_name, commit_hash)
-            
-            self.log(f"Tag '{tag_name}' créé sur le commit {commit_hash}", "success")
-            
-            # Pousser le tag si demandé
-            if push_tag:
-                self.git_repo.git.push('origin', tag_name)
-                self.log(f"Tag '{tag_name}' poussé vers le dépôt distant", "success")
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors de la création du tag: {str(e)}")
-    
-    def create_tag(self):
-        """Crée un tag sur le commit actuel (HEAD)"""
-        if not self.current_repo or not self.git_repo:
-            messagebox.showinfo("Information", "Veuillez sélectionner un dépôt Git valide")
-            return
-        
-        # Afficher la boîte de dialogue pour créer un tag
+
+        export_btn = ModernButton(button_frame, text="Exporter", command=export_metrics,
+                               width=150, height=40, bg_color=COLORS['primary'])
+        export_btn.pack(side=tk.RIGHT, padx=(0, 12))
+
+        journal_btn = ModernButton(button_frame, text="Journal", command=self.show_journal_panel,
+                                width=150, height=40, bg_color=COLORS['secondary'])
+        journal_btn.pack(side=tk.RIGHT, padx=(0, 12))
+
+        refresh()
+
+    def show_journal_panel(self):
+        """Affiche les opérations les plus lentes et les modifications du jour d'après le journal"""
         dialog = tk.Toplevel(self.root)
-        dialog.title("Créer un tag")
-        dialog.geometry("500x300")
+        dialog.title("Journal des opérations")
+        dialog.geometry("1000x560")
         dialog.transient(self.root)
-        dialog.grab_set()
         dialog.configure(bg=COLORS['bg_light'])
-        
-        # Centrer la boîte de dialogue
+
+        # Centrer la fenêtre
         self.center_window(dialog)
-        
+
         # Frame principal
         main_frame = ttk.Frame(dialog, padding="20")
         main_frame.pack(fill=tk.BOTH, expand=True)
-        
+
         # Titre
-        title_label = ttk.Label(main_frame, text="Créer un nouveau tag", style="Title.TLabel")
+        title_label = ttk.Label(main_frame, text="Journal des opérations", style="Title.TLabel")
         title_label.pack(anchor=tk.W, pady=(0, 15))
-        
-        # Formulaire
-        form_frame = ttk.Frame(main_frame)
-        form_frame.pack(fill=tk.X, pady=(0, 15))
-        
-        # Nom du tag
-        name_frame = ttk.Frame(form_frame)
-        name_frame.pack(fill=tk.X, pady=5)
-        ttk.Label(name_frame, text="Nom du tag:").pack(side=tk.LEFT, padx=(0, 5))
-        name_var = tk.StringVar()
-        ttk.Entry(name_frame, textvariable=name_var, width=30).pack(side=tk.LEFT, fill=tk.X, expand=True)
-        
-        # Message du tag
-        message_frame = ttk.Frame(form_frame)
-        message_frame.pack(fill=tk.X, pady=5)
-        ttk.Label(message_frame, text="Message:").pack(anchor=tk.W)
-        message_text = scrolledtext.ScrolledText(message_frame, wrap=tk.WORD, width=50, height=5)
-        message_text.pack(fill=tk.X, pady=(5, 0))
-        
-        # Options
-        options_frame = ttk.Frame(main_frame)
-        options_frame.pack(fill=tk.X, pady=(0, 15))
-        
-        push_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(options_frame, text="Pousser le tag vers le dépôt distant", variable=push_var).pack(anchor=tk.W)
-        
-        lightweight_var = tk.BooleanVar(value=False)
-        ttk.Checkbutton(options_frame, text="Tag léger (sans message)", variable=lightweight_var).pack(anchor=tk.W)
-        
+
+        # Choix du dépôt
+        all_repos = "Tous les dépôts"
+        filter_frame = ttk.Frame(main_frame)
+        filter_frame.pack(fill=tk.X, pady=(0, 10))
+        ttk.Label(filter_frame, text="Dépôt:").pack(side=tk.LEFT, padx=(0, 10))
+        repo_var = tk.StringVar(value=self.current_repo["name"] if self.current_repo else all_repos)
+        ttk.Combobox(filter_frame, textvariable=repo_var, state="readonly", width=40,
+                     values=[all_repos] + [repo["name"] for repo in self.repo_config.get_repos()]).pack(side=tk.LEFT)
+
+        notebook = ttk.Notebook(main_frame)
+        notebook.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+
+        columns = {"time": ("Date", 140), "repo": ("Dépôt", 130), "operation": ("Opération", 120),
+                   "args": ("Arguments", 220), "duration": ("Durée (ms)", 90), "outcome": ("Résultat", 80),
+                   "refs": ("Références modifiées", 200)}
+
+        def make_table(title):
+            frame = ttk.Frame(notebook)
+            notebook.add(frame, text=title)
+            table = ttk.Treeview(frame, columns=tuple(columns), show="headings")
+            for column, (text, width) in columns.items():
+                table.heading(column, text=text)
+                table.column(column, width=width, anchor=tk.E if column == "duration" else tk.W)
+            scrollbar = ttk.Scrollbar(frame, orient="vertical", command=table.yview)
+            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            table.configure(yscrollcommand=scrollbar.set)
+            table.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            return table
+
+        slowest_list = make_table("Opérations les plus lentes")
+        today_list = make_table("Modifications du jour")
+
+        def row(entry):
+            refs = ", ".join(f"{ref.replace('refs/heads/', '')}: {(old or '-')[:7]} → {(new or '-')[:7]}"
+                             for ref, (old, new) in entry.get("refs", {}).items())
+            return (datetime.fromtimestamp(entry.get("time", 0)).strftime("%Y-%m-%d %H:%M:%S"), entry.get("repo", ""),
+                    entry.get("operation", ""), " ".join(entry.get("args", [])),
+                    f"{entry.get('duration', 0) * 1000:.0f}",
+                    "succès" if entry.get("outcome") == "success" else "erreur", refs)
+
+        def fill(table, entries):
+            table.delete(*table.get_children())
+            for entry in entries:
+                table.insert("", "end", values=row(entry))
+
+        def refresh(*args):
+            repo = None if repo_var.get() == all_repos else repo_var.get()
+
+            def worker():
+                try:
+                    slowest = self.journal.slowest(repo=repo)
+                    today = self.journal.changes_on(repo) if repo else []
+                except Exception as e:
+                    self.log(f"Erreur lors de la lecture du journal: {str(e)}", "error")
+                    return
+
+                def show():
+                    if dialog.winfo_exists():
+                        fill(slowest_list, slowest)
+                        fill(today_list, today)
+                self.root.after(0, show)
+            threading.Thread(target=worker, daemon=True).start()
+
+        repo_var.trace_add("write", refresh)
+
         # Boutons
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X)
-        
-        cancel_btn = ModernButton(button_frame, text="Annuler", command=dialog.destroy,
-                               width=150, height=40, bg_color=COLORS['bg_dark'])
-        cancel_btn.pack(side=tk.RIGHT)
-        
-        create_btn = ModernButton(button_frame, text="Créer", 
-                               command=lambda: self.do_create_tag(
-                                   name_var.get(), message_text.get("1.0", tk.END).strip(),
-                                   lightweight_var.get(), push_var.get(), dialog
-                               ),
-                               width=150, height=40, bg_color=COLORS['primary'])
-        create_btn.pack(side=tk.RIGHT, padx=(0, 12))
-    
-    def do_create_tag(self, name, message, lightweight, push, dialog):
-        """Crée effectivement le tag"""
-        if not name:
-            messagebox.showerror("Erreur", "Le nom du tag est obligatoire", parent=dialog)
-            return
-        
-        if not lightweight and not message:
-            messagebox.showerror("Erreur", "Le message est obligatoire pour un tag annoté", parent=dialog)
-            return
-        
-        dialog.destroy()
-        self.operation_running = True
-        self.status_label.config(text="Création du tag...")
-        self.progress_bar["value"] = 20
-        
-        # Lancer l'opération dans un thread
-        threading.Thread(target=lambda: self._create_tag_thread(name, message, lightweight, push)).start()
-    
-    def _create_tag_thread(self, name, message, lightweight, push):
-        """Thread pour créer un tag"""
-        try:
-            # Aller dans le répertoire du dépôt
-            os.chdir(self.current_repo["local_path"])
-            
-            # Créer le tag
-            if lightweight:
-                self.log(f"Création d'un tag léger '{name}'...", "info")
-                self.git_repo.git.tag(name)
-            else:
-                self.log(f"Création d'un tag annoté '{name}'...", "info")
-                self.git_repo.git.tag('-a', name, '-m', message)
-            
-            self.progress_bar["value"] = 60
-            
-            # Pousser le tag si demandé
-            if push:
-                self.log(f"Push du tag '{name}' vers le dépôt distant...", "info")
-                self.git_repo.git.push('origin', name)
-            
-            self.progress_bar["value"] = 100
-            self.log(f"Tag '{name}' créé avec succès", "success")
-            
-            # Mettre à jour l'interface
-            self.root.after(0, self._tag_operation_completed)
-            
-        except Exception as e:
-            self.root.after(0, lambda: self._tag_operation_error(str(e)))
-    
-    def _tag_operation_completed(self):
-        """Gère la fin d'une opération de tag réussie"""
-        self.operation_running = False
-        self.status_label.config(text="Prêt")
-    
-    def _tag_operation_error(self, error_msg):
-        """Gère une erreur lors d'une opération de tag"""
-        self.operation_running = False
-        self.status_label.config(text="Erreur")
-        self.progress_bar["value"] = 0
-        self.log(f"Erreur lors de la création du tag: {error_msg}", "error")
-        messagebox.showerror("Erreur", f"Erreur lors de la création du tag: {error_msg}")
+
+        close_btn = ModernButton(button_frame, text="Fermer", command=dialog.destroy,
+                              width=150, height=40, bg_color=COLORS['bg_dark'])
+        close_btn.pack(side=tk.RIGHT)
+
+        refresh_btn = ModernButton(button_frame, text="Actualiser", command=refresh,
+                                width=150, height=40, bg_color=COLORS['primary'])
+        refresh_btn.pack(side=tk.RIGHT, padx=(0, 12))
+
+        refresh()
 
     def center_window(self, window=None):
         """Centre une fenêtre sur l'écran"""
@@ -1652,20 +8723,11 @@ class GitApp:
             return
         
         # Vérifier s'il y a des conflits
-        unmerged_files = []
         try:
-            unmerged_output = self.git_repo.git.execute(['ls-files', '--unmerged'])
-            if not unmerged_output:
+            unmerged_files = GitOperations(self.git_repo).unmerged_files()
+            if not unmerged_files:
                 messagebox.showinfo("Information", "Aucun conflit détecté")
                 return
-            
-            # Parser la sortie pour extraire les fichiers uniques
-            for line in unmerged_output.splitlines():
-                parts = line.split()
-                if len(parts) >= 4:
-                    unmerged_files.append(' '.join(parts[3:]))
-            
-            unmerged_files = list(set(unmerged_files))
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors de la détection des conflits: {str(e)}")
             return
@@ -1756,6 +8818,80 @@ class GitApp:
                                command=lambda: self.complete_merge(dialog),
                                width=200, height=40, bg_color=COLORS['primary'])
         commit_btn.pack(side=tk.RIGHT, padx=(0, 10))
+
+    def open_conflict_file(self, path):
+        """Ouvre un fichier en conflit avec l'application par défaut du système"""
+        if not path:
+            messagebox.showerror("Erreur", "Veuillez sélectionner un fichier")
+            return
+        full_path = os.path.join(self.git_repo.working_dir, path)
+        try:
+            if sys.platform == "win32":
+                os.startfile(full_path)
+            elif sys.platform == "darwin":
+                subprocess.Popen(["open", full_path])
+            else:
+                subprocess.Popen(["xdg-open", full_path])
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Impossible d'ouvrir le fichier: {str(e)}")
+
+    def _conflict_operation(self, operation, args, action, on_success, dialog):
+        """Exécute une étape de résolution de conflit dans un thread, mesurée et journalisée"""
+        def worker():
+            try:
+                os.chdir(self.current_repo["local_path"])
+                with METRICS.span(operation, self.current_repo["name"], " ".join(args)), \
+                        self.journal.operation(operation, self.current_repo["name"], args, self.git_repo):
+                    action()
+                self.root.after(0, on_success)
+            except Exception as e:
+                self.log(f"Erreur lors de la résolution des conflits: {str(e)}", "error")
+                self.root.after(0, lambda error=str(e): messagebox.showerror(
+                    "Erreur", f"Erreur lors de la résolution des conflits: {error}",
+                    parent=dialog if dialog.winfo_exists() else self.root))
+        threading.Thread(target=worker).start()
+
+    def resolve_conflict_with(self, path, side, files_list, dialog):
+        """Résout le conflit d'un fichier en gardant notre version (--ours) ou la leur (--theirs)"""
+        if not path:
+            messagebox.showerror("Erreur", "Veuillez sélectionner un fichier", parent=dialog)
+            return
+
+        def action():
+            self.git_repo.git.checkout(side, '--', path)
+            self.git_repo.git.add('--', path)
+            self.log(f"Conflit résolu pour '{path}' ({'notre' if side == '--ours' else 'leur'} version)", "success")
+
+        def on_success():
+            if dialog.winfo_exists() and path in files_list.get(0, tk.END):
+                files_list.delete(files_list.get(0, tk.END).index(path))
+        self._conflict_operation("resolve-conflict", [side, path], action, on_success, dialog)
+
+    def complete_merge(self, dialog):
+        """Crée le commit de fusion une fois tous les conflits résolus"""
+        try:
+            remaining = GitOperations(self.git_repo).unmerged_files()
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors de la détection des conflits: {str(e)}", parent=dialog)
+            return
+        if remaining:
+            messagebox.showerror("Erreur", f"{len(remaining)} fichier(s) encore en conflit", parent=dialog)
+            return
+
+        def action():
+            self.git_repo.git.commit('--no-edit')
+            self.log("Fusion finalisée avec succès", "success")
+        self._conflict_operation("merge-commit", [], action, dialog.destroy, dialog)
+
+    def abort_merge(self, dialog):
+        """Annule la fusion en cours et restaure l'état précédent"""
+        if not messagebox.askyesno("Confirmation", "Voulez-vous vraiment annuler la fusion en cours?", parent=dialog):
+            return
+
+        def action():
+            self.git_repo.git.merge('--abort')
+            self.log("Fusion annulée", "info")
+        self._conflict_operation("merge-abort", [], action, dialog.destroy, dialog)
     
     def push_changes(self):
         """Push les changements vers le dépôt distant"""
@@ -1773,43 +8909,197 @@ class GitApp:
             messagebox.showerror("Erreur", f"Erreur lors de la vérification des dépôts distants: {str(e)}")
             return
             
-        # Demander confirmation
+        # Demander confirmation avec le résumé de ce qui sera envoyé
+        remote_name = remotes[0].name
+        git_ops = GitOperations(self.git_repo)
         current_branch = self.git_repo.active_branch.name
-        if not messagebox.askyesno("Confirmation", f"Voulez-vous pousser la branche '{current_branch}' vers le dépôt distant?"):
+        try:
+            tracking = git_ops.branch_tracking()
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors de la lecture des branches: {str(e)}")
             return
-            
-        # Démarrer l'opération
-        self.operation_running = True
-        self.status_label.config(text="Push en cours...")
-        self.progress_bar["value"] = 20
-        
-        # Lancer dans un thread séparé
-        threading.Thread(target=self._push_thread).start()
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Push")
+        dialog.geometry("900x600")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        dialog.configure(bg=COLORS['bg_light'])
+
+        # Centrer la boîte de dialogue
+        self.center_window(dialog)
+
+        # Frame principal
+        main_frame = ttk.Frame(dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Titre
+        title_label = ttk.Label(main_frame, text=f"Pousser vers '{remote_name}'", style="Title.TLabel")
+        title_label.pack(anchor=tk.W, pady=(0, 15))
+
+        content_frame = ttk.Frame(main_frame)
+        content_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+
+        # Branches locales (sélection multiple), avec l'avance et le retard sur la branche suivie
+        branch_frame = ttk.Frame(content_frame)
+        branch_frame.pack(side=tk.LEFT, fill=tk.Y)
+        branch_list = ttk.Treeview(branch_frame, columns=("branch", "ahead", "behind", "remote"), show="headings",
+                                   selectmode="extended", height=15)
+        branch_list.heading("branch", text="Branche")
+        branch_list.heading("ahead", text="À pousser")
+        branch_list.heading("behind", text="En retard")
+        branch_list.heading("remote", text="Distant")
+        branch_list.column("branch", width=160)
+        branch_list.column("ahead", width=70, anchor=tk.E)
+        branch_list.column("behind", width=70, anchor=tk.E)
+        branch_list.column("remote", width=120)
+        branch_list.pack(side=tk.LEFT, fill=tk.Y)
+        for name, (ahead, behind, upstream) in sorted(tracking.items()):
+            values = (name, ahead, behind, "") if upstream else (name, "nouvelle", "-", "")
+            branch_list.insert("", "end", iid=name, values=values)
+
+        def apply_badges(labels):
+            # L'instantané du distant peut être plus récent que les références de suivi
+            if not dialog.winfo_exists():
+                return
+            for ref, label in labels.items():
+                name = ref[len("refs/heads/"):]
+                if branch_list.exists(name):
+                    branch_list.set(name, "remote", label)
+        self.load_remote_badges([f"refs/heads/{name}" for name in tracking], apply_badges, remote_name)
+        if branch_list.exists(current_branch):
+            branch_list.selection_set(current_branch)
+            branch_list.see(current_branch)
+
+        # Résumé des branches sélectionnées
+        summary_text = scrolledtext.ScrolledText(content_frame, wrap=tk.WORD, bg=COLORS['card'],
+                                                 relief=tk.FLAT, borderwidth=0, highlightthickness=0,
+                                                 padx=10, pady=10)
+        summary_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(15, 0))
+        summary_text.tag_configure("title", font=("Segoe UI", 10, "bold"))
+        summary_text.tag_configure("warning", foreground=COLORS['warning'])
+        summary_text.config(state=tk.DISABLED)
+        state = {"token": 0}
+
+        def show_summaries(token, summaries):
+            if token != state["token"] or not dialog.winfo_exists():
+                return
+            summary_text.config(state=tk.NORMAL)
+            summary_text.delete("1.0", tk.END)
+            for summary in summaries:
+                summary_text.insert(tk.END, f"{summary['branch']} → {remote_name}\n", "title")
+                if summary["upstream"] is None:
+                    summary_text.insert(tk.END, "Nouvelle branche sur le distant\n")
+                summary_text.insert(tk.END, f"{summary['ahead']} commit(s), {len(summary['files'])} fichier(s), "
+                                            f"taille estimée {format_size(summary['size'])}\n")
+                if summary["behind"]:
+                    summary_text.insert(tk.END, f"Le distant a {summary['behind']} commit(s) absents localement : "
+                                                f"le push sera refusé sans pull préalable\n", "warning")
+                for sha, author, date, subject in summary["commits"]:
+                    summary_text.insert(tk.END, f"  {sha[:8]} {date} {author}: {subject}\n")
+                if summary["ahead"] > len(summary["commits"]):
+                    summary_text.insert(tk.END, f"  ... et {summary['ahead'] - len(summary['commits'])} autre(s)\n")
+                if summary["files"]:
+                    summary_text.insert(tk.END, "Fichiers:\n")
+                    for path in summary["files"][:100]:
+                        summary_text.insert(tk.END, f"  {path}\n")
+                    if len(summary["files"]) > 100:
+                        summary_text.insert(tk.END, f"  ... et {len(summary['files']) - 100} autre(s)\n")
+                summary_text.insert(tk.END, "\n")
+            summary_text.config(state=tk.DISABLED)
+
+        def on_select(event=None):
+            branches = list(branch_list.selection())
+            state["token"] += 1
+            token = state["token"]
+            summary_text.config(state=tk.NORMAL)
+            summary_text.delete("1.0", tk.END)
+            summary_text.insert(tk.END, "Calcul du résumé..." if branches else "Aucune branche sélectionnée")
+            summary_text.config(state=tk.DISABLED)
+
+            def worker():
+                try:
+                    with METRICS.span("push-summary", self.current_repo["name"], " ".join(branches)):
+                        summaries = [git_ops.outgoing_summary(branch, remote_name) for branch in branches]
+                    self.root.after(0, lambda: show_summaries(token, summaries))
+                except Exception as e:
+                    self.root.after(0, lambda error=str(e): self.log(f"Erreur lors du calcul du résumé: {error}", "error"))
+            if branches:
+                threading.Thread(target=worker, daemon=True).start()
+
+        branch_list.bind("<<TreeviewSelect>>", on_select)
+
+        def confirm():
+            branches = list(branch_list.selection())
+            if not branches:
+                messagebox.showerror("Erreur", "Veuillez sélectionner au moins une branche", parent=dialog)
+                return
+            dialog.destroy()
+
+            def start_push():
+                # Démarrer l'opération
+                self.operation_running = True
+                self.status_label.config(text="Push en cours...")
+                self.progress_bar["value"] = 20
+
+                # Lancer sur la boucle asyncio : la progression est lue au fil de l'eau
+                self.async_git.submit(self._push_async(remote_name, branches))
+
+            # Taille de tous les blobs sortants avant d'envoyer quoi que ce soit
+            scanner = LargeFileScanner(self.git_repo, self.large_file_threshold())
+            self.confirm_large_files(lambda: scanner.scan_outgoing(branches, remote_name)[0], start_push,
+                                     "pousser ces fichiers")
+
+        # Boutons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
+
+        cancel_btn = ModernButton(button_frame, text="Annuler", command=dialog.destroy,
+                               width=150, height=40, bg_color=COLORS['bg_dark'])
+        cancel_btn.pack(side=tk.RIGHT)
+
+        push_btn = ModernButton(button_frame, text="Pousser la sélection", command=confirm,
+                             width=180, height=40, bg_color=COLORS['success'])
+        push_btn.pack(side=tk.RIGHT, padx=(0, 12))
+
+        on_select()
     
-    def _push_thread(self):
-        """Thread pour pousser les modifications"""
+    def show_git_progress(self, line, percent, start=20, end=95):
+        """Reporte une ligne de progression de git dans la barre d'état (appelable depuis n'importe quel thread)"""
+        def update():
+            self.status_label.config(text=line[:80])
+            if percent is not None:
+                self.progress_bar["value"] = start + (end - start) * percent / 100
+        self.root.after(0, update)
+
+    async def _push_async(self, remote_name, branches):
+        """Pousse les branches sélectionnées en une seule commande, sur la boucle asyncio"""
+        repo_name = self.current_repo["name"]
+        git_repo = self.git_repo
+        loop = asyncio.get_running_loop()
         try:
-            # Aller dans le répertoire du dépôt
-            os.chdir(self.current_repo["local_path"])
-            
-            # Obtenir la branche actuelle
-            current_branch = self.git_repo.active_branch.name
-            
-            # Push vers le dépôt distant
-            self.log(f"Push de la branche '{current_branch}' vers le dépôt distant...", "info")
-            remote_name = self.git_repo.remotes[0].name
-            
-            # Exécuter le push
-            output = self.git_repo.git.push(remote_name, current_branch)
-            
-            self.progress_bar["value"] = 100
-            self.log("Push terminé avec succès", "success")
-            
-            # Mettre à jour l'interface
-            self.root.after(0, self._push_completed)
-            
+            with METRICS.span("push", repo_name, " ".join(branches)):
+                async with self.journal.operation_async("push", repo_name, [remote_name] + branches, git_repo):
+                    names = ", ".join(f"'{branch}'" for branch in branches)
+                    self.root.after(0, lambda: self.log(
+                        f"Push de {len(branches)} branche(s) ({names}) vers le dépôt distant...", "info"))
+
+                    # Une seule connexion pour toutes les branches
+                    await self.async_git.run(git_repo.working_dir,
+                                             ['push', '--progress', remote_name,
+                                              *GitOperations.push_refspecs(branches)],
+                                             on_progress=self.show_git_progress, repo_name=repo_name)
+                    # Lecture des références locales et écriture du cache : hors de la boucle
+                    await loop.run_in_executor(None, lambda: self.remember_remote_refs(
+                        remote_name, pushed=[f"refs/heads/{branch}" for branch in branches]))
+
+            def completed():
+                self.progress_bar["value"] = 100
+                self.log("Push terminé avec succès", "success")
+                self._push_completed()
+            self.root.after(0, completed)
         except Exception as e:
-            self.root.after(0, lambda: self._push_error(str(e)))
+            self.root.after(0, lambda error=str(e): self._push_error(error))
     
     def _push_completed(self):
         """Gère la fin d'un push réussi"""
@@ -1830,4 +9120,5 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
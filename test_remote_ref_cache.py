@@ -0,0 +1,130 @@
+"""Tests de RemoteRefCache avec un dépôt nu local comme distant
+
+Le dépôt de travail et son distant sont générés par SyntheticRepoBuilder (benchmark.py).
+Lancement : python -m pytest -q
+"""
+
+import subprocess
+
+import pytest
+from git import Repo
+
+import github
+from benchmark import SyntheticRepoBuilder
+from github import RemoteRefCache
+
+
+def git(*args):
+    return subprocess.run(["git", *args], check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def repos(tmp_path, monkeypatch):
+    """Dépôt de travail, distant nu et cache des références écrit dans le dossier temporaire"""
+    monkeypatch.setattr(github, "REMOTE_REFS_DIR", str(tmp_path / "remote_refs"))
+    work, remote = SyntheticRepoBuilder(commits=5, branches=1, files=3, depth=2).build(str(tmp_path / "repo"))
+    return work, remote
+
+
+def other_clone(tmp_path, remote):
+    """Second clone du distant, pour le faire avancer sans que le dépôt de travail le sache"""
+    path = str(tmp_path / "other")
+    git("clone", "-q", remote, path)
+    git("-C", path, "config", "user.name", "Other")
+    git("-C", path, "config", "user.email", "other@example.com")
+    return path
+
+
+def test_snapshot_expires_after_ttl(repos):
+    work, _ = repos
+    cache = RemoteRefCache(Repo(work), work, ttl=60)
+    assert cache.get("origin") is None
+    assert cache.is_stale("origin")
+
+    assert cache.refresh("origin")
+    assert not cache.is_stale("origin")
+    assert cache.get("origin")["refs/heads/main"] == git("-C", work, "rev-parse", "main")
+
+    # Instantané vieux de plus que le TTL : à relire, mais toujours servi en attendant
+    cache.snapshots["origin"]["time"] -= 120
+    assert cache.is_stale("origin")
+    assert cache.get("origin") is not None
+
+
+def test_snapshot_is_persisted(repos):
+    work, _ = repos
+    RemoteRefCache(Repo(work), work).refresh("origin")
+    reloaded = RemoteRefCache(Repo(work), work)
+    assert "refs/heads/main" in reloaded.get("origin")
+    assert not reloaded.is_stale("origin")
+
+
+def test_push_and_delete_update_snapshot_locally(repos):
+    work, remote = repos
+    cache = RemoteRefCache(Repo(work), work)
+    cache.refresh("origin")
+
+    git("-C", work, "branch", "pushed", "main")
+    git("-C", work, "push", "-q", "origin", "pushed")
+    # Le distant a changé mais le cache ne le sait que par record_push, sans ls-remote
+    assert cache.compare("origin", ["refs/heads/pushed"]) == {"refs/heads/pushed": "absent"}
+    local = cache.local_refs()
+    cache.record_push("origin", {"refs/heads/pushed": local["refs/heads/pushed"]})
+    assert cache.compare("origin", ["refs/heads/pushed"]) == {"refs/heads/pushed": "same"}
+
+    git("-C", work, "push", "-q", "origin", "--delete", "pushed")
+    cache.record_delete("origin", ["refs/heads/pushed"])
+    assert cache.compare("origin", ["refs/heads/pushed"]) == {"refs/heads/pushed": "absent"}
+    assert "refs/heads/pushed" not in git("-C", remote, "for-each-ref", "refs/heads")
+
+
+def test_record_without_snapshot_is_ignored(repos):
+    work, _ = repos
+    cache = RemoteRefCache(Repo(work), work)
+    cache.record_push("origin", {"refs/heads/main": "0" * 40})
+    cache.record_delete("origin", ["refs/heads/main"])
+    assert cache.get("origin") is None
+    assert cache.compare("origin", ["refs/heads/main"]) is None
+
+
+def test_exists_on_remote_badge(repos):
+    work, _ = repos
+    git("-C", work, "branch", "remote-only", "main")
+    git("-C", work, "push", "-q", "origin", "remote-only")
+    git("-C", work, "branch", "-D", "remote-only")
+
+    cache = RemoteRefCache(Repo(work), work)
+    cache.refresh("origin")
+    assert cache.compare("origin", ["refs/heads/remote-only"]) == {"refs/heads/remote-only": "exists"}
+    assert RemoteRefCache.BADGES["exists"] == "sur le distant"
+
+
+def test_remote_ahead_badge(repos, tmp_path):
+    work, remote = repos
+    other = other_clone(tmp_path, remote)
+    git("-C", other, "commit", "-q", "--allow-empty", "-m", "Commit inconnu du dépôt de travail")
+    git("-C", other, "push", "-q", "origin", "main")
+
+    cache = RemoteRefCache(Repo(work), work)
+    cache.refresh("origin")
+    # Le commit distant n'existe pas encore localement
+    assert cache.compare("origin", ["refs/heads/main"]) == {"refs/heads/main": "remote_ahead"}
+
+    # Après un fetch, le commit est connu et descend de la branche locale
+    git("-C", work, "fetch", "-q", "origin")
+    assert cache.compare("origin", ["refs/heads/main"]) == {"refs/heads/main": "remote_ahead"}
+
+
+def test_local_ahead_and_diverged_badges(repos, tmp_path):
+    work, remote = repos
+    cache = RemoteRefCache(Repo(work), work)
+    cache.refresh("origin")
+    git("-C", work, "commit", "-q", "--allow-empty", "-m", "Commit local")
+    assert cache.compare("origin", ["refs/heads/main"]) == {"refs/heads/main": "local_ahead"}
+
+    other = other_clone(tmp_path, remote)
+    git("-C", other, "commit", "-q", "--allow-empty", "-m", "Commit distant")
+    git("-C", other, "push", "-q", "origin", "main")
+    cache.refresh("origin")
+    git("-C", work, "fetch", "-q", "origin")
+    assert cache.compare("origin", ["refs/heads/main"]) == {"refs/heads/main": "diverged"}